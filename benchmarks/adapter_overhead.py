@@ -0,0 +1,422 @@
+"""
+Adapter overhead benchmark: what the greeble helpers add per request.
+
+Drives FastAPI (ASGI), Flask and Django (WSGI) apps in-process, without sockets, and
+times each request. Every greeble route has a bare-framework twin rendering the same
+template, so the reported overhead is the adapter's cost alone:
+
+- `template_response` full page vs the framework's own render
+- `template_response` with `HX-Request: true` (partial) and with triggers
+- FastAPI `partial_html` vs a plain `HTMLResponse`
+- `hx_trigger_headers` called directly (no framework)
+
+Results are requests/sec plus p50/p99 latency. `--json PATH` writes them with the git
+commit and library versions so two runs can be diffed; `--compare PATH` prints the p50
+change against such a file.
+
+Usage:
+    uv run python -m benchmarks.adapter_overhead [--requests 2000] [--json out.json]
+    uv run python -m benchmarks.adapter_overhead --compare out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from importlib import metadata
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+TEMPLATES = {
+    "layout.html": (
+        "<!doctype html><html><head><title>{{ title }}</title></head>"
+        "<body>{% block content %}{% endblock %}</body></html>"
+    ),
+    "page.html": '{% extends "layout.html" %}{% block content %}{% include "rows.html" %}{% endblock %}',
+    "rows.html": (
+        '<ul id="rows">{% for row in rows %}'
+        '<li data-id="{{ row.id }}">{{ row.name }}</li>{% endfor %}</ul>'
+    ),
+}
+CONTEXT: dict[str, Any] = {
+    "title": "Benchmark",
+    "rows": [{"id": index, "name": f"Row <{index}>"} for index in range(20)],
+}
+TRIGGERS = {"greeble:toast": {"level": "info", "message": "Saved"}}
+FRAGMENT = '<div class="greeble-toast" role="status">Saved</div>'
+
+# (scenario, path, HTMX request, baseline scenario)
+SCENARIOS: list[tuple[str, str, bool, str | None]] = [
+    ("baseline_page", "/baseline/page", False, None),
+    ("template_response_page", "/greeble/page", False, "baseline_page"),
+    ("baseline_partial", "/baseline/partial", True, None),
+    ("template_response_partial", "/greeble/page", True, "baseline_partial"),
+    ("template_response_triggers", "/greeble/triggers", True, "baseline_partial"),
+    ("baseline_html", "/baseline/html", False, None),
+    ("partial_html", "/greeble/html", False, "baseline_html"),
+]
+
+Timings = list[int]
+
+
+def _write_templates(directory: Path) -> None:
+    for name, source in TEMPLATES.items():
+        (directory / name).write_text(source, encoding="utf-8")
+
+
+def _summary(samples: Timings, total: float) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "requests_per_sec": len(ordered) / total,
+        "p50_us": ordered[len(ordered) // 2] / 1000,
+        "p99_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1000,
+    }
+
+
+def _time_calls(call: Callable[[], object], requests: int, warmup: int) -> dict[str, float]:
+    for _ in range(warmup):
+        call()
+    samples: Timings = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter_ns()
+        call()
+        samples.append(time.perf_counter_ns() - start)
+    return _summary(samples, time.perf_counter() - started)
+
+
+# --- FastAPI (ASGI) -----------------------------------------------------------------
+
+
+def _fastapi_app(directory: Path) -> Any:
+    from fastapi import FastAPI
+    from fastapi.responses import HTMLResponse
+    from fastapi.templating import Jinja2Templates
+
+    from greeble.adapters.fastapi import partial_html, template_response
+
+    templates = Jinja2Templates(directory=str(directory))
+
+    # Plain Starlette routes: the endpoints take the request positionally, so neither side
+    # pays for FastAPI's dependency resolution and the comparison isolates the adapter.
+    async def baseline_page(request: Any) -> Any:
+        return templates.TemplateResponse(request, "page.html", dict(CONTEXT))
+
+    async def baseline_partial(request: Any) -> Any:
+        return templates.TemplateResponse(request, "rows.html", dict(CONTEXT))
+
+    async def baseline_html(request: Any) -> Any:
+        return HTMLResponse(FRAGMENT)
+
+    async def greeble_page(request: Any) -> Any:
+        return template_response(
+            templates, "page.html", dict(CONTEXT), request, partial_template="rows.html"
+        )
+
+    async def greeble_triggers(request: Any) -> Any:
+        return template_response(
+            templates,
+            "page.html",
+            dict(CONTEXT),
+            request,
+            partial_template="rows.html",
+            triggers=TRIGGERS,
+        )
+
+    async def greeble_html(request: Any) -> Any:
+        return partial_html(FRAGMENT, triggers="greeble:saved")
+
+    app = FastAPI()
+    for path, endpoint in {
+        "/baseline/page": baseline_page,
+        "/baseline/partial": baseline_partial,
+        "/baseline/html": baseline_html,
+        "/greeble/page": greeble_page,
+        "/greeble/triggers": greeble_triggers,
+        "/greeble/html": greeble_html,
+    }.items():
+        app.add_route(path, endpoint, methods=["GET"])
+    return app
+
+
+def _asgi_scope(path: str, hx: bool) -> dict[str, Any]:
+    headers = [(b"host", b"testserver")]
+    if hx:
+        headers.append((b"hx-request", b"true"))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+def bench_fastapi(directory: Path, requests: int, warmup: int) -> dict[str, dict[str, float]]:
+    app = _fastapi_app(directory)
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def run(path: str, hx: bool) -> dict[str, float]:
+        scope = _asgi_scope(path, hx)
+        status: list[int] = []
+
+        async def send(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        for _ in range(warmup):
+            await app(dict(scope), receive, send)
+        if status[-1] != 200:
+            raise RuntimeError(f"{path} answered {status[-1]}")
+        samples: Timings = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            start = time.perf_counter_ns()
+            await app(dict(scope), receive, send)
+            samples.append(time.perf_counter_ns() - start)
+        return _summary(samples, time.perf_counter() - started)
+
+    async def run_all() -> dict[str, dict[str, float]]:
+        return {name: await run(path, hx) for name, path, hx, _ in SCENARIOS}
+
+    return asyncio.run(run_all())
+
+
+# --- WSGI (Flask, Django) -----------------------------------------------------------
+
+
+def _wsgi_call(app: Callable[..., Iterable[bytes]], path: str, hx: bool) -> Callable[[], None]:
+    from werkzeug.test import EnvironBuilder
+
+    headers = [("HX-Request", "true")] if hx else []
+    base = EnvironBuilder(path=path, headers=headers).get_environ()
+    status: list[str] = []
+
+    def start_response(code: str, _headers: object, _exc_info: object = None) -> None:
+        status.append(code)
+
+    def call() -> None:
+        environ = dict(base)
+        environ["wsgi.input"] = io.BytesIO()
+        body = app(environ, start_response)
+        for _ in body:
+            pass
+        if hasattr(body, "close"):
+            body.close()
+
+    call()
+    if not status[-1].startswith("200"):
+        raise RuntimeError(f"{path} answered {status[-1]}")
+    return call
+
+
+def _bench_wsgi(
+    app: Callable[..., Iterable[bytes]], scenarios: Iterable[str], requests: int, warmup: int
+) -> dict[str, dict[str, float]]:
+    wanted = set(scenarios)
+    return {
+        name: _time_calls(_wsgi_call(app, path, hx), requests, warmup)
+        for name, path, hx, _ in SCENARIOS
+        if name in wanted
+    }
+
+
+def bench_flask(directory: Path, requests: int, warmup: int) -> dict[str, dict[str, float]]:
+    from flask import Flask, render_template, request
+
+    from greeble.adapters.flask import template_response
+
+    app = Flask(__name__, template_folder=str(directory))
+    app.add_url_rule("/baseline/page", "bp", lambda: render_template("page.html", **CONTEXT))
+    app.add_url_rule("/baseline/partial", "bpp", lambda: render_template("rows.html", **CONTEXT))
+    app.add_url_rule(
+        "/greeble/page",
+        "gp",
+        lambda: template_response(
+            "page.html", dict(CONTEXT), request, partial_template="rows.html"
+        ),
+    )
+    app.add_url_rule(
+        "/greeble/triggers",
+        "gt",
+        lambda: template_response(
+            "page.html", dict(CONTEXT), request, partial_template="rows.html", triggers=TRIGGERS
+        ),
+    )
+    scenarios = [name for name, path, _, _ in SCENARIOS if not path.endswith("/html")]
+    return _bench_wsgi(app.wsgi_app, scenarios, requests, warmup)
+
+
+def bench_django(directory: Path, requests: int, warmup: int) -> dict[str, dict[str, float]]:
+    import django
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.shortcuts import render
+    from django.urls import path as url_path
+
+    from greeble.adapters.django import template_response
+
+    def baseline_page(request: Any) -> Any:
+        return render(request, "page.html", dict(CONTEXT))
+
+    def baseline_partial(request: Any) -> Any:
+        return render(request, "rows.html", dict(CONTEXT))
+
+    def greeble_page(request: Any) -> Any:
+        return template_response("page.html", dict(CONTEXT), request, partial_template="rows.html")
+
+    def greeble_triggers(request: Any) -> Any:
+        return template_response(
+            "page.html", dict(CONTEXT), request, partial_template="rows.html", triggers=TRIGGERS
+        )
+
+    urls = ModuleType("greeble_benchmark_urls")  # ROOT_URLCONF accepts a module object
+    urls.urlpatterns = [  # type: ignore[attr-defined]
+        url_path("baseline/page", baseline_page),
+        url_path("baseline/partial", baseline_partial),
+        url_path("greeble/page", greeble_page),
+        url_path("greeble/triggers", greeble_triggers),
+    ]
+    if not settings.configured:
+        settings.configure(
+            DEBUG=False,
+            SECRET_KEY="benchmark",
+            ALLOWED_HOSTS=["*"],
+            ROOT_URLCONF=urls,
+            MIDDLEWARE=[],
+            INSTALLED_APPS=[],
+            TEMPLATES=[
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "DIRS": [str(directory)],
+                }
+            ],
+        )
+        django.setup()
+    scenarios = [name for name, path, _, _ in SCENARIOS if not path.endswith("/html")]
+    return _bench_wsgi(WSGIHandler(), scenarios, requests, warmup)
+
+
+def bench_helpers(requests: int, warmup: int) -> dict[str, dict[str, float]]:
+    from greeble.adapters.utils import hx_trigger_headers
+
+    cases: dict[str, Callable[[], object]] = {
+        "hx_trigger_headers_str": lambda: hx_trigger_headers("greeble:saved"),
+        "hx_trigger_headers_list": lambda: hx_trigger_headers(["greeble:saved", "refresh"]),
+        "hx_trigger_headers_mapping": lambda: hx_trigger_headers(TRIGGERS, after="settle"),
+    }
+    return {name: _time_calls(call, requests, warmup) for name, call in cases.items()}
+
+
+def _add_overhead(results: dict[str, dict[str, float]]) -> None:
+    for name, _, _, baseline in SCENARIOS:
+        if name in results and baseline in results:
+            base = results[baseline]["p50_us"]
+            results[name]["overhead_p50_pct"] = (results[name]["p50_us"] - base) / base * 100
+
+
+def _metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions: dict[str, str | None] = {}
+    for package in ("fastapi", "starlette", "flask", "django", "jinja2"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {"commit": commit, "python": platform.python_version(), "versions": versions}
+
+
+def run(requests: int, warmup: int) -> dict[str, Any]:
+    benches: dict[str, Callable[[Path, int, int], dict[str, dict[str, float]]]] = {
+        "fastapi": bench_fastapi,
+        "flask": bench_flask,
+        "django": bench_django,
+    }
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="greeble-bench-") as tmp:
+        directory = Path(tmp)
+        _write_templates(directory)
+        for framework, bench in benches.items():
+            try:
+                results[framework] = bench(directory, requests, warmup)
+            except ImportError as exc:
+                results[framework] = {"skipped": f"{exc.name or exc} is not installed"}
+                continue
+            _add_overhead(results[framework])
+    results["helpers"] = bench_helpers(requests * 10, warmup)
+    return {"meta": _metadata(), "requests": requests, "results": results}
+
+
+def _print_table(report: dict[str, Any], previous: dict[str, Any] | None) -> None:
+    header = f"{'framework':<10}{'scenario':<30}{'req/s':>10}{'p50 µs':>10}{'p99 µs':>10}"
+    header += f"{'overhead':>10}" + (f"{'Δ p50':>10}" if previous else "")
+    print(header)
+    for framework, scenarios in report["results"].items():
+        if "skipped" in scenarios:
+            print(f"{framework:<10}skipped: {scenarios['skipped']}")
+            continue
+        for name, stats in scenarios.items():
+            overhead = stats.get("overhead_p50_pct")
+            line = (
+                f"{framework:<10}{name:<30}{stats['requests_per_sec']:>10.0f}"
+                f"{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+                + (f"{overhead:>+9.1f}%" if overhead is not None else f"{'':>10}")
+            )
+            if previous:
+                before = previous["results"].get(framework, {}).get(name)
+                if before and "p50_us" in before:
+                    change = (stats["p50_us"] - before["p50_us"]) / before["p50_us"] * 100
+                    line += f"{change:>+9.1f}%"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed requests per scenario")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write results to PATH")
+    parser.add_argument(
+        "--compare", type=Path, metavar="PATH", help="Show p50 change against a previous --json"
+    )
+    args = parser.parse_args(argv)
+
+    previous = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    report = run(args.requests, args.warmup)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    _print_table(report, previous)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""
+CLI startup benchmark for `greeble list` and `greeble doctor`.
+
+Runs each command in fresh interpreter processes (as a user would) and reports wall
+time with the compiled manifest cache disabled (`GREEBLE_NO_CACHE=1`) versus warm.
+A separate in-process measurement isolates `load_manifest()` itself.
+
+Usage:
+    uv run python benchmarks/cli_startup.py [--runs 15] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+COMMANDS: dict[str, list[str]] = {"list": ["list"], "doctor": ["doctor"]}
+
+
+def _run_cli(argv: list[str], env: dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "greeble_cli.cli", *argv],
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p90_ms": ordered[int(0.9 * (len(ordered) - 1))] * 1000,
+    }
+
+
+def bench_cli(runs: int) -> dict[str, dict[str, dict[str, float]]]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory(prefix="greeble-bench-") as cache:
+        base = {**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC), str(ROOT)])}
+        modes = {
+            "uncached": {**base, "GREEBLE_NO_CACHE": "1"},
+            "cached": {**base, "GREEBLE_CACHE_DIR": cache},
+        }
+        for name, argv in COMMANDS.items():
+            results[name] = {}
+            for mode, env in modes.items():
+                _run_cli(argv, env)  # warm the OS page cache (and the manifest cache)
+                results[name][mode] = _summary([_run_cli(argv, env) for _ in range(runs)])
+    return results
+
+
+def bench_load_manifest(runs: int) -> dict[str, dict[str, float]]:
+    sys.path.insert(0, str(SRC))
+    from greeble_cli.manifest import default_manifest_path, load_manifest
+
+    path = default_manifest_path()
+    with tempfile.TemporaryDirectory(prefix="greeble-bench-") as cache:
+        os.environ["GREEBLE_CACHE_DIR"] = cache
+        load_manifest(path)
+        timings: dict[str, list[float]] = {"uncached": [], "cached": []}
+        for _ in range(runs):
+            start = time.perf_counter()
+            load_manifest(path, use_cache=False)
+            timings["uncached"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            load_manifest(path)
+            timings["cached"].append(time.perf_counter() - start)
+    return {mode: _summary(samples) for mode, samples in timings.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15, help="Samples per measurement")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    report = {
+        "cli": bench_cli(args.runs),
+        "load_manifest": bench_load_manifest(args.runs * 10),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'measurement':<28}{'uncached':>12}{'cached':>12}   (median ms)")
+    rows = [(f"greeble {name}", modes) for name, modes in report["cli"].items()]
+    rows.append(("load_manifest() in-process", report["load_manifest"]))
+    for label, modes in rows:
+        uncached = modes["uncached"]["median_ms"]
+        cached = modes["cached"]["median_ms"]
+        print(f"{label:<28}{uncached:>12.2f}{cached:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""
+Manifest scaling benchmark: monolithic vs sharded layouts with synthetic libraries.
+
+Generates libraries of N components, writes each as one monolithic manifest and as a
+sharded index (`split_manifest`), then measures in-process:
+
+- `load`: `load_manifest()` with a warm cache (what every CLI invocation pays)
+- `list`: load plus iterating the listing fields (`greeble list`)
+- `get`: load plus fetching one component's details (`greeble add <one>`)
+- `peak_kib`: tracemalloc peak of `load` + `get`
+
+Usage:
+    uv run python benchmarks/manifest_scale.py [--sizes 100 1000 5000] [--runs 20] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from greeble_cli.manifest import Manifest, load_manifest, split_manifest
+
+
+def _write_library(directory: Path, size: int) -> Path:
+    lines = ["version: 1", "library:", "  name: Bench", "components:"]
+    for index in range(size):
+        key = f"widget-{index:05d}"
+        lines += [
+            f"  - key: {key}",
+            f"    title: Widget {index}",
+            f"    summary: Synthetic component number {index}",
+            "    files:",
+            f"      - templates/greeble/{key}.html",
+            f"      - static/greeble/{key}.css",
+            f"      - docs/components/{key}.md",
+            "    endpoints: []",
+            "    events: {emits: ['greeble:change'], listens: []}",
+        ]
+    path = directory / "monolithic.yaml"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _median_ms(action: Callable[[], object], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def _measure(path: Path, runs: int, probe: str) -> dict[str, float]:
+    def _list() -> None:
+        for _entry in load_manifest(path).entries():
+            pass
+
+    def _get() -> Manifest:
+        manifest = load_manifest(path)
+        manifest.get(probe)
+        return manifest
+
+    load_manifest(path).get(probe)  # populate the cache
+    tracemalloc.start()
+    _get()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "load_ms": _median_ms(lambda: load_manifest(path), runs),
+        "list_ms": _median_ms(_list, runs),
+        "get_ms": _median_ms(_get, runs),
+        "peak_kib": peak / 1024,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--runs", type=int, default=20, help="Samples per measurement")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    report: dict[str, dict[str, dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory(prefix="greeble-bench-") as tmp:
+        os.environ["GREEBLE_CACHE_DIR"] = str(Path(tmp) / "cache")
+        for size in args.sizes:
+            directory = Path(tmp) / str(size)
+            directory.mkdir()
+            monolithic = _write_library(directory, size)
+            index = directory / "greeble.manifest.yaml"
+            split_manifest(monolithic, index)
+            probe = f"widget-{size // 2:05d}"
+            report[str(size)] = {
+                "monolithic": _measure(monolithic, args.runs, probe),
+                "sharded": _measure(index, args.runs, probe),
+            }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    header = f"{'components':>10} {'layout':<11}{'load ms':>10}{'list ms':>10}{'get ms':>10}"
+    print(header + f"{'peak KiB':>11}")
+    for size, layouts in report.items():
+        for layout, row in layouts.items():
+            print(
+                f"{size:>10} {layout:<11}{row['load_ms']:>10.2f}{row['list_ms']:>10.2f}"
+                f"{row['get_ms']:>10.2f}{row['peak_kib']:>11.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,356 @@
+"""
+Component render matrix: cost of rendering every template in the manifest.
+
+Loads each component from `greeble.manifest.yaml`, renders its templates and partials
+with representative contexts through Jinja2 (the engine behind the FastAPI and Flask
+adapters) and the Django template engine, and times the string renderers in
+`greeble.demo.helpers`. For each render it reports:
+
+- `us`: median microseconds per render
+- `bytes`: size of the rendered output
+- `peak_kib`: tracemalloc peak allocated while rendering once
+
+Templates that use Jinja-only syntax (macros, `{% set %}`, filters with arguments) are
+reported as unsupported under Django rather than skipped silently.
+
+Usage:
+    uv run python -m benchmarks.render_matrix [--runs 200] [--component forecast-chart] [--json out.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from greeble_cli.manifest import Manifest, default_manifest_path, load_manifest
+from greeble_cli.scaffold import build_copy_plan
+
+_FORECAST = [
+    {
+        "month": f"M{month}",
+        "min": 100 + month * 7,
+        "expected": 110 + month * 9,
+        "max": 118 + month * 11,
+    }
+    for month in range(1, 13)
+]
+_FACTORS = [
+    {"key": "nap_consistency", "label": "NAP Consistency", "weight": 0.4, "value": 0.82},
+    {"key": "listing_completeness", "label": "Listing Completeness", "weight": 0.25, "value": 0.64},
+    {"key": "citation_coverage", "label": "Citation Coverage", "weight": 0.25, "value": 0.47},
+    {"key": "visibility_hint", "label": "Visibility Hint", "weight": 0.1, "value": 1.0},
+]
+_CITATIONS = [
+    {
+        "name": "Blue Bottle Coffee",
+        "url": f"https://{host}/biz/blue-bottle-coffee",
+        "telephone": f"+1 555-010-{index:04d}",
+        "address": {"raw": f"{300 + index} Main St, San Francisco, CA"},
+        "_host": host,
+        "_jsonld": index % 2 == 0,
+        "_title": f"Blue Bottle Coffee - {host}",
+    }
+    for index, host in enumerate(["yelp.com", "yellowpages.com", "foursquare.com", "bbb.org"])
+]
+_DIAGNOSTICS = {
+    "checked_count": 14,
+    "matched_count": 11,
+    "distinct_hosts": 4,
+    "jsonld_count": 2,
+    "nap_consistency": 11 / 14,
+    "citation_coverage": 0.61,
+}
+_METRICS = [
+    {"key": "checked", "label": "Citations checked", "value": 14, "format": "number"},
+    {"key": "matched", "label": "NAP matches", "value": 11, "format": "number"},
+    {"key": "nap", "label": "NAP consistency", "value": 0.79, "format": "percent"},
+    {"key": "coverage", "label": "Coverage", "value": 0.61, "format": "percent"},
+    {"key": "hosts", "label": "Domains", "value": 4, "color": "success"},
+]
+
+# Context per template name; templates not listed render with an empty context.
+CONTEXTS: dict[str, dict[str, Any]] = {
+    "forecast-chart.partial.html": {"forecast": _FORECAST},
+    "score-gauge.partial.html": {"score": 78, "grade": "B", "label": "Local SEO score"},
+    "factor-breakdown.partial.html": {"factors": _FACTORS},
+    "metric-grid.partial.html": {"metrics": _METRICS},
+    "citation-list.partial.html": {"citations": _CITATIONS, "max_height": "16rem"},
+    "step-progress.partial.html": {
+        "status": "active",
+        "step_number": 2,
+        "title": "Fetch listings",
+        "time_display": "1.2s",
+    },
+    "drop-canvas.html": {"csrf_token": "benchmark-token"},
+    "drop-canvas.partial.html": {
+        "step_id": "step-1",
+        "index": 0,
+        "title": "Parse CSV",
+        "input_type": "file",
+        "input_label": "File",
+        "output_type": "table",
+        "output_label": "Table",
+    },
+    "audit-dashboard.partial.html": {
+        "audit": {
+            "location": {
+                "brand": "Blue Bottle Coffee",
+                "location": "San Francisco, CA",
+                "domain": "www.bluebottlecoffee.com",
+            },
+            "score": {
+                "value": 78,
+                "grade": "B",
+                "factors": _FACTORS,
+                "recommendations": ["Fix NAP inconsistencies on top directories."],
+            },
+            "forecast": _FORECAST,
+            "diagnostics": _DIAGNOSTICS,
+            "citations": _CITATIONS,
+            "insight": "Found 14 citation(s) across 4 domain(s); 11 matched NAP details.",
+        }
+    },
+}
+
+
+@dataclass(frozen=True)
+class _Product:
+    sku: str
+    name: str
+    tagline: str
+    price: float
+    inventory: int
+    category: str
+    description: str
+
+
+@dataclass(frozen=True)
+class _Account:
+    org: str
+    owner: str
+    plan: str
+    seats_used: int
+    seats_total: int
+    status: str
+
+
+def _median_us(render: Callable[[], object], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        render()
+        samples.append(time.perf_counter_ns() - start)
+    return statistics.median(samples) / 1000
+
+
+def _peak_kib(render: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - baseline) / 1024
+
+
+def measure(render: Callable[[], str], runs: int) -> dict[str, Any]:
+    try:
+        output = render()  # also warms template and regex caches
+    except Exception as exc:  # a broken template is a result, not a reason to stop
+        return {"error": f"{type(exc).__name__}: {exc}"}
+    return {
+        "us": _median_us(render, runs),
+        "bytes": len(output.encode("utf-8")),
+        "peak_kib": _peak_kib(render),
+    }
+
+
+def component_templates(manifest: Manifest, keys: Iterable[str]) -> dict[str, dict[str, str]]:
+    """Return `{component: {template name: source}}` with names as installed (`greeble/x.html`)."""
+    project = Path("project")
+    templates: dict[str, dict[str, str]] = {}
+    for key in keys:
+        plans = build_copy_plan(
+            manifest=manifest,
+            component=manifest.get(key),
+            project_root=project,
+            templates_dir=Path("templates"),
+            static_dir=Path("static"),
+            include_docs=False,
+            docs_dir=None,
+        )
+        templates[key] = {
+            plan.destination.relative_to(project / "templates").as_posix(): plan.source.read_text(
+                encoding="utf-8"
+            )
+            for plan in plans
+            if plan.source.suffix == ".html"
+        }
+    return templates
+
+
+def bench_jinja(sources: dict[str, str], names: Iterable[str], runs: int) -> dict[str, Any]:
+    import jinja2
+
+    env = jinja2.Environment(loader=jinja2.DictLoader(sources), autoescape=True)
+    results: dict[str, Any] = {}
+    for name in names:
+        context = CONTEXTS.get(name.rsplit("/", 1)[-1], {})
+        try:
+            template = env.get_template(name)
+        except jinja2.TemplateError as exc:
+            results[name] = {"error": str(exc)}
+            continue
+        results[name] = measure(partial(template.render, context), runs)
+    return results
+
+
+def bench_django(sources: dict[str, str], names: Iterable[str], runs: int) -> dict[str, Any]:
+    import django
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure()
+        django.setup()
+    from django.template import Context, Engine, TemplateSyntaxError
+
+    engine = Engine(loaders=[("django.template.loaders.locmem.Loader", sources)])
+    results: dict[str, Any] = {}
+    for name in names:
+        context = CONTEXTS.get(name.rsplit("/", 1)[-1], {})
+        try:
+            template = engine.get_template(name)
+        except TemplateSyntaxError as exc:
+            results[name] = {"unsupported": str(exc).splitlines()[0]}
+            continue
+
+        def render(template: Any = template, context: dict[str, Any] = context) -> str:
+            return str(template.render(Context(context)))
+
+        results[name] = measure(render, runs)
+    return results
+
+
+def bench_helpers(runs: int) -> dict[str, Any]:
+    from greeble.demo import helpers
+
+    products = [
+        _Product(f"SKU-{i}", f"Widget {i}", "Small & sturdy", 9.5 + i, i * 3, "tools", "A widget.")
+        for i in range(8)
+    ]
+    accounts = [
+        _Account(f"Org {i} & Co", f"owner{i}@example.com", "Team", i, 10, status)
+        for i, status in enumerate(["active", "pending", "delinquent"] * 4)
+    ]
+    steps: dict[str, helpers.StepContent] = {
+        "details": {
+            "title": "Details",
+            "description": "Tell us about the project.",
+            "tasks": ["Name it", "Pick a region", "Invite the team"],
+            "prev": None,
+            "next": "review",
+        }
+    }
+    feed = [f"Message {i}" for i in range(10)]
+    renderers: dict[str, Callable[[], str]] = {
+        "toast_fragment": lambda: helpers.toast_fragment("success", "Saved", "Changes stored."),
+        "toast_block": lambda: helpers.toast_block(helpers.toast_fragment("info", "Hi", "There")),
+        "render_palette_results": lambda: helpers.render_palette_results(products),
+        "render_palette_detail": lambda: helpers.render_palette_detail(products[0]),
+        "render_account_rows": lambda: helpers.render_account_rows(accounts),
+        "table_rows": lambda: helpers.table_rows(accounts, page=1, field="org", direction="asc"),
+        "render_feed_items": lambda: helpers.render_feed_items(feed, count(), batch_size=5),
+        "render_stepper_content": lambda: helpers.render_stepper_content("details", steps),
+        "render_signin_group": lambda: helpers.render_signin_group(
+            "ada@example", "Enter a valid email.", swap_oob=True
+        ),
+        "render_valid_email_group": lambda: helpers.render_valid_email_group(
+            "ada@example.com", swap_oob=True
+        ),
+    }
+    return {name: measure(render, runs) for name, render in renderers.items()}
+
+
+def run(runs: int, components: list[str] | None) -> dict[str, Any]:
+    manifest = load_manifest(default_manifest_path())
+    keys = components or sorted(manifest.keys())
+    templates = component_templates(manifest, keys)
+    sources = {name: source for group in templates.values() for name, source in group.items()}
+
+    report: dict[str, Any] = {"runs": runs, "components": {}}
+    engines = {"jinja2": bench_jinja, "django": bench_django}
+    for key, group in templates.items():
+        report["components"][key] = {}
+        for engine, bench in engines.items():
+            try:
+                report["components"][key][engine] = bench(sources, group, runs)
+            except ImportError as exc:
+                report["components"][key][engine] = {"skipped": f"{exc.name} is not installed"}
+    report["helpers"] = bench_helpers(runs)
+    return report
+
+
+def _rows(report: dict[str, Any]) -> list[tuple[str, str, str, dict[str, Any]]]:
+    rows = []
+    for key, engines in report["components"].items():
+        for engine, templates in engines.items():
+            if "skipped" in templates:
+                continue
+            for name, stats in templates.items():
+                rows.append((key, name.rsplit("/", 1)[-1], engine, stats))
+    rows.extend(
+        ("demo.helpers", name, "python", stats) for name, stats in report["helpers"].items()
+    )
+    return rows
+
+
+def _print_table(report: dict[str, Any], sort: bool) -> None:
+    rows = _rows(report)
+    if sort:
+        rows.sort(key=lambda row: row[3].get("us", -1), reverse=True)
+    print(f"{'component':<18}{'template':<34}{'engine':<8}{'µs':>10}{'bytes':>9}{'peak KiB':>10}")
+    for key, name, engine, stats in rows:
+        if "us" in stats:
+            print(
+                f"{key:<18}{name:<34}{engine:<8}{stats['us']:>10.1f}"
+                f"{stats['bytes']:>9}{stats['peak_kib']:>10.1f}"
+            )
+        else:
+            note = stats.get("unsupported") or stats.get("error", "")
+            print(f"{key:<18}{name:<34}{engine:<8}  {'n/a':>8}  {note[:60]}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200, help="Timed renders per template")
+    parser.add_argument(
+        "--component", action="append", dest="components", help="Limit to a component (repeat)"
+    )
+    parser.add_argument("--sort", action="store_true", help="Order rows slowest first")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write results to PATH")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs, args.components)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    _print_table(report, args.sort)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
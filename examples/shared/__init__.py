@@ -6,6 +6,7 @@ from .assets import (
     asset_mounts,
     django_static_dirs,
     head_markup,
+    preload_assets,
     public_images_path,
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     "asset_mounts",
     "django_static_dirs",
     "head_markup",
+    "preload_assets",
     "public_images_path",
 ]
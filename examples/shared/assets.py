@@ -3,24 +3,41 @@ from __future__ import annotations
 import textwrap
 from collections.abc import Iterable, Mapping
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from flask import Flask
-from markupsafe import Markup
-from werkzeug.middleware.shared_data import SharedDataMiddleware
+from greeble.assets import PreloadLink, configure_preload, load_vendor_manifest
+
+# Framework imports are deferred to the helpers that need them, so a Django demo does
+# not pay for importing FastAPI and Flask (and vice versa).
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from flask import Flask
+    from markupsafe import Markup
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 CORE_ASSETS = REPO_ROOT / "packages" / "greeble_core" / "assets" / "css"
 HYPERSCRIPT_ASSETS = REPO_ROOT / "packages" / "greeble_hyperscript" / "assets"
 PUBLIC_IMAGES = REPO_ROOT / "public" / "images"
+# Populated by `greeble vendor --dest packages/greeble_core/assets/vendor`
+VENDOR_ASSETS = REPO_ROOT / "packages" / "greeble_core" / "assets" / "vendor"
+VENDOR_MOUNT = "/static/greeble/vendor"
+
+_STYLESHEETS = (
+    "/static/greeble/greeble-core.css",
+    "/static/greeble/greeble-landing.css",
+)
 
-_HEAD_MARKUP = textwrap.dedent(
+_HEAD_LINKS = textwrap.dedent(
     """
     <link rel="stylesheet" href="/static/greeble/greeble-core.css" />
     <link rel="stylesheet" href="/static/greeble/greeble-landing.css" />
     <link rel="icon" href="/static/images/greeble-icon-black.svg" type="image/svg+xml" media="(prefers-color-scheme: light)" />
     <link rel="icon" href="/static/images/greeble-icon-alpha-white.png" sizes="any" media="(prefers-color-scheme: dark)" />
+    """
+).strip()
+
+_CDN_SCRIPTS = textwrap.dedent(
+    """
     <script src="https://unpkg.com/htmx.org@1.9.12" defer></script>
     <script src="https://unpkg.com/htmx.org/dist/ext/sse.js" defer></script>
     <script src="https://unpkg.com/hyperscript.org@0.9.12"></script>
@@ -29,36 +46,87 @@ _HEAD_MARKUP = textwrap.dedent(
 ).strip()
 
 
+def _vendored_scripts() -> list[str] | None:
+    """Return hashed script URLs (htmx, sse, hyperscript) when the bundle is vendored."""
+
+    mapping = load_vendor_manifest(VENDOR_ASSETS)
+    if not mapping:
+        return None
+    try:
+        names = [mapping["htmx.min.js"], mapping["sse.js"], mapping["_hyperscript.min.js"]]
+    except KeyError:
+        return None
+    return [f"{VENDOR_MOUNT}/{name}" for name in names]
+
+
+def _build_head_markup() -> str:
+    scripts = _vendored_scripts()
+    if scripts is None:
+        return f"{_HEAD_LINKS}\n{_CDN_SCRIPTS}"
+    htmx, sse, hyperscript = scripts
+    # Inline the behaviors so Hyperscript does not issue a second, blocking fetch.
+    behaviors = (HYPERSCRIPT_ASSETS / "greeble.hyperscript").read_text(encoding="utf-8")
+    return "\n".join(
+        [
+            _HEAD_LINKS,
+            f'<script src="{htmx}" defer></script>',
+            f'<script src="{sse}" defer></script>',
+            f'<script src="{hyperscript}" defer></script>',
+            f'<script type="text/hyperscript">\n{behaviors}</script>',
+        ]
+    )
+
+
+_HEAD_MARKUP = _build_head_markup()
+
+
+def preload_assets() -> list[PreloadLink]:
+    """Return preload hints for the core stylesheets and any vendored scripts."""
+
+    links = [PreloadLink(href=href, as_="style") for href in _STYLESHEETS]
+    links.extend(PreloadLink(href=src, as_="script") for src in _vendored_scripts() or [])
+    return links
+
+
 def asset_mounts() -> dict[str, Path]:
     """Return mapping of mount paths to asset directories."""
 
-    return {
+    mounts = {
         "/static/greeble": CORE_ASSETS,
         "/static/greeble/hyperscript": HYPERSCRIPT_ASSETS,
         "/static/images": PUBLIC_IMAGES,
     }
+    if VENDOR_ASSETS.is_dir():
+        mounts[VENDOR_MOUNT] = VENDOR_ASSETS
+    return mounts
 
 
 _MOUNT_NAMES: Mapping[str, str] = {
     "/static/greeble": "greeble-static",
     "/static/greeble/hyperscript": "greeble-hyperscript",
+    "/static/greeble/vendor": "greeble-vendor",
     "/static/images": "greeble-images",
 }
 
 
 def apply_fastapi_assets(app: FastAPI) -> None:
-    """Mount shared static assets on a FastAPI instance."""
+    """Mount shared static assets on a FastAPI instance and register preload hints."""
+    from fastapi.staticfiles import StaticFiles
 
-    for mount, path in asset_mounts().items():
+    # Longest prefix first so nested mounts are not shadowed by /static/greeble
+    for mount, path in sorted(asset_mounts().items(), key=lambda item: -len(item[0])):
         name = _MOUNT_NAMES[mount]
         app.mount(mount, StaticFiles(directory=str(path)), name=name)
+    configure_preload(preload_assets())
 
 
 def apply_flask_assets(app: Flask) -> None:
-    """Mount shared static assets on a Flask instance."""
+    """Mount shared static assets on a Flask instance and register preload hints."""
+    from werkzeug.middleware.shared_data import SharedDataMiddleware
 
     mounts = {mount: str(path) for mount, path in asset_mounts().items()}
     app.wsgi_app = SharedDataMiddleware(app.wsgi_app, mounts)
+    configure_preload(preload_assets())
 
     @app.context_processor  # pragma: no cover - framework hook
     def _inject_greeble_assets() -> Mapping[str, str]:
@@ -69,11 +137,14 @@ def django_static_dirs() -> Iterable[tuple[str, Path]]:
     """Return static directory tuples suitable for Django's ``STATICFILES_DIRS``."""
 
     mounts = asset_mounts()
-    return [
+    dirs = [
         ("greeble", mounts["/static/greeble"]),
         ("greeble/hyperscript", mounts["/static/greeble/hyperscript"]),
         ("images", mounts["/static/images"]),
     ]
+    if VENDOR_MOUNT in mounts:
+        dirs.append(("greeble/vendor", mounts[VENDOR_MOUNT]))
+    return dirs
 
 
 def public_images_path() -> Path:
@@ -84,5 +155,6 @@ def public_images_path() -> Path:
 
 def head_markup() -> Markup:
     """Return the head asset HTML marked safe for template engines."""
+    from markupsafe import Markup
 
     return Markup(_HEAD_MARKUP)
@@ -16,10 +16,16 @@ from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 import greeble.demo as demo
+from greeble.adapters.fastapi import mount_static_fragments
 from greeble.demo import (
     load_component_stylesheets,
     load_component_template,
 )
+from greeble.fragments import StaticFragmentRegistry
+from greeble.minify import minify_html
+from greeble.prerender import SnapshotMiddleware
+from greeble.rowdiff import ROW_STATE_FIELD
+from greeble.virtualtable import VirtualTable
 
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 8045))
@@ -68,28 +74,38 @@ def render_feed_items(
     return demo.render_feed_items(messages, cast(Iterator[int], counter), batch_size=batch_size)
 
 
-MODAL_PARTIAL = load_component_template(CPTS, "modal", "modal.partial.html")
-DRAWER_TRIGGER = load_component_template(CPTS, "drawer", "drawer.html")
-DRAWER_PARTIAL = load_component_template(CPTS, "drawer", "drawer.partial.html")
-PALETTE_TEMPLATE = load_component_template(CPTS, "palette", "palette.html")
-TABS_TEMPLATE = load_component_template(CPTS, "tabs", "tabs.html")
-INFINITE_LIST_TEMPLATE = load_component_template(CPTS, "infinite-list", "infinite-list.html")
-DROPDOWN_TEMPLATE = load_component_template(CPTS, "dropdown", "dropdown.html")
-STEPPER_TEMPLATE = load_component_template(CPTS, "stepper", "stepper.html")
-FORM_TEMPLATE = load_component_template(CPTS, "form-validated", "form.html")
-FORM_INVALID_PARTIAL = load_component_template(CPTS, "form-validated", "form.partial.html")
-AUDIO_RECORDER_TEMPLATE = load_component_template(CPTS, "audio-recorder", "audio-recorder.html")
-DRAGGABLE_CARD_TEMPLATE = load_component_template(CPTS, "draggable-card", "draggable-card.html")
-DROP_CANVAS_TEMPLATE = load_component_template(CPTS, "drop-canvas", "drop-canvas.html")
-DROP_ZONE_TEMPLATE = load_component_template(CPTS, "drop-zone", "drop-zone.html")
-FILE_UPLOAD_TEMPLATE = load_component_template(CPTS, "file-upload", "file-upload.html")
-STEP_PROGRESS_TEMPLATE = load_component_template(CPTS, "step-progress", "step-progress.html")
-SWAP_SELECT_TEMPLATE = load_component_template(CPTS, "swap-select", "swap-select.html")
-TYPE_BADGE_TEMPLATE = load_component_template(CPTS, "type-badge", "type-badge.html")
-NAV_TEMPLATE = load_component_template(CPTS, "nav", "nav.html")
-SIDEBAR_TEMPLATE = load_component_template(CPTS, "sidebar", "sidebar.html")
-FOOTER_TEMPLATE = load_component_template(CPTS, "footer", "footer.html")
-MOBILE_MENU_TEMPLATE = load_component_template(CPTS, "mobile-menu", "mobile-menu.html")
+MODAL_PARTIAL = load_component_template(CPTS, "modal", "modal.partial.html", minify=True)
+DRAWER_TRIGGER = load_component_template(CPTS, "drawer", "drawer.html", minify=True)
+DRAWER_PARTIAL = load_component_template(CPTS, "drawer", "drawer.partial.html", minify=True)
+PALETTE_TEMPLATE = load_component_template(CPTS, "palette", "palette.html", minify=True)
+TABS_TEMPLATE = load_component_template(CPTS, "tabs", "tabs.html", minify=True)
+INFINITE_LIST_TEMPLATE = load_component_template(
+    CPTS, "infinite-list", "infinite-list.html", minify=True
+)
+DROPDOWN_TEMPLATE = load_component_template(CPTS, "dropdown", "dropdown.html", minify=True)
+STEPPER_TEMPLATE = load_component_template(CPTS, "stepper", "stepper.html", minify=True)
+FORM_TEMPLATE = load_component_template(CPTS, "form-validated", "form.html", minify=True)
+FORM_INVALID_PARTIAL = load_component_template(
+    CPTS, "form-validated", "form.partial.html", minify=True
+)
+AUDIO_RECORDER_TEMPLATE = load_component_template(
+    CPTS, "audio-recorder", "audio-recorder.html", minify=True
+)
+DRAGGABLE_CARD_TEMPLATE = load_component_template(
+    CPTS, "draggable-card", "draggable-card.html", minify=True
+)
+DROP_CANVAS_TEMPLATE = load_component_template(CPTS, "drop-canvas", "drop-canvas.html", minify=True)
+DROP_ZONE_TEMPLATE = load_component_template(CPTS, "drop-zone", "drop-zone.html", minify=True)
+FILE_UPLOAD_TEMPLATE = load_component_template(CPTS, "file-upload", "file-upload.html", minify=True)
+STEP_PROGRESS_TEMPLATE = load_component_template(
+    CPTS, "step-progress", "step-progress.html", minify=True
+)
+SWAP_SELECT_TEMPLATE = load_component_template(CPTS, "swap-select", "swap-select.html", minify=True)
+TYPE_BADGE_TEMPLATE = load_component_template(CPTS, "type-badge", "type-badge.html", minify=True)
+NAV_TEMPLATE = load_component_template(CPTS, "nav", "nav.html", minify=True)
+SIDEBAR_TEMPLATE = load_component_template(CPTS, "sidebar", "sidebar.html", minify=True)
+FOOTER_TEMPLATE = load_component_template(CPTS, "footer", "footer.html", minify=True)
+MOBILE_MENU_TEMPLATE = load_component_template(CPTS, "mobile-menu", "mobile-menu.html", minify=True)
 
 COMPONENT_CSS = load_component_stylesheets(
     CPTS,
@@ -141,6 +157,12 @@ app.mount(
     name="site-static",
 )
 
+# Full-page routes `greeble export-static` prerenders. Set GREEBLE_SNAPSHOT_DIR to the
+# export directory to serve them from disk; HTMX partial endpoints stay dynamic.
+PRERENDER_ROUTES = ("/",)
+if SNAPSHOT_DIR := os.getenv("GREEBLE_SNAPSHOT_DIR"):
+    app.add_middleware(SnapshotMiddleware, directory=SNAPSHOT_DIR)
+
 
 @dataclass
 class Product:
@@ -330,8 +352,8 @@ _TAB_CONTENT: dict[str, TabContent] = {
 }
 
 
-def render_page(body_html: str) -> HTMLResponse:
-    layout = Template(
+PAGE_LAYOUT = Template(
+    minify_html(
         """
 <!doctype html>
 <html lang="en">
@@ -454,6 +476,14 @@ def render_page(body_html: str) -> HTMLResponse:
       table.greeble-table {
         min-width: 520px;
       }
+      #virtual-accounts .greeble-table__container {
+        max-height: 30rem;
+        overflow-y: auto;
+      }
+      #virtual-accounts tbody tr:not(.greeble-table__spacer) {
+        height: 72px; /* VIRTUAL_TABLE.row_height */
+        white-space: nowrap;
+      }
       /* Modal root and modal element styling */
       #modal-root {
         position: fixed;
@@ -629,8 +659,12 @@ $component_css
 </html>
         """
     )
+)
+
+
+def render_page(body_html: str) -> HTMLResponse:
     return HTMLResponse(
-        layout.substitute(
+        PAGE_LAYOUT.substitute(
             body=body_html,
             component_css=COMPONENT_CSS,
             nav=NAV_TEMPLATE,
@@ -711,6 +745,25 @@ def build_table_section() -> str:
     """
 
 
+def build_virtual_table_section() -> str:
+    total = len(VIRTUAL_ACCOUNTS)
+    return f"""
+<section class=\"demo\" id=\"virtual-accounts\">
+  <header>
+    <h2 class=\"greeble-heading-2\">Windowed Table</h2>
+    <p>{total:,} generated accounts; only the rows around the scroll position are rendered.</p>
+  </header>
+  <div class=\"greeble-table__container\">
+    <table class=\"greeble-table\" aria-rowcount=\"{total}\">
+      <caption class=\"visually-hidden\">Windowed account list.</caption>
+      <tbody id=\"{VIRTUAL_TABLE.tbody_id}\" hx-get=\"{VIRTUAL_TABLE.url(0)}\"
+             hx-trigger=\"load\" hx-target=\"this\" hx-swap=\"innerHTML\"></tbody>
+    </table>
+  </div>
+</section>
+    """
+
+
 def build_tabs_section() -> str:
     return f"""
 <section class="demo" id="product-tabs-section">
@@ -909,7 +962,12 @@ async def landing() -> HTMLResponse:
     data_display = build_section_group(
         "Data Display",
         "Tables, badges, and infinite lists for presenting information.",
-        [build_table_section(), build_type_badge_section(), build_infinite_list_section()],
+        [
+            build_table_section(),
+            build_virtual_table_section(),
+            build_type_badge_section(),
+            build_infinite_list_section(),
+        ],
     )
 
     # Group 4: Overlays & Dialogs
@@ -951,11 +1009,6 @@ async def modal_example() -> HTMLResponse:
     return HTMLResponse(MODAL_PARTIAL)
 
 
-@app.get("/modal/close", response_class=HTMLResponse)
-async def modal_close() -> HTMLResponse:
-    return HTMLResponse("")
-
-
 @app.post("/modal/submit", response_class=HTMLResponse)
 async def modal_submit(email: str = Form("")) -> HTMLResponse:
     email = email.strip()
@@ -1033,6 +1086,42 @@ def _query_accounts(page: int, field: str, direction: str, page_size: int = 3) -
     return sorted_accounts[start:end]
 
 
+class _GeneratedAccounts:
+    """Indexed stand-in for a large accounts table: row `i` is derived, never stored."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def fetch(self, start: int, stop: int) -> list[Account]:
+        return [self._account(i) for i in range(start, min(stop, self.total))]
+
+    @staticmethod
+    def _account(index: int) -> Account:
+        base = ACCOUNTS[index % len(ACCOUNTS)]
+        used = (base.seats_used + index * 7) % (base.seats_total + 1)
+        return Account(
+            org=f"{base.org} {index + 1:06d}",
+            owner=base.owner,
+            plan=base.plan,
+            seats_used=used,
+            seats_total=base.seats_total,
+            status=base.status,
+        )
+
+
+_NO_ACCOUNTS_ROW = '<tr><td colspan="5">No matching accounts.</td></tr>'
+_NO_SEARCH_MATCHES_ROW = '<tr><td colspan="5">No accounts match this search.</td></tr>'
+
+# 100k rows at 72px keeps the spacers well under browser element-height limits.
+VIRTUAL_ACCOUNTS = _GeneratedAccounts(100_000)
+VIRTUAL_TABLE = VirtualTable(
+    endpoint="/table/window", tbody_id="virtual-table-body", columns=4, row_height=72
+)
+
+
 def _get_account_by_slug(slug: str) -> Account:
     try:
         return cast(Account, demo.find_account_by_slug(ACCOUNTS, slug))
@@ -1122,6 +1211,17 @@ async def table_rows(request: Request) -> HTMLResponse:
     sort_param = params.get("sort", "org:asc")
     field, _, direction = sort_param.partition(":")
     direction = direction or "asc"
+    payload = json.dumps({"greeble:table:update": {"page": page, "sort": f"{field}:{direction}"}})
+    headers = {"HX-Trigger": payload}
+
+    # Clients that include the row-state input get only the rows that changed.
+    if (row_state := params.get(ROW_STATE_FIELD)) is not None:
+        page_accounts = demo.paginate_accounts(
+            ACCOUNTS, page=page, field=field or "org", direction=direction
+        )
+        diff = demo.account_rows_diff(page_accounts, row_state, empty=_NO_ACCOUNTS_ROW)
+        return HTMLResponse(diff.html, headers={**headers, **diff.headers})
+
     rows_html = demo.table_rows(
         ACCOUNTS,
         page=page,
@@ -1130,30 +1230,51 @@ async def table_rows(request: Request) -> HTMLResponse:
     )
 
     if not rows_html:
-        return HTMLResponse('<tr><td colspan="5">No matching accounts.</td></tr>')
+        return HTMLResponse(_NO_ACCOUNTS_ROW)
 
-    payload = json.dumps({"greeble:table:update": {"page": page, "sort": f"{field}:{direction}"}})
-    headers = {"HX-Trigger": payload}
     return HTMLResponse(rows_html, headers=headers)
 
 
+@app.get("/table/window", response_class=HTMLResponse)
+async def table_window(start: int = 0) -> HTMLResponse:
+    html = VIRTUAL_TABLE.render(
+        VIRTUAL_ACCOUNTS, start, lambda account: demo.render_account_rows([account])
+    )
+    return HTMLResponse(html)
+
+
 @app.post("/table/search", response_class=HTMLResponse)
-async def table_search(q: str = Form("")) -> HTMLResponse:
-    query = q.strip()
+async def table_search(request: Request) -> HTMLResponse:
+    form = await request.form()
+    query = str(form.get("q", "")).strip()
+    # Read the raw form: the state input starts out empty, and Form() treats "" as missing.
+    raw_state = form.get(ROW_STATE_FIELD)
+    row_state = None if raw_state is None else str(raw_state)
     if not query:
-        html = demo.table_rows(ACCOUNTS, page=1, field="org", direction="asc")
         headers = {"HX-Trigger": json.dumps({"greeble:table:update": {"query": ""}})}
+        if row_state is not None:
+            first_page = demo.paginate_accounts(ACCOUNTS, page=1, field="org", direction="asc")
+            diff = demo.account_rows_diff(first_page, row_state)
+            return HTMLResponse(diff.html, headers={**headers, **diff.headers})
+        html = demo.table_rows(ACCOUNTS, page=1, field="org", direction="asc")
         return HTMLResponse(html, headers=headers)
 
     matches = demo.filter_accounts(ACCOUNTS, query)
     if not matches:
-        return HTMLResponse('<tr><td colspan="5">No accounts match this search.</td></tr>')
+        if row_state is not None:
+            # Also resets the client's row state, so clearing the search renders in full.
+            diff = demo.account_rows_diff(matches, row_state, empty=_NO_SEARCH_MATCHES_ROW)
+            return HTMLResponse(diff.html, headers=diff.headers)
+        return HTMLResponse(_NO_SEARCH_MATCHES_ROW)
 
     headers = {
         "HX-Trigger": json.dumps(
             {"greeble:table:update": {"query": query, "results": len(matches)}}
         )
     }
+    if row_state is not None:
+        diff = demo.account_rows_diff(matches, row_state)
+        return HTMLResponse(diff.html, headers={**headers, **diff.headers})
     return HTMLResponse(demo.render_account_rows(matches), headers=headers)
 
 
@@ -1269,11 +1390,6 @@ async def drawer_open() -> HTMLResponse:
     return HTMLResponse(DRAWER_PARTIAL)
 
 
-@app.get("/drawer/close", response_class=HTMLResponse)
-async def drawer_close() -> HTMLResponse:
-    return HTMLResponse("")
-
-
 @app.post("/drawer/subscribe", response_class=HTMLResponse)
 async def drawer_subscribe(email: str = Form("")) -> HTMLResponse:
     value = email.strip()
@@ -1412,13 +1528,9 @@ SWAP_OPTIONS = {
 }
 
 
-@app.get("/options/source", response_class=HTMLResponse)
-@app.get("/options/target", response_class=HTMLResponse)
-async def swap_select_options() -> HTMLResponse:
-    options = "\n".join(
-        f'<option value="{code}">{name}</option>' for code, name in SWAP_OPTIONS["languages"]
-    )
-    return HTMLResponse(options)
+SWAP_OPTIONS_HTML = "".join(
+    f'<option value="{code}">{name}</option>' for code, name in SWAP_OPTIONS["languages"]
+)
 
 
 @app.post("/audio/upload", response_class=HTMLResponse)
@@ -1452,15 +1564,15 @@ async def pipeline_run() -> HTMLResponse:
     return HTMLResponse(body, headers=headers)
 
 
-# Mobile menu endpoints
-@app.get("/menu/open", response_class=HTMLResponse)
-async def menu_open() -> HTMLResponse:
-    return HTMLResponse(MOBILE_MENU_TEMPLATE)
-
-
-@app.get("/menu/close", response_class=HTMLResponse)
-async def menu_close() -> HTMLResponse:
-    return HTMLResponse("")
+# Constant fragments: encoded, gzipped, and ETagged once at startup
+STATIC_FRAGMENTS = StaticFragmentRegistry()
+STATIC_FRAGMENTS.add("/modal/close", "")
+STATIC_FRAGMENTS.add("/drawer/close", "")
+STATIC_FRAGMENTS.add("/options/source", SWAP_OPTIONS_HTML)
+STATIC_FRAGMENTS.add("/options/target", SWAP_OPTIONS_HTML)
+STATIC_FRAGMENTS.add("/menu/open", MOBILE_MENU_TEMPLATE)
+STATIC_FRAGMENTS.add("/menu/close", "")
+mount_static_fragments(app, STATIC_FRAGMENTS)
 
 
 if __name__ == "__main__":
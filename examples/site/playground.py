@@ -12,11 +12,23 @@ import json
 import os
 from pathlib import Path
 from string import Template
+from urllib.parse import urlencode
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+from greeble.prerender import SnapshotMiddleware
+from greeble.theme import (
+    COLOR_PALETTES,
+    FONT_PRESETS,
+    RADIUS_PRESETS,
+    SHADOW_PRESETS,
+    ThemeCache,
+    ThemeError,
+    ThemeSpec,
+)
+
 HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 8046))
 
@@ -37,6 +49,12 @@ app.mount(
     name="site-static",
 )
 
+# Full-page routes `greeble export-static` prerenders. Set GREEBLE_SNAPSHOT_DIR to the
+# export directory to serve them from disk; HTMX partial endpoints stay dynamic.
+PRERENDER_ROUTES = ("/",)
+if SNAPSHOT_DIR := os.getenv("GREEBLE_SNAPSHOT_DIR"):
+    app.add_middleware(SnapshotMiddleware, directory=SNAPSHOT_DIR)
+
 # Component categories for the sidebar
 COMPONENT_CATEGORIES = {
     "Inputs": [
@@ -66,122 +84,9 @@ COMPONENT_CATEGORIES = {
     ],
 }
 
-# Color palettes - themed for Python developers
-COLOR_PALETTES = {
-    "midnight": {
-        "name": "Midnight",
-        "description": "Deep dark theme for late-night coding",
-        "background": "#0b0b0c",
-        "foreground": "#e8e8ea",
-        "muted": "#a0a0a7",
-        "accent": "#6aa1ff",
-    },
-    "terminal": {
-        "name": "Terminal",
-        "description": "Classic green-on-black terminal vibes",
-        "background": "#0a0f0a",
-        "foreground": "#00ff41",
-        "muted": "#4a7c4a",
-        "accent": "#00ff41",
-    },
-    "solar": {
-        "name": "Solar",
-        "description": "Warm amber tones inspired by Solarized",
-        "background": "#002b36",
-        "foreground": "#fdf6e3",
-        "muted": "#839496",
-        "accent": "#b58900",
-    },
-    "nord": {
-        "name": "Nord",
-        "description": "Arctic, bluish-gray color palette",
-        "background": "#2e3440",
-        "foreground": "#eceff4",
-        "muted": "#4c566a",
-        "accent": "#88c0d0",
-    },
-    "monokai": {
-        "name": "Monokai",
-        "description": "The beloved syntax theme",
-        "background": "#272822",
-        "foreground": "#f8f8f2",
-        "muted": "#75715e",
-        "accent": "#f92672",
-    },
-    "dracula": {
-        "name": "Dracula",
-        "description": "Dark theme with purple accents",
-        "background": "#282a36",
-        "foreground": "#f8f8f2",
-        "muted": "#6272a4",
-        "accent": "#bd93f9",
-    },
-    "github": {
-        "name": "GitHub Dark",
-        "description": "GitHub's dark mode palette",
-        "background": "#0d1117",
-        "foreground": "#c9d1d9",
-        "muted": "#8b949e",
-        "accent": "#58a6ff",
-    },
-    "paper": {
-        "name": "Paper",
-        "description": "Light theme for daylight coders",
-        "background": "#fafafa",
-        "foreground": "#1a1a1a",
-        "muted": "#6b7280",
-        "accent": "#2563eb",
-    },
-}
-
-# Radius presets
-RADIUS_PRESETS = {
-    "none": {"name": "None", "value": "0"},
-    "sm": {"name": "Small", "value": "4px"},
-    "md": {"name": "Medium", "value": "8px"},
-    "lg": {"name": "Large", "value": "12px"},
-    "xl": {"name": "Extra Large", "value": "16px"},
-}
-
-# Shadow presets
-SHADOW_PRESETS = {
-    "none": {"name": "None", "value1": "none", "value2": "none"},
-    "subtle": {
-        "name": "Subtle",
-        "value1": "0 1px 2px rgba(0,0,0,.1)",
-        "value2": "0 4px 12px rgba(0,0,0,.15)",
-    },
-    "medium": {
-        "name": "Medium",
-        "value1": "0 1px 2px rgba(0,0,0,.2)",
-        "value2": "0 8px 30px rgba(0,0,0,.35)",
-    },
-    "dramatic": {
-        "name": "Dramatic",
-        "value1": "0 2px 8px rgba(0,0,0,.3)",
-        "value2": "0 16px 48px rgba(0,0,0,.5)",
-    },
-}
-
-# Font presets
-FONT_PRESETS = {
-    "system": {
-        "name": "System",
-        "value": "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif",
-    },
-    "mono": {
-        "name": "Monospace",
-        "value": "'JetBrains Mono', 'Fira Code', 'SF Mono', Consolas, monospace",
-    },
-    "inter": {
-        "name": "Inter",
-        "value": "'Inter', -apple-system, BlinkMacSystemFont, sans-serif",
-    },
-    "geist": {
-        "name": "Geist",
-        "value": "'Geist', -apple-system, BlinkMacSystemFont, sans-serif",
-    },
-}
+# Theme presets live in greeble.theme so the compiler and Tailwind preset share them.
+# Compiled themes are cached by content hash and served from /theme/<hash>.css?<spec>.
+THEME_CACHE = ThemeCache()
 
 
 def build_sidebar_html() -> str:
@@ -912,7 +817,7 @@ def build_javascript() -> str:
                 item.addEventListener('click', () => {
                     const componentId = item.dataset.component;
                     const blockId = componentBlockMap[componentId] || 'card';
-                    const block = document.querySelector(`[data-block="${blockId}"]`);
+                    const block = document.querySelector(`[data-block="$${blockId}"]`);
 
                     // Remove active from all items, add to clicked
                     document.querySelectorAll('.sidebar-item').forEach(i => i.classList.remove('active'));
@@ -1915,6 +1820,42 @@ async def playground() -> HTMLResponse:
     return HTMLResponse(html)
 
 
+@app.get("/theme.css")
+async def theme_css(request: Request) -> RedirectResponse:
+    """Compile the theme described by the query string and redirect to its hashed URL.
+
+    Accepts `palette`, `accent`, `radius`, `shadow`, `font`, and `scale`.
+    """
+    try:
+        spec = ThemeSpec.from_mapping(request.query_params)
+        compiled = THEME_CACHE.compile(spec)
+    except ThemeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    query = urlencode(spec.to_mapping())
+    location = f"/theme/{compiled.hash}.css" + (f"?{query}" if query else "")
+    return RedirectResponse(location, status_code=307)
+
+
+@app.get("/theme/{theme_hash}.css")
+async def theme_css_by_hash(theme_hash: str, request: Request) -> Response:
+    """Serve a compiled theme; the URL is content-addressed, so it is cached immutably.
+
+    The query string repeats the spec so any worker can rebuild a theme it has not
+    compiled (or has evicted); a spec that does not hash to `theme_hash` is a 404.
+    """
+    try:
+        spec = ThemeSpec.from_mapping(request.query_params)
+    except ThemeError:
+        spec = None
+    compiled = THEME_CACHE.get(theme_hash, spec=spec)
+    if compiled is None:
+        raise HTTPException(status_code=404, detail="Unknown theme")
+    variant = compiled.fragment.select(
+        request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+    )
+    return Response(variant.body, status_code=variant.status, headers=dict(variant.headers))
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -11,10 +11,23 @@ generated fragments.
 """
 
 import json
+import time
 from collections.abc import Mapping, MutableMapping
 from typing import Any
 
-from .utils import hx_trigger_headers, is_hx_request
+from ..assets import merge_link_header
+from ..fragments import StaticFragment, StaticFragmentRegistry
+from ..metrics import CONTENT_TYPE, METRICS_PATH, metrics_registry, metrics_text
+from ..minify import response_minifier
+from ..profiling import start_profile
+from ..timing import SERVER_TIMING_HEADER, merge_server_timing, start_timing
+from .utils import (
+    TEMPLATE_RELOAD_PATH,
+    hx_request_headers,
+    hx_target,
+    hx_trigger_headers,
+    is_hx_request,
+)
 
 
 def csrf_header(request: Any) -> dict[str, str]:
@@ -53,17 +66,121 @@ def template_response(
     - template_name: full layout template
     - partial_template: fragment template to use when HTMX or `partial=True`
     - request: django HttpRequest for HTMX detection and template rendering
-    """
-    from django.shortcuts import render
 
+    Output is minified when `greeble.minify.configure_response_minify()` is enabled.
+    Full-page renders also carry the preload `Link` header registered via
+    `greeble.assets.configure_preload()`. Requests sampled by
+    `greeble.timing.configure_server_timing()` get a `Server-Timing` header, and
+    `greeble.metrics.configure_metrics()` records latency and size per template.
+    Renders sampled by `greeble.profiling.configure_profiling()` run under cProfile.
+    """
+    timing = start_timing()
+    metrics = metrics_registry()
+    started = time.perf_counter_ns() if metrics is not None else 0
     use_partial = partial is True or (partial is None and is_hx_request(request))
     name = partial_template if (use_partial and partial_template) else template_name
-    # Django's render ensures the response carries proper content type
-    resp = render(request, name, context=context, status=status_code)
+    profile = start_profile()
+    try:
+        if timing is None:
+            from django.shortcuts import render
+
+            # Django's render ensures the response carries proper content type
+            resp = render(request, name, context=context, status=status_code)
+        else:
+            # The steps of `render()`, split so lookup and rendering are timed separately.
+            from django.http import HttpResponse
+            from django.template import loader
+
+            template = loader.get_template(name)
+            timing.mark("lookup")
+            content = template.render(context, request)
+            timing.mark("render")
+            resp = HttpResponse(content, status=status_code)
+    finally:
+        if profile is not None:
+            profile.finish(name, hx_request_headers(request))
+    if (minifier := response_minifier()) is not None:
+        resp.content = minifier(resp.content.decode(resp.charset))
     if headers:
         for k, v in headers.items():
             resp[k] = v
     if triggers is not None:
         for k, v in hx_trigger_headers(triggers).items():
             resp[k] = v
+    if not use_partial and (link := merge_link_header(resp.headers.get("Link"))):
+        resp["Link"] = link
+    if timing is not None:
+        timing.mark("serialize")
+        resp[SERVER_TIMING_HEADER] = merge_server_timing(
+            resp.headers.get(SERVER_TIMING_HEADER), timing
+        )
+    if metrics is not None:
+        metrics.observe(
+            name,
+            kind="partial" if use_partial else "full",
+            hx_target=hx_target(request),
+            elapsed_ns=time.perf_counter_ns() - started,
+            size=len(resp.content),
+        )
     return resp
+
+
+def static_fragment_urls(registry: StaticFragmentRegistry) -> list[Any]:
+    """Return URL patterns serving every fragment in `registry`.
+
+    Include them in `urlpatterns`; views answer GET/HEAD only, reply to `If-None-Match`
+    with 304, and serve the gzip variant when the client accepts it.
+    """
+    from django.http import HttpResponse
+    from django.urls import path as url_path
+    from django.views.decorators.http import require_safe
+
+    def make_view(fragment: StaticFragment) -> Any:
+        @require_safe
+        def view(request: Any) -> Any:
+            variant = fragment.select(
+                request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+            )
+            return HttpResponse(variant.body, status=variant.status, headers=variant.headers)
+
+        return view
+
+    return [url_path(path.lstrip("/"), make_view(fragment)) for path, fragment in registry.items()]
+
+
+def template_reload_urls(path: str = TEMPLATE_RELOAD_PATH) -> list[Any]:
+    """Return a URL pattern whose POST view resets Django's cached template loaders.
+
+    Target of `greeble watch --notify`. Development only: add it to `urlpatterns` behind a
+    `settings.DEBUG` check.
+    """
+    from django.http import HttpResponse
+    from django.template.autoreload import reset_loaders
+    from django.urls import path as url_path
+    from django.views.decorators.csrf import csrf_exempt
+    from django.views.decorators.http import require_POST
+
+    @csrf_exempt
+    @require_POST
+    def reload_templates(request: Any) -> Any:
+        reset_loaders()
+        return HttpResponse(status=204)
+
+    return [url_path(path.lstrip("/"), reload_templates)]
+
+
+def metrics_urls(path: str = METRICS_PATH) -> list[Any]:
+    """Return a URL pattern whose GET view serves `greeble.metrics` for Prometheus.
+
+    Enable collection with `greeble.metrics.configure_metrics()`; while it is disabled the
+    view returns an empty body.
+    """
+    from django.http import HttpResponse
+    from django.urls import path as url_path
+    from django.views.decorators.http import require_GET
+
+    @require_GET
+    def metrics(request: Any) -> Any:
+        return HttpResponse(metrics_text(), content_type=CONTENT_TYPE)
+
+    return [url_path(path.lstrip("/"), metrics)]
@@ -29,12 +29,23 @@ Notes:
 from __future__ import annotations
 
 import json
+import time
 from collections.abc import Mapping, MutableMapping
 from typing import Any, Literal
 
-from fastapi import Request
+from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+from ..assets import merge_link_header
+from ..fragments import StaticFragment, StaticFragmentRegistry
+from ..metrics import CONTENT_TYPE, METRICS_PATH, metrics_registry, metrics_text
+from ..minify import response_minifier
+from ..profiling import start_profile
+from ..timing import SERVER_TIMING_HEADER, merge_server_timing, start_timing
+from .utils import HX_TARGET_HEADER, TEMPLATE_RELOAD_PATH, hx_request_headers
 
 HX_REQUEST_HEADER = "HX-Request"
 
@@ -97,13 +108,34 @@ def partial_html(
     - status_code: HTTP status code (default 200)
     - headers: additional headers to include
     - triggers: event(s) to trigger on the client (HX-Trigger*)
+
+    Requests sampled by `greeble.timing.configure_server_timing()` get a `Server-Timing`
+    header with the serialize (minify + trigger) span. With `greeble.metrics` enabled the
+    response is recorded under the `(inline)` template as a `fragment`.
     """
+    timing = start_timing()
+    metrics = metrics_registry()
+    started = time.perf_counter_ns() if metrics is not None else 0
+    if (minifier := response_minifier()) is not None:
+        html = minifier(html)
     hdrs: dict[str, str] = {}
     if headers:
         hdrs |= headers
     if triggers is not None:
         hdrs |= hx_trigger_headers(triggers)
-    return HTMLResponse(content=html, status_code=status_code, headers=hdrs)
+    if timing is not None:
+        timing.mark("serialize")
+        hdrs[SERVER_TIMING_HEADER] = merge_server_timing(hdrs.get(SERVER_TIMING_HEADER), timing)
+    resp = HTMLResponse(content=html, status_code=status_code, headers=hdrs)
+    if metrics is not None:
+        metrics.observe(
+            "(inline)",
+            kind="fragment",
+            hx_target=None,
+            elapsed_ns=time.perf_counter_ns() - started,
+            size=len(resp.body),
+        )
+    return resp
 
 
 def template_response(
@@ -138,14 +170,42 @@ def template_response(
           `partial_template` is provided, render the partial.
         - Otherwise render the full `template_name`.
         - If `triggers` is provided, attach HX-Trigger headers.
+        - When `greeble.minify.configure_response_minify()` is enabled, the rendered
+          markup is minified (with caching) before it is sent.
+        - Full-page renders carry a `Link: rel=preload` header for the assets registered
+          via `greeble.assets.configure_preload()`.
+        - When `greeble.timing.configure_server_timing()` samples the request, a
+          `Server-Timing` header reports lookup, render, and serialize spans.
+        - When `greeble.metrics.configure_metrics()` is enabled, latency and body size are
+          recorded per template, partial/full, and `HX-Target`.
+        - Renders sampled by `greeble.profiling.configure_profiling()` run under cProfile
+          and slow ones are saved for `greeble profile report`.
     """
+    timing = start_timing()
+    metrics = metrics_registry()
+    started = time.perf_counter_ns() if metrics is not None else 0
     # Ensure the Request object is present in the template context
     ctx = dict(context)
 
     use_partial = partial is True or (partial is None and is_hx_request(request))
     name = partial_template if (use_partial and partial_template) else template_name
 
-    resp = templates.TemplateResponse(request, name, ctx, status_code=status_code)
+    profile = start_profile()
+    try:
+        if timing is not None:
+            # Sampled requests look the template up separately so the two costs can be told
+            # apart; TemplateResponse then hits Jinja's template cache.
+            templates.get_template(name)
+            timing.mark("lookup")
+        resp = templates.TemplateResponse(request, name, ctx, status_code=status_code)
+    finally:
+        if profile is not None:
+            profile.finish(name, hx_request_headers(request))
+    if timing is not None:
+        timing.mark("render")
+    if (minifier := response_minifier()) is not None:
+        resp.body = minifier(bytes(resp.body).decode(resp.charset)).encode(resp.charset)
+        resp.headers["content-length"] = str(len(resp.body))
 
     if headers:
         for k, v in headers.items():
@@ -153,5 +213,92 @@ def template_response(
     if triggers is not None:
         for k, v in hx_trigger_headers(triggers).items():
             resp.headers[k] = v
+    if not use_partial and (link := merge_link_header(resp.headers.get("Link"))):
+        resp.headers["Link"] = link
+    if timing is not None:
+        timing.mark("serialize")
+        resp.headers[SERVER_TIMING_HEADER] = merge_server_timing(
+            resp.headers.get(SERVER_TIMING_HEADER), timing
+        )
+    if metrics is not None:
+        metrics.observe(
+            name,
+            kind="partial" if use_partial else "full",
+            hx_target=request.headers.get(HX_TARGET_HEADER),
+            elapsed_ns=time.perf_counter_ns() - started,
+            size=len(resp.body),
+        )
 
     return resp
+
+
+class _StaticFragmentEndpoint:
+    """Raw ASGI endpoint that streams a prepared `StaticFragment` variant.
+
+    Bypasses Request/Response construction: the only per-request work is scanning the
+    two relevant request headers and sending pre-encoded bytes.
+    """
+
+    def __init__(self, fragment: StaticFragment) -> None:
+        self.fragment = fragment
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if_none_match = accept_encoding = None
+        for key, value in scope["headers"]:
+            if key == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+            elif key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        variant = self.fragment.select(if_none_match, accept_encoding)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": variant.status,
+                "headers": variant.raw_headers,
+            }
+        )
+        body = b"" if scope["method"] == "HEAD" else variant.body
+        await send({"type": "http.response.body", "body": body})
+
+
+def mount_static_fragments(app: FastAPI, registry: StaticFragmentRegistry) -> None:
+    """Add a GET/HEAD route for every fragment in `registry`.
+
+    Routes are inserted ahead of existing routes so they take precedence over handlers
+    declared for the same path, and are excluded from the OpenAPI schema.
+    """
+    routes = [
+        Route(path, _StaticFragmentEndpoint(fragment), methods=["GET", "HEAD"])
+        for path, fragment in registry.items()
+    ]
+    app.router.routes[:0] = routes
+
+
+def mount_template_reload(
+    app: FastAPI, templates: Jinja2Templates, *, path: str = TEMPLATE_RELOAD_PATH
+) -> None:
+    """Add a POST route that drops `templates`' compiled-template cache.
+
+    `greeble watch --notify http://127.0.0.1:8000/__greeble/reload` calls it after
+    copying changed component files. Development only: do not mount it in production.
+    """
+
+    def reload_templates() -> Response:
+        if templates.env.cache is not None:
+            templates.env.cache.clear()
+        return Response(status_code=204)
+
+    app.add_api_route(path, reload_templates, methods=["POST"], include_in_schema=False)
+
+
+def mount_metrics(app: FastAPI, *, path: str = METRICS_PATH) -> None:
+    """Add a GET route serving `greeble.metrics` in the Prometheus text format.
+
+    Enable collection with `greeble.metrics.configure_metrics()`; while it is disabled the
+    endpoint returns an empty body.
+    """
+
+    def metrics() -> Response:
+        return Response(metrics_text(), media_type=CONTENT_TYPE)
+
+    app.add_api_route(path, metrics, methods=["GET"], include_in_schema=False)
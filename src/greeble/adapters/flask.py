@@ -12,10 +12,23 @@ be used for trusted, server-generated fragments.
 
 from __future__ import annotations
 
+import time
 from collections.abc import Mapping, MutableMapping
 from typing import Any
 
-from .utils import hx_trigger_headers, is_hx_request
+from ..assets import merge_link_header
+from ..fragments import StaticFragment, StaticFragmentRegistry
+from ..metrics import CONTENT_TYPE, METRICS_PATH, metrics_registry, metrics_text
+from ..minify import response_minifier
+from ..profiling import start_profile
+from ..timing import SERVER_TIMING_HEADER, merge_server_timing, start_timing
+from .utils import (
+    TEMPLATE_RELOAD_PATH,
+    hx_request_headers,
+    hx_target,
+    hx_trigger_headers,
+    is_hx_request,
+)
 
 
 def template_response(
@@ -34,12 +47,38 @@ def template_response(
     - template_name: full layout template
     - partial_template: fragment template to use when HTMX or `partial=True`
     - request: flask request object for HTMX detection
+
+    Output is minified when `greeble.minify.configure_response_minify()` is enabled.
+    Full-page renders also carry the preload `Link` header registered via
+    `greeble.assets.configure_preload()`. Requests sampled by
+    `greeble.timing.configure_server_timing()` get a `Server-Timing` header, and
+    `greeble.metrics.configure_metrics()` records latency and size per template.
+    Renders sampled by `greeble.profiling.configure_profiling()` run under cProfile.
     """
     from flask import make_response, render_template
 
+    timing = start_timing()
+    metrics = metrics_registry()
+    started = time.perf_counter_ns() if metrics is not None else 0
     use_partial = partial is True or (partial is None and is_hx_request(request))
     name = partial_template if (use_partial and partial_template) else template_name
-    html = render_template(name, **context)
+    template: Any = name
+    profile = start_profile()
+    try:
+        if timing is not None:
+            from flask import current_app
+
+            # render_template() accepts the Template object, so the lookup is not repeated.
+            template = current_app.jinja_env.get_or_select_template(name)
+            timing.mark("lookup")
+        html = render_template(template, **context)
+    finally:
+        if profile is not None:
+            profile.finish(name, hx_request_headers(request))
+    if timing is not None:
+        timing.mark("render")
+    if (minifier := response_minifier()) is not None:
+        html = minifier(html)
     resp = make_response(html, status_code)
     resp.headers["Content-Type"] = "text/html; charset=utf-8"
     if headers:
@@ -48,4 +87,68 @@ def template_response(
     if triggers is not None:
         for k, v in hx_trigger_headers(triggers).items():
             resp.headers[k] = v
+    if not use_partial and (link := merge_link_header(resp.headers.get("Link"))):
+        resp.headers["Link"] = link
+    if timing is not None:
+        timing.mark("serialize")
+        resp.headers[SERVER_TIMING_HEADER] = merge_server_timing(
+            resp.headers.get(SERVER_TIMING_HEADER), timing
+        )
+    if metrics is not None:
+        metrics.observe(
+            name,
+            kind="partial" if use_partial else "full",
+            hx_target=hx_target(request),
+            elapsed_ns=time.perf_counter_ns() - started,
+            size=len(resp.get_data()),
+        )
     return resp
+
+
+def register_static_fragments(app: Any, registry: StaticFragmentRegistry) -> None:
+    """Register a GET/HEAD view for every fragment in `registry`.
+
+    Each view returns the fragment's prepared bytes and headers, answering
+    `If-None-Match` with 304 and serving the gzip variant when accepted.
+    """
+    from flask import request
+
+    def make_view(fragment: StaticFragment) -> Any:
+        def view() -> Any:
+            variant = fragment.select(
+                request.headers.get("If-None-Match"), request.headers.get("Accept-Encoding")
+            )
+            return app.response_class(variant.body, variant.status, variant.headers)
+
+        return view
+
+    for path, fragment in registry.items():
+        endpoint = "greeble_fragment:" + path
+        app.add_url_rule(path, endpoint, make_view(fragment), methods=["GET"])
+
+
+def register_template_reload(app: Any, *, path: str = TEMPLATE_RELOAD_PATH) -> None:
+    """Register a POST view that drops the app's compiled Jinja templates.
+
+    Target of `greeble watch --notify`. Development only: do not register it in production.
+    """
+
+    def reload_templates() -> Any:
+        if app.jinja_env.cache is not None:
+            app.jinja_env.cache.clear()
+        return app.response_class(status=204)
+
+    app.add_url_rule(path, "greeble_template_reload", reload_templates, methods=["POST"])
+
+
+def register_metrics(app: Any, *, path: str = METRICS_PATH) -> None:
+    """Register a GET view serving `greeble.metrics` in the Prometheus text format.
+
+    Enable collection with `greeble.metrics.configure_metrics()`; while it is disabled the
+    view returns an empty body.
+    """
+
+    def metrics() -> Any:
+        return app.response_class(metrics_text(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule(path, "greeble_metrics", metrics, methods=["GET"])
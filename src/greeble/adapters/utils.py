@@ -5,6 +5,18 @@ from collections.abc import Mapping
 from typing import Any, Literal
 
 HX_REQUEST_HEADER = "HX-Request"
+HX_TARGET_HEADER = "HX-Target"
+# Request headers htmx sends that identify the interaction behind a request.
+HX_REQUEST_HEADERS = (
+    HX_REQUEST_HEADER,
+    "HX-Boosted",
+    "HX-Current-URL",
+    HX_TARGET_HEADER,
+    "HX-Trigger",
+    "HX-Trigger-Name",
+)
+# Default route for the template-reload hooks that `greeble watch --notify` calls.
+TEMPLATE_RELOAD_PATH = "/__greeble/reload"
 AfterPhase = Literal["receive", "settle", "swap"]
 _HEADER_BY_PHASE: dict[AfterPhase, str] = {
     "receive": "HX-Trigger",
@@ -13,8 +25,8 @@ _HEADER_BY_PHASE: dict[AfterPhase, str] = {
 }
 
 
-def is_hx_request(request: Any) -> bool:
-    """Return True if the incoming request was initiated by HTMX (framework-agnostic).
+def request_header(request: Any, name: str) -> str:
+    """Return the value of header `name` on `request`, or "" (framework-agnostic).
 
     Attempts to read `request.headers` (Flask/Django/Starlette) and falls back to
     environ-style dicts `request.environ` (Flask) or `request.META` (Django).
@@ -23,18 +35,35 @@ def is_hx_request(request: Any) -> bool:
     headers = getattr(request, "headers", None)
     if headers is not None:
         try:
-            value = headers.get(HX_REQUEST_HEADER, "")
+            value = headers.get(name, "")
         except Exception:
             value = ""
+    environ_key = f"HTTP_{name.replace('-', '_').upper()}"
     if not value:
         environ = getattr(request, "environ", None)
         if isinstance(environ, dict):
-            value = environ.get(f"HTTP_{HX_REQUEST_HEADER.replace('-', '_').upper()}", "")
+            value = environ.get(environ_key, "")
     if not value:
         meta = getattr(request, "META", None)
         if isinstance(meta, dict):
-            value = meta.get(f"HTTP_{HX_REQUEST_HEADER.replace('-', '_').upper()}", "")
-    return str(value).lower() == "true"
+            value = meta.get(environ_key, "")
+    return str(value)
+
+
+def is_hx_request(request: Any) -> bool:
+    """Return True if the incoming request was initiated by HTMX (framework-agnostic)."""
+    return request_header(request, HX_REQUEST_HEADER).lower() == "true"
+
+
+def hx_target(request: Any) -> str:
+    """Return the id of the element the HTMX request targets (`HX-Target`), or ""."""
+    return request_header(request, HX_TARGET_HEADER)
+
+
+def hx_request_headers(request: Any) -> dict[str, str]:
+    """Return the htmx request headers present on `request` (for tagging diagnostics)."""
+    values = {name: request_header(request, name) for name in HX_REQUEST_HEADERS}
+    return {name: value for name, value in values.items() if value}
 
 
 def serialize_triggers(triggers: str | list[str] | Mapping[str, Any]) -> str:
@@ -0,0 +1,175 @@
+"""
+Asset helpers: self-hosted HTMX/Hyperscript bundles and preload hints.
+
+Purpose:
+    - Vendor the HTMX runtime, the SSE extension, and the Hyperscript runtime into a
+      local static directory using content-hashed filenames, so first-page loads no
+      longer depend on a third-party CDN round-trip.
+    - Describe critical assets (core CSS, scripts) as preload links and serialize them
+      into an HTTP `Link` header.
+    - Hold a process-wide preload registry that the framework adapters consult when
+      rendering full-page responses.
+
+Notes:
+    The registry is empty by default, so adapters emit no `Link` header until an app
+    calls `configure_preload()`. Partial (HTMX) responses never carry preload hints.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+__all__ = [
+    "CDN_SCRIPTS",
+    "VENDOR_MANIFEST",
+    "PreloadLink",
+    "configure_preload",
+    "hashed_name",
+    "link_header",
+    "load_vendor_manifest",
+    "merge_link_header",
+    "preload_headers",
+    "preload_links",
+    "vendor_scripts",
+]
+
+# Logical name -> pinned CDN URL. The logical names double as the unhashed filenames.
+CDN_SCRIPTS: dict[str, str] = {
+    "htmx.min.js": "https://unpkg.com/htmx.org@1.9.12/dist/htmx.min.js",
+    "sse.js": "https://unpkg.com/htmx.org@1.9.12/dist/ext/sse.js",
+    "_hyperscript.min.js": "https://unpkg.com/hyperscript.org@0.9.12/dist/_hyperscript.min.js",
+}
+
+VENDOR_MANIFEST = "vendor.json"
+
+Fetcher = Callable[[str], bytes]
+
+
+@dataclass(frozen=True)
+class PreloadLink:
+    """A single `rel=preload` hint for a critical asset."""
+
+    href: str
+    as_: str
+    type: str | None = None
+    crossorigin: bool = False
+
+    def header_value(self) -> str:
+        parts = [f"<{self.href}>", "rel=preload", f"as={self.as_}"]
+        if self.type:
+            parts.append(f'type="{self.type}"')
+        if self.crossorigin:
+            parts.append("crossorigin")
+        return "; ".join(parts)
+
+
+def link_header(links: Iterable[PreloadLink]) -> str:
+    """Serialize preload links into a single `Link` header value."""
+    return ", ".join(link.header_value() for link in links)
+
+
+def hashed_name(name: str, data: bytes, *, length: int = 10) -> str:
+    """Return `name` with a content hash inserted before the final suffix.
+
+    `htmx.min.js` becomes `htmx.min.<hash>.js`.
+    """
+    digest = hashlib.sha256(data).hexdigest()[:length]
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+def _fetch(url: str) -> bytes:
+    import urllib.request  # deferred: only `greeble vendor` downloads anything
+
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        data: bytes = resp.read()
+    return data
+
+
+def vendor_scripts(
+    destination: Path,
+    *,
+    scripts: Mapping[str, str] | None = None,
+    fetch: Fetcher | None = None,
+) -> dict[str, str]:
+    """Download scripts into `destination` with hashed filenames.
+
+    Writes each script as `<stem>.<hash>.<suffix>` plus a `vendor.json` manifest mapping
+    logical names to hashed filenames, and returns that mapping. Previously vendored
+    copies with the same content are left untouched.
+    """
+    sources = CDN_SCRIPTS if scripts is None else scripts
+    fetcher = fetch or _fetch
+    destination.mkdir(parents=True, exist_ok=True)
+
+    mapping: dict[str, str] = {}
+    for name, url in sources.items():
+        data = fetcher(url)
+        filename = hashed_name(name, data)
+        target = destination / filename
+        if not target.exists():
+            target.write_bytes(data)
+        mapping[name] = filename
+
+    manifest_path = destination / VENDOR_MANIFEST
+    manifest_path.write_text(json.dumps(mapping, indent=2, sort_keys=True) + "\n", "utf-8")
+    return mapping
+
+
+def load_vendor_manifest(directory: Path) -> dict[str, str] | None:
+    """Return the logical->hashed filename mapping, or None when nothing is vendored."""
+    path = directory / VENDOR_MANIFEST
+    if not path.is_file():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {str(k): str(v) for k, v in data.items()}
+
+
+class _PreloadRegistry:
+    links: tuple[PreloadLink, ...] = ()
+    header: str = ""
+
+
+_REGISTRY = _PreloadRegistry()
+
+
+def configure_preload(links: Iterable[PreloadLink]) -> None:
+    """Register the preload links adapters attach to full-page responses.
+
+    The `Link` header value is serialized once here rather than per request.
+    """
+    _REGISTRY.links = tuple(links)
+    _REGISTRY.header = link_header(_REGISTRY.links)
+
+
+def preload_links() -> tuple[PreloadLink, ...]:
+    """Return the currently registered preload links."""
+    return _REGISTRY.links
+
+
+def preload_headers() -> dict[str, str]:
+    """Return `{"Link": ...}` for the registered preload links, or an empty dict."""
+    return {"Link": _REGISTRY.header} if _REGISTRY.header else {}
+
+
+def merge_link_header(existing: str | None) -> str | None:
+    """Return `existing` extended with the registered preload links.
+
+    Returns None when there is nothing to set (no registry and no existing header).
+    """
+    if not _REGISTRY.header:
+        return existing
+    if existing:
+        return f"{existing}, {_REGISTRY.header}"
+    return _REGISTRY.header
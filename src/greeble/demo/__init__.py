@@ -4,6 +4,9 @@ from .helpers import (
     AccountLike,
     ProductLike,
     StepContent,
+    account_row_id,
+    account_row_version,
+    account_rows_diff,
     account_slug,
     account_status_display,
     filter_accounts,
@@ -31,6 +34,9 @@ __all__ = [
     "AccountLike",
     "ProductLike",
     "StepContent",
+    "account_row_id",
+    "account_row_version",
+    "account_rows_diff",
     "account_slug",
     "account_status_display",
     "filter_accounts",
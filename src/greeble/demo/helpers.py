@@ -6,6 +6,9 @@ from pathlib import Path
 from string import Template
 from typing import Protocol, TypedDict
 
+from ..minify import minify_html
+from ..rowdiff import RowDiff, diff_rows, row_version
+
 
 class ProductLike(Protocol):
     sku: str
@@ -34,10 +37,153 @@ class StepContent(TypedDict, total=False):
     next: str | None
 
 
-def load_component_template(components_root: Path, component: str, filename: str) -> str:
-    """Read a component template shipped with greeble_components."""
+# Fragment templates are minified once at import so responses skip indentation bytes.
+_TOAST_TEMPLATE = Template(
+    minify_html(
+        """
+<div class="greeble-toast greeble-toast--$level" role="status" data-level="$level">
+  <div class="greeble-toast__icon" aria-hidden="true">$icon</div>
+  <div class="greeble-toast__body">
+    <p class="greeble-toast__title">$title</p>
+    <p class="greeble-toast__message">$message</p>
+  </div>
+</div>
+"""
+    )
+)
+
+_PALETTE_RESULT_TEMPLATE = Template(
+    minify_html(
+        """
+<li role="option" data-sku="$sku" aria-selected="$selected">
+  <button class="greeble-palette__result" type="button"
+          hx-post="$url"
+          hx-target="$target"
+          hx-swap="innerHTML"
+          hx-vals='{"sku": "$sku"}'>
+    <div class="greeble-palette__result-label">
+      <strong>$name</strong>
+      <span>$tagline</span>
+    </div>
+    <span class="greeble-palette__result-kbd">$category</span>
+  </button>
+</li>
+"""
+    )
+)
+
+_PALETTE_DETAIL_TEMPLATE = Template(
+    minify_html(
+        """
+<article class="greeble-palette__detail-card" data-sku="$sku">
+  <header>
+    <h3 class="greeble-heading-3">$name</h3>
+    <p>$tagline</p>
+  </header>
+  <dl class="greeble-palette__meta">
+    <div><dt>SKU</dt><dd>$sku</dd></div>
+    <div><dt>Category</dt><dd>$category</dd></div>
+    <div><dt>Price</dt><dd>$price_fmt</dd></div>
+    <div><dt>Inventory</dt><dd>$inventory</dd></div>
+  </dl>
+  <p>$description</p>
+</article>
+"""
+    )
+)
+
+_SECONDARY_ACTION_TEMPLATE = Template(
+    minify_html(
+        """
+<button class="greeble-button $variation" type="button"
+        hx-post="$url"
+        hx-target="#greeble-toasts"
+        hx-swap="outerHTML">
+  $label
+</button>
+"""
+    )
+)
+
+_ACCOUNT_ROW_TEMPLATE = Template(
+    minify_html(
+        """
+<tr$row_attrs>
+  <td>
+    <div class="greeble-table__primary">
+      <strong>$org</strong>
+      <span>$plan plan · $seats seats</span>
+    </div>
+  </td>
+  <td>$owner</td>
+  <td>
+    <span class="greeble-table__status $status_class">$status_label</span>
+  </td>
+  <td class="greeble-table__actions">
+    <button class="greeble-button greeble-button--ghost" type="button"
+            hx-get="/table/accounts/$slug"
+            hx-target="#table-body"
+            hx-swap="none">
+      View
+    </button>
+    $secondary_action
+  </td>
+</tr>
+"""
+    )
+)
+
+_FEED_ITEM_TEMPLATE = Template(
+    minify_html(
+        """
+<li class="greeble-feed__item">
+  <strong>Update #$idx</strong>
+  <span>$message</span>
+</li>
+"""
+    )
+)
+
+_SIGNIN_GROUP_TEMPLATE = Template(
+    minify_html(
+        """
+<div $attrs>
+  <label class="greeble-field__label" for="signin-email">Work email</label>
+  <input $input_attrs />
+  <p id="signin-hint" class="greeble-field__hint">We'll email you a magic link.</p>
+  $error_html
+</div>
+"""
+    )
+)
+
+_VALID_EMAIL_GROUP_TEMPLATE = Template(
+    minify_html(
+        """
+<div $attrs>
+  <label class="greeble-field__label" for="form-email">Work email</label>
+  <input class="greeble-input" id="form-email" name="email" type="email"
+         autocomplete="email" aria-describedby="form-email-hint" required $value />
+  <p class="greeble-field__hint" id="form-email-hint">
+    Use your company domain for faster approval.
+  </p>
+</div>
+"""
+    )
+)
+
+
+def load_component_template(
+    components_root: Path, component: str, filename: str, *, minify: bool = False
+) -> str:
+    """Read a component template shipped with greeble_components.
+
+    With `minify=True` the doc-header comments and indentation are stripped so the
+    markup can be served directly to clients.
+    """
     path = components_root / component / "templates" / filename
-    return path.read_text(encoding="utf-8")
+    text = path.read_text(encoding="utf-8")
+    return minify_html(text) if minify else text
 
 
 def load_component_stylesheets(components_root: Path, assets: Iterable[tuple[str, str]]) -> str:
@@ -67,17 +213,7 @@ def toast_fragment(level: str, title: str, message: str, *, icon: str | None = N
         "danger": "✖",
     }
     symbol = icon if icon is not None else icons.get(level, "ℹ")
-    return Template(
-        """
-  <div class="greeble-toast greeble-toast--$level" role="status" data-level="$level">
-    <div class="greeble-toast__icon" aria-hidden="true">$icon</div>
-    <div class="greeble-toast__body">
-      <p class="greeble-toast__title">$title</p>
-      <p class="greeble-toast__message">$message</p>
-    </div>
-  </div>
-        """
-    ).substitute(
+    return _TOAST_TEMPLATE.substitute(
         level=escape(level),
         icon=escape(symbol),
         title=escape(title),
@@ -124,23 +260,7 @@ def render_palette_results(
     for idx, product in enumerate(products):
         selected = "true" if idx == 0 else "false"
         items.append(
-            Template(
-                """
-<li role="option" data-sku="$sku" aria-selected="$selected">
-  <button class="greeble-palette__result" type="button"
-          hx-post="$url"
-          hx-target="$target"
-          hx-swap="innerHTML"
-          hx-vals='{"sku": "$sku"}'>
-    <div class="greeble-palette__result-label">
-      <strong>$name</strong>
-      <span>$tagline</span>
-    </div>
-    <span class="greeble-palette__result-kbd">$category</span>
-  </button>
-</li>
-                """
-            ).substitute(
+            _PALETTE_RESULT_TEMPLATE.substitute(
                 sku=escape(product.sku),
                 selected=selected,
                 url=escape(select_url),
@@ -167,23 +287,7 @@ def render_palette_results(
 
 def render_palette_detail(product: ProductLike) -> str:
     """Return detail card markup for a selected palette product."""
-    return Template(
-        """
-<article class="greeble-palette__detail-card" data-sku="$sku">
-  <header>
-    <h3 class="greeble-heading-3">$name</h3>
-    <p>$tagline</p>
-  </header>
-  <dl class="greeble-palette__meta">
-    <div><dt>SKU</dt><dd>$sku</dd></div>
-    <div><dt>Category</dt><dd>$category</dd></div>
-    <div><dt>Price</dt><dd>$price_fmt</dd></div>
-    <div><dt>Inventory</dt><dd>$inventory</dd></div>
-  </dl>
-  <p>$description</p>
-</article>
-        """
-    ).substitute(
+    return _PALETTE_DETAIL_TEMPLATE.substitute(
         sku=escape(product.sku),
         name=escape(product.name),
         tagline=escape(product.tagline),
@@ -256,55 +360,39 @@ def _account_secondary_action(account: AccountLike, slug: str) -> str:
         account.status,
         ("Archive", f"/table/accounts/{slug}/archive", "greeble-button--danger"),
     )
-    return Template(
-        """
-<button class="greeble-button $variation" type="button"
-        hx-post="$url"
-        hx-target="#greeble-toasts"
-        hx-swap="outerHTML">
-  $label
-</button>
-        """
-    ).substitute(
+    return _SECONDARY_ACTION_TEMPLATE.substitute(
         variation=variation,
         url=escape(url),
         label=escape(label),
     )
 
 
-def render_account_rows(accounts: Iterable[AccountLike]) -> str:
+def account_row_id(slug: str) -> str:
+    return f"account-row-{slug}"
+
+
+def account_row_version(account: AccountLike) -> str:
+    return row_version(
+        account.org,
+        account.owner,
+        account.plan,
+        account.status,
+        account.seats_used,
+        account.seats_total,
+    )
+
+
+def render_account_rows(accounts: Iterable[AccountLike], *, row_ids: bool = False) -> str:
     rows: list[str] = []
     for account in accounts:
         status_class, status_label = account_status_display(account)
         slug = account_slug(account)
+        row_attrs = f' id="{escape(account_row_id(slug))}"' if row_ids else ""
         seats = f"{account.seats_used}/{account.seats_total}"
         secondary_action = _account_secondary_action(account, slug)
         rows.append(
-            Template(
-                """
-<tr>
-  <td>
-    <div class="greeble-table__primary">
-      <strong>$org</strong>
-      <span>$plan plan · $seats seats</span>
-    </div>
-  </td>
-  <td>$owner</td>
-  <td>
-    <span class="greeble-table__status $status_class">$status_label</span>
-  </td>
-  <td class="greeble-table__actions">
-    <button class="greeble-button greeble-button--ghost" type="button"
-            hx-get="/table/accounts/$slug"
-            hx-target="#table-body"
-            hx-swap="none">
-      View
-    </button>
-    $secondary_action
-  </td>
-</tr>
-                """
-            ).substitute(
+            _ACCOUNT_ROW_TEMPLATE.substitute(
+                row_attrs=row_attrs,
                 org=escape(account.org),
                 plan=escape(account.plan),
                 seats=escape(seats),
@@ -318,6 +406,29 @@ def render_account_rows(accounts: Iterable[AccountLike]) -> str:
     return "".join(rows)
 
 
+def account_rows_diff(
+    accounts: Sequence[AccountLike],
+    client_state: str | None,
+    *,
+    tbody_id: str = "table-body",
+    empty: str = "",
+) -> RowDiff:
+    """Diff `accounts` (in display order) against the `_greeble_rows` state the client sent.
+
+    `empty` is the body (e.g. a "no results" row) sent when `accounts` is empty.
+    """
+    return diff_rows(
+        accounts,
+        key=account_slug,
+        version=account_row_version,
+        render=lambda account: render_account_rows([account], row_ids=True),
+        client_state=client_state,
+        tbody_id=tbody_id,
+        row_id=account_row_id,
+        empty=empty,
+    )
+
+
 def table_rows(
     accounts: Iterable[AccountLike],
     *,
@@ -360,16 +471,7 @@ def render_feed_items(
     items: list[str] = []
     for message in messages:
         idx = next(counter)
-        items.append(
-            Template(
-                """
-<li class="greeble-feed__item">
-  <strong>Update #$idx</strong>
-  <span>$message</span>
-</li>
-                """
-            ).substitute(idx=idx, message=escape(message))
-        )
+        items.append(_FEED_ITEM_TEMPLATE.substitute(idx=idx, message=escape(message)))
         if len(items) >= batch_size:
             break
     return "".join(items)
@@ -457,16 +559,7 @@ def render_signin_group(email: str, error: str | None, *, swap_oob: bool) -> str
         else ""
     )
 
-    return Template(
-        """
-<div $attrs>
-  <label class="greeble-field__label" for="signin-email">Work email</label>
-  <input $input_attrs />
-  <p id="signin-hint" class="greeble-field__hint">We'll email you a magic link.</p>
-  $error_html
-</div>
-        """
-    ).substitute(
+    return _SIGNIN_GROUP_TEMPLATE.substitute(
         attrs=" ".join(attrs),
         input_attrs=" ".join(input_attrs),
         error_html=error_html,
@@ -491,18 +584,7 @@ def render_valid_email_group(email: str, *, swap_oob: bool) -> str:
 
     value_attr = f'value="{escape(email, quote=True)}"' if email else ""
 
-    return Template(
-        """
-<div $attrs>
-  <label class="greeble-field__label" for="form-email">Work email</label>
-  <input class="greeble-input" id="form-email" name="email" type="email"
-         autocomplete="email" aria-describedby="form-email-hint" required $value />
-  <p class="greeble-field__hint" id="form-email-hint">
-    Use your company domain for faster approval.
-  </p>
-</div>
-        """
-    ).substitute(attrs=" ".join(attrs), value=value_attr)
+    return _VALID_EMAIL_GROUP_TEMPLATE.substitute(attrs=" ".join(attrs), value=value_attr)
 
 
 def validate_signin_email(email: str) -> str | None:
@@ -0,0 +1,196 @@
+"""
+Static fragment registry: constant HTMX responses served from pre-encoded bytes.
+
+Purpose:
+    Many HTMX endpoints return markup that never changes (close buttons that clear a
+    target, menu bodies, fixed `<option>` lists). Declaring them in a
+    `StaticFragmentRegistry` moves all work to startup: each fragment is encoded once,
+    gzip-compressed once, and given a content-derived ETag. Requests then only pick one
+    of the prepared variants (body bytes plus ready-made headers).
+
+Behavior:
+    - `If-None-Match` matching the selected encoding's ETag yields `304 Not Modified`.
+    - Clients that accept gzip receive the pre-compressed body when it is smaller. The
+      gzip variant is a different representation, so its ETag carries a `-gz` suffix.
+    - Responses always carry `ETag`, `Cache-Control`, and `Vary: Accept-Encoding`.
+
+Framework glue lives in the adapters (`mount_static_fragments` for FastAPI,
+`register_static_fragments` for Flask, `static_fragment_urls` for Django).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from .minify import minify_html
+
+__all__ = [
+    "DEFAULT_CACHE_CONTROL",
+    "FragmentVariant",
+    "StaticFragment",
+    "StaticFragmentRegistry",
+    "accepts_gzip",
+]
+
+DEFAULT_CACHE_CONTROL = "no-cache"
+_HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return True when an `Accept-Encoding` header allows gzip."""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2): ignore W/ prefixes.
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _gzip_etag(etag: str) -> str:
+    return f'{etag[:-1]}-gz"'
+
+
+@dataclass(frozen=True)
+class FragmentVariant:
+    """One prepared response: status, body, and headers in both str and raw ASGI form."""
+
+    status: int
+    body: bytes
+    headers: Mapping[str, str]
+    raw_headers: tuple[tuple[bytes, bytes], ...]
+
+    @classmethod
+    def build(cls, status: int, body: bytes, headers: Mapping[str, str]) -> FragmentVariant:
+        raw = tuple((k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items())
+        return cls(status=status, body=body, headers=dict(headers), raw_headers=raw)
+
+
+@dataclass(frozen=True)
+class StaticFragment:
+    """A constant response prepared as identity, gzip, and 304 variants.
+
+    `etag` is the identity ETag; the gzip variant (and its 304) use `gzip_etag`.
+    """
+
+    etag: str
+    identity: FragmentVariant
+    gzipped: FragmentVariant | None
+    not_modified: FragmentVariant
+    gzip_not_modified: FragmentVariant | None = None
+
+    @property
+    def gzip_etag(self) -> str:
+        return _gzip_etag(self.etag)
+
+    @classmethod
+    def build(
+        cls,
+        html: str,
+        *,
+        content_type: str = _HTML_CONTENT_TYPE,
+        cache_control: str = DEFAULT_CACHE_CONTROL,
+        compressed: bytes | None = None,
+    ) -> StaticFragment:
+        """Encode `html`, gzip it, and prepare the headers for every response variant.
+
+        Pass `compressed` to reuse an existing gzip encoding of `html` (e.g. a `.gz`
+        file written at build time) instead of compressing again.
+        """
+        body = html.encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        common = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        headers = {**common, "Content-Type": content_type, "Content-Length": str(len(body))}
+
+        gzipped = gzip_not_modified = None
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            gzip_common = {**common, "ETag": _gzip_etag(etag)}
+            gzip_headers = {
+                **headers,
+                **gzip_common,
+                "Content-Encoding": "gzip",
+                "Content-Length": str(len(compressed)),
+            }
+            gzipped = FragmentVariant.build(200, compressed, gzip_headers)
+            gzip_not_modified = FragmentVariant.build(304, b"", gzip_common)
+        return cls(
+            etag=etag,
+            identity=FragmentVariant.build(200, body, headers),
+            gzipped=gzipped,
+            not_modified=FragmentVariant.build(304, b"", common),
+            gzip_not_modified=gzip_not_modified,
+        )
+
+    @property
+    def body(self) -> bytes:
+        return self.identity.body
+
+    def select(self, if_none_match: str | None, accept_encoding: str | None) -> FragmentVariant:
+        """Return the variant matching a request's `If-None-Match`/`Accept-Encoding`."""
+        if self.gzipped is not None and accepts_gzip(accept_encoding):
+            if if_none_match and _etag_matches(if_none_match, self.gzip_etag):
+                return self.gzip_not_modified or self.not_modified
+            return self.gzipped
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return self.not_modified
+        return self.identity
+
+
+class StaticFragmentRegistry:
+    """Ordered mapping of URL path -> `StaticFragment`, built once at startup."""
+
+    def __init__(self, *, cache_control: str = DEFAULT_CACHE_CONTROL) -> None:
+        self.cache_control = cache_control
+        self._fragments: dict[str, StaticFragment] = {}
+
+    def add(self, path: str, html: str, *, minify: bool = False) -> StaticFragment:
+        """Register literal markup under `path` and return the prepared fragment."""
+        fragment = StaticFragment.build(
+            minify_html(html) if minify else html, cache_control=self.cache_control
+        )
+        return self.register(path, fragment)
+
+    def register(self, path: str, fragment: StaticFragment) -> StaticFragment:
+        """Register an already prepared fragment under `path`."""
+        if not path.startswith("/"):
+            raise ValueError(f"Fragment path must start with '/': {path!r}")
+        if path in self._fragments:
+            raise ValueError(f"Fragment already registered for {path!r}")
+        self._fragments[path] = fragment
+        return fragment
+
+    def add_file(self, path: str, source: Path, *, minify: bool = False) -> StaticFragment:
+        """Register the contents of a template file (e.g. a manifest partial) under `path`."""
+        return self.add(path, source.read_text(encoding="utf-8"), minify=minify)
+
+    def get(self, path: str) -> StaticFragment | None:
+        return self._fragments.get(path)
+
+    def items(self) -> Iterator[tuple[str, StaticFragment]]:
+        yield from self._fragments.items()
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._fragments
+
+    def __len__(self) -> int:
+        return len(self._fragments)
@@ -0,0 +1,338 @@
+"""
+In-process render metrics with a Prometheus text exposition.
+
+Purpose:
+    Record latency and response size for every response the framework adapters render,
+    per template name, partial vs full page, and `HX-Target`, without extra
+    dependencies. Scrape them from a mounted `/metrics` endpoint
+    (`mount_metrics()` / `register_metrics()` / `metrics_urls()` in the adapters) or
+    read p50/p95/p99 estimates in-process with `MetricsRegistry.summaries()`.
+
+Behavior:
+    - Disabled by default; `configure_metrics()` installs a process-wide registry.
+    - Histograms use fixed buckets, so each series is a few small integer lists.
+    - Recording takes no lock: every thread writes to its own shard of series (a lock
+      is only taken when a thread records for the first time or starts a new series),
+      and shards are merged when metrics are read. When a thread dies its shard is
+      folded into one retired shard, so thread-per-request servers keep a bounded
+      number of shards.
+    - At most `max_series` label combinations are tracked. Later ones are folded into
+      a `template="__other__"` series and counted in
+      `greeble_metrics_series_dropped_total`, keeping memory bounded.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_LATENCY_BUCKETS",
+    "DEFAULT_SIZE_BUCKETS",
+    "METRICS_PATH",
+    "Histogram",
+    "MetricsRegistry",
+    "SeriesSummary",
+    "configure_metrics",
+    "metrics_registry",
+    "metrics_text",
+]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_PATH = "/metrics"
+# Seconds; the spread of a cached partial (sub-millisecond) to a slow full page.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+# Bytes.
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+OVERFLOW_LABEL = "__other__"
+
+SeriesKey = tuple[str, str, str]  # (template, kind, hx_target)
+
+
+class Histogram:
+    """Fixed-bucket histogram: a count per upper bound (plus +Inf), a sum, and a count."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[int]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+
+    def observe(self, value: int) -> None:
+        # Prometheus buckets are inclusive upper bounds (`le`).
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def merge(self, other: Histogram) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile by linear interpolation inside its bucket."""
+        total = self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.bounds):
+                    return float(self.bounds[-1])  # above the last bucket: clamp
+                lower = self.bounds[index - 1] if index else 0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return float(self.bounds[-1])
+
+
+@dataclass(frozen=True)
+class SeriesSummary:
+    template: str
+    kind: str
+    hx_target: str
+    count: int
+    p50: float  # seconds
+    p95: float
+    p99: float
+    bytes_total: int
+
+
+class _Series:
+    __slots__ = ("latency", "size")
+
+    def __init__(self, latency_bounds: Sequence[int], size_bounds: Sequence[int]) -> None:
+        self.latency = Histogram(latency_bounds)
+        self.size = Histogram(size_bounds)
+
+
+class _Shard:
+    __slots__ = ("dropped", "series")
+
+    def __init__(self) -> None:
+        self.series: dict[SeriesKey, _Series] = {}
+        self.dropped = 0
+
+
+class MetricsRegistry:
+    """Latency and size histograms per `(template, kind, hx_target)` series."""
+
+    def __init__(
+        self,
+        *,
+        max_series: int = 500,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: Sequence[int] = DEFAULT_SIZE_BUCKETS,
+    ) -> None:
+        self.max_series = max_series
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        # Latency is recorded in integer nanoseconds to keep floats off the hot path.
+        self._latency_bounds = tuple(round(bound * 1e9) for bound in self.latency_buckets)
+        self._known: set[SeriesKey] = set()
+        self._local = threading.local()
+        # Live threads' shards by token; dead threads' shards are folded into `_retired`.
+        # Reentrant: the fold runs from a weakref finalizer, i.e. whenever the garbage
+        # collector frees a Thread, possibly while this thread already holds the lock.
+        self._shards: dict[int, _Shard] = {}
+        self._retired = _Shard()
+        self._shards_lock = threading.RLock()
+
+    def _shard(self) -> _Shard:
+        shard: _Shard | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            token = id(shard)
+            with self._shards_lock:
+                self._shards[token] = shard
+            finalizer = weakref.finalize(threading.current_thread(), self._retire, token)
+            finalizer.atexit = False
+        return shard
+
+    def _retire(self, token: int) -> None:
+        with self._shards_lock:
+            shard = self._shards.pop(token, None)
+            if shard is not None:
+                self._fold(self._retired, shard)
+
+    def _fold(self, target: _Shard, shard: _Shard) -> None:
+        for key, series in list(shard.series.items()):
+            merged = target.series.get(key)
+            if merged is None:
+                merged = target.series[key] = _Series(self._latency_bounds, self.size_buckets)
+            merged.latency.merge(series.latency)
+            merged.size.merge(series.size)
+        target.dropped += shard.dropped
+
+    def _admit(self, key: SeriesKey) -> bool:
+        """Claim a slot for a new series; False once `max_series` are tracked."""
+        with self._shards_lock:
+            if key in self._known:
+                return True
+            if len(self._known) >= self.max_series:
+                return False
+            self._known.add(key)
+            return True
+
+    def observe(
+        self, template: str, *, kind: str, hx_target: str | None, elapsed_ns: int, size: int
+    ) -> None:
+        """Record one response: `kind` is "full", "partial", or "fragment"."""
+        shard = self._shard()
+        key = (template, kind, hx_target or "")
+        series = shard.series.get(key)
+        if series is None:
+            if not self._admit(key):
+                shard.dropped += 1
+                key = (OVERFLOW_LABEL, kind, OVERFLOW_LABEL)
+            series = shard.series.get(key)
+            if series is None:
+                series = shard.series[key] = _Series(self._latency_bounds, self.size_buckets)
+        series.latency.observe(elapsed_ns)
+        series.size.observe(size)
+
+    def collect(self) -> dict[SeriesKey, _Series]:
+        """Merge every thread's shard (and the retired shard) into one snapshot."""
+        merged = _Shard()
+        with self._shards_lock:
+            for shard in [self._retired, *self._shards.values()]:
+                self._fold(merged, shard)
+        return merged.series
+
+    @property
+    def dropped(self) -> int:
+        with self._shards_lock:
+            return self._retired.dropped + sum(s.dropped for s in self._shards.values())
+
+    def summaries(self) -> list[SeriesSummary]:
+        """Return estimated p50/p95/p99 latency (seconds) per series, busiest first."""
+        rows = [
+            SeriesSummary(
+                template=key[0],
+                kind=key[1],
+                hx_target=key[2],
+                count=series.latency.count,
+                p50=series.latency.quantile(0.5) / 1e9,
+                p95=series.latency.quantile(0.95) / 1e9,
+                p99=series.latency.quantile(0.99) / 1e9,
+                bytes_total=series.size.sum,
+            )
+            for key, series in self.collect().items()
+        ]
+        return sorted(rows, key=lambda row: row.count, reverse=True)
+
+    def exposition(self) -> str:
+        """Render all series in the Prometheus text exposition format (version 0.0.4)."""
+        collected = sorted(self.collect().items())
+        lines: list[str] = []
+        lines += _histogram_lines(
+            "greeble_render_seconds",
+            "Time spent rendering a response in the greeble adapters.",
+            ((key, series.latency) for key, series in collected),
+            [_format_bound(bound) for bound in self.latency_buckets],
+            scale=1e-9,
+        )
+        lines += _histogram_lines(
+            "greeble_response_bytes",
+            "Size of responses rendered by the greeble adapters.",
+            ((key, series.size) for key, series in collected),
+            [_format_bound(bound) for bound in self.size_buckets],
+            scale=1,
+        )
+        lines += [
+            (
+                "# HELP greeble_metrics_series_dropped_total Observations folded into the "
+                f"{OVERFLOW_LABEL} series by the cardinality limit."
+            ),
+            "# TYPE greeble_metrics_series_dropped_total counter",
+            f"greeble_metrics_series_dropped_total {self.dropped}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(
+    name: str,
+    help_text: str,
+    series: Iterable[tuple[SeriesKey, Histogram]],
+    bounds: list[str],
+    *,
+    scale: float,
+) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (template, kind, hx_target), histogram in series:
+        labels = (
+            f'template="{_escape(template)}",kind="{_escape(kind)}",'
+            f'hx_target="{_escape(hx_target)}"'
+        )
+        cumulative = 0
+        for bound, count in zip([*bounds, "+Inf"], histogram.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        total = histogram.sum * scale
+        lines.append(f"{name}_sum{{{labels}}} {total:.9g}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+class _MetricsState:
+    registry: MetricsRegistry | None = None
+
+
+_STATE = _MetricsState()
+
+
+def configure_metrics(
+    enabled: bool = True,
+    *,
+    max_series: int = 500,
+    latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    size_buckets: Sequence[int] = DEFAULT_SIZE_BUCKETS,
+) -> MetricsRegistry | None:
+    """Enable (with a fresh registry) or disable render metrics in the adapters."""
+    _STATE.registry = (
+        MetricsRegistry(
+            max_series=max_series, latency_buckets=latency_buckets, size_buckets=size_buckets
+        )
+        if enabled
+        else None
+    )
+    return _STATE.registry
+
+
+def metrics_registry() -> MetricsRegistry | None:
+    """Return the active registry, or None when metrics are disabled (the default)."""
+    return _STATE.registry
+
+
+def metrics_text() -> str:
+    """Return the exposition for the active registry (empty when disabled)."""
+    registry = _STATE.registry
+    return registry.exposition() if registry is not None else ""
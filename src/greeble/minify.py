@@ -0,0 +1,337 @@
+"""
+Whitespace- and comment-aware HTML/SVG minification.
+
+Purpose:
+    Shrink component templates, inline fragments, and SVG icons before they ship to
+    clients without changing how they render or how template engines parse them.
+
+Behavior:
+    - `<!-- ... -->` comments are dropped (conditional comments and `<!--! ... -->`
+      markers are kept).
+    - Whitespace runs in text collapse to a single space; whitespace-only runs next to
+      block-level tags are removed entirely.
+    - Whitespace between attributes collapses to one space. Attribute values are never
+      rewritten in HTML mode (Hyperscript `_="..."` values are newline-sensitive).
+    - `<pre>`, `<textarea>`, `<script>`, and `<style>` bodies are preserved verbatim.
+    - Jinja/Django tags (`{{ }}`, `{% %}`, `{# #}`) are treated as opaque tokens, so
+      templates stay valid after minification.
+
+    `minify_svg()` additionally removes all inter-element whitespace (except inside
+    `<text>`) and collapses whitespace inside attribute values such as `d` or `points`.
+
+    `ResponseMinifier` wraps `minify_html()` with a bounded LRU cache for use as a
+    response filter; adapters apply it once `configure_response_minify()` is enabled.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+__all__ = [
+    "MINIFY_SUFFIXES",
+    "MinifyResult",
+    "ResponseMinifier",
+    "can_minify",
+    "configure_response_minify",
+    "minify_file_text",
+    "minify_html",
+    "minify_svg",
+    "response_minifier",
+]
+
+_TEMPLATE_TAG = r"\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}"
+_TAG_BODY = rf"""(?:"[^"]*"|'[^']*'|{_TEMPLATE_TAG}|[^>"'{{]|\{{)*"""
+_RAW_ELEMENTS = ("pre", "textarea", "script", "style")
+
+_TOKEN_RE = re.compile(
+    "|".join(
+        [
+            r"(?P<comment><!--.*?-->)",
+            rf"(?P<raw><(?P<raw_name>{'|'.join(_RAW_ELEMENTS)})\b{_TAG_BODY}>.*?</(?P=raw_name)\s*>)",
+            rf"(?P<template>{_TEMPLATE_TAG})",
+            rf"(?P<tag></?[A-Za-z!?]{_TAG_BODY}>)",
+            r"(?P<text>[^<{]+|[<{])",
+        ]
+    ),
+    re.DOTALL | re.IGNORECASE,
+)
+_TAG_PART_RE = re.compile(rf"""("[^"]*"|'[^']*'|{_TEMPLATE_TAG})""", re.DOTALL)
+_TAG_NAME_RE = re.compile(r"</?([A-Za-z][\w:-]*)")
+_WS_RE = re.compile(r"\s+")
+_PATH_ATTR_RE = re.compile(r"\sd=$")
+_PATH_COMMAND_RE = re.compile(r"\s*([MmLlHhVvCcSsQqTtAaZz])\s*")
+
+_BLOCK_TAGS = frozenset(
+    {
+        "!doctype",
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "body",
+        "br",
+        "caption",
+        "circle",
+        "col",
+        "colgroup",
+        "dd",
+        "defs",
+        "details",
+        "dialog",
+        "div",
+        "dl",
+        "dt",
+        "ellipse",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "g",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "head",
+        "header",
+        "hr",
+        "html",
+        "li",
+        "line",
+        "lineargradient",
+        "link",
+        "main",
+        "meta",
+        "nav",
+        "ol",
+        "optgroup",
+        "option",
+        "p",
+        "path",
+        "polygon",
+        "polyline",
+        "pre",
+        "radialgradient",
+        "rect",
+        "script",
+        "section",
+        "select",
+        "stop",
+        "style",
+        "summary",
+        "svg",
+        "table",
+        "tbody",
+        "td",
+        "template",
+        "tfoot",
+        "th",
+        "thead",
+        "title",
+        "tr",
+        "ul",
+    }
+)
+
+
+def _keep_comment(comment: str) -> bool:
+    return comment.startswith(("<!--[if", "<!--!", "<!--<![endif]"))
+
+
+def _tag_name(tag: str) -> str:
+    if tag.startswith(("<!", "<?")):
+        return tag[1:].split(None, 1)[0].lower()
+    match = _TAG_NAME_RE.match(tag)
+    return match.group(1).lower() if match else ""
+
+
+def _compact_path(value: str) -> str:
+    return _WS_RE.sub(" ", _PATH_COMMAND_RE.sub(r"\1", value)).strip()
+
+
+def _compact_tag(tag: str, *, svg: bool) -> str:
+    parts = _TAG_PART_RE.split(tag)
+    out: list[str] = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            if svg and part[:1] in "\"'":
+                quote, body = part[0], part[1:-1]
+                before = parts[index - 1]
+                if _PATH_ATTR_RE.search(before):
+                    body = _compact_path(body)
+                else:
+                    body = _WS_RE.sub(" ", body).strip()
+                out.append(quote + body + quote)
+            else:
+                out.append(part)
+        else:
+            out.append(_WS_RE.sub(" ", part))
+    compact = "".join(out)
+    compact = re.sub(r"\s+>$", ">", compact)
+    # Only drop the space before "/>" when it cannot merge into an unquoted value
+    return re.sub(r"""(["']|[\s<][\w:.-]+)\s+/>$""", r"\1/>", compact)
+
+
+def _is_boundary(tokens: list[tuple[str, str, bool]], index: int, step: int) -> bool:
+    """Return True when the nearest rendered neighbour in `step` direction is block-level.
+
+    Template statements (`{% %}`, `{# #}`) produce no output of their own, so they are
+    looked through along with whitespace-only text; the start and end of the document
+    count as block boundaries.
+    """
+    index += step
+    while 0 <= index < len(tokens):
+        kind, value, block = tokens[index]
+        if kind == "markup" or (kind == "text" and not value.isspace()):
+            return block
+        index += step
+    return True
+
+
+def _minify(markup: str, *, svg: bool, keep_comments: bool) -> str:
+    # (kind, value, is_block) where kind is "text", "statement", or "markup"
+    tokens: list[tuple[str, str, bool]] = []
+    text_depth = 0
+    for match in _TOKEN_RE.finditer(markup):
+        kind = match.lastgroup
+        value = match.group(0)
+        if kind == "comment":
+            if keep_comments or _keep_comment(value):
+                tokens.append(("markup", value, False))
+            continue
+        if kind == "raw":
+            tokens.append(("markup", value, True))
+        elif kind == "template":
+            statement = not value.startswith("{{")
+            tokens.append(("statement" if statement else "markup", value, False))
+        elif kind == "tag":
+            name = _tag_name(value)
+            if svg and name == "?xml":
+                continue
+            if svg and name in {"text", "tspan"}:
+                text_depth += -1 if value.startswith("</") else int(not value.endswith("/>"))
+            block = name in _BLOCK_TAGS or (svg and text_depth == 0)
+            tokens.append(("markup", _compact_tag(value, svg=svg), block))
+        elif tokens and tokens[-1][0] == "text":
+            tokens[-1] = ("text", tokens[-1][1] + value, False)
+        else:
+            tokens.append(("text", value, False))
+
+    out: list[str] = []
+    for index, (kind, value, _) in enumerate(tokens):
+        if kind != "text":
+            out.append(value)
+            continue
+        collapsed = _WS_RE.sub(" ", value)
+        if collapsed == " " and (_is_boundary(tokens, index, -1) or _is_boundary(tokens, index, 1)):
+            continue
+        out.append(collapsed)
+    return "".join(out).strip()
+
+
+def minify_html(html: str, *, keep_comments: bool = False) -> str:
+    """Return `html` with comments and insignificant whitespace removed."""
+    return _minify(html, svg=False, keep_comments=keep_comments)
+
+
+def minify_svg(svg: str, *, keep_comments: bool = False) -> str:
+    """Return `svg` with comments, inter-element whitespace, and padded values removed."""
+    return _minify(svg, svg=True, keep_comments=keep_comments)
+
+
+@dataclass(frozen=True)
+class MinifyResult:
+    """Outcome of minifying a single file."""
+
+    original_bytes: int
+    minified_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.minified_bytes
+
+
+# File suffixes `minify_file_text()` handles; everything else is copied byte for byte.
+MINIFY_SUFFIXES = frozenset({".html", ".svg"})
+
+
+def can_minify(name: str) -> bool:
+    """Whether `minify_file_text()` handles files named `name` (checked before reading)."""
+    return any(name.lower().endswith(suffix) for suffix in MINIFY_SUFFIXES)
+
+
+def minify_file_text(name: str, text: str) -> str | None:
+    """Minify `text` according to the file suffix of `name`.
+
+    Returns None for file types the minifier does not handle.
+    """
+    lowered = name.lower()
+    if lowered.endswith(".svg"):
+        return minify_svg(text)
+    if lowered.endswith(".html"):
+        return minify_html(text)
+    return None
+
+
+class ResponseMinifier:
+    """`minify_html()` with a bounded LRU cache keyed by the input markup.
+
+    Constant fragments (menus, empty states, static partials) hit the cache, so only
+    new markup pays the minification cost. Cache access is locked, so one instance can
+    be shared by threaded servers; minification itself runs outside the lock.
+    """
+
+    def __init__(self, max_entries: int = 256, *, max_length: int = 256 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_length = max_length
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, html: str) -> str:
+        with self._lock:
+            cached = self._cache.get(html)
+            if cached is not None:
+                self.hits += 1
+                self._cache.move_to_end(html)
+                return cached
+            self.misses += 1
+        result = minify_html(html)
+        if len(html) <= self.max_length and self.max_entries > 0:
+            with self._lock:
+                self._cache[html] = result
+                if len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class _MinifyRegistry:
+    minifier: ResponseMinifier | None = None
+
+
+_REGISTRY = _MinifyRegistry()
+
+
+def configure_response_minify(enabled: bool = True, *, max_entries: int = 256) -> None:
+    """Enable or disable response minification in the framework adapters."""
+    _REGISTRY.minifier = ResponseMinifier(max_entries) if enabled else None
+
+
+def response_minifier() -> ResponseMinifier | None:
+    """Return the active response minifier, or None when disabled (the default)."""
+    return _REGISTRY.minifier
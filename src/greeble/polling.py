@@ -0,0 +1,253 @@
+"""
+Adaptive polling back-off driven by server load.
+
+Purpose:
+    Polling elements (`hx-trigger="every 2s"` dashboards, SSE fallbacks) hit the server
+    at a fixed rate no matter how busy it is. A `PollController` tracks two load
+    signals, in-flight requests and event-loop lag, and advises each poll response:
+
+    - under normal load, keep the base interval;
+    - under pressure, re-render the polling element with a longer `every` interval
+      (the element must be swapped with `outerHTML` so its new trigger takes effect);
+    - above `stop_at` (if set), answer `286`, which makes htmx stop polling that element.
+
+    Intervals shrink back to the base automatically once load drops. A `286` stop is
+    final for that element (htmx does not resume it), so set `stop_at` conservatively.
+
+    Long-lived responses would otherwise count as in flight for their whole lifetime:
+    `PollLoadMiddleware` stops counting a request once it starts a `text/event-stream`
+    response, and both middlewares take an `exclude(path)` predicate for other
+    long-lived routes (long polls, downloads).
+
+Usage:
+    polls = PollController(base_interval=2, max_interval=30, max_in_flight=64)
+    app.add_middleware(PollLoadMiddleware, controller=polls)   # counts in-flight requests
+    # exclude=lambda path: path.startswith("/longpoll/") skips other long-lived routes
+
+    polls.start_lag_monitor()   # from a startup/lifespan hook, inside the running loop
+
+    @app.get("/dashboard/stats")
+    async def stats(request: Request) -> HTMLResponse:
+        advice = polls.advise()
+        html = templates.get_template("stats.partial.html").render(poll=advice, ...)
+        return HTMLResponse(html, status_code=advice.status)
+
+    <div hx-get="/dashboard/stats" hx-trigger="{{ poll.trigger }}" hx-swap="outerHTML">
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+__all__ = [
+    "STOP_POLLING_STATUS",
+    "PollAdvice",
+    "PollController",
+    "PollLoadMiddleware",
+    "PollLoadWSGIMiddleware",
+]
+
+# htmx stops polling an element when a poll response carries this status.
+STOP_POLLING_STATUS = 286
+
+
+@dataclass(frozen=True)
+class PollAdvice:
+    """What to tell one polling client: how long to wait, or to stop."""
+
+    interval: float
+    load: float
+    stop: bool = False
+
+    @property
+    def status(self) -> int:
+        return STOP_POLLING_STATUS if self.stop else 200
+
+    @property
+    def trigger(self) -> str:
+        """Value for the polling element's `hx-trigger`, e.g. `every 4s`."""
+        seconds = f"{self.interval:g}"
+        return f"every {seconds}s"
+
+    def sse_retry(self) -> str:
+        """SSE `retry:` field asking an `EventSource` to reconnect after `interval`."""
+        return f"retry: {round(self.interval * 1000)}\n\n"
+
+
+class PollController:
+    """Turn in-flight request count and event-loop lag into polling intervals.
+
+    - base_interval: seconds between polls when the server is idle.
+    - max_interval: the longest interval handed out, reached at full load.
+    - max_in_flight / max_lag: the values of each signal that count as full load (1.0).
+    - slow_at: load at which intervals start growing (linear up to full load).
+    - stop_at: load at which polls are answered with 286; `None` never stops polling.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_interval: float = 2.0,
+        max_interval: float = 30.0,
+        max_in_flight: int = 100,
+        max_lag: float = 0.25,
+        slow_at: float = 0.5,
+        stop_at: float | None = None,
+        smoothing: float = 0.3,
+    ) -> None:
+        if not 0 < base_interval <= max_interval:
+            msg = "expected 0 < base_interval <= max_interval"
+            raise ValueError(msg)
+        if max_in_flight < 1 or max_lag <= 0:
+            msg = "max_in_flight must be >= 1 and max_lag > 0"
+            raise ValueError(msg)
+        if not 0 <= slow_at < 1:
+            msg = f"slow_at must be in [0, 1), got {slow_at}"
+            raise ValueError(msg)
+        if not 0 < smoothing <= 1:
+            msg = f"smoothing must be in (0, 1], got {smoothing}"
+            raise ValueError(msg)
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.max_in_flight = max_in_flight
+        self.max_lag = max_lag
+        self.slow_at = slow_at
+        self.stop_at = stop_at
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._lag = 0.0
+        self._monitor: asyncio.Task[None] | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def lag(self) -> float:
+        """Smoothed event-loop lag in seconds (0 until a monitor reports)."""
+        return self._lag
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count the enclosed block as one in-flight request."""
+        self._enter()
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def _leave(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def record_lag(self, seconds: float) -> None:
+        """Feed one lag sample; samples are smoothed with an exponential moving average."""
+        sample = max(0.0, seconds)
+        self._lag += self.smoothing * (sample - self._lag)
+
+    async def monitor_lag(self, period: float = 0.5) -> None:
+        """Sample how late `asyncio.sleep(period)` wakes up, forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(period)
+            self.record_lag(loop.time() - started - period)
+
+    def start_lag_monitor(self, period: float = 0.5) -> asyncio.Task[None]:
+        """Run `monitor_lag()` as a task of the running loop (idempotent)."""
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self.monitor_lag(period))
+        return self._monitor
+
+    def load(self) -> float:
+        """Current load: the larger of in-flight and lag utilisation (1.0 = full)."""
+        return max(self._in_flight / self.max_in_flight, self._lag / self.max_lag)
+
+    def advise(self) -> PollAdvice:
+        load = self.load()
+        if self.stop_at is not None and load >= self.stop_at:
+            return PollAdvice(interval=self.max_interval, load=load, stop=True)
+        pressure = min(1.0, max(0.0, (load - self.slow_at) / (1 - self.slow_at)))
+        if pressure == 0:
+            return PollAdvice(interval=self.base_interval, load=load)
+        interval = self.base_interval + (self.max_interval - self.base_interval) * pressure
+        # Whole seconds keep re-rendered triggers stable while load hovers.
+        return PollAdvice(interval=min(self.max_interval, float(math.ceil(interval))), load=load)
+
+
+PathFilter = Callable[[str], bool]
+
+
+def _is_event_stream(message: dict[str, Any]) -> bool:
+    for key, value in message.get("headers", []):
+        if key.lower() == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"text/event-stream"
+    return False
+
+
+class PollLoadMiddleware:
+    """ASGI middleware counting HTTP requests as in flight for a `PollController`.
+
+    A request stops counting once it starts a `text/event-stream` response; paths for
+    which `exclude(path)` is true are never counted.
+    """
+
+    def __init__(
+        self, app: Any, controller: PollController, exclude: PathFilter | None = None
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.exclude = exclude
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or (self.exclude is not None and self.exclude(scope["path"])):
+            await self.app(scope, receive, send)
+            return
+        counted = True
+
+        async def send_tracked(message: dict[str, Any]) -> None:
+            nonlocal counted
+            if counted and message["type"] == "http.response.start" and _is_event_stream(message):
+                counted = False
+                self.controller._leave()
+            await send(message)
+
+        self.controller._enter()
+        try:
+            await self.app(scope, receive, send_tracked)
+        finally:
+            if counted:
+                self.controller._leave()
+
+
+class PollLoadWSGIMiddleware:
+    """WSGI counterpart of `PollLoadMiddleware` (wrap `app.wsgi_app` in Flask).
+
+    The request counts as in flight until the app returns its response iterable, so
+    streamed bodies are not counted; paths for which `exclude(path)` is true never are.
+    """
+
+    def __init__(
+        self, app: Any, controller: PollController, exclude: PathFilter | None = None
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.exclude = exclude
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> Any:
+        path = environ.get("PATH_INFO") or "/"
+        if self.exclude is not None and self.exclude(path):
+            return self.app(environ, start_response)
+        with self.controller.track():
+            return self.app(environ, start_response)
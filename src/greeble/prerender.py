@@ -0,0 +1,371 @@
+"""
+Prerender full-page routes into static HTML snapshots and serve them at runtime.
+
+Purpose:
+    Landing pages and playgrounds often rebuild large, deterministic documents on every
+    request. `export_static()` requests those routes once, in-process, against an ASGI
+    (FastAPI/Starlette) or WSGI (Flask/Django) app and writes the HTML plus a gzip
+    variant to an output directory. `SnapshotMiddleware` (ASGI) and
+    `SnapshotWSGIMiddleware` (WSGI) then answer plain GET/HEAD requests for those routes
+    from the snapshots; every other request — including HTMX requests to the same
+    paths — reaches the app unchanged, so partial endpoints stay dynamic. Snapshots are
+    keyed by path plus query string: `/?page=2` is only served from a snapshot if that
+    exact route was prerendered, otherwise it reaches the app.
+
+Layout:
+    <output>/index.html, index.html.gz       for "/"
+    <output>/docs/index.html, ...html.gz     for "/docs"
+    <output>/index.<hash>.html, ...          for "/?page=2" (hash of the query string)
+    <output>/prerender.json                  route -> file manifest
+
+Notes:
+    Apps are driven without running lifespan/startup handlers; routes that need them
+    should not be prerendered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+from .fragments import DEFAULT_CACHE_CONTROL, StaticFragment, StaticFragmentRegistry
+
+__all__ = [
+    "ROUTES_ATTRIBUTE",
+    "SNAPSHOT_MANIFEST",
+    "PrerenderError",
+    "Snapshot",
+    "SnapshotMiddleware",
+    "SnapshotWSGIMiddleware",
+    "export_static",
+    "fetch_page",
+    "import_app",
+    "load_snapshots",
+    "snapshot_filename",
+]
+
+SNAPSHOT_MANIFEST = "prerender.json"
+# Module attribute apps may define to declare their prerenderable full-page routes
+ROUTES_ATTRIBUTE = "PRERENDER_ROUTES"
+
+_CRAWL_HEADERS = {"Accept-Encoding": "identity", "User-Agent": "greeble-prerender"}
+
+
+class PrerenderError(RuntimeError):
+    """Raised when a route cannot be prerendered."""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A prerendered route as recorded in `prerender.json`."""
+
+    route: str
+    file: str
+    size: int
+    gzip_size: int | None
+
+
+def import_app(spec: str) -> tuple[Any, list[str] | None]:
+    """Import `module:attribute` and return the app plus its declared prerender routes.
+
+    Declared routes come from a module-level `PRERENDER_ROUTES` sequence, if present.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name:
+        raise PrerenderError(f"Invalid app spec {spec!r}; expected 'module:attribute'")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as exc:
+        raise PrerenderError(f"Could not import {module_name!r}: {exc}") from exc
+    app = getattr(module, attribute or "app", None)
+    if app is None:
+        raise PrerenderError(f"Module {module_name!r} has no attribute {attribute or 'app'!r}")
+    routes = getattr(module, ROUTES_ATTRIBUTE, None)
+    return app, (list(routes) if routes is not None else None)
+
+
+def _is_asgi(app: Any) -> bool:
+    if inspect.iscoroutinefunction(app):
+        return True
+    return callable(app) and inspect.iscoroutinefunction(type(app).__call__)
+
+
+async def _asgi_get(
+    app: Any, path: str, query: str, headers: Mapping[str, str]
+) -> tuple[int, dict[str, str], bytes]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "query_string": query.encode("latin-1"),
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            *((k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    status = 500
+    response_headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+    request_sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Never disconnect; the app's listeners are cancelled once the response ends.
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}  # pragma: no cover - unreachable
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for key, value in message.get("headers", []):
+                response_headers[key.decode("latin-1").lower()] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, response_headers, b"".join(chunks)
+
+
+def _wsgi_get(
+    app: Any, path: str, query: str, headers: Mapping[str, str]
+) -> tuple[int, dict[str, str], bytes]:
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for key, value in headers.items():
+        environ["HTTP_" + key.upper().replace("-", "_")] = value
+
+    captured: dict[str, Any] = {}
+    chunks: list[bytes] = []
+
+    def start_response(
+        status: str, response_headers: list[tuple[str, str]], exc_info: Any = None
+    ) -> Callable[[bytes], None]:
+        captured["status"] = int(status.split(None, 1)[0])
+        captured["headers"] = {k.lower(): v for k, v in response_headers}
+        return chunks.append
+
+    result = app(environ, start_response)
+    try:
+        chunks.extend(result)
+    finally:
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+    return captured.get("status", 500), captured.get("headers", {}), b"".join(chunks)
+
+
+def fetch_page(
+    app: Any, route: str, *, headers: Mapping[str, str] | None = None
+) -> tuple[int, dict[str, str], bytes]:
+    """Issue an in-process GET for `route` against an ASGI or WSGI app.
+
+    Returns `(status, lower-cased headers, body)`.
+    """
+    path, _, query = route.partition("?")
+    merged = {**_CRAWL_HEADERS, **(headers or {})}
+    if _is_asgi(app):
+        return asyncio.run(_asgi_get(app, path, query, merged))
+    return _wsgi_get(app, path, query, merged)
+
+
+def snapshot_filename(route: str) -> str:
+    """Map a route to its snapshot file: `/` -> `index.html`, `/docs` -> `docs/index.html`.
+
+    A query string adds a hash of it before the extension (`/?page=2` -> `index.<hash>.html`)
+    so routes that differ only in their query do not overwrite each other.
+    """
+    path, _, query = route.partition("?")
+    path = path.strip("/")
+    if not path:
+        filename = "index.html"
+    elif path.endswith(".html"):
+        filename = path
+    else:
+        filename = f"{path}/index.html"
+    if not query:
+        return filename
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:12]
+    return f"{filename[: -len('.html')]}.{digest}.html"
+
+
+def _snapshot_key(path: str, query: str) -> str:
+    return f"{path}?{query}" if query else path
+
+
+def export_static(
+    app: Any, routes: Iterable[str], output: Path, *, compress: bool = True
+) -> list[Snapshot]:
+    """Prerender `routes` into `output` and write the `prerender.json` manifest.
+
+    Raises PrerenderError when a route does not answer `200` with an HTML body.
+    """
+    snapshots: list[Snapshot] = []
+    for route in routes:
+        if not route.startswith("/"):
+            raise PrerenderError(f"Route must start with '/': {route!r}")
+        try:
+            status, headers, body = fetch_page(app, route)
+        except Exception as exc:
+            raise PrerenderError(f"{route} raised {type(exc).__name__}: {exc}") from exc
+        content_type = headers.get("content-type", "")
+        if status != 200:
+            raise PrerenderError(f"{route} returned HTTP {status}")
+        if "html" not in content_type:
+            raise PrerenderError(f"{route} returned {content_type or 'no content type'}")
+        if headers.get("content-encoding", "identity") != "identity":
+            raise PrerenderError(f"{route} returned an encoded body")
+
+        filename = snapshot_filename(route)
+        target = output / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+        gzip_size = None
+        if compress:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            Path(f"{target}.gz").write_bytes(compressed)
+            gzip_size = len(compressed)
+        snapshots.append(Snapshot(route, filename, len(body), gzip_size))
+
+    manifest = {"routes": [asdict(snapshot) for snapshot in snapshots]}
+    output.mkdir(parents=True, exist_ok=True)
+    (output / SNAPSHOT_MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", "utf-8")
+    return snapshots
+
+
+def load_snapshots(
+    directory: Path, *, cache_control: str = DEFAULT_CACHE_CONTROL
+) -> StaticFragmentRegistry:
+    """Load an `export_static()` directory into a fragment registry keyed by route.
+
+    Keys are the path plus `?query` when the route has one.
+
+    Existing `.gz` files are reused rather than compressed again.
+    """
+    manifest_path = directory / SNAPSHOT_MANIFEST
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise PrerenderError(f"Invalid snapshot manifest {manifest_path}: {exc}") from exc
+
+    registry = StaticFragmentRegistry(cache_control=cache_control)
+    for entry in data.get("routes", []):
+        source = directory / entry["file"]
+        gz_path = Path(f"{source}.gz")
+        compressed = gz_path.read_bytes() if gz_path.is_file() else None
+        fragment = StaticFragment.build(
+            source.read_text(encoding="utf-8"),
+            cache_control=cache_control,
+            compressed=compressed,
+        )
+        path, _, query = entry["route"].partition("?")
+        registry.register(_snapshot_key(path, query), fragment)
+    return registry
+
+
+def _is_hx(value: str | None) -> bool:
+    return (value or "").lower() == "true"
+
+
+class SnapshotMiddleware:
+    """ASGI middleware serving prerendered snapshots for plain GET/HEAD requests.
+
+    Requests carrying `HX-Request: true`, other methods, and paths or query strings
+    without a snapshot pass through.
+    """
+
+    def __init__(self, app: Any, directory: Path | str) -> None:
+        self.app = app
+        self.snapshots = load_snapshots(Path(directory))
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        fragment = None
+        if scope["type"] == "http" and scope["method"] in {"GET", "HEAD"}:
+            query = scope.get("query_string", b"").decode("latin-1")
+            fragment = self.snapshots.get(_snapshot_key(scope["path"], query))
+        if fragment is None:
+            await self.app(scope, receive, send)
+            return
+
+        hx = if_none_match = accept_encoding = None
+        for key, value in scope["headers"]:
+            if key == b"hx-request":
+                hx = value.decode("latin-1")
+            elif key == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+            elif key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        if _is_hx(hx):
+            await self.app(scope, receive, send)
+            return
+
+        variant = fragment.select(if_none_match, accept_encoding)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": variant.status,
+                "headers": variant.raw_headers,
+            }
+        )
+        body = b"" if scope["method"] == "HEAD" else variant.body
+        await send({"type": "http.response.body", "body": body})
+
+
+class SnapshotWSGIMiddleware:
+    """WSGI counterpart of `SnapshotMiddleware` (wrap `app.wsgi_app` in Flask)."""
+
+    _REASONS: ClassVar[dict[int, str]] = {200: "200 OK", 304: "304 Not Modified"}
+
+    def __init__(self, app: Any, directory: Path | str) -> None:
+        self.app = app
+        self.snapshots = load_snapshots(Path(directory))
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> Any:
+        fragment = None
+        if environ.get("REQUEST_METHOD") in {"GET", "HEAD"}:
+            key = _snapshot_key(environ.get("PATH_INFO") or "/", environ.get("QUERY_STRING", ""))
+            fragment = self.snapshots.get(key)
+        if fragment is None or _is_hx(environ.get("HTTP_HX_REQUEST")):
+            return self.app(environ, start_response)
+
+        variant = fragment.select(
+            environ.get("HTTP_IF_NONE_MATCH"), environ.get("HTTP_ACCEPT_ENCODING")
+        )
+        start_response(self._REASONS[variant.status], list(variant.headers.items()))
+        return [b"" if environ["REQUEST_METHOD"] == "HEAD" else variant.body]
@@ -0,0 +1,266 @@
+"""
+Slow-render profiling with on-disk `cProfile` captures.
+
+Purpose:
+    Find out why a particular template or partial is slow in production. Adapters
+    run one in every `sample_every` renders under `cProfile`. When such a render takes
+    at least `threshold_ms`, its stats are written to a capture directory
+    (`.greeble/profiles` by default). `greeble profile report` (or
+    `summarize_captures()`) then lists the slowest templates and hottest functions
+    across the captures.
+
+Behavior:
+    - Disabled by default; `configure_profiling()` enables it.
+    - Each capture is a `<time_ns>-<template>.pstats` file (loadable with `pstats`)
+      plus a `.json` sidecar with the template name, elapsed time, and the request's
+      HX-* headers.
+    - Only the newest `max_captures` captures are kept; older ones are deleted after
+      each write.
+    - One render is profiled at a time. A sampled render that overlaps a running capture
+      is skipped, because Python allows only one active profiler. If the profiler
+      cannot start at all (another profiler or `sys.monitoring` tool is active), a
+      warning is logged once and renders run unprofiled.
+    - The threshold is compared against the profiled time, which includes the
+      profiler's own overhead.
+    - Capture writes run after the render. An `OSError` while writing or rotating
+      (full disk, read-only directory) is logged to the `greeble.profiling` logger and
+      the capture is dropped, so the response and any render exception are unaffected.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import itertools
+import json
+import logging
+import pstats
+import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+__all__ = [
+    "DEFAULT_CAPTURE_DIR",
+    "FunctionStats",
+    "ProfileCapture",
+    "ProfileReport",
+    "TemplateStats",
+    "configure_profiling",
+    "start_profile",
+    "summarize_captures",
+]
+
+CAPTURE_SUFFIX = ".pstats"
+DEFAULT_CAPTURE_DIR = Path(".greeble/profiles")
+SORT_KEYS = ("tottime", "cumtime", "calls")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _ProfilingSettings:
+    directory: Path
+    threshold_ns: int
+    sample_every: int
+    max_captures: int
+
+
+class _ProfilingRegistry:
+    settings: _ProfilingSettings | None = None
+    counter = itertools.count()
+    # Held while a capture runs; Python supports a single active profiler.
+    active = threading.Lock()
+    # Set once a profiler failed to start, so the warning is logged only once.
+    start_failed = False
+
+
+_REGISTRY = _ProfilingRegistry()
+
+
+def configure_profiling(
+    enabled: bool = True,
+    *,
+    directory: str | Path = DEFAULT_CAPTURE_DIR,
+    threshold_ms: float = 100.0,
+    sample_every: int = 10,
+    max_captures: int = 200,
+) -> None:
+    """Enable or disable slow-render captures in the framework adapters.
+
+    One in `sample_every` renders is profiled; it is saved to `directory` when it takes
+    at least `threshold_ms`.
+    """
+    if not enabled:
+        _REGISTRY.settings = None
+        return
+    if sample_every < 1:
+        msg = f"sample_every must be at least 1, got {sample_every}"
+        raise ValueError(msg)
+    if max_captures < 1:
+        msg = f"max_captures must be at least 1, got {max_captures}"
+        raise ValueError(msg)
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    _REGISTRY.counter = itertools.count()
+    _REGISTRY.start_failed = False
+    _REGISTRY.settings = _ProfilingSettings(
+        directory=path,
+        threshold_ns=round(threshold_ms * 1e6),
+        sample_every=sample_every,
+        max_captures=max_captures,
+    )
+
+
+class ProfileCapture:
+    """A render running under `cProfile`; call `finish()` once it is done."""
+
+    __slots__ = ("_profiler", "_settings", "_start")
+
+    def __init__(self, settings: _ProfilingSettings) -> None:
+        self._settings = settings
+        self._profiler = cProfile.Profile()
+        self._start = time.perf_counter_ns()
+        self._profiler.enable()
+
+    def finish(self, template: str, tags: Mapping[str, str]) -> Path | None:
+        """Stop profiling; write and return the capture if the render was slow enough.
+
+        Returns None when the render was fast or the capture could not be written.
+        """
+        self._profiler.disable()
+        elapsed = time.perf_counter_ns() - self._start
+        _REGISTRY.active.release()
+        if elapsed < self._settings.threshold_ns:
+            return None
+        try:
+            return _write_capture(self._settings, self._profiler, template, tags, elapsed)
+        except OSError:
+            logger.warning("Could not write profile capture for %s", template, exc_info=True)
+            return None
+
+
+def start_profile() -> ProfileCapture | None:
+    """Return a running `ProfileCapture` when this render is sampled, else None."""
+    settings = _REGISTRY.settings
+    if settings is None or next(_REGISTRY.counter) % settings.sample_every:
+        return None
+    if not _REGISTRY.active.acquire(blocking=False):
+        return None
+    try:
+        return ProfileCapture(settings)
+    except (ValueError, RuntimeError) as exc:
+        # Another profiler or sys.monitoring tool is active (e.g. a debugger or coverage
+        # on 3.12+); the sampled render just runs unprofiled.
+        _REGISTRY.active.release()
+        if not _REGISTRY.start_failed:
+            _REGISTRY.start_failed = True
+            logger.warning("Could not start the render profiler: %s", exc)
+        return None
+    except BaseException:
+        _REGISTRY.active.release()
+        raise
+
+
+def _write_capture(
+    settings: _ProfilingSettings,
+    profiler: cProfile.Profile,
+    template: str,
+    tags: Mapping[str, str],
+    elapsed_ns: int,
+) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", template).strip("_") or "template"
+    path = settings.directory / f"{time.time_ns()}-{slug}{CAPTURE_SUFFIX}"
+    profiler.dump_stats(path)
+    meta = {"template": template, "elapsed_ms": elapsed_ns / 1e6, "headers": dict(tags)}
+    path.with_suffix(".json").write_text(json.dumps(meta, sort_keys=True), encoding="utf-8")
+    _rotate(settings.directory, settings.max_captures)
+    return path
+
+
+def _captures(directory: Path) -> list[Path]:
+    # The time_ns prefix makes name order chronological.
+    return sorted(directory.glob(f"*{CAPTURE_SUFFIX}"))
+
+
+def _rotate(directory: Path, keep: int) -> None:
+    for path in _captures(directory)[:-keep]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class TemplateStats:
+    template: str
+    captures: int
+    mean_ms: float
+    max_ms: float
+    hx_targets: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class FunctionStats:
+    location: str  # file:line(function)
+    calls: int
+    tottime: float  # seconds, summed over captures
+    cumtime: float
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    captures: int
+    templates: list[TemplateStats]
+    functions: list[FunctionStats]
+
+
+def summarize_captures(
+    directory: str | Path, *, limit: int = 15, sort: str = "tottime"
+) -> ProfileReport:
+    """Aggregate the captures in `directory` into per-template and per-function totals."""
+    if sort not in SORT_KEYS:
+        msg = f"sort must be one of {', '.join(SORT_KEYS)}, got {sort!r}"
+        raise ValueError(msg)
+    paths = _captures(Path(directory))
+    if not paths:
+        return ProfileReport(captures=0, templates=[], functions=[])
+
+    by_template: dict[str, list[float]] = {}
+    targets: dict[str, set[str]] = {}
+    for path in paths:
+        sidecar = path.with_suffix(".json")
+        try:
+            meta = json.loads(sidecar.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {"template": "(unknown)", "elapsed_ms": 0.0, "headers": {}}
+        template = str(meta.get("template", "(unknown)"))
+        by_template.setdefault(template, []).append(float(meta.get("elapsed_ms", 0.0)))
+        if target := meta.get("headers", {}).get("HX-Target"):
+            targets.setdefault(template, set()).add(str(target))
+    templates = sorted(
+        (
+            TemplateStats(
+                template=name,
+                captures=len(times),
+                mean_ms=sum(times) / len(times),
+                max_ms=max(times),
+                hx_targets=tuple(sorted(targets.get(name, ()))),
+            )
+            for name, times in by_template.items()
+        ),
+        key=lambda row: row.max_ms,
+        reverse=True,
+    )
+
+    stats = pstats.Stats(*(str(path) for path in paths))
+    functions = [
+        FunctionStats(
+            location=f"{filename}:{line}({name})",
+            calls=calls,
+            tottime=tottime,
+            cumtime=cumtime,
+        )
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items()  # type: ignore[attr-defined]
+    ]
+    functions.sort(key=lambda row: getattr(row, sort), reverse=True)
+    return ProfileReport(captures=len(paths), templates=templates, functions=functions[:limit])
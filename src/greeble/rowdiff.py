@@ -0,0 +1,177 @@
+"""
+Keyed row diffs: send only the table rows that changed, as out-of-band swaps.
+
+Purpose:
+    Sort, search and row actions re-render a whole `<tbody>` even when one row changed.
+    With row diffs the client submits the keys and version hashes of the rows it shows
+    (a hidden `_greeble_rows` input included with `hx-include`), and the server answers
+    with `hx-swap-oob` fragments for the rows that were updated, inserted or removed.
+    Versions are computed from row data, not from rendered markup, so only changed rows
+    are rendered and wire bytes scale with the change rather than the page size.
+
+Response shapes:
+    - No rows in common with the client state (or no state), or the surviving rows
+      changed order (e.g. a new sort): a full `<tbody>` body for the normal swap, plus
+      the state input out-of-band. With no rows at all the body is `empty` (such as a
+      "no results" row), and the state is reset so the next request renders in full.
+    - Otherwise `HX-Reswap: none` and out-of-band fragments, with the updated and removed
+      rows inside a leading plain `<tbody>`:
+        updated   <tr id="row-k" hx-swap-oob="true">…</tr>
+        removed   <tr id="row-k" hx-swap-oob="delete"></tr>
+        inserted  <tbody hx-swap-oob="afterend:#row-prev"><tr id="row-k">…</tr></tbody>
+                  (or `afterbegin:#<tbody id>` for the first row)
+      htmx 1.9 only searches a response's top-level fragment for `hx-swap-oob`, not
+      `<template>` content (unless `useTemplateFragments` is set). A body starting with
+      `<tbody>` is parsed inside a `<table>`, which keeps every row, the inserted
+      `<tbody>`s and the hidden state input in the searched fragment.
+
+Usage:
+    diff = diff_rows(
+        accounts,
+        key=account_slug,
+        version=lambda a: row_version(a.org, a.plan, a.status, a.seats_used),
+        render=lambda a: render_account_rows([a], row_ids=True),
+        client_state=request.query_params.get(ROW_STATE_FIELD),
+        tbody_id="table-body",
+        row_id=lambda key: f"account-row-{key}",
+    )
+    return HTMLResponse(diff.html, headers=diff.headers)
+
+    Rendered rows must start with `<tr` and carry `id="{row_id(key)}"`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from html import escape
+from typing import Any, TypeVar
+
+__all__ = [
+    "ROW_STATE_FIELD",
+    "RowDiff",
+    "decode_rows",
+    "diff_rows",
+    "encode_rows",
+    "row_state_input",
+    "row_version",
+]
+
+ROW_STATE_FIELD = "_greeble_rows"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RowDiff:
+    html: str
+    state: str
+    full: bool
+    inserted: tuple[str, ...] = ()
+    updated: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.full or self.inserted or self.updated or self.removed)
+
+
+def row_version(*values: Any) -> str:
+    """Short hash of the data a row renders from."""
+    return hashlib.blake2b(repr(values).encode(), digest_size=6).hexdigest()
+
+
+def encode_rows(rows: Iterable[tuple[str, str]]) -> str:
+    return ";".join(f"{key}:{version}" for key, version in rows)
+
+
+def decode_rows(raw: str | None) -> list[tuple[str, str]]:
+    """Parse `key:version;...` in display order; malformed entries are dropped."""
+    rows: list[tuple[str, str]] = []
+    for entry in (raw or "").split(";"):
+        key, sep, version = entry.rpartition(":")
+        if sep and key:
+            rows.append((key, version))
+    return rows
+
+
+def row_state_input(
+    state: str, *, input_id: str = "table-row-state", swap_oob: bool = False
+) -> str:
+    """Hidden input carrying the row state; include it in table requests with `hx-include`."""
+    oob = ' hx-swap-oob="true"' if swap_oob else ""
+    return (
+        f'<input type="hidden" id="{escape(input_id, quote=True)}" '
+        f'name="{ROW_STATE_FIELD}" value="{escape(state, quote=True)}"{oob} />'
+    )
+
+
+def _oob(row_html: str) -> str:
+    if not row_html.startswith("<tr"):
+        msg = "rendered rows must start with <tr"
+        raise ValueError(msg)
+    return f'<tr hx-swap-oob="true"{row_html[3:]}'
+
+
+def diff_rows(
+    rows: Sequence[T],
+    *,
+    key: Callable[[T], str],
+    version: Callable[[T], str],
+    render: Callable[[T], str],
+    client_state: str | None,
+    tbody_id: str,
+    row_id: Callable[[str], str] = lambda key: f"row-{key}",
+    state_input_id: str = "table-row-state",
+    empty: str = "",
+) -> RowDiff:
+    """Diff `rows` (in display order) against the rows the client reports showing.
+
+    `empty` is the body sent when `rows` is empty.
+    """
+    current = [(key(row), version(row)) for row in rows]
+    state = encode_rows(current)
+    state_oob = row_state_input(state, input_id=state_input_id, swap_oob=True)
+    previous = dict(decode_rows(client_state))
+    keys = {k for k, _ in current}
+
+    kept_now = [k for k, _ in current if k in previous]
+    kept_before = [k for k, _ in decode_rows(client_state) if k in keys]
+    if not kept_now or kept_now != kept_before:
+        body = "".join(render(row) for row in rows) if rows else empty
+        return RowDiff(html=body + state_oob, state=state, full=True)
+
+    rows_html: list[str] = []
+    inserts_html: list[str] = []
+    inserted: list[str] = []
+    updated: list[str] = []
+    removed = [k for k in previous if k not in keys]
+    for k in removed:
+        rows_html.append(f'<tr id="{escape(row_id(k), quote=True)}" hx-swap-oob="delete"></tr>')
+
+    before: str | None = None
+    for row, (k, ver) in zip(rows, current, strict=True):
+        if k not in previous:
+            anchor = f"afterend:#{row_id(before)}" if before else f"afterbegin:#{tbody_id}"
+            inserts_html.append(
+                f'<tbody hx-swap-oob="{escape(anchor, quote=True)}">{render(row)}</tbody>'
+            )
+            inserted.append(k)
+        elif previous[k] != ver:
+            rows_html.append(_oob(render(row)))
+            updated.append(k)
+        before = k
+
+    if not (rows_html or inserts_html):
+        return RowDiff(html="", state=state, full=False, headers={"HX-Reswap": "none"})
+    return RowDiff(
+        html=f"<tbody>{''.join(rows_html)}</tbody>{''.join(inserts_html)}{state_oob}",
+        state=state,
+        full=False,
+        inserted=tuple(inserted),
+        updated=tuple(updated),
+        removed=tuple(removed),
+        headers={"HX-Reswap": "none"},
+    )
@@ -0,0 +1,269 @@
+"""
+Coalesce concurrent identical calls into one computation.
+
+Purpose:
+    When many users request the same expensive partial at once (a dashboard backed
+    by a slow audit call, a popular palette query on a cold cache), each request would
+    otherwise do the same work. A single-flight group runs the first call for a key;
+    calls for that key arriving while it runs wait for it and get the same result
+    (or exception). An optional short `ttl` keeps finished results for a while, so the
+    herd that arrives just after the computation finishes is served too.
+
+Usage:
+    @singleflight(ttl=5.0)
+    async def load_audit(brand: str) -> dict[str, Any]: ...
+
+    @singleflight(key=lambda request, q: request_key(request))
+    async def render_results(request: Request, q: str) -> str: ...
+
+    @app.get("/palette/search")
+    async def palette_search(request: Request, q: str = "") -> HTMLResponse:
+        return HTMLResponse(await render_results(request, q))  # one response per request
+
+Behavior:
+    - Coroutine functions use `AsyncSingleFlight`. The shared computation runs as its own
+      task, so a waiter that is cancelled (for example, its client disconnected) does not
+      cancel it for the others.
+    - Plain functions use `SingleFlight`, which is thread-safe. Followers block until the
+      leader finishes.
+    - Keys default to the call's positional and keyword arguments, which must be hashable.
+      `request_key()` builds a key from the method, path, sorted query parameters,
+      whether the request came from htmx, and any extra values.
+    - Exceptions are shared with the waiting callers but never cached.
+    - Every caller receives the same object, so coalesce values such as a rendered body
+      string, not response objects (which carry per-request headers and are consumed when
+      sent).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar, overload
+from urllib.parse import parse_qsl
+
+from .adapters.utils import is_hx_request
+
+__all__ = [
+    "AsyncSingleFlight",
+    "SingleFlight",
+    "request_key",
+    "singleflight",
+]
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _ResultCache:
+    """Finished results kept for `ttl` seconds, bounded to `max_entries` (LRU)."""
+
+    __slots__ = ("_entries", "max_entries", "ttl")
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        if ttl < 0:
+            msg = f"ttl must be >= 0, got {ttl}"
+            raise ValueError(msg)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _Call:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-safe group that runs one call per key at a time and shares its outcome."""
+
+    def __init__(self, *, ttl: float = 0.0, max_entries: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._cache = _ResultCache(ttl, max_entries)
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Return `fn(*args, **kwargs)`, sharing one execution among concurrent `key` callers."""
+        with self._lock:
+            hit, value = self._cache.get(key)
+            if hit:
+                return value
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None:
+                    self._cache.put(key, call.result)
+            call.done.set()
+        return call.result
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a cached result so the next call for `key` recomputes."""
+        with self._lock:
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class AsyncSingleFlight:
+    """Event-loop group that runs one coroutine per key at a time and shares its outcome."""
+
+    def __init__(self, *, ttl: float = 0.0, max_entries: int = 1024) -> None:
+        self._tasks: dict[Hashable, asyncio.Future[Any]] = {}
+        self._cache = _ResultCache(ttl, max_entries)
+
+    async def do(
+        self, key: Hashable, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """Await `fn(*args, **kwargs)`, sharing one execution among concurrent `key` callers."""
+        hit, value = self._cache.get(key)
+        if hit:
+            return value
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Reading the exception also marks it retrieved when every waiter was cancelled.
+        if not task.cancelled() and task.exception() is None:
+            self._cache.put(key, task.result())
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a cached result so the next call for `key` recomputes."""
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+    return (args, tuple(sorted(kwargs.items())))
+
+
+def request_key(request: Any, *extra: Hashable) -> tuple[Hashable, ...]:
+    """Key a request by method, path, sorted query, htmx-ness, and `extra` (e.g. form fields).
+
+    Works with Starlette/FastAPI, Flask, and Django request objects.
+    """
+    url = getattr(request, "url", None)
+    if url is not None and hasattr(url, "path"):  # Starlette URL object
+        path, query = url.path, url.query
+    else:
+        path = getattr(request, "path", "")
+        query = getattr(request, "query_string", None)  # Flask (bytes)
+        if query is None:
+            query = getattr(request, "META", {}).get("QUERY_STRING", "")  # Django
+    if isinstance(query, bytes):
+        query = query.decode("latin-1")
+    params = tuple(sorted(parse_qsl(query, keep_blank_values=True)))
+    method = getattr(request, "method", "GET")
+    return (method, path, params, is_hx_request(request), *extra)
+
+
+@overload
+def singleflight(fn: F, /) -> F: ...
+
+
+@overload
+def singleflight(
+    *,
+    key: Callable[..., Hashable] | None = None,
+    ttl: float = 0.0,
+    max_entries: int = 1024,
+) -> Callable[[F], F]: ...
+
+
+def singleflight(
+    fn: F | None = None,
+    /,
+    *,
+    key: Callable[..., Hashable] | None = None,
+    ttl: float = 0.0,
+    max_entries: int = 1024,
+) -> F | Callable[[F], F]:
+    """Decorate a sync or async function so concurrent identical calls run once.
+
+    - key: builds the coalescing key from the call's arguments (default: the arguments
+      themselves, which must be hashable). See `request_key()` for request handlers.
+    - ttl: seconds a finished result keeps being served (0 disables caching).
+    - max_entries: bound on cached results.
+
+    The group is available as `wrapper.flight`, e.g. to `forget()` a key after a write.
+    """
+    make_key = key or _default_key
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            async_flight = AsyncSingleFlight(ttl=ttl, max_entries=max_entries)
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await async_flight.do(make_key(*args, **kwargs), func, *args, **kwargs)
+
+            async_wrapper.flight = async_flight  # type: ignore[attr-defined]
+            return async_wrapper  # type: ignore[return-value]
+        sync_flight = SingleFlight(ttl=ttl, max_entries=max_entries)
+
+        @functools.wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            return sync_flight.do(make_key(*args, **kwargs), func, *args, **kwargs)
+
+        sync_wrapper.flight = sync_flight  # type: ignore[attr-defined]
+        return sync_wrapper  # type: ignore[return-value]
+
+    return decorate(fn) if fn is not None else decorate
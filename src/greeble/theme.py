@@ -0,0 +1,484 @@
+"""
+Theme compiler: token presets -> CSS custom properties and the Tailwind preset.
+
+Purpose:
+    Keep Greeble's theme tokens (palettes, radius, shadow, font, spacing scale) in one
+    Python spec and derive everything else from it:
+    - `compile_theme_css()` renders a `:root { --greeble-...: ... }` override block.
+    - `ThemeCache` memoizes compiled themes by a content hash, pre-encoded and
+      pre-gzipped via `greeble.fragments.StaticFragment`, so multi-tenant apps can
+      serve `/theme/<hash>.css` with immutable caching instead of recompiling.
+    - `tailwind_theme_source()` generates `greeble_tailwind_preset/theme.cjs`, whose
+      `var(--token, fallback)` defaults come from the default spec plus the published
+      shadow, focus-ring and font fallbacks in `PUBLISHED_PRESET_FALLBACKS`.
+
+Notes:
+    Specs built from request data go through `ThemeSpec.from_mapping()`, which only
+    accepts known preset keys, `#rrggbb` accents, and a bounded spacing scale, so user
+    input never reaches the generated CSS verbatim.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+
+from .fragments import StaticFragment
+
+__all__ = [
+    "COLOR_PALETTES",
+    "FONT_PRESETS",
+    "IMMUTABLE_CACHE_CONTROL",
+    "PUBLISHED_PRESET_FALLBACKS",
+    "RADIUS_PRESETS",
+    "SHADOW_PRESETS",
+    "CompiledTheme",
+    "ThemeCache",
+    "ThemeError",
+    "ThemeSpec",
+    "compile_theme_css",
+    "tailwind_theme_source",
+    "theme_hash",
+    "theme_variables",
+]
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_CSS_CONTENT_TYPE = "text/css; charset=utf-8"
+_HEX_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+SPACING_SCALE_RANGE = (0.5, 2.0)
+# Multipliers of the spacing scale for --greeble-spacing-1..4 (rem)
+_SPACING_STEPS = (0.25, 0.5, 0.75, 1.0)
+
+# Color palettes - themed for Python developers
+COLOR_PALETTES: dict[str, dict[str, str]] = {
+    "midnight": {
+        "name": "Midnight",
+        "description": "Deep dark theme for late-night coding",
+        "background": "#0b0b0c",
+        "foreground": "#e8e8ea",
+        "muted": "#a0a0a7",
+        "accent": "#6aa1ff",
+    },
+    "terminal": {
+        "name": "Terminal",
+        "description": "Classic green-on-black terminal vibes",
+        "background": "#0a0f0a",
+        "foreground": "#00ff41",
+        "muted": "#4a7c4a",
+        "accent": "#00ff41",
+    },
+    "solar": {
+        "name": "Solar",
+        "description": "Warm amber tones inspired by Solarized",
+        "background": "#002b36",
+        "foreground": "#fdf6e3",
+        "muted": "#839496",
+        "accent": "#b58900",
+    },
+    "nord": {
+        "name": "Nord",
+        "description": "Arctic, bluish-gray color palette",
+        "background": "#2e3440",
+        "foreground": "#eceff4",
+        "muted": "#4c566a",
+        "accent": "#88c0d0",
+    },
+    "monokai": {
+        "name": "Monokai",
+        "description": "The beloved syntax theme",
+        "background": "#272822",
+        "foreground": "#f8f8f2",
+        "muted": "#75715e",
+        "accent": "#f92672",
+    },
+    "dracula": {
+        "name": "Dracula",
+        "description": "Dark theme with purple accents",
+        "background": "#282a36",
+        "foreground": "#f8f8f2",
+        "muted": "#6272a4",
+        "accent": "#bd93f9",
+    },
+    "github": {
+        "name": "GitHub Dark",
+        "description": "GitHub's dark mode palette",
+        "background": "#0d1117",
+        "foreground": "#c9d1d9",
+        "muted": "#8b949e",
+        "accent": "#58a6ff",
+    },
+    "paper": {
+        "name": "Paper",
+        "description": "Light theme for daylight coders",
+        "background": "#fafafa",
+        "foreground": "#1a1a1a",
+        "muted": "#6b7280",
+        "accent": "#2563eb",
+    },
+}
+
+# Radius presets
+RADIUS_PRESETS: dict[str, dict[str, str]] = {
+    "none": {"name": "None", "value": "0"},
+    "sm": {"name": "Small", "value": "4px"},
+    "md": {"name": "Medium", "value": "8px"},
+    "lg": {"name": "Large", "value": "12px"},
+    "xl": {"name": "Extra Large", "value": "16px"},
+}
+
+# Shadow presets
+SHADOW_PRESETS: dict[str, dict[str, str]] = {
+    "none": {"name": "None", "value1": "none", "value2": "none"},
+    "subtle": {
+        "name": "Subtle",
+        "value1": "0 1px 2px rgba(0,0,0,.1)",
+        "value2": "0 4px 12px rgba(0,0,0,.15)",
+    },
+    "medium": {
+        "name": "Medium",
+        "value1": "0 1px 2px rgba(0,0,0,.2)",
+        "value2": "0 8px 30px rgba(0,0,0,.35)",
+    },
+    "dramatic": {
+        "name": "Dramatic",
+        "value1": "0 2px 8px rgba(0,0,0,.3)",
+        "value2": "0 16px 48px rgba(0,0,0,.5)",
+    },
+}
+
+# Font presets
+FONT_PRESETS: dict[str, dict[str, str]] = {
+    "system": {
+        "name": "System",
+        "value": "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif",
+    },
+    "mono": {
+        "name": "Monospace",
+        "value": "'JetBrains Mono', 'Fira Code', 'SF Mono', Consolas, monospace",
+    },
+    "inter": {
+        "name": "Inter",
+        "value": "'Inter', -apple-system, BlinkMacSystemFont, sans-serif",
+    },
+    "geist": {
+        "name": "Geist",
+        "value": "'Geist', -apple-system, BlinkMacSystemFont, sans-serif",
+    },
+}
+
+
+class ThemeError(ValueError):
+    """Raised when a theme spec references unknown presets or invalid values."""
+
+
+@dataclass(frozen=True)
+class ThemeSpec:
+    """Selected presets plus overrides; defaults match the playground's initial theme."""
+
+    palette: str = "midnight"
+    accent: str | None = None
+    radius: str = "lg"
+    shadow: str = "medium"
+    font: str = "system"
+    spacing_scale: float = 1.0
+
+    def __post_init__(self) -> None:
+        for value, presets, label in (
+            (self.palette, COLOR_PALETTES, "palette"),
+            (self.radius, RADIUS_PRESETS, "radius"),
+            (self.shadow, SHADOW_PRESETS, "shadow"),
+            (self.font, FONT_PRESETS, "font"),
+        ):
+            if value not in presets:
+                choices = ", ".join(presets)
+                raise ThemeError(f"Unknown {label} preset {value!r} (choose from {choices})")
+        if self.accent is not None and not _HEX_COLOR_RE.match(self.accent):
+            raise ThemeError(f"Accent must be a #rrggbb color, got {self.accent!r}")
+        low, high = SPACING_SCALE_RANGE
+        if not low <= self.spacing_scale <= high:
+            raise ThemeError(f"Spacing scale must be between {low} and {high}")
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, str]) -> ThemeSpec:
+        """Build a spec from string values (query parameters, form fields, CLI flags).
+
+        Recognised keys: `palette`, `accent`, `radius`, `shadow`, `font`, `scale`.
+        """
+        spec = cls()
+        changes: dict[str, object] = {
+            key: data[key] for key in ("palette", "radius", "shadow", "font") if data.get(key)
+        }
+        if data.get("accent"):
+            changes["accent"] = data["accent"]
+        if data.get("scale"):
+            try:
+                changes["spacing_scale"] = float(data["scale"])
+            except ValueError as exc:
+                raise ThemeError(f"Invalid spacing scale {data['scale']!r}") from exc
+        return replace(spec, **changes) if changes else spec  # type: ignore[arg-type]
+
+    def to_mapping(self) -> dict[str, str]:
+        """The `from_mapping()` values that differ from the defaults (for query strings)."""
+        defaults = type(self)()
+        data = {
+            key: getattr(self, key)
+            for key in ("palette", "radius", "shadow", "font")
+            if getattr(self, key) != getattr(defaults, key)
+        }
+        if self.accent is not None:
+            data["accent"] = self.accent
+        if self.spacing_scale != defaults.spacing_scale:
+            data["scale"] = f"{self.spacing_scale:g}"
+        return data
+
+
+def _format_rem(value: float) -> str:
+    return f"{round(value, 3):g}rem"
+
+
+def theme_variables(spec: ThemeSpec) -> dict[str, str]:
+    """Return the ordered `--greeble-*` custom properties for `spec`."""
+    palette = COLOR_PALETTES[spec.palette]
+    accent = spec.accent or palette["accent"]
+    shadow = SHADOW_PRESETS[spec.shadow]
+    variables = {
+        "--greeble-color-background": palette["background"],
+        "--greeble-color-foreground": palette["foreground"],
+        "--greeble-color-muted": palette["muted"],
+        "--greeble-color-accent": accent,
+        "--greeble-radius-medium": RADIUS_PRESETS[spec.radius]["value"],
+        "--greeble-shadow-1": shadow["value1"],
+        "--greeble-shadow-2": shadow["value2"],
+    }
+    for index, step in enumerate(_SPACING_STEPS, start=1):
+        variables[f"--greeble-spacing-{index}"] = _format_rem(step * spec.spacing_scale)
+    variables["--greeble-font-family"] = FONT_PRESETS[spec.font]["value"]
+    variables["--greeble-focus-ring"] = f"0 0 0 3px {accent}80"
+    return variables
+
+
+def theme_hash(spec: ThemeSpec, *, length: int = 12) -> str:
+    """Return a content hash of the variables `spec` compiles to."""
+    payload = json.dumps(list(theme_variables(spec).items()), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:length]
+
+
+def compile_theme_css(spec: ThemeSpec, *, selector: str = ":root") -> str:
+    """Render `spec` as a CSS rule overriding Greeble's custom properties."""
+    lines = [f"  {name}: {value};" for name, value in theme_variables(spec).items()]
+    return f"{selector} {{\n" + "\n".join(lines) + "\n}\n"
+
+
+@dataclass(frozen=True)
+class CompiledTheme:
+    """A compiled theme: its hash, CSS text, and pre-encoded response variants."""
+
+    hash: str
+    css: str
+    fragment: StaticFragment
+
+    @property
+    def filename(self) -> str:
+        return f"theme.{self.hash}.css"
+
+
+class ThemeCache:
+    """Content-addressed LRU of compiled themes keyed by `theme_hash()`.
+
+    `compile()` returns the cached entry for any spec that resolves to the same
+    variables; `get()` looks themes up by hash for `/theme/<hash>.css` style routes.
+    The cache is per process, so hashed URLs should also carry their spec (see
+    `ThemeSpec.to_mapping()`) and pass it to `get()`, which recompiles on a miss.
+    """
+
+    def __init__(
+        self, max_entries: int = 4096, *, cache_control: str = IMMUTABLE_CACHE_CONTROL
+    ) -> None:
+        self.max_entries = max_entries
+        self.cache_control = cache_control
+        self._themes: OrderedDict[str, CompiledTheme] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, spec: ThemeSpec) -> CompiledTheme:
+        key = theme_hash(spec)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        css = compile_theme_css(spec)
+        fragment = StaticFragment.build(
+            css, content_type=_CSS_CONTENT_TYPE, cache_control=self.cache_control
+        )
+        compiled = CompiledTheme(hash=key, css=css, fragment=fragment)
+        with self._lock:
+            self.misses += 1
+            self._themes[key] = compiled
+            if len(self._themes) > self.max_entries:
+                self._themes.popitem(last=False)
+        return compiled
+
+    def get(self, key: str, *, spec: ThemeSpec | None = None) -> CompiledTheme | None:
+        """Cached theme for `key`; on a miss, compile `spec` if it hashes to `key`."""
+        compiled = self._lookup(key)
+        if compiled is None and spec is not None and theme_hash(spec) == key:
+            compiled = self.compile(spec)
+        return compiled
+
+    def _lookup(self, key: str) -> CompiledTheme | None:
+        with self._lock:
+            compiled = self._themes.get(key)
+            if compiled is not None:
+                self.hits += 1
+                self._themes.move_to_end(key)
+            return compiled
+
+    def __len__(self) -> int:
+        return len(self._themes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._themes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _js(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _font_stack(value: str) -> str:
+    return value.replace("'", '"')
+
+
+# Fallbacks the published Tailwind preset has always shipped. They are spelled (and,
+# for fonts, stacked) differently from the playground presets and are kept verbatim so
+# regenerating the preset from the default spec does not change its output.
+PUBLISHED_PRESET_FALLBACKS: dict[str, str] = {
+    "--greeble-shadow-1": "0 1px 2px rgba(0, 0, 0, 0.2)",
+    "--greeble-shadow-2": "0 8px 30px rgba(0, 0, 0, 0.35)",
+    "--greeble-focus-ring": "0 0 0 3px rgba(106, 161, 255, 0.5)",
+    "--greeble-font-sans": '"Inter", "Helvetica Neue", system-ui, -apple-system, sans-serif',
+    "--greeble-font-display": '"Satoshi", "Inter", system-ui, sans-serif',
+    "--greeble-font-mono": (
+        '"JetBrains Mono", "Fira Code", ui-monospace, SFMono-Regular, monospace'
+    ),
+}
+
+
+def tailwind_theme_source(spec: ThemeSpec | None = None) -> str:
+    """Generate the `theme.cjs` Tailwind preset module with fallbacks from `spec`.
+
+    Without a spec the output is the published preset: the default spec's values plus
+    `PUBLISHED_PRESET_FALLBACKS`. An explicit spec uses its own values throughout.
+    """
+    fallbacks = dict(PUBLISHED_PRESET_FALLBACKS) if spec is None else {}
+    spec = spec or ThemeSpec()
+    variables = theme_variables(spec)
+    family = _font_stack(variables["--greeble-font-family"])
+    fallbacks.setdefault("--greeble-font-sans", family)
+    fallbacks.setdefault("--greeble-font-display", family)
+    fallbacks.setdefault("--greeble-font-mono", _font_stack(FONT_PRESETS["mono"]["value"]))
+
+    def var(name: str) -> str:
+        fallback = fallbacks.get(name, variables.get(name))
+        return _js(f"var({name}, {fallback})")
+
+    return f"""const colors = {{
+  background: {var("--greeble-color-background")},
+  surface: {var("--greeble-color-background")},
+  foreground: {var("--greeble-color-foreground")},
+  muted: {var("--greeble-color-muted")},
+  accent: {var("--greeble-color-accent")},
+  'accent-foreground': {var("--greeble-color-background")},
+}};
+
+const borderRadiusBase = {var("--greeble-radius-medium")};
+const borderRadius = {{
+  none: '0px',
+  sm: `calc(${{borderRadiusBase}} / 2)`,
+  DEFAULT: borderRadiusBase,
+  md: `calc(${{borderRadiusBase}} * 1.25)`,
+  lg: `calc(${{borderRadiusBase}} * 1.5)`,
+  full: '9999px',
+}};
+
+const spacingBase = {{
+  1: {var("--greeble-spacing-1")},
+  2: {var("--greeble-spacing-2")},
+  3: {var("--greeble-spacing-3")},
+  4: {var("--greeble-spacing-4")},
+}};
+
+const spacing = {{
+  ...spacingBase,
+  xs: spacingBase[1],
+  sm: spacingBase[2],
+  md: spacingBase[3],
+  lg: spacingBase[4],
+}};
+
+const boxShadow = {{
+  DEFAULT: {var("--greeble-shadow-1")},
+  sm: {var("--greeble-shadow-1")},
+  md: {var("--greeble-shadow-2")},
+  lg: {var("--greeble-shadow-2")},
+  focus: {var("--greeble-focus-ring")},
+}};
+
+const fontFamily = {{
+  sans: {var("--greeble-font-sans")},
+  display: {var("--greeble-font-display")},
+  mono: {var("--greeble-font-mono")},
+}};
+
+const extend = {{
+  colors,
+  borderColor: {{
+    DEFAULT: colors.muted,
+  }},
+  borderRadius,
+  boxShadow,
+  fontFamily,
+  ringColor: {{
+    DEFAULT: colors.accent,
+  }},
+  ringOffsetColor: {{
+    DEFAULT: colors.background,
+  }},
+  outlineColor: {{
+    DEFAULT: colors.accent,
+  }},
+  spacing,
+}};
+
+function createPreset(options = {{}}) {{
+  const {{
+    content = [],
+    darkMode = 'class',
+    plugins = [],
+  }} = options;
+
+  return {{
+    content,
+    darkMode,
+    theme: {{
+      extend,
+    }},
+    plugins,
+  }};
+}}
+
+const preset = createPreset();
+
+module.exports = {{
+  extend,
+  createPreset,
+  preset,
+}};
+"""
@@ -0,0 +1,269 @@
+"""
+Per-client token-bucket throttling for keystroke-driven htmx endpoints.
+
+Purpose:
+    Validation groups fire `keyup delay:…` requests at `/auth/validate` and
+    `/form/validate`, and the command palette searches on every keystroke. Under heavy
+    traffic these dominate request volume while most of their responses are superseded
+    by the next keystroke anyway. `ThrottleMiddleware` (ASGI) and `ThrottleWSGIMiddleware`
+    (WSGI) give each client a token bucket per configured route. A request over budget is
+    shed with `204 No Content` and `HX-Reswap: none`: htmx keeps the current markup, so
+    users never see an error. The server cannot tell which keystroke is the last one,
+    so if the final request is shed, the markup stays stale (e.g. a validation message
+    for an earlier value) until the next trigger. Debounced triggers
+    (`keyup changed delay:300ms`) and a `burst` above the typical burst of keystrokes
+    make that rare; keep a validated submit as the source of truth.
+
+Usage:
+    throttle = Throttle(
+        [
+            ThrottleRule("/auth/validate", rate=2, burst=4),
+            ThrottleRule("/form/validate", rate=2, burst=4),
+            ThrottleRule("/palette/search", rate=5, burst=10),
+        ]
+    )
+    app.add_middleware(ThrottleMiddleware, throttle=throttle)       # FastAPI/Starlette
+    app.wsgi_app = ThrottleWSGIMiddleware(app.wsgi_app, throttle)   # Flask
+
+Behavior:
+    - Rules are matched in order against the request path (`fnmatch` patterns such as
+      `/palette/*`); the first match wins and unmatched paths pass through untouched.
+    - Only htmx requests (`HX-Request: true`) are throttled unless `htmx_only=False`, so
+      full page loads and form posts without JavaScript are never shed.
+    - Clients are keyed by the peer address, or by `client_key(remote_addr, headers)`
+      when the app sits behind a proxy or identifies users by session.
+    - At most `max_clients` buckets are kept (least recently used first out); an evicted
+      client starts again with a full bucket.
+    - `counters()` reports allowed and shed requests per rule; `exposition()` renders
+      them in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, ClassVar
+
+__all__ = [
+    "RESWAP_HEADER",
+    "RuleCounters",
+    "Throttle",
+    "ThrottleMiddleware",
+    "ThrottleRule",
+    "ThrottleWSGIMiddleware",
+]
+
+RESWAP_HEADER = "HX-Reswap"
+# Headers of a shed response: no content, and tell htmx not to swap anything.
+_SHED_HEADERS = ((RESWAP_HEADER, "none"), ("Cache-Control", "no-store"))
+
+ClientKey = Callable[[str, Mapping[str, str]], str]
+
+
+@dataclass(frozen=True)
+class ThrottleRule:
+    """Budget for one route: `burst` requests at once, refilled at `rate` per second."""
+
+    pattern: str
+    rate: float
+    burst: int
+    methods: frozenset[str] | None = None
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            msg = f"rate must be > 0, got {self.rate}"
+            raise ValueError(msg)
+        if self.burst < 1:
+            msg = f"burst must be >= 1, got {self.burst}"
+            raise ValueError(msg)
+        if self.methods is not None:
+            object.__setattr__(self, "methods", frozenset(m.upper() for m in self.methods))
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return fnmatchcase(path, self.pattern)
+
+
+@dataclass(frozen=True)
+class RuleCounters:
+    pattern: str
+    allowed: int
+    shed: int
+
+
+class Throttle:
+    """Thread-safe token buckets keyed by (rule, client)."""
+
+    def __init__(
+        self,
+        rules: Iterable[ThrottleRule],
+        *,
+        htmx_only: bool = True,
+        client_key: ClientKey | None = None,
+        max_clients: int = 10_000,
+    ) -> None:
+        self.rules = tuple(rules)
+        self.htmx_only = htmx_only
+        self.client_key = client_key
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        # (pattern, client) -> [tokens, last refill (monotonic seconds)]
+        self._buckets: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._allowed = dict.fromkeys((rule.pattern for rule in self.rules), 0)
+        self._shed = dict(self._allowed)
+
+    def match(self, method: str, path: str) -> ThrottleRule | None:
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return rule
+        return None
+
+    def acquire(self, rule: ThrottleRule, client: str) -> bool:
+        """Take one token from `client`'s bucket for `rule`; False means shed the request."""
+        now = time.monotonic()
+        key = (rule.pattern, client)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(rule.burst), now]
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(rule.burst), bucket[0] + (now - bucket[1]) * rule.rate)
+                bucket[1] = now
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                self._allowed[rule.pattern] += 1
+                return True
+            self._shed[rule.pattern] += 1
+            return False
+
+    def check(
+        self,
+        method: str,
+        path: str,
+        *,
+        hx_request: str | None,
+        remote_addr: str,
+        headers: Callable[[], Mapping[str, str]],
+    ) -> bool:
+        """Return False when the request should be shed.
+
+        `headers` is only called when a custom `client_key` needs them (lower-cased names).
+        """
+        if self.htmx_only and (hx_request or "").lower() != "true":
+            return True
+        rule = self.match(method, path)
+        if rule is None:
+            return True
+        client = remote_addr
+        if self.client_key is not None:
+            client = self.client_key(remote_addr, headers())
+        return self.acquire(rule, client)
+
+    def counters(self) -> list[RuleCounters]:
+        with self._lock:
+            return [
+                RuleCounters(rule.pattern, self._allowed[rule.pattern], self._shed[rule.pattern])
+                for rule in self.rules
+            ]
+
+    def reset(self) -> None:
+        """Refill every bucket and zero the counters."""
+        with self._lock:
+            self._buckets.clear()
+            for pattern in self._allowed:
+                self._allowed[pattern] = self._shed[pattern] = 0
+
+    def exposition(self) -> str:
+        """Counters in the Prometheus text format (append to `metrics_text()` if desired)."""
+        lines = [
+            "# HELP greeble_throttle_requests_total Throttled-route requests by outcome.",
+            "# TYPE greeble_throttle_requests_total counter",
+        ]
+        for counter in self.counters():
+            route = counter.pattern.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(
+                f'greeble_throttle_requests_total{{route="{route}",outcome="allowed"}} '
+                f"{counter.allowed}"
+            )
+            lines.append(
+                f'greeble_throttle_requests_total{{route="{route}",outcome="shed"}} {counter.shed}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+class ThrottleMiddleware:
+    """ASGI middleware answering over-budget htmx requests with 204 + `HX-Reswap: none`."""
+
+    _RAW_SHED_HEADERS: ClassVar[list[tuple[bytes, bytes]]] = [
+        (k.lower().encode(), v.encode()) for k, v in _SHED_HEADERS
+    ]
+
+    def __init__(self, app: Any, throttle: Throttle) -> None:
+        self.app = app
+        self.throttle = throttle
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or self._allowed(scope):
+            await self.app(scope, receive, send)
+            return
+        await send(
+            {"type": "http.response.start", "status": 204, "headers": self._RAW_SHED_HEADERS}
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    def _allowed(self, scope: dict[str, Any]) -> bool:
+        hx = None
+        for key, value in scope["headers"]:
+            if key == b"hx-request":
+                hx = value.decode("latin-1")
+                break
+        client = scope.get("client")
+        return self.throttle.check(
+            scope["method"],
+            scope["path"],
+            hx_request=hx,
+            remote_addr=client[0] if client else "",
+            headers=lambda: {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]},
+        )
+
+
+class ThrottleWSGIMiddleware:
+    """WSGI counterpart of `ThrottleMiddleware` (wrap `app.wsgi_app` in Flask, or Django's
+    `get_wsgi_application()`)."""
+
+    def __init__(self, app: Any, throttle: Throttle) -> None:
+        self.app = app
+        self.throttle = throttle
+
+    def __call__(self, environ: dict[str, Any], start_response: Any) -> Any:
+        allowed = self.throttle.check(
+            environ.get("REQUEST_METHOD", "GET"),
+            environ.get("PATH_INFO") or "/",
+            hx_request=environ.get("HTTP_HX_REQUEST"),
+            remote_addr=environ.get("REMOTE_ADDR", ""),
+            headers=lambda: _environ_headers(environ),
+        )
+        if allowed:
+            return self.app(environ, start_response)
+        start_response("204 No Content", list(_SHED_HEADERS))
+        return [b""]
+
+
+def _environ_headers(environ: Mapping[str, Any]) -> dict[str, str]:
+    headers = {
+        key[5:].replace("_", "-").lower(): value
+        for key, value in environ.items()
+        if key.startswith("HTTP_")
+    }
+    for key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+        if environ.get(key):
+            headers[key.replace("_", "-").lower()] = environ[key]
+    return headers
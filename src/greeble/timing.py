@@ -0,0 +1,88 @@
+"""
+`Server-Timing` spans for adapter responses.
+
+Purpose:
+    Show where the time of a rendered response goes (template lookup, render,
+    serialization) directly in browser devtools, next to each htmx request.
+
+Behavior:
+    - Disabled by default. `configure_server_timing()` enables it for a fraction of
+      requests (`sample_rate`), so production cost can be kept negligible.
+    - Adapters call `start_timing()` once per response. When the request is not
+      sampled it returns None and every later step is a single `is not None` check.
+    - Spans are measured with `time.perf_counter_ns()` between consecutive `mark()`
+      calls and serialized as `name;dur=<ms>`, followed by a `total` span.
+
+Example header:
+    Server-Timing: lookup;dur=0.041, render;dur=0.812, serialize;dur=0.019, total;dur=0.874
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+__all__ = [
+    "SERVER_TIMING_HEADER",
+    "ServerTiming",
+    "configure_server_timing",
+    "merge_server_timing",
+    "start_timing",
+]
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class ServerTiming:
+    """Consecutive named spans of one response, measured in nanoseconds."""
+
+    __slots__ = ("_last", "_start", "spans")
+
+    def __init__(self) -> None:
+        self._start = self._last = time.perf_counter_ns()
+        self.spans: list[tuple[str, int]] = []
+
+    def mark(self, name: str) -> None:
+        """Close the span `name`, which started at the previous mark (or creation)."""
+        now = time.perf_counter_ns()
+        self.spans.append((name, now - self._last))
+        self._last = now
+
+    def header_value(self) -> str:
+        """Serialize the spans plus a `total` span up to now."""
+        total = time.perf_counter_ns() - self._start
+        parts = [f"{name};dur={elapsed / 1e6:.3f}" for name, elapsed in self.spans]
+        parts.append(f"total;dur={total / 1e6:.3f}")
+        return ", ".join(parts)
+
+
+class _TimingRegistry:
+    sample_rate: float = 0.0
+
+
+_REGISTRY = _TimingRegistry()
+
+
+def configure_server_timing(enabled: bool = True, *, sample_rate: float = 1.0) -> None:
+    """Enable or disable `Server-Timing` headers in the framework adapters.
+
+    `sample_rate` is the fraction of responses that are timed (0.0-1.0).
+    """
+    if not 0.0 <= sample_rate <= 1.0:
+        msg = f"sample_rate must be between 0 and 1, got {sample_rate}"
+        raise ValueError(msg)
+    _REGISTRY.sample_rate = sample_rate if enabled else 0.0
+
+
+def start_timing() -> ServerTiming | None:
+    """Return a new `ServerTiming` when this response is sampled, else None."""
+    rate = _REGISTRY.sample_rate
+    if rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+        return None
+    return ServerTiming()
+
+
+def merge_server_timing(existing: str | None, timing: ServerTiming) -> str:
+    """Return `existing` (a header the app already set) extended with `timing`'s spans."""
+    value = timing.header_value()
+    return f"{existing}, {value}" if existing else value
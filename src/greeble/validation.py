@@ -0,0 +1,172 @@
+"""
+Batched multi-field validation with out-of-band swaps for changed groups only.
+
+Purpose:
+    Field groups such as `render_signin_group` validate one field per htmx request, so
+    a form with N fields costs N round-trips and N group renders per burst of edits.
+    A `BatchValidator` takes every dirty field in one request, runs their validators,
+    and returns one response made of `hx-swap-oob` group renders. Groups whose
+    validation outcome did not change since the last response are skipped.
+
+State:
+    Each group's outcome (its error message, or none) is reduced to a short hash. The
+    hashes travel in a hidden input (`_greeble_state`) inside the form, so htmx submits
+    them with the next batch. The response swaps that input out-of-band whenever a group
+    changes. Re-rendering only on an outcome change also keeps the focused input from
+    being replaced while the user is still typing a valid (or still invalid) value.
+
+Usage:
+    batch = BatchValidator(
+        [
+            FieldGroup("email", lambda value, form: validate_signin_email(value),
+                       render_signin_group),
+        ]
+    )
+
+    <form hx-post="/form/validate-batch" hx-trigger="input changed delay:400ms"
+          hx-swap="none">
+      {{ batch.state_input(batch.initial_state()) | safe }}
+      ...field groups...
+    </form>
+
+    @app.post("/form/validate-batch")
+    async def validate_batch(request: Request) -> HTMLResponse:
+        result = batch.validate(await request.form())
+        return HTMLResponse(result.html)
+
+    Dirty fields come from `_greeble_dirty` (comma-separated names) when present,
+    otherwise every configured field present in the submission is validated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from html import escape
+from typing import Any, Protocol
+
+__all__ = [
+    "DIRTY_FIELD",
+    "STATE_FIELD",
+    "BatchResult",
+    "BatchValidator",
+    "FieldGroup",
+    "GroupRenderer",
+    "decode_state",
+    "encode_state",
+    "state_token",
+]
+
+STATE_FIELD = "_greeble_state"
+DIRTY_FIELD = "_greeble_dirty"
+
+Validator = Callable[[str, Mapping[str, Any]], str | None]
+
+
+class GroupRenderer(Protocol):
+    """Renders a field group, e.g. `render_signin_group(email, error, swap_oob=True)`."""
+
+    def __call__(self, value: str, error: str | None, *, swap_oob: bool) -> str: ...
+
+
+@dataclass(frozen=True)
+class FieldGroup:
+    """One form field: `validate(value, form)` returns an error message or None."""
+
+    field: str
+    validate: Validator
+    render: GroupRenderer
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    html: str
+    errors: dict[str, str]
+    changed: tuple[str, ...]
+    state: str
+
+    @property
+    def valid(self) -> bool:
+        """True when none of the validated fields has an error."""
+        return not self.errors
+
+
+def state_token(error: str | None) -> str:
+    """Short hash of one group's validation outcome."""
+    return hashlib.blake2b((error or "").encode(), digest_size=6).hexdigest()
+
+
+def encode_state(tokens: Mapping[str, str]) -> str:
+    return ";".join(f"{field}:{token}" for field, token in sorted(tokens.items()))
+
+
+def decode_state(raw: str) -> dict[str, str]:
+    """Parse `field:token;...`; malformed entries are ignored (the group re-renders)."""
+    tokens: dict[str, str] = {}
+    for entry in raw.split(";"):
+        field, sep, token = entry.rpartition(":")
+        if sep and field:
+            tokens[field] = token
+    return tokens
+
+
+class BatchValidator:
+    """Validate several field groups per request and swap only the ones that changed."""
+
+    def __init__(
+        self, groups: Iterable[FieldGroup], *, state_input_id: str = "greeble-validation-state"
+    ) -> None:
+        self.groups = {group.field: group for group in groups}
+        self.state_input_id = state_input_id
+
+    def initial_state(self) -> str:
+        """State of a freshly rendered form: every group shown without an error."""
+        return encode_state(dict.fromkeys(self.groups, state_token(None)))
+
+    def state_input(self, state: str, *, swap_oob: bool = False) -> str:
+        """Hidden input carrying `state`; place it inside the form."""
+        oob = ' hx-swap-oob="true"' if swap_oob else ""
+        return (
+            f'<input type="hidden" id="{escape(self.state_input_id, quote=True)}" '
+            f'name="{STATE_FIELD}" value="{escape(state, quote=True)}"{oob} />'
+        )
+
+    def dirty_fields(self, form: Mapping[str, Any]) -> list[str]:
+        raw = form.get(DIRTY_FIELD)
+        if raw:
+            names = {name.strip() for name in str(raw).split(",")}
+            return [field for field in self.groups if field in names]
+        return [field for field in self.groups if field in form]
+
+    def validate(
+        self, form: Mapping[str, Any], *, dirty: Iterable[str] | None = None
+    ) -> BatchResult:
+        """Validate the dirty fields of `form` (a Starlette/Flask/Django form mapping works).
+
+        `dirty` overrides the fields named in `_greeble_dirty`.
+        """
+        previous = decode_state(str(form.get(STATE_FIELD) or ""))
+        fields = (
+            self.dirty_fields(form) if dirty is None else [f for f in dirty if f in self.groups]
+        )
+        tokens = {field: token for field, token in previous.items() if field in self.groups}
+        errors: dict[str, str] = {}
+        changed: list[str] = []
+        parts: list[str] = []
+        for field in fields:
+            group = self.groups[field]
+            value = str(form.get(field) or "")
+            error = group.validate(value, form)
+            if error:
+                errors[field] = error
+            token = state_token(error)
+            tokens[field] = token
+            if previous.get(field) != token:
+                changed.append(field)
+                parts.append(group.render(value, error, swap_oob=True))
+
+        state = encode_state(tokens)
+        if changed:
+            parts.append(self.state_input(state, swap_oob=True))
+        return BatchResult(html="".join(parts), errors=errors, changed=tuple(changed), state=state)
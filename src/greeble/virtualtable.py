@@ -0,0 +1,210 @@
+"""
+Windowed (virtualized) server-rendered tables for very large datasets.
+
+Purpose:
+    Paginated tables render a page of rows plus controls. To scroll through millions of
+    rows without pagination, a `VirtualTable` renders only a window of `window_size`
+    rows between two spacer rows whose heights stand in for the rows above and below.
+    The spacers double as `hx-trigger="intersect once"` sentinels: scrolling one into
+    view fetches a window, which replaces the `<tbody>` content. The DOM size and the
+    per-request render cost stay constant however large the dataset is.
+
+Data sources:
+    Anything with `__len__()` and `fetch(start, stop)` works (an `IndexedSource`):
+    a keyset/OFFSET query, a search index, or `SequenceSource` over an in-memory sorted
+    list. Only `window_size` rows are fetched per request.
+
+Windows:
+    A sentinel's request computes `start` in the browser (`hx-vals="js:…"`) from how far
+    the top of the visible area lies inside the spacer, divided by `row_height`, minus
+    half a window. Dragging the scrollbar deep into a spacer therefore loads the rows
+    at that position in one request. When scrolling row by row, the result is the
+    adjacent window overlapping by half, so rows on screen keep their offsets. The
+    server clamps `start` to the dataset. Each row gets `aria-rowindex`; put
+    `aria-rowcount="{{ total }}"` on the `<table>`.
+
+Usage:
+    table = VirtualTable(endpoint="/table/window", tbody_id="table-body", columns=5)
+
+    @app.get("/table/window")
+    async def table_window(start: int = 0, sort: str = "org:asc") -> HTMLResponse:
+        html = table.render(source, start, render_account_row, params={"sort": sort})
+        return HTMLResponse(html)
+
+    <div class="greeble-table__container" style="max-height: 30rem; overflow-y: auto">
+      <table class="greeble-table">
+        <tbody id="table-body">{{ table.render(source, 0, render_account_row) | safe }}</tbody>
+      </table>
+    </div>
+
+Notes:
+    Browsers cap element heights (roughly 17–33 million pixels), so `total * row_height`
+    should stay below that; keep `row_height` accurate, or rows drift from their spacers.
+    The visible area is taken to be the table's parent element (the scroll container)
+    clipped to the viewport. Computing `start` needs htmx's `allowEval` (the default).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from html import escape
+from typing import Generic, Protocol, TypeVar
+from urllib.parse import urlencode
+
+__all__ = [
+    "IndexedSource",
+    "SequenceSource",
+    "VirtualTable",
+    "Window",
+    "window_for",
+]
+
+T = TypeVar("T")
+T_co = TypeVar("T_co", covariant=True)
+
+
+class IndexedSource(Protocol[T_co]):
+    def __len__(self) -> int: ...
+
+    def fetch(self, start: int, stop: int) -> Sequence[T_co]:
+        """Rows `start` (inclusive) to `stop` (exclusive) in display order."""
+        ...
+
+
+class SequenceSource(Generic[T]):
+    """`IndexedSource` over an in-memory sequence (already sorted/filtered)."""
+
+    def __init__(self, rows: Sequence[T]) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def fetch(self, start: int, stop: int) -> Sequence[T]:
+        return self.rows[start:stop]
+
+
+@dataclass(frozen=True)
+class Window:
+    start: int
+    stop: int
+    total: int
+    size: int
+
+    @property
+    def before(self) -> int:
+        """Rows above the window (rendered as the top spacer)."""
+        return self.start
+
+    @property
+    def after(self) -> int:
+        """Rows below the window (rendered as the bottom spacer)."""
+        return self.total - self.stop
+
+    @property
+    def previous_start(self) -> int | None:
+        return max(0, self.start - self.size // 2) if self.start > 0 else None
+
+    @property
+    def next_start(self) -> int | None:
+        return self.start + max(1, self.size // 2) if self.stop < self.total else None
+
+
+def window_for(total: int, start: int, size: int) -> Window:
+    """Clamp a requested window to the dataset (the last window is always full)."""
+    if size < 1:
+        msg = f"window size must be >= 1, got {size}"
+        raise ValueError(msg)
+    first = min(max(0, start), max(0, total - size))
+    return Window(start=first, stop=min(total, first + size), total=total, size=size)
+
+
+@dataclass(frozen=True)
+class VirtualTable:
+    """Render windows of an `IndexedSource` into a `<tbody>` with spacer sentinels.
+
+    - endpoint: URL answering `?start=N` (plus `params`) with `render()` output; `N` may
+      be out of range and is clamped.
+    - tbody_id: id of the `<tbody>` each window replaces.
+    - columns: column count, for the spacer cells' `colspan`.
+    - row_height: rendered row height in pixels; spacers are sized with it.
+    - window_size: rows per window.
+    """
+
+    endpoint: str
+    tbody_id: str
+    columns: int
+    row_height: float = 48.0
+    window_size: int = 50
+
+    def window(self, source: IndexedSource[object], start: int) -> Window:
+        return window_for(len(source), start, self.window_size)
+
+    def render(
+        self,
+        source: IndexedSource[T],
+        start: int,
+        render_row: Callable[[T], str],
+        *,
+        params: Mapping[str, str] | None = None,
+    ) -> str:
+        """Rows of the window around `start`, between the top and bottom spacers.
+
+        `render_row` must return a single `<tr…>` element; `aria-rowindex` is added to it.
+        """
+        window = self.window(source, start)
+        parts = [self._spacer(window.before, 0, params, "top")]
+        for offset, row in enumerate(source.fetch(window.start, window.stop)):
+            html = render_row(row)
+            if not html.startswith("<tr"):
+                msg = "render_row must return a <tr> element"
+                raise ValueError(msg)
+            parts.append(f'<tr aria-rowindex="{window.start + offset + 1}"{html[3:]}')
+        parts.append(self._spacer(window.after, window.stop, params, "bottom"))
+        return "".join(parts)
+
+    def url(self, start: int | None, params: Mapping[str, str] | None = None) -> str:
+        """Endpoint URL with `params`, plus `start` unless it is None."""
+        values: dict[str, object] = dict(params or {})
+        if start is not None:
+            values["start"] = start
+        if not values:
+            return self.endpoint
+        separator = "&" if "?" in self.endpoint else "?"
+        return f"{self.endpoint}{separator}{urlencode(values)}"
+
+    def jump_vals(self, spacer_id: str, first_row: int) -> str:
+        """`hx-vals` computing the window `start` from the spacer's scroll position.
+
+        `first_row` is the index of the first row the spacer stands in for.
+        """
+        spacer = f"document.getElementById('{spacer_id}')"
+        container = f"{spacer}.closest('table').parentElement"
+        view_top = f"Math.max(0, {container}.getBoundingClientRect().top)"
+        offset = f"Math.max(0, {view_top} - {spacer}.getBoundingClientRect().top)"
+        row = f"{first_row} + Math.floor({offset} / {self.row_height:g})"
+        return f"js:{{start: Math.max(0, {row} - {self.window_size // 2})}}"
+
+    def _spacer(
+        self, rows: int, first_row: int, params: Mapping[str, str] | None, edge: str
+    ) -> str:
+        if rows <= 0:
+            return ""
+        spacer_id = f"{self.tbody_id}-spacer-{edge}"
+        attrs = [
+            f'id="{escape(spacer_id, quote=True)}"',
+            f'class="greeble-table__spacer greeble-table__spacer--{edge}"',
+            'aria-hidden="true"',
+            f'hx-get="{escape(self.url(None, params), quote=True)}"',
+            f'hx-vals="{escape(self.jump_vals(spacer_id, first_row), quote=True)}"',
+            'hx-trigger="intersect once"',
+            f'hx-target="#{escape(self.tbody_id, quote=True)}"',
+            'hx-swap="innerHTML"',
+        ]
+        height = f"{rows * self.row_height:.1f}"
+        return (
+            f"<tr {' '.join(attrs)}>"
+            f'<td colspan="{self.columns}" style="height: {height}px; padding: 0; border: 0">'
+            "</td></tr>"
+        )
@@ -3,21 +3,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
 from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .manifest import Component, Manifest, ManifestError, default_manifest_path, load_manifest
-from .scaffold import (
-    CopyPlan,
-    ScaffoldError,
-    backup_existing_files,
-    build_copy_plan,
-    component_sources,
-    ensure_within_project,
-    execute_plan,
-    remove_files,
-)
-from .starter import StarterError, scaffold_baseline_assets, scaffold_starter
+from .manifest import Manifest, ManifestError, default_manifest_path, load_manifest
+
+if TYPE_CHECKING:
+    from .drift import ComponentDrift
+    from .lockfile import Lockfile, PlanStatus
+    from .manifest import Component
+    from .scaffold import CopyPlan
 
 __all__ = ["main"]
 
@@ -74,6 +71,8 @@ def _build_doctor_report(
     docs_dir: Path | None,
     include_docs: bool,
 ) -> dict[str, object]:
+    from .scaffold import component_sources
+
     tokens_value = manifest.library.get("tokens_file")
     tokens_declared = isinstance(tokens_value, str)
     tokens_path = manifest.tokens_file if tokens_declared else None
@@ -198,9 +197,8 @@ def _build_doctor_report(
 
 
 def cmd_list(args: argparse.Namespace, manifest: Manifest) -> int:
-    components = [manifest.get(key) for key in sorted(manifest.keys())]
-
     if getattr(args, "json", False):
+        components = [manifest.get(key) for key in sorted(manifest.keys())]
         payload = {
             "total": len(components),
             "components": [
@@ -216,43 +214,111 @@ def cmd_list(args: argparse.Namespace, manifest: Manifest) -> int:
         print(json.dumps(payload, indent=2))
         return 0
 
+    # Text output only needs the index, so sharded manifests never open a component file.
     print("Available components:\n")
-    for component in components:
-        print(f"- {component.key}: {component.title} — {component.summary}")
+    for entry in sorted(manifest.entries(), key=lambda entry: entry.key):
+        print(f"- {entry.key}: {entry.title} — {entry.summary}")
     return 0
 
 
-def _copy_component(
-    *,
+def _selected_components(args: argparse.Namespace, manifest: Manifest) -> list[Component]:
+    """Resolve the positional component keys (or `--all`); raises KeyError for unknown keys."""
+    keys = sorted(manifest.keys()) if args.all else list(dict.fromkeys(args.components))
+    return [manifest.get(key) for key in keys]
+
+
+def _plan_components(
     manifest: Manifest,
-    component: Component,
+    components: Sequence[Component],
+    *,
     project_root: Path,
     templates: Path,
     static: Path,
     docs: Path | None,
     include_docs: bool,
+    minify: bool,
+) -> tuple[Lockfile, list[PlanStatus]]:
+    """Build one combined plan for `components` and classify it against the lockfile."""
+    from .lockfile import Lockfile, classify_plans
+    from .scaffold import build_copy_plan, ensure_within_project
+
+    lock = Lockfile.load(project_root)
+    statuses: list[PlanStatus] = []
+    for component in components:
+        plans = build_copy_plan(
+            manifest=manifest,
+            component=component,
+            project_root=project_root,
+            templates_dir=templates,
+            static_dir=static,
+            include_docs=include_docs,
+            docs_dir=docs,
+        )
+        ensure_within_project(project_root, plans)
+        statuses.extend(classify_plans(lock, component.key, plans, minify=minify))
+    return lock, statuses
+
+
+def _apply_plan(
+    lock: Lockfile,
+    statuses: Sequence[PlanStatus],
+    pending: Sequence[PlanStatus],
+    *,
     force: bool,
-    dry_run: bool,
+    minify: bool,
 ) -> list[Path]:
-    plans = build_copy_plan(
-        manifest=manifest,
-        component=component,
-        project_root=project_root,
-        templates_dir=templates,
-        static_dir=static,
-        include_docs=include_docs,
-        docs_dir=docs,
+    """Copy `pending` as one batch and record the results in the lockfile."""
+    from .lockfile import UNCHANGED
+    from .scaffold import execute_plan, merge_plans
+
+    plans = merge_plans(status.plan for status in pending)
+    written = execute_plan(plans, force=force, dry_run=False, minify=minify)
+    for status in pending:
+        lock.record(status.component, status, minified=minify)
+    for status in statuses:
+        if status.state == UNCHANGED:
+            lock.adopt(status.component, status, minified=minify)
+    lock.save()
+    return written
+
+
+def _print_plan_summary(plans: Sequence[CopyPlan], components: int, elapsed: float) -> None:
+    size = sum(plan.source.stat().st_size for plan in plans)
+    directories = len({plan.destination.parent for plan in plans})
+    print(
+        f"\nPlan: {len(plans)} file(s), {size:,} bytes into {directories} directories "
+        f"for {components} component(s); planned in {elapsed * 1000:.1f} ms"
     )
-    ensure_within_project(project_root, plans)
-    if dry_run:
-        print(_render_plan(plans))
-        return []
-    return execute_plan(plans, force=force, dry_run=False)
+
+
+def _format_savings(original: int, minified: int) -> str:
+    saved = original - minified
+    percent = (saved / original * 100) if original else 0.0
+    return f"{original} -> {minified} bytes (saved {saved}, {percent:.1f}%)"
+
+
+def _print_minify_summary(manifest: Manifest, components: Sequence[Component]) -> None:
+    from .scaffold import component_sources, minify_savings
+
+    sources = [path for component in components for path in component_sources(manifest, component)]
+    results = minify_savings(dict.fromkeys(sources))
+    if not results:
+        return
+    original = sum(r.original_bytes for r in results.values())
+    minified = sum(r.minified_bytes for r in results.values())
+    print(f"Minified {len(results)} file(s): {_format_savings(original, minified)}")
 
 
 def cmd_add(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .lockfile import UNCHANGED
+    from .scaffold import ScaffoldError, merge_plans
+    from .starter import StarterError, scaffold_baseline_assets
+
+    if not args.components and not args.all:
+        print("error: specify at least one component or --all", file=sys.stderr)
+        return 2
     try:
-        component = manifest.get(args.component)
+        components = _selected_components(args, manifest)
     except KeyError as exc:
         print(exc, file=sys.stderr)
         return 2
@@ -274,32 +340,44 @@ def cmd_add(args: argparse.Namespace, manifest: Manifest) -> int:
             return 2
 
     try:
-        written = _copy_component(
-            manifest=manifest,
-            component=component,
+        started = time.perf_counter()
+        lock, statuses = _plan_components(
+            manifest,
+            components,
             project_root=project_root,
             templates=templates_dir,
             static=static_dir,
             docs=docs_dir,
             include_docs=args.include_docs,
-            force=args.force,
-            dry_run=args.dry_run,
+            minify=args.minify,
         )
+        pending = [status for status in statuses if status.state != UNCHANGED]
+        if args.dry_run:
+            plans = merge_plans(status.plan for status in pending)
+            print(_render_plan(plans))
+            _print_plan_summary(plans, len(components), time.perf_counter() - started)
+            return 0
+        written = _apply_plan(lock, statuses, pending, force=args.force, minify=args.minify)
     except ScaffoldError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
 
-    if args.dry_run:
-        return 0
-
-    print(f"Copied {len(written)} file(s):")
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Copied {len(written)} file(s) in {elapsed:.1f} ms:")
     for path in written:
         rel = path.relative_to(project_root)
         print(f"  - {rel}")
+    unchanged = len(statuses) - len(pending)
+    if unchanged:
+        print(f"Skipped {unchanged} unchanged file(s).")
+    if args.minify:
+        _print_minify_summary(manifest, components)
     return 0
 
 
 def _is_directory_non_empty(path: Path) -> bool:
+    from .scaffold import ScaffoldError
+
     if not path.exists():
         return False
     if not path.is_dir():
@@ -308,6 +386,9 @@ def _is_directory_non_empty(path: Path) -> bool:
 
 
 def cmd_new(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .scaffold import ScaffoldError
+    from .starter import STARTER_COMPONENTS, StarterError, scaffold_starter
+
     project_root = Path(args.project).resolve()
     docs_dir: Path = args.docs
 
@@ -327,7 +408,13 @@ def cmd_new(args: argparse.Namespace, manifest: Manifest) -> int:
     if not args.dry_run:
         project_root.mkdir(parents=True, exist_ok=True)
 
+    if args.all:
+        components = sorted(manifest.keys())
+    else:
+        components = list(dict.fromkeys([*STARTER_COMPONENTS, *(args.component or [])]))
+
     try:
+        started = time.perf_counter()
         plan = scaffold_starter(
             manifest=manifest,
             project_root=project_root,
@@ -335,7 +422,11 @@ def cmd_new(args: argparse.Namespace, manifest: Manifest) -> int:
             docs_dir=docs_dir,
             force=args.force,
             dry_run=args.dry_run,
+            components=components,
         )
+    except KeyError as exc:
+        print(exc, file=sys.stderr)
+        return 2
     except (ScaffoldError, StarterError) as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
@@ -349,6 +440,11 @@ def cmd_new(args: argparse.Namespace, manifest: Manifest) -> int:
         print("Starter files that would be created:\n")
         for rel in lines:
             print(f"  - {rel}")
+        elapsed = (time.perf_counter() - started) * 1000
+        print(
+            f"\nPlan: {len(lines)} file(s) for {len(components)} component(s); "
+            f"planned in {elapsed:.1f} ms"
+        )
         return 0
 
     print(f"Starter project created at {project_root}")
@@ -362,9 +458,25 @@ def cmd_new(args: argparse.Namespace, manifest: Manifest) -> int:
     return 0
 
 
+def _render_sync_plan(statuses: Sequence[PlanStatus]) -> str:
+    lines = ["Files to copy:"]
+    lines.extend(
+        f"  - {status.plan.source} -> {status.plan.destination} ({status.state})"
+        for status in statuses
+    )
+    return "\n".join(lines)
+
+
 def cmd_sync(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .lockfile import LOCAL, LOCALLY_MODIFIED, UNCHANGED
+    from .scaffold import ScaffoldError, backup_existing_files, merge_plans
+    from .starter import StarterError, scaffold_baseline_assets
+
+    if not args.components and not args.all:
+        print("error: specify at least one component or --all", file=sys.stderr)
+        return 2
     try:
-        component = manifest.get(args.component)
+        components = _selected_components(args, manifest)
     except KeyError as exc:
         print(exc, file=sys.stderr)
         return 2
@@ -385,44 +497,64 @@ def cmd_sync(args: argparse.Namespace, manifest: Manifest) -> int:
             print(f"error: {exc}", file=sys.stderr)
             return 2
     try:
-        plans = build_copy_plan(
-            manifest=manifest,
-            component=component,
+        started = time.perf_counter()
+        lock, statuses = _plan_components(
+            manifest,
+            components,
             project_root=project_root,
-            templates_dir=templates_dir,
-            static_dir=static_dir,
-            docs_dir=docs_dir,
+            templates=templates_dir,
+            static=static_dir,
+            docs=docs_dir,
             include_docs=args.include_docs,
+            minify=args.minify,
         )
-        ensure_within_project(project_root, plans)
     except ScaffoldError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
 
+    skipped = {UNCHANGED, LOCAL} if args.keep_local else {UNCHANGED}
+    pending = [status for status in statuses if status.state not in skipped]
+    kept = [status for status in statuses if args.keep_local and status.state == LOCAL]
+    # Only files holding edits the library cannot reproduce are worth backing up.
+    to_backup = merge_plans(status.plan for status in pending if status.state in LOCALLY_MODIFIED)
+    unchanged = len(statuses) - len(pending) - len(kept)
+
     if args.dry_run:
-        print(_render_plan(plans))
-        if args.backup:
-            existing = [plan.destination for plan in plans if plan.destination.exists()]
-            if existing:
-                print("\nBackups that would be created:")
-                for dest in existing:
-                    try:
-                        rel = dest.relative_to(project_root)
-                    except ValueError:  # pragma: no cover - defensive
-                        rel = dest
-                    print(f"  - {rel}")
+        print(_render_sync_plan(pending))
+        _print_plan_summary(
+            merge_plans(status.plan for status in pending),
+            len(components),
+            time.perf_counter() - started,
+        )
+        if unchanged:
+            print(f"Unchanged (skipped): {unchanged} file(s)")
+        if args.backup and to_backup:
+            print("\nBackups that would be created:")
+            for plan in to_backup:
+                try:
+                    rel = plan.destination.relative_to(project_root)
+                except ValueError:  # pragma: no cover - defensive
+                    rel = plan.destination
+                print(f"  - {rel}")
         return 0
 
     try:
         backups: list[Path] = []
         if args.backup:
-            backups = backup_existing_files(plans)
-        written = execute_plan(plans, force=True, dry_run=False)
+            backups = backup_existing_files(to_backup)
+        written = _apply_plan(lock, statuses, pending, force=True, minify=args.minify)
     except ScaffoldError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
 
-    print(f"Synced {len(written)} file(s).")
+    print(f"Synced {len(written)} file(s); {unchanged} unchanged.")
+    for status in pending:
+        if status.state in LOCALLY_MODIFIED:
+            print(f"  ! overwrote local edits ({status.state}): {status.key}")
+    for status in kept:
+        print(f"  = kept local edits: {status.key}")
+    if args.minify:
+        _print_minify_summary(manifest, components)
     if args.backup and backups:
         print(f"Created {len(backups)} backup file(s):")
         for path in backups:
@@ -434,7 +566,83 @@ def cmd_sync(args: argparse.Namespace, manifest: Manifest) -> int:
     return 0
 
 
+def cmd_watch(args: argparse.Namespace, manifest: Manifest) -> int:
+    import functools
+
+    from .lockfile import MISSING, UPSTREAM, Lockfile
+    from .scaffold import ScaffoldError
+    from .watch import Watcher, WatchTarget
+
+    project_root = Path(args.project).resolve()
+    try:
+        if args.components or args.all:
+            components = _selected_components(args, manifest)
+        else:
+            installed = Lockfile.load(project_root).components
+            components = [
+                manifest.get(key) for key in sorted(installed) if key in manifest.components
+            ]
+    except KeyError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except ScaffoldError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if not components:
+        print(
+            "error: nothing to watch; pass component keys or --all, or `greeble add` components first",
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        lock, statuses = _plan_components(
+            manifest,
+            components,
+            project_root=project_root,
+            templates=Path(args.templates),
+            static=Path(args.static),
+            docs=args.docs,
+            include_docs=args.include_docs,
+            minify=args.minify,
+        )
+        # Catch up first; locally edited copies are left alone until their source changes.
+        pending = [status for status in statuses if status.state in {MISSING, UPSTREAM}]
+        if pending:
+            written = _apply_plan(lock, statuses, pending, force=True, minify=args.minify)
+            print(f"Synced {len(written)} out-of-date file(s).")
+    except ScaffoldError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    watcher = Watcher(
+        [WatchTarget(component=status.component, plan=status.plan) for status in statuses],
+        project_root=project_root,
+        minify=args.minify,
+        notify=args.notify,
+        interval=args.interval,
+        debounce=args.debounce,
+        use_inotify=not args.no_inotify,
+        log=functools.partial(print, flush=True),
+    )
+    print(
+        f"Watching {len(watcher.poller.paths)} source file(s) for {len(components)} "
+        f"component(s) using {watcher.backend}; press Ctrl-C to stop.",
+        flush=True,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        watcher.close()
+    return 0
+
+
 def cmd_remove(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .lockfile import Lockfile
+    from .scaffold import ScaffoldError, build_copy_plan, ensure_within_project, remove_files
+
     try:
         component = manifest.get(args.component)
     except KeyError as exc:
@@ -464,6 +672,9 @@ def cmd_remove(args: argparse.Namespace, manifest: Manifest) -> int:
                 print(f"  - {rel}")
             return 0
         removed, missing = remove_files(plans, dry_run=False)
+        lock = Lockfile.load(project_root)
+        lock.forget(component.key, (lock.key_for(plan.destination) for plan in plans))
+        lock.save()
     except ScaffoldError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
@@ -478,7 +689,43 @@ def cmd_remove(args: argparse.Namespace, manifest: Manifest) -> int:
     return 0
 
 
+def _detect_drift(
+    args: argparse.Namespace, manifest: Manifest, project_root: Path
+) -> list[ComponentDrift]:
+    from .drift import detect_drift
+
+    return detect_drift(
+        manifest,
+        [manifest.get(key) for key in sorted(manifest.keys())],
+        project_root=project_root,
+        templates_dir=Path(args.templates),
+        static_dir=Path(args.static),
+        docs_dir=Path(args.docs),
+        include_docs=args.include_docs,
+        workers=args.workers,
+    )
+
+
+def _relative(path: Path, root: Path) -> Path:
+    try:
+        return path.relative_to(root)
+    except ValueError:  # pragma: no cover - defensive
+        return path
+
+
 def cmd_doctor(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .scaffold import ScaffoldError, component_sources
+
+    drift_root = None
+    drift: list[ComponentDrift] = []
+    if args.drift:
+        drift_root = Path(args.project).resolve() if args.project else Path.cwd().resolve()
+        try:
+            drift = _detect_drift(args, manifest, drift_root)
+        except ScaffoldError as exc:  # e.g. a malformed .greeble.lock
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+
     # JSON mode: generate a structured report and print it
     if getattr(args, "json", False):
         project_root = Path(args.project).resolve() if args.project else None
@@ -491,6 +738,27 @@ def cmd_doctor(args: argparse.Namespace, manifest: Manifest) -> int:
             docs_dir=docs_dir,
             include_docs=args.include_docs,
         )
+        if drift_root is not None:
+            drifted = [component for component in drift if component.drifted]
+            report["drift"] = {
+                "root": drift_root,
+                "installed": len(drift),
+                "drifted": [
+                    {
+                        "component": component.key,
+                        "files": [
+                            {"path": _relative(entry.destination, drift_root), "state": entry.state}
+                            for entry in component.drifted
+                        ],
+                    }
+                    for component in drifted
+                ],
+            }
+            summary = report["summary"]
+            assert isinstance(summary, dict)
+            summary["drifted_components"] = len(drifted)
+            if drifted:
+                report["status"] = "error"
         print(json.dumps(report, indent=2, default=str))
         return 0 if report.get("status") == "ok" else 1
 
@@ -519,9 +787,139 @@ def cmd_doctor(args: argparse.Namespace, manifest: Manifest) -> int:
         assert templates_dir_opt is not None and static_dir_opt is not None
         _print_project_status(project_root, templates_dir_opt, static_dir_opt, docs_dir)
 
+    if drift_root is not None:
+        drifted = [installed for installed in drift if installed.drifted]
+        for installed in drifted:
+            print(f"✖ Drift in {installed.key}: {len(installed.drifted)} file(s)")
+            for entry in installed.drifted:
+                print(f"    {entry.state}: {_relative(entry.destination, drift_root)}")
+        if not drifted:
+            print(f"✔ No drift in {len(drift)} installed component(s)")
+        ok = ok and not drifted
+
     return 0 if ok else 1
 
 
+def cmd_minify(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .scaffold import component_sources, minify_savings
+
+    keys = list(args.components) or sorted(manifest.keys())
+    # (name, files, original bytes, minified bytes)
+    rows: list[tuple[str, int, int, int]] = []
+    try:
+        for key in keys:
+            results = minify_savings(component_sources(manifest, manifest.get(key)))
+            original = sum(r.original_bytes for r in results.values())
+            minified = sum(r.minified_bytes for r in results.values())
+            rows.append((key, len(results), original, minified))
+    except KeyError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    if args.images:
+        images_dir = manifest.root / "public" / "images"
+        for path, result in sorted(minify_savings(images_dir.glob("*.svg")).items()):
+            name = f"public/images/{path.name}"
+            rows.append((name, 1, result.original_bytes, result.minified_bytes))
+
+    total_original = sum(row[2] for row in rows)
+    total_minified = sum(row[3] for row in rows)
+
+    if getattr(args, "json", False):
+        payload = {
+            "total": {
+                "original": total_original,
+                "minified": total_minified,
+                "saved": total_original - total_minified,
+            },
+            "entries": [
+                {
+                    "name": name,
+                    "files": files,
+                    "original": original,
+                    "minified": minified,
+                    "saved": original - minified,
+                }
+                for name, files, original, minified in rows
+            ],
+        }
+        print(json.dumps(payload, indent=2))
+        return 0
+
+    print("Minification savings (HTML/SVG):\n")
+    for name, _, original, minified in rows:
+        print(f"- {name}: {_format_savings(original, minified)}")
+    print(f"\nTotal: {_format_savings(total_original, total_minified)}")
+    return 0
+
+
+def cmd_vendor(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.assets import CDN_SCRIPTS, vendor_scripts
+
+    project_root = Path(args.project).resolve()
+    destination = project_root / Path(args.dest)
+
+    if args.dry_run:
+        print(f"Scripts that would be vendored into {destination}:\n")
+        for name, url in CDN_SCRIPTS.items():
+            print(f"  - {name} <- {url}")
+        return 0
+
+    try:
+        mapping = vendor_scripts(destination)
+    except OSError as exc:
+        print(f"error: failed to vendor scripts: {exc}", file=sys.stderr)
+        return 2
+
+    print(f"Vendored {len(mapping)} script(s) into {destination}:")
+    for name, filename in sorted(mapping.items()):
+        print(f"  - {name} -> {filename}")
+    return 0
+
+
+def cmd_export_static(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.prerender import PrerenderError, export_static, import_app
+
+    app_dir = str(Path(args.app_dir).resolve())
+    if app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    try:
+        app, declared = import_app(args.app)
+    except PrerenderError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    routes = list(args.route or declared or ["/"])
+    output = Path(args.out).resolve()
+    try:
+        snapshots = export_static(app, routes, output, compress=not args.no_gzip)
+    except (PrerenderError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    print(f"Prerendered {len(snapshots)} route(s) into {output}:")
+    for snap in snapshots:
+        gz = f", {snap.gzip_size:,} B gzip" if snap.gzip_size is not None else ""
+        print(f"  - {snap.route} -> {snap.file} ({snap.size:,} B{gz})")
+    return 0
+
+
+def cmd_split_manifest(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .manifest import split_manifest
+
+    if manifest.sharded:
+        print(f"error: manifest is already sharded: {manifest.path}", file=sys.stderr)
+        return 2
+    target = Path(args.out) if args.out else manifest.path
+    try:
+        shard_dir = split_manifest(manifest.path, target, shards=args.shards)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"Wrote index {target} and {len(manifest.components)} component shard(s) to {shard_dir}")
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="greeble", description="Greeble component CLI")
     parser.add_argument(
@@ -572,6 +970,17 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Docs root relative to project (defaults to 'docs')",
     )
+    sub_new.add_argument(
+        "--component",
+        action="append",
+        metavar="KEY",
+        help="Also copy this component (repeatable; the starter set is always included)",
+    )
+    sub_new.add_argument(
+        "--all",
+        action="store_true",
+        help="Copy every component in the manifest instead of the starter set",
+    )
     sub_new.add_argument(
         "--force",
         action="store_true",
@@ -584,8 +993,14 @@ def build_parser() -> argparse.ArgumentParser:
     )
     sub_new.set_defaults(func=cmd_new)
 
-    sub_add = sub.add_parser("add", help="Copy a component into your project")
-    sub_add.add_argument("component", help="Component key to add (see `greeble list`)")
+    sub_add = sub.add_parser("add", help="Copy one or more components into your project")
+    sub_add.add_argument(
+        "components",
+        nargs="*",
+        metavar="component",
+        help="Component keys to add (see `greeble list`)",
+    )
+    sub_add.add_argument("--all", action="store_true", help="Add every component in the manifest")
     sub_add.add_argument(
         "--project",
         default=Path.cwd(),
@@ -630,10 +1045,18 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show the files that would be copied without writing them",
     )
+    sub_add.add_argument(
+        "--minify",
+        action="store_true",
+        help="Strip comments and insignificant whitespace from HTML/SVG files while copying",
+    )
     sub_add.set_defaults(func=cmd_add)
 
-    sub_sync = sub.add_parser("sync", help="Re-copy a component, overwriting existing files")
-    sub_sync.add_argument("component", help="Component key to sync")
+    sub_sync = sub.add_parser("sync", help="Re-copy components, overwriting changed files")
+    sub_sync.add_argument(
+        "components", nargs="*", metavar="component", help="Component keys to sync"
+    )
+    sub_sync.add_argument("--all", action="store_true", help="Sync every component in the manifest")
     sub_sync.add_argument(
         "--project",
         default=Path.cwd(),
@@ -666,7 +1089,12 @@ def build_parser() -> argparse.ArgumentParser:
     sub_sync.add_argument(
         "--backup",
         action="store_true",
-        help="Create backups of existing files before overwriting",
+        help="Back up locally edited files before overwriting them",
+    )
+    sub_sync.add_argument(
+        "--keep-local",
+        action="store_true",
+        help="Leave locally edited files alone when the library version has not changed",
     )
     sub_sync.add_argument(
         "--dry-run",
@@ -678,8 +1106,82 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Scaffold baseline Greeble assets into the project before syncing the component",
     )
+    sub_sync.add_argument(
+        "--minify",
+        action="store_true",
+        help="Strip comments and insignificant whitespace from HTML/SVG files while copying",
+    )
     sub_sync.set_defaults(func=cmd_sync)
 
+    sub_watch = sub.add_parser(
+        "watch", help="Copy component sources into the project whenever they change"
+    )
+    sub_watch.add_argument(
+        "components",
+        nargs="*",
+        metavar="component",
+        help="Component keys to watch (default: components recorded in .greeble.lock)",
+    )
+    sub_watch.add_argument("--all", action="store_true", help="Watch every component")
+    sub_watch.add_argument(
+        "--project",
+        default=Path.cwd(),
+        type=Path,
+        help="Destination project root (default: current directory)",
+    )
+    sub_watch.add_argument(
+        "--templates",
+        default=Path("templates"),
+        type=Path,
+        help="Templates root relative to project",
+    )
+    sub_watch.add_argument(
+        "--static",
+        default=Path("static"),
+        type=Path,
+        help="Static root relative to project",
+    )
+    sub_watch.add_argument(
+        "--docs",
+        default=Path("docs"),
+        type=Path,
+        help="Docs root relative to project",
+    )
+    sub_watch.add_argument(
+        "--include-docs",
+        action="store_true",
+        help="Watch documentation files alongside templates/static",
+    )
+    sub_watch.add_argument(
+        "--minify",
+        action="store_true",
+        help="Minify HTML/SVG files while copying",
+    )
+    sub_watch.add_argument(
+        "--notify",
+        metavar="URL",
+        help="POST changed paths to this dev-server URL after each sync "
+        "(e.g. http://127.0.0.1:8000/__greeble/reload)",
+    )
+    sub_watch.add_argument(
+        "--interval",
+        type=float,
+        default=0.25,
+        help="Seconds between stat polls (default: 0.25)",
+    )
+    sub_watch.add_argument(
+        "--debounce",
+        type=float,
+        default=0.1,
+        help="Quiet period that ends a burst of changes, in seconds (default: 0.1)",
+    )
+    sub_watch.add_argument(
+        "--no-inotify",
+        action="store_true",
+        help="Use plain stat polling even where inotify is available",
+    )
+    sub_watch.set_defaults(func=cmd_watch)
+
     sub_remove = sub.add_parser("remove", help="Remove a component's files from your project")
     sub_remove.add_argument("component", help="Component key to remove")
     sub_remove.add_argument(
@@ -752,8 +1254,145 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Emit a structured JSON report to stdout",
     )
+    sub_doctor.add_argument(
+        "--drift",
+        action="store_true",
+        help="Compare installed component files with the library (project: --project or cwd)",
+    )
+    sub_doctor.add_argument(
+        "--workers",
+        type=int,
+        help="Threads used to hash files for --drift (default: 4 per CPU, up to 32)",
+    )
     sub_doctor.set_defaults(func=cmd_doctor)
 
+    sub_minify = sub.add_parser(
+        "minify", help="Report bytes saved by minifying component templates and SVGs"
+    )
+    sub_minify.add_argument("components", nargs="*", help="Component keys to report (default: all)")
+    sub_minify.add_argument(
+        "--images",
+        action="store_true",
+        help="Include SVGs under public/images in the report",
+    )
+    sub_minify.add_argument("--json", action="store_true", help="Emit a JSON report")
+    sub_minify.set_defaults(func=cmd_minify)
+
+    sub_vendor = sub.add_parser(
+        "vendor", help="Download htmx/Hyperscript into the project with content-hashed names"
+    )
+    sub_vendor.add_argument(
+        "--project",
+        default=Path.cwd(),
+        type=Path,
+        help="Destination project root (default: current directory)",
+    )
+    sub_vendor.add_argument(
+        "--dest",
+        default=Path("static/greeble/vendor"),
+        type=Path,
+        help="Vendor directory relative to project (default: static/greeble/vendor)",
+    )
+    sub_vendor.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the scripts that would be downloaded",
+    )
+    sub_vendor.set_defaults(func=cmd_vendor)
+
+    sub_export = sub.add_parser(
+        "export-static", help="Prerender an app's full-page routes to static HTML (+ gzip)"
+    )
+    sub_export.add_argument("app", help="App to import as module:attribute (e.g. main:app)")
+    sub_export.add_argument(
+        "--route",
+        action="append",
+        help="Route to prerender (repeatable; default: the module's PRERENDER_ROUTES or /)",
+    )
+    sub_export.add_argument(
+        "--out",
+        default=Path("dist/prerender"),
+        type=Path,
+        help="Output directory (default: dist/prerender)",
+    )
+    sub_export.add_argument(
+        "--app-dir",
+        default=Path.cwd(),
+        type=Path,
+        help="Directory added to sys.path before importing the app (default: cwd)",
+    )
+    sub_export.add_argument(
+        "--no-gzip", action="store_true", help="Skip writing .gz variants next to each page"
+    )
+    sub_export.set_defaults(func=cmd_export_static)
+
+    sub_split = sub.add_parser(
+        "split-manifest", help="Convert the manifest into an index plus one file per component"
+    )
+    sub_split.add_argument(
+        "--out",
+        type=Path,
+        help="Where to write the index (default: overwrite the manifest in place)",
+    )
+    sub_split.add_argument(
+        "--shards",
+        default="manifest.d",
+        help="Shard directory, relative to the index (default: manifest.d)",
+    )
+    sub_split.set_defaults(func=cmd_split_manifest)
+
+    sub_loadtest = sub.add_parser(
+        "loadtest", help="Replay the components' htmx scenarios with concurrent users"
+    )
+    sub_loadtest.add_argument(
+        "components", nargs="*", help="Component keys (default: every component with scenarios)"
+    )
+    loadtest_target = sub_loadtest.add_mutually_exclusive_group(required=True)
+    loadtest_target.add_argument(
+        "--app",
+        help="In-process ASGI or WSGI app as module:attribute (e.g. examples.site.landing:app)",
+    )
+    loadtest_target.add_argument("--url", help="Base URL of a running server")
+    sub_loadtest.add_argument(
+        "--scenario", action="append", help="Only run scenarios with this name (repeatable)"
+    )
+    sub_loadtest.add_argument(
+        "--users", type=int, default=10, help="Concurrent virtual users (default: 10)"
+    )
+    sub_loadtest.add_argument(
+        "--iterations", type=int, default=3, help="Scenario runs per user (default: 3)"
+    )
+    sub_loadtest.add_argument(
+        "--no-think",
+        action="store_true",
+        help="Skip typing gaps and think time; send requests back to back",
+    )
+    sub_loadtest.add_argument("--json", action="store_true", help="Print a JSON report")
+    sub_loadtest.set_defaults(func=cmd_loadtest)
+
+    sub_profile = sub.add_parser("profile", help="Inspect slow-render profiler captures")
+    profile_sub = sub_profile.add_subparsers(dest="profile_cmd", required=True)
+    sub_profile_report = profile_sub.add_parser(
+        "report", help="Summarise the slowest templates and hottest functions"
+    )
+    sub_profile_report.add_argument(
+        "directory",
+        nargs="?",
+        default=Path(".greeble/profiles"),
+        type=Path,
+        help="Capture directory passed to configure_profiling() (default: .greeble/profiles)",
+    )
+    sub_profile_report.add_argument(
+        "--limit", type=int, default=15, help="Number of functions to list (default: 15)"
+    )
+    sub_profile_report.add_argument(
+        "--sort",
+        choices=["tottime", "cumtime", "calls"],
+        default="tottime",
+        help="Function ordering (default: tottime)",
+    )
+    sub_profile_report.set_defaults(func=cmd_profile_report)
+
     # Theme & Tailwind helpers
     sub_theme = sub.add_parser("theme", help="Theme and Tailwind helpers")
     theme_sub = sub_theme.add_subparsers(dest="theme_cmd", required=True)
@@ -797,6 +1436,34 @@ def build_parser() -> argparse.ArgumentParser:
     )
     sub_theme_init.set_defaults(func=cmd_theme_init)
 
+    sub_theme_css = theme_sub.add_parser(
+        "css", help="Compile a theme spec into CSS custom-property overrides"
+    )
+    sub_theme_css.add_argument("--palette", help="Palette preset (default: midnight)")
+    sub_theme_css.add_argument("--accent", help="Accent color override (#rrggbb)")
+    sub_theme_css.add_argument("--radius", help="Radius preset (default: lg)")
+    sub_theme_css.add_argument("--shadow", help="Shadow preset (default: medium)")
+    sub_theme_css.add_argument("--font", help="Font preset (default: system)")
+    sub_theme_css.add_argument("--scale", help="Spacing scale between 0.5 and 2 (default: 1)")
+    sub_theme_css.add_argument("--selector", default=":root", help="CSS selector (default: :root)")
+    sub_theme_css.add_argument("--out", type=Path, help="Write CSS to this file instead of stdout")
+    sub_theme_css.set_defaults(func=cmd_theme_css)
+
+    sub_theme_preset = theme_sub.add_parser(
+        "preset", help="Regenerate greeble_tailwind_preset/theme.cjs from the theme spec"
+    )
+    sub_theme_preset.add_argument(
+        "--out",
+        type=Path,
+        help="Output path (default: packages/greeble_tailwind_preset/theme.cjs in the repo)",
+    )
+    sub_theme_preset.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if the file differs from the generated output instead of writing it",
+    )
+    sub_theme_preset.set_defaults(func=cmd_theme_preset)
+
     return parser
 
 
@@ -810,7 +1477,118 @@ def main(argv: Sequence[str] | None = None) -> int:
         print(f"error: {exc}", file=sys.stderr)
         return 2
 
-    return args.func(args, manifest)
+    try:
+        return args.func(args, manifest)
+    except ManifestError as exc:  # e.g. a missing or invalid component shard
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+
+def cmd_loadtest(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.prerender import PrerenderError, import_app
+
+    from .loadtest import LoadtestError, component_scenarios, report_json, run_loadtest
+
+    keys = args.components or list(manifest.keys())
+    try:
+        scenarios = [
+            scenario for key in keys for scenario in component_scenarios(manifest.get(key))
+        ]
+    except KeyError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except LoadtestError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+    if not scenarios:
+        print("error: no loadtest scenarios selected", file=sys.stderr)
+        return 2
+
+    try:
+        app = import_app(args.app)[0] if args.app else None
+        report = run_loadtest(
+            scenarios,
+            app=app,
+            url=args.url,
+            users=args.users,
+            iterations=args.iterations,
+            think=not args.no_think,
+        )
+    except (PrerenderError, LoadtestError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(report_json(report) if args.json else report.summary())
+    return 0
+
+
+def cmd_profile_report(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.profiling import summarize_captures
+
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"error: capture directory not found: {directory}", file=sys.stderr)
+        return 2
+    report = summarize_captures(directory, limit=args.limit, sort=args.sort)
+    if not report.captures:
+        print(f"No captures in {directory}.")
+        return 0
+
+    print(f"{report.captures} capture(s) in {directory}\n")
+    print(f"{'template':<40} {'captures':>8} {'mean ms':>9} {'max ms':>9}  hx-target")
+    for row in report.templates:
+        targets = ", ".join(row.hx_targets) or "-"
+        print(
+            f"{row.template:<40} {row.captures:>8} {row.mean_ms:>9.1f} {row.max_ms:>9.1f}  {targets}"
+        )
+    print(f"\n{'calls':>9} {'tottime s':>10} {'cumtime s':>10}  function")
+    for fn in report.functions:
+        print(f"{fn.calls:>9} {fn.tottime:>10.4f} {fn.cumtime:>10.4f}  {fn.location}")
+    return 0
+
+
+def cmd_theme_css(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.theme import ThemeError, ThemeSpec, compile_theme_css
+
+    options = {
+        key: getattr(args, key)
+        for key in ("palette", "accent", "radius", "shadow", "font", "scale")
+        if getattr(args, key)
+    }
+    try:
+        css = compile_theme_css(ThemeSpec.from_mapping(options), selector=args.selector)
+    except ThemeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.out:
+        Path(args.out).write_text(css, encoding="utf-8")
+        print(f"Wrote theme CSS to {args.out}")
+    else:
+        print(css, end="")
+    return 0
+
+
+def cmd_theme_preset(args: argparse.Namespace, manifest: Manifest) -> int:
+    from greeble.theme import tailwind_theme_source
+
+    default_path = manifest.root / "packages" / "greeble_tailwind_preset" / "theme.cjs"
+    target = Path(args.out) if args.out else default_path
+    source = tailwind_theme_source()
+    current = target.read_text(encoding="utf-8") if target.exists() else None
+    if args.check:
+        if current == source:
+            print(f"{target} is up to date")
+            return 0
+        print(f"{target} is out of date; run `greeble theme preset`", file=sys.stderr)
+        return 1
+    if current == source:
+        print(f"{target} is up to date")
+        return 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(source, encoding="utf-8")
+    print(f"Wrote Tailwind theme preset to {target}")
+    return 0
 
 
 def cmd_theme_init(args: argparse.Namespace, manifest: Manifest) -> int:
@@ -919,6 +1697,8 @@ def cmd_theme_init(args: argparse.Namespace, manifest: Manifest) -> int:
 
 
 def cmd_init(args: argparse.Namespace, manifest: Manifest) -> int:
+    from .starter import StarterError, scaffold_baseline_assets
+
     project_root = Path(args.project).resolve()
     dry_run = bool(args.dry_run)
     try:
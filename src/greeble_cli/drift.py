@@ -0,0 +1,200 @@
+"""
+Drift detection: compare component files copied into a project with the library sources.
+
+Files are hashed on a thread pool (chunked reads, `mmap` for large files) and each
+digest is cached by `(inode, mtime_ns, size)` in the CLI cache directory, so a repeated
+`greeble doctor --drift` over an unchanged tree only pays for `stat()` calls.
+
+When the project lockfile records that a file was installed minified, the installed
+hash from the lock is the expected value instead of the source hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .lockfile import Lockfile
+from .manifest import Component, Manifest, _cache_file, _read_cache, _write_cache
+from .scaffold import CopyPlan, ScaffoldError, build_copy_plan
+
+__all__ = [
+    "ComponentDrift",
+    "FileDrift",
+    "FileHasher",
+    "detect_drift",
+]
+
+CHUNK_SIZE = 1 << 20
+MMAP_THRESHOLD = 8 << 20
+# Bump when the cached digest format changes.
+HASH_CACHE_FORMAT = 1
+
+
+def _default_workers() -> int:
+    # Hashing is I/O bound on cold caches; a few threads per core keeps disks busy.
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+def _digest(path: Path, size: int) -> str:
+    with path.open("rb") as handle:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        digest = hashlib.sha256()
+        while chunk := handle.read(CHUNK_SIZE):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class FileHasher:
+    """SHA-256 file digests with a persistent `(inode, mtime_ns, size)` cache."""
+
+    def __init__(self, cache_key: str, *, workers: int | None = None) -> None:
+        self.workers = workers or _default_workers()
+        self._cache_path = _cache_file("hashes", f"{HASH_CACHE_FORMAT}:{cache_key}")
+        cached = _read_cache(self._cache_path)
+        self._cache: dict[str, list[object]] = cached if isinstance(cached, dict) else {}
+        self._seen: dict[str, list[object]] = {}
+        self.hashed = 0
+
+    def _hash(self, path: Path) -> tuple[str | None, bool]:
+        """Return `(digest, whether the file had to be read)`."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None, False
+        identity = [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+        key = str(path)
+        cached = self._cache.get(key)
+        read = not (isinstance(cached, list) and cached[:3] == identity)
+        if read:
+            try:
+                digest = _digest(path, stat.st_size)
+            except OSError:
+                return None, False
+        else:
+            digest = str(cached[3])  # type: ignore[index]
+        self._seen[key] = [*identity, digest]
+        return digest, read
+
+    def hash_many(self, paths: Iterable[Path]) -> dict[Path, str | None]:
+        """Return `{path: digest or None when missing}` for every unique path."""
+        unique = list(dict.fromkeys(paths))
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="greeble-hash") as pool:
+            results = list(pool.map(self._hash, unique))
+        self.hashed += sum(read for _, read in results)
+        return {path: digest for path, (digest, _) in zip(unique, results, strict=True)}
+
+    def save(self) -> None:
+        """Persist the digests seen in this run (dropping entries for vanished files)."""
+        if self._seen != self._cache:
+            _write_cache(self._cache_path, self._seen)
+
+
+@dataclass(frozen=True)
+class FileDrift:
+    source: Path
+    destination: Path
+    state: str  # "ok", "modified", or "missing"
+
+
+@dataclass(frozen=True)
+class ComponentDrift:
+    key: str
+    files: list[FileDrift] = field(default_factory=list)
+
+    @property
+    def drifted(self) -> list[FileDrift]:
+        return [entry for entry in self.files if entry.state != "ok"]
+
+
+def _component_plans(
+    manifest: Manifest,
+    component: Component,
+    *,
+    project_root: Path,
+    templates_dir: Path,
+    static_dir: Path,
+    docs_dir: Path | None,
+    include_docs: bool,
+) -> list[CopyPlan]:
+    try:
+        return build_copy_plan(
+            manifest=manifest,
+            component=component,
+            project_root=project_root,
+            templates_dir=templates_dir,
+            static_dir=static_dir,
+            include_docs=include_docs,
+            docs_dir=docs_dir,
+        )
+    except ScaffoldError:
+        return []  # missing sources are reported by the regular doctor checks
+
+
+def detect_drift(
+    manifest: Manifest,
+    components: Sequence[Component],
+    *,
+    project_root: Path,
+    templates_dir: Path,
+    static_dir: Path,
+    docs_dir: Path | None,
+    include_docs: bool,
+    workers: int | None = None,
+) -> list[ComponentDrift]:
+    """Compare installed components with the library; components not installed are skipped.
+
+    A component counts as installed when any of its destinations exists or the lockfile
+    records it.
+    """
+    lock = Lockfile.load(project_root)
+    planned = [
+        (
+            component,
+            _component_plans(
+                manifest,
+                component,
+                project_root=project_root,
+                templates_dir=templates_dir,
+                static_dir=static_dir,
+                docs_dir=docs_dir,
+                include_docs=include_docs,
+            ),
+        )
+        for component in components
+    ]
+
+    # One parallel pass stats (and, on cache misses, hashes) every source and destination.
+    hasher = FileHasher(str(project_root), workers=workers)
+    paths = [path for _, plans in planned for p in plans for path in (p.source, p.destination)]
+    digests = hasher.hash_many(paths)
+    hasher.save()
+
+    report: list[ComponentDrift] = []
+    for component, plans in planned:
+        installed_any = any(digests[plan.destination] is not None for plan in plans)
+        if not installed_any and component.key not in lock.components:
+            continue
+        files: list[FileDrift] = []
+        for plan in plans:
+            installed = digests[plan.destination]
+            expected = digests[plan.source]
+            entry = lock.entry(component.key, lock.key_for(plan.destination))
+            if entry is not None and entry.minified and entry.source == expected:
+                expected = entry.installed
+            if installed is None:
+                state = "missing"
+            elif installed != expected:
+                state = "modified"
+            else:
+                state = "ok"
+            files.append(FileDrift(source=plan.source, destination=plan.destination, state=state))
+        report.append(ComponentDrift(key=component.key, files=files))
+    return report
@@ -0,0 +1,656 @@
+"""
+Replay htmx interactions against an app and report latency and bytes per step.
+
+Purpose:
+    Each component can declare `loadtest` scenarios in the manifest, next to its
+    `endpoints`. A scenario is a list of steps that reproduce what htmx sends while
+    someone uses the component: debounced keystrokes in a search box, scrolling an
+    infinite list, paging a table, or holding an SSE stream open. `greeble loadtest`
+    runs them with concurrent virtual users, either in-process (ASGI through an httpx
+    transport, WSGI through direct calls) or against a running server.
+
+Scenario format (inside a manifest component):
+
+    loadtest:
+      - name: type-to-search
+        steps:
+          - method: POST
+            path: /palette/search
+            hx_target: palette-results
+            type: {field: q, text: "invoice", keystroke_ms: [110, 110, 420], debounce_ms: 250}
+      - name: scroll
+        steps:
+          - {path: "/list?cursor={i}", repeat: 5, think_ms: 800}
+      - name: live
+        steps:
+          - {path: /stream, sse_events: 2}
+
+Step keys:
+    - `method` / `path`: the request (default GET). `{i}` in the path, `params`, or
+      `form` is replaced with the 1-based repeat index; other braces are left alone.
+    - `params` / `form`: query parameters and url-encoded form fields.
+    - `headers`, `hx_target`: extra headers. Every step except SSE sends `HX-Request`.
+    - `repeat`, `think_ms`: send the request `repeat` times, pausing `think_ms`
+      before each one.
+    - `type`: type `text` into `field` with the given gaps between keystrokes (cycled).
+      As with `hx-trigger="keyup changed delay:<debounce_ms>ms"`, a request is sent
+      only after a gap of at least `debounce_ms`, and once more after the last key.
+    - `sse_events`: open an event stream and read this many events, then disconnect.
+
+Latency percentiles are exact (nearest rank over every request's duration), not
+estimated from histogram buckets, so slow outliers are reported as measured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import io
+import json
+import math
+import sys
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+if TYPE_CHECKING:
+    from .manifest import Component
+
+__all__ = [
+    "LoadReport",
+    "LoadtestError",
+    "PlannedRequest",
+    "Scenario",
+    "Step",
+    "StepReport",
+    "Typing",
+    "component_scenarios",
+    "open_target",
+    "report_json",
+    "run_loadtest",
+]
+
+_STEP_KEYS = {
+    "name",
+    "method",
+    "path",
+    "params",
+    "form",
+    "headers",
+    "hx_target",
+    "repeat",
+    "think_ms",
+    "type",
+    "sse_events",
+}
+
+
+class LoadtestError(RuntimeError):
+    """Raised for invalid scenarios or targets."""
+
+
+def _fill_index(value: str, index: int) -> str:
+    """Replace `{i}` with `index`; unlike `str.format`, other braces stay literal."""
+    return value.replace("{i}", str(index))
+
+
+@dataclass(frozen=True)
+class Typing:
+    """Keystrokes typed into one field under an `hx-trigger` debounce."""
+
+    field: str
+    text: str
+    keystroke_ms: tuple[float, ...] = (120.0,)
+    debounce_ms: float = 250.0
+
+    def bursts(self) -> list[tuple[float, str]]:
+        """Return `(seconds since the previous request, value)` for each request fired."""
+        fired: list[tuple[float, str]] = []
+        now = last = 0.0
+        for index in range(1, len(self.text) + 1):
+            last_key = index == len(self.text)
+            gap = self.keystroke_ms[(index - 1) % len(self.keystroke_ms)]
+            if last_key or gap >= self.debounce_ms:
+                at = now + self.debounce_ms
+                fired.append(((at - last) / 1000, self.text[:index]))
+                last = at
+            now += gap
+        return fired
+
+
+@dataclass(frozen=True)
+class PlannedRequest:
+    step: str
+    method: str
+    url: str
+    headers: Mapping[str, str]
+    body: bytes
+    delay: float  # seconds to wait before sending (think time, typing)
+    sse_events: int = 0
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    method: str = "GET"
+    path: str = "/"
+    params: Mapping[str, str] = field(default_factory=dict)
+    form: Mapping[str, str] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
+    hx_target: str | None = None
+    repeat: int = 1
+    think_ms: float = 0.0
+    typing: Typing | None = None
+    sse_events: int = 0
+
+    def requests(self) -> list[PlannedRequest]:
+        """Expand the step into the concrete requests one user sends."""
+        if self.typing is not None:
+            key = self.typing.field
+            values = [
+                (delay, {**self.params, key: text}, {**self.form, key: text})
+                for delay, text in self.typing.bursts()
+            ]
+        else:
+            values = [
+                (
+                    self.think_ms / 1000,
+                    {k: _fill_index(v, i) for k, v in self.params.items()},
+                    {k: _fill_index(v, i) for k, v in self.form.items()},
+                )
+                for i in range(1, self.repeat + 1)
+            ]
+        headers = dict(self.headers)
+        if self.sse_events:
+            headers.setdefault("Accept", "text/event-stream")
+        else:
+            headers.setdefault("HX-Request", "true")
+        if self.hx_target:
+            headers.setdefault("HX-Target", self.hx_target)
+
+        planned = []
+        for index, (delay, params, form) in enumerate(values, start=1):
+            path = _fill_index(self.path, index) if self.typing is None else self.path
+            query = {**params, **form} if self.method == "GET" else params
+            if query:
+                path += ("&" if "?" in path else "?") + urlencode(query)
+            body = urlencode(form).encode() if form and self.method != "GET" else b""
+            request_headers = dict(headers)
+            if body:
+                request_headers["Content-Type"] = "application/x-www-form-urlencoded"
+            planned.append(
+                PlannedRequest(
+                    step=self.name,
+                    method=self.method,
+                    url=path,
+                    headers=request_headers,
+                    body=body,
+                    delay=delay,
+                    sse_events=self.sse_events,
+                )
+            )
+        return planned
+
+
+@dataclass(frozen=True)
+class Scenario:
+    component: str
+    name: str
+    steps: tuple[Step, ...]
+
+    @property
+    def label(self) -> str:
+        return f"{self.component}/{self.name}"
+
+    def requests(self) -> list[PlannedRequest]:
+        return [request for step in self.steps for request in step.requests()]
+
+
+def _str_map(owner: str, key: str, value: Any) -> dict[str, str]:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise LoadtestError(f"{owner}: '{key}' must be a mapping")
+    return {str(k): str(v) for k, v in value.items()}
+
+
+def _parse_typing(owner: str, raw: Any) -> Typing:
+    if not isinstance(raw, dict) or not raw.get("field") or not raw.get("text"):
+        raise LoadtestError(f"{owner}: 'type' needs 'field' and 'text'")
+    gaps = raw.get("keystroke_ms", [120])
+    if not isinstance(gaps, list):
+        gaps = [gaps]
+    if not gaps or not all(isinstance(gap, int | float) and gap >= 0 for gap in gaps):
+        raise LoadtestError(f"{owner}: 'keystroke_ms' must be non-negative numbers")
+    return Typing(
+        field=str(raw["field"]),
+        text=str(raw["text"]),
+        keystroke_ms=tuple(float(gap) for gap in gaps),
+        debounce_ms=float(raw.get("debounce_ms", 250)),
+    )
+
+
+def _parse_step(owner: str, raw: Any) -> Step:
+    if not isinstance(raw, dict) or not isinstance(raw.get("path"), str):
+        raise LoadtestError(f"{owner}: each step must be a mapping with a 'path'")
+    unknown = set(raw) - _STEP_KEYS
+    if unknown:
+        raise LoadtestError(f"{owner}: unknown step keys: {', '.join(sorted(unknown))}")
+    method = str(raw.get("method", "GET")).upper()
+    repeat = raw.get("repeat", 1)
+    sse_events = raw.get("sse_events", 0)
+    if not isinstance(repeat, int) or repeat < 1:
+        raise LoadtestError(f"{owner}: 'repeat' must be a positive integer")
+    if not isinstance(sse_events, int) or sse_events < 0:
+        raise LoadtestError(f"{owner}: 'sse_events' must be a non-negative integer")
+    return Step(
+        name=str(raw.get("name") or f"{method} {raw['path']}"),
+        method=method,
+        path=raw["path"],
+        params=_str_map(owner, "params", raw.get("params")),
+        form=_str_map(owner, "form", raw.get("form")),
+        headers=_str_map(owner, "headers", raw.get("headers")),
+        hx_target=raw.get("hx_target"),
+        repeat=repeat,
+        think_ms=float(raw.get("think_ms", 0)),
+        typing=_parse_typing(owner, raw["type"]) if "type" in raw else None,
+        sse_events=sse_events,
+    )
+
+
+def component_scenarios(component: Component) -> list[Scenario]:
+    """Parse the `loadtest` scenarios declared for `component`."""
+    scenarios = []
+    for position, raw in enumerate(component.loadtest, start=1):
+        name = str(raw.get("name") or f"scenario-{position}")
+        owner = f"{component.key}/{name}"
+        steps = raw.get("steps")
+        if not isinstance(steps, list) or not steps:
+            raise LoadtestError(f"{owner}: 'steps' must be a non-empty list")
+        scenarios.append(
+            Scenario(
+                component=component.key,
+                name=name,
+                steps=tuple(_parse_step(owner, step) for step in steps),
+            )
+        )
+    return scenarios
+
+
+@dataclass(frozen=True)
+class _Result:
+    status: int
+    size: int
+    events: int = 0
+
+
+def _percentile(ordered: Sequence[int], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q * len(ordered)))
+    return float(ordered[rank - 1])
+
+
+class _StepStats:
+    __slots__ = ("errors", "events", "latencies", "size")
+
+    def __init__(self) -> None:
+        self.latencies: list[int] = []  # nanoseconds, one per request
+        self.size = 0
+        self.errors = 0
+        self.events = 0
+
+    def record(self, result: _Result, elapsed_ns: int) -> None:
+        self.latencies.append(elapsed_ns)
+        self.size += result.size
+        self.events += result.events
+        if not 200 <= result.status < 400:
+            self.errors += 1
+
+
+@dataclass(frozen=True)
+class StepReport:
+    scenario: str
+    step: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_bytes: float
+    total_bytes: int
+    events: int
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    users: int
+    iterations: int
+    seconds: float
+    steps: list[StepReport]
+
+    @property
+    def requests(self) -> int:
+        return sum(step.requests for step in self.steps)
+
+    def summary(self) -> str:
+        header = (
+            f"{'scenario':<28} {'step':<28} {'reqs':>6} {'err':>4} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'bytes/req':>10}"
+        )
+        lines = [header]
+        for row in self.steps:
+            lines.append(
+                f"{row.scenario:<28} {row.step:<28} {row.requests:>6} {row.errors:>4} "
+                f"{row.p50_ms:>8.2f} {row.p95_ms:>8.2f} {row.p99_ms:>8.2f} {row.mean_bytes:>10.0f}"
+            )
+        rate = self.requests / self.seconds if self.seconds else 0.0
+        lines.append(
+            f"\n{self.requests} request(s) from {self.users} user(s) x {self.iterations} "
+            f"iteration(s) in {self.seconds:.2f}s ({rate:.1f} req/s)"
+        )
+        return "\n".join(lines)
+
+
+class _HttpxTarget:
+    """Requests through an `httpx.AsyncClient` (a server URL or an ASGI transport)."""
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    async def send(self, request: PlannedRequest) -> _Result:
+        if request.sse_events:
+            return await self._stream(request)
+        response = await self.client.request(
+            request.method, request.url, headers=request.headers, content=request.body
+        )
+        return _Result(response.status_code, len(response.content))
+
+    async def _stream(self, request: PlannedRequest) -> _Result:
+        events = size = 0
+        async with self.client.stream(
+            request.method, request.url, headers=request.headers, content=request.body
+        ) as response:
+            async for line in response.aiter_lines():
+                size += len(line) + 1
+                events += line.startswith("data:")
+                if events >= request.sse_events:
+                    break
+        return _Result(response.status_code, size, events)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class _StopStream(Exception):
+    pass
+
+
+class _AsgiTarget(_HttpxTarget):
+    """In-process ASGI app through httpx's ASGI transport.
+
+    SSE steps call the app directly: the transport buffers the whole response, which
+    never ends for an event stream.
+    """
+
+    def __init__(self, client: Any, app: Any) -> None:
+        super().__init__(client)
+        self.app = app
+
+    async def _stream(self, request: PlannedRequest) -> _Result:
+        path, _, query = request.url.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": [
+                (b"host", b"loadtest"),
+                *(
+                    (k.lower().encode("latin-1"), v.encode("latin-1"))
+                    for k, v in request.headers.items()
+                ),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        status = 500
+        events = size = 0
+        disconnected = asyncio.Event()
+        body_sent = False
+
+        async def receive() -> dict[str, Any]:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": request.body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status, events, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                events += chunk.count(b"data:")
+                if events >= request.sse_events:
+                    disconnected.set()
+                    raise _StopStream
+
+        try:
+            await self.app(scope, receive, send)
+        except _StopStream:
+            pass
+        return _Result(status, size, events)
+
+
+class _WsgiTarget:
+    """In-process WSGI app called directly, one worker thread per in-flight request.
+
+    The pool is sized to the number of users so requests are not capped by the
+    event loop's default executor.
+    """
+
+    def __init__(self, app: Any, *, workers: int = 1) -> None:
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="greeble-loadtest"
+        )
+
+    async def send(self, request: PlannedRequest) -> _Result:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call, request)
+
+    def _call(self, request: PlannedRequest) -> _Result:
+        path, _, query = request.url.partition("?")
+        environ: dict[str, Any] = {
+            "REQUEST_METHOD": request.method,
+            "SCRIPT_NAME": "",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "loadtest",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": "loadtest",
+            "CONTENT_LENGTH": str(len(request.body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(request.body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for key, value in request.headers.items():
+            if key.lower() == "content-type":
+                environ["CONTENT_TYPE"] = value
+            else:
+                environ["HTTP_" + key.upper().replace("-", "_")] = value
+
+        status = 500
+        size = events = 0
+
+        def write(data: bytes) -> None:
+            nonlocal size
+            size += len(data)
+
+        def start_response(
+            status_line: str, headers: list[tuple[str, str]], exc_info: Any = None
+        ) -> Callable[[bytes], None]:
+            nonlocal status
+            status = int(status_line.split(None, 1)[0])
+            return write
+
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                size += len(chunk)
+                if request.sse_events:
+                    events += chunk.count(b"data:")
+                    if events >= request.sse_events:
+                        break
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        return _Result(status, size, events)
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+def _is_asgi(app: Any) -> bool:
+    if inspect.iscoroutinefunction(app):
+        return True
+    return callable(app) and inspect.iscoroutinefunction(type(app).__call__)
+
+
+def open_target(
+    *, app: Any = None, url: str | None = None, users: int = 1
+) -> _HttpxTarget | _WsgiTarget:
+    """Return a target for an in-process ASGI/WSGI `app` or a server at `url`.
+
+    WSGI apps get one worker thread per user.
+    """
+    if (app is None) == (url is None):
+        raise LoadtestError("pass exactly one of an app or a server URL")
+    if app is not None and not _is_asgi(app):
+        return _WsgiTarget(app, workers=users)
+    try:
+        import httpx
+    except ImportError:
+        raise LoadtestError("ASGI apps and server URLs need httpx (pip install httpx)") from None
+    if url is not None:
+        return _HttpxTarget(httpx.AsyncClient(base_url=url, timeout=30.0))
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return _AsgiTarget(httpx.AsyncClient(transport=transport, base_url="http://loadtest"), app)
+
+
+async def _user(
+    target: _HttpxTarget | _WsgiTarget,
+    plans: Sequence[tuple[str, list[PlannedRequest]]],
+    stats: dict[tuple[str, str], _StepStats],
+    *,
+    iterations: int,
+    think: bool,
+) -> None:
+    for _ in range(iterations):
+        for label, requests in plans:
+            for request in requests:
+                if think and request.delay:
+                    await asyncio.sleep(request.delay)
+                started = time.perf_counter_ns()
+                try:
+                    result = await target.send(request)
+                except Exception:  # noqa: BLE001
+                    # Connection failures and app exceptions count as errors.
+                    result = _Result(status=0, size=0)
+                stats[label, request.step].record(result, time.perf_counter_ns() - started)
+
+
+async def _run(
+    target: _HttpxTarget | _WsgiTarget,
+    scenarios: Iterable[Scenario],
+    *,
+    users: int,
+    iterations: int,
+    think: bool,
+) -> LoadReport:
+    plans = [(scenario.label, scenario.requests()) for scenario in scenarios]
+    stats: dict[tuple[str, str], _StepStats] = {}
+    for label, requests in plans:
+        for request in requests:
+            stats.setdefault((label, request.step), _StepStats())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(_user(target, plans, stats, iterations=iterations, think=think) for _ in range(users))
+        )
+    finally:
+        await target.close()
+    seconds = time.perf_counter() - started
+    rows = []
+    for (label, step), step_stats in stats.items():
+        latencies = sorted(step_stats.latencies)
+        count = len(latencies)
+        rows.append(
+            StepReport(
+                scenario=label,
+                step=step,
+                requests=count,
+                errors=step_stats.errors,
+                p50_ms=_percentile(latencies, 0.5) / 1e6,
+                p95_ms=_percentile(latencies, 0.95) / 1e6,
+                p99_ms=_percentile(latencies, 0.99) / 1e6,
+                mean_bytes=step_stats.size / count if count else 0.0,
+                total_bytes=step_stats.size,
+                events=step_stats.events,
+            )
+        )
+    return LoadReport(users=users, iterations=iterations, seconds=seconds, steps=rows)
+
+
+def run_loadtest(
+    scenarios: Sequence[Scenario],
+    *,
+    app: Any = None,
+    url: str | None = None,
+    users: int = 1,
+    iterations: int = 1,
+    think: bool = True,
+) -> LoadReport:
+    """Run every scenario `iterations` times for each of `users` concurrent users.
+
+    With `think=False`, typing gaps and think time are skipped, so requests go out
+    back to back.
+    """
+    if users < 1 or iterations < 1:
+        raise LoadtestError("users and iterations must be at least 1")
+    if not scenarios:
+        raise LoadtestError("no scenarios to run")
+    target = open_target(app=app, url=url, users=users)
+    return asyncio.run(_run(target, scenarios, users=users, iterations=iterations, think=think))
+
+
+def report_json(report: LoadReport) -> str:
+    """Serialize `report` for `greeble loadtest --json`."""
+    payload = {
+        "users": report.users,
+        "iterations": report.iterations,
+        "seconds": round(report.seconds, 4),
+        "requests": report.requests,
+        "steps": [asdict(step) for step in report.steps],
+    }
+    return json.dumps(payload, indent=2)
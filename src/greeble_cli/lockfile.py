@@ -0,0 +1,225 @@
+"""
+Project lockfile (`.greeble.lock`) recording what the CLI copied into a project.
+
+Each component file is stored by its project-relative destination with:
+
+- `source`: sha256 of the library source at the time it was copied
+- `installed`: sha256 of the bytes written (differs from `source` when minified)
+- `minified`: whether `--minify` produced the installed bytes
+- `source_stamp` / `stamp`: `(mtime_ns, size)` of the source and destination, so
+  unchanged files are recognised from a `stat()` without re-hashing
+
+Comparing the lock (base), the library source (upstream), and the project copy (local)
+gives a three-way state per file; `add`/`sync` skip unchanged files and only back up
+files with local edits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .scaffold import CopyPlan, ScaffoldError
+
+__all__ = [
+    "CONFLICT",
+    "LOCAL",
+    "LOCALLY_MODIFIED",
+    "LOCKFILE_NAME",
+    "MISSING",
+    "UNCHANGED",
+    "UNTRACKED",
+    "UPSTREAM",
+    "LockEntry",
+    "Lockfile",
+    "PlanStatus",
+    "classify_plans",
+    "file_sha256",
+]
+
+LOCKFILE_NAME = ".greeble.lock"
+LOCK_VERSION = 1
+
+# File states, from the point of view of (lock, source, destination)
+MISSING = "missing"  # destination does not exist
+UNCHANGED = "unchanged"  # destination matches what the source would produce
+UPSTREAM = "upstream"  # source changed since the last copy; no local edits
+LOCAL = "local"  # destination edited locally; source unchanged
+CONFLICT = "conflict"  # both the source and the destination changed
+UNTRACKED = "untracked"  # destination differs and the lock has no record of it
+
+# States whose destination holds content the library cannot reproduce.
+LOCALLY_MODIFIED = frozenset({LOCAL, CONFLICT, UNTRACKED})
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class LockEntry:
+    source: str
+    installed: str
+    minified: bool
+    source_stamp: tuple[int, int]
+    stamp: tuple[int, int]
+
+
+@dataclass(frozen=True)
+class PlanStatus:
+    component: str
+    plan: CopyPlan
+    key: str
+    state: str
+    source_hash: str
+
+
+class Lockfile:
+    """Per-project record of copied component files, keyed by component and destination."""
+
+    def __init__(self, path: Path, components: dict[str, dict[str, LockEntry]]) -> None:
+        self.path = path
+        self.components = components
+        self.changed = False
+
+    @classmethod
+    def load(cls, project_root: Path) -> Lockfile:
+        path = project_root / LOCKFILE_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls(path, {})
+        except (OSError, ValueError) as exc:
+            raise ScaffoldError(f"Unreadable lockfile {path}: {exc}") from exc
+        if not isinstance(data, dict) or data.get("version") != LOCK_VERSION:
+            raise ScaffoldError(f"Unsupported lockfile format in {path}; delete it to rebuild")
+        components: dict[str, dict[str, LockEntry]] = {}
+        try:
+            for component, files in data["components"].items():
+                components[component] = {
+                    key: LockEntry(
+                        source=entry["source"],
+                        installed=entry["installed"],
+                        minified=entry["minified"],
+                        source_stamp=tuple(entry["source_stamp"]),
+                        stamp=tuple(entry["stamp"]),
+                    )
+                    for key, entry in files.items()
+                }
+        except (AttributeError, KeyError, TypeError) as exc:
+            raise ScaffoldError(f"Malformed lockfile {path}: {exc}") from exc
+        return cls(path, components)
+
+    def key_for(self, destination: Path) -> str:
+        return destination.relative_to(self.path.parent).as_posix()
+
+    def entry(self, component: str, key: str) -> LockEntry | None:
+        return self.components.get(component, {}).get(key)
+
+    def record(self, component: str, status: PlanStatus, *, minified: bool) -> None:
+        """Record the file just written for `status` (hashes the destination once)."""
+        destination = status.plan.destination
+        entry = LockEntry(
+            source=status.source_hash,
+            installed=status.source_hash if not minified else file_sha256(destination),
+            minified=minified,
+            source_stamp=_stamp(status.plan.source) or (0, 0),
+            stamp=_stamp(destination) or (0, 0),
+        )
+        self._store(component, status.key, entry)
+
+    def adopt(self, component: str, status: PlanStatus, *, minified: bool) -> None:
+        """Refresh stamps for a file found unchanged so the next run skips hashing it."""
+        current = self.entry(component, status.key)
+        if current is None or current.stamp != _stamp(status.plan.destination):
+            self.record(component, status, minified=minified)
+
+    def forget(self, component: str, keys: Iterable[str]) -> None:
+        files = self.components.get(component)
+        if files is None:
+            return
+        for key in keys:
+            if files.pop(key, None) is not None:
+                self.changed = True
+        if not files:
+            del self.components[component]
+
+    def _store(self, component: str, key: str, entry: LockEntry) -> None:
+        files = self.components.setdefault(component, {})
+        if files.get(key) != entry:
+            files[key] = entry
+            self.changed = True
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+        payload = {
+            "version": LOCK_VERSION,
+            "components": {
+                component: {key: asdict(files[key]) for key in sorted(files)}
+                for component, files in sorted(self.components.items())
+            },
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as exc:
+            tmp.unlink(missing_ok=True)
+            raise ScaffoldError(f"Failed to write lockfile {self.path}: {exc}") from exc
+        self.changed = False
+
+
+def _source_hash(plan: CopyPlan, entry: LockEntry | None) -> str:
+    if entry is not None and entry.source_stamp == _stamp(plan.source):
+        return entry.source
+    return file_sha256(plan.source)
+
+
+def _installed_hash(plan: CopyPlan, entry: LockEntry | None) -> str:
+    if entry is not None and entry.stamp == _stamp(plan.destination):
+        return entry.installed
+    return file_sha256(plan.destination)
+
+
+def classify_plans(
+    lock: Lockfile, component: str, plans: Iterable[CopyPlan], *, minify: bool
+) -> list[PlanStatus]:
+    """Return the three-way state of every planned file."""
+    statuses: list[PlanStatus] = []
+    for plan in plans:
+        key = lock.key_for(plan.destination)
+        entry = lock.entry(component, key)
+        source_hash = _source_hash(plan, entry)
+        if not plan.destination.exists():
+            state = MISSING
+        elif entry is None:
+            # No base to compare against: only an identical plain copy counts as unchanged.
+            same = not minify and file_sha256(plan.destination) == source_hash
+            state = UNCHANGED if same else UNTRACKED
+        else:
+            local_edit = _installed_hash(plan, entry) != entry.installed
+            upstream = source_hash != entry.source or entry.minified != minify
+            if local_edit:
+                state = CONFLICT if upstream else LOCAL
+            else:
+                state = UPSTREAM if upstream else UNCHANGED
+        statuses.append(
+            PlanStatus(
+                component=component, plan=plan, key=key, state=state, source_hash=source_hash
+            )
+        )
+    return statuses
@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
-from importlib import metadata
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-
-import yaml
+from typing import Any
 
 __all__ = [
     "Component",
+    "IndexEntry",
     "Manifest",
     "ManifestError",
+    "cache_dir",
     "default_manifest_path",
     "load_manifest",
+    "split_manifest",
 ]
 
+# Bump when the cached payload layout or validation rules change.
+CACHE_FORMAT = 3
+
 
 @dataclass(frozen=True)
 class Component:
@@ -24,12 +31,59 @@ class Component:
     title: str
     summary: str
     files: list[str]
+    # Raw `loadtest` scenarios; parsed and validated by `greeble_cli.loadtest`.
+    loadtest: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """The listing fields of a component, available without loading its details."""
+
+    key: str
+    title: str
+    summary: str
+
+
+class ShardedComponents(Mapping[str, Component]):
+    """Component mapping backed by an index plus one YAML file per component.
+
+    Membership, iteration, and `len()` only consult the index; a component's shard is
+    read (and validated) the first time it is looked up. With `use_cache=False` shards
+    are always parsed from YAML and the JSON cache is neither read nor written.
+    """
+
+    def __init__(
+        self, index: Mapping[str, IndexEntry], directory: Path, *, use_cache: bool = True
+    ) -> None:
+        self.index = index
+        self.directory = directory
+        self.use_cache = use_cache
+        self._loaded: dict[str, Component] = {}
+
+    def __getitem__(self, key: str) -> Component:
+        component = self._loaded.get(key)
+        if component is None:
+            component = _load_shard(self.directory, self.index[key], use_cache=self.use_cache)
+            self._loaded[key] = component
+        return component
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def shard_path(self, key: str) -> Path:
+        return self.directory / f"{key}.yaml"
 
 
 @dataclass(frozen=True)
 class Manifest:
     version: int
-    components: dict[str, Component]
+    components: Mapping[str, Component]
     root: Path
     library: dict[str, object]
     path: Path
@@ -44,6 +98,18 @@ class Manifest:
     def keys(self) -> Iterable[str]:
         return self.components.keys()
 
+    def entries(self) -> Iterator[IndexEntry]:
+        """Yield listing fields in manifest order without loading sharded components."""
+        if isinstance(self.components, ShardedComponents):
+            yield from self.components.index.values()
+            return
+        for component in self.components.values():
+            yield IndexEntry(key=component.key, title=component.title, summary=component.summary)
+
+    @property
+    def sharded(self) -> bool:
+        return isinstance(self.components, ShardedComponents)
+
     @property
     def tokens_file(self) -> Path | None:
         value = self.library.get("tokens_file")
@@ -54,7 +120,8 @@ class ManifestError(RuntimeError):
     """Raised when the manifest cannot be parsed."""
 
 
-ALLOWED_ROOT_KEYS = {"version", "components", "library"}
+ALLOWED_ROOT_KEYS = {"version", "components", "library", "shards"}
+ALLOWED_INDEX_KEYS = {"key", "title", "summary"}
 ALLOWED_COMPONENT_KEYS = {
     "key",
     "title",
@@ -63,6 +130,7 @@ ALLOWED_COMPONENT_KEYS = {
     "endpoints",
     "events",
     "accessibility",
+    "loadtest",
 }
 ALLOWED_FILE_PREFIXES = {"templates", "static", "docs"}
 
@@ -88,9 +156,188 @@ def _validate_component_files(key: str, files: Iterable[str]) -> None:
             )
 
 
-def load_manifest(path: Path) -> Manifest:
-    if not path.exists():
-        raise ManifestError(f"Manifest file not found: {path}")
+def cache_dir() -> Path | None:
+    """Return the directory for compiled CLI caches, or None when caching is disabled.
+
+    `GREEBLE_NO_CACHE=1` disables caching; `GREEBLE_CACHE_DIR` overrides the default
+    `$XDG_CACHE_HOME/greeble` (`~/.cache/greeble`).
+    """
+    if os.environ.get("GREEBLE_NO_CACHE"):
+        return None
+    override = os.environ.get("GREEBLE_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "greeble"
+
+
+def _cache_file(kind: str, identity: str) -> Path | None:
+    directory = cache_dir()
+    if directory is None:
+        return None
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+    return directory / f"{kind}-{digest}.json"
+
+
+def _read_cache(cache_path: Path | None) -> Any:
+    if cache_path is None:
+        return None
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(cache_path: Path | None, payload: object) -> None:
+    """Write `payload` atomically; failures (read-only home, races) are ignored."""
+    if cache_path is None:
+        return
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except (OSError, TypeError):
+        tmp.unlink(missing_ok=True)
+
+
+def _manifest_from_payload(payload: dict[str, Any], path: Path) -> Manifest:
+    components: Mapping[str, Component]
+    shards = payload.get("shards")
+    if shards is None:
+        components = {entry["key"]: Component(**entry) for entry in payload["components"]}
+    else:
+        index = {row[0]: IndexEntry(*row) for row in payload["index"]}
+        components = ShardedComponents(index, path.parent / shards)
+    return Manifest(
+        version=payload["version"],
+        components=components,
+        root=path.parent,
+        library=payload["library"],
+        path=path,
+    )
+
+
+def _cache_stamp(path: Path) -> list[int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        raise ManifestError(f"Manifest file not found: {path}") from None
+    return [CACHE_FORMAT, stat.st_mtime_ns, stat.st_size]
+
+
+def load_manifest(path: Path, *, use_cache: bool = True) -> Manifest:
+    """Load and validate a manifest.
+
+    Validated manifests are cached as JSON keyed by the file's resolved path, mtime,
+    and size (see `cache_dir()`), so unchanged manifests skip YAML parsing and
+    validation on subsequent CLI invocations.
+
+    A manifest with a `shards` directory is an index: its `components` entries carry
+    only `key`, `title`, and `summary`, and each component's details live in
+    `<shards>/<key>.yaml`, loaded on first lookup (see `ShardedComponents`).
+    """
+    stamp = _cache_stamp(path)
+    cache_path = None
+    if use_cache:
+        cache_path = _cache_file("manifest", str(path.resolve()))
+        cached = _read_cache(cache_path)
+        if isinstance(cached, dict) and cached.get("stamp") == stamp:
+            try:
+                return _manifest_from_payload(cached["manifest"], path)
+            except (KeyError, TypeError):
+                pass
+
+    manifest, shards = _parse_manifest(path, use_cache=use_cache)
+    payload: dict[str, Any] = {"version": manifest.version, "library": manifest.library}
+    if shards is None:
+        payload["components"] = [asdict(component) for component in manifest.components.values()]
+    else:
+        payload["shards"] = shards
+        payload["index"] = [[e.key, e.title, e.summary] for e in manifest.entries()]
+    _write_cache(cache_path, {"stamp": stamp, "manifest": payload})
+    return manifest
+
+
+def _load_shard(directory: Path, entry: IndexEntry, *, use_cache: bool = True) -> Component:
+    shard = directory / f"{entry.key}.yaml"
+    if not shard.exists():
+        raise ManifestError(f"Component '{entry.key}' shard not found: {shard}")
+    stamp = _cache_stamp(shard)
+    cache_path = None
+    if use_cache:
+        cache_path = _cache_file("manifest-shard", str(shard.resolve()))
+        cached = _read_cache(cache_path)
+        if isinstance(cached, dict) and cached.get("stamp") == stamp:
+            try:
+                return Component(**cached["component"])
+            except (KeyError, TypeError):
+                pass
+
+    import yaml
+
+    data = yaml.safe_load(shard.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ManifestError(f"Component shard {shard} must be a mapping")
+    if data.setdefault("key", entry.key) != entry.key:
+        raise ManifestError(
+            f"Component shard {shard} declares key '{data['key']}', expected '{entry.key}'"
+        )
+    data.setdefault("title", entry.title)
+    data.setdefault("summary", entry.summary)
+    component = _component_from_entry(data)
+    _write_cache(cache_path, {"stamp": stamp, "component": asdict(component)})
+    return component
+
+
+def _component_key(entry: object) -> str:
+    if not isinstance(entry, dict):
+        raise ManifestError("Each component entry must be a mapping")
+    key = entry.get("key")
+    if not isinstance(key, str):
+        raise ManifestError("Component entry missing string 'key'")
+    return key
+
+
+def _component_from_entry(entry: dict[str, Any]) -> Component:
+    key = _component_key(entry)
+    unknown_component_keys = set(entry) - ALLOWED_COMPONENT_KEYS
+    if unknown_component_keys:
+        raise ManifestError(
+            f"Component '{key}' has unknown fields: " + ", ".join(sorted(unknown_component_keys))
+        )
+    title = entry.get("title", key.title())
+    summary = entry.get("summary", "")
+    files = entry.get("files", [])
+    if not isinstance(files, list) or not all(isinstance(p, str) for p in files):
+        raise ManifestError(f"Component '{key}' has invalid 'files' list")
+    _validate_component_files(key, files)
+    loadtest = entry.get("loadtest") or []
+    if not isinstance(loadtest, list) or not all(isinstance(item, dict) for item in loadtest):
+        raise ManifestError(f"Component '{key}' has invalid 'loadtest' list (expected mappings)")
+    return Component(
+        key=key, title=title, summary=summary, files=list(files), loadtest=list(loadtest)
+    )
+
+
+def _index_entry(entry: dict[str, Any]) -> IndexEntry:
+    key = _component_key(entry)
+    unknown = set(entry) - ALLOWED_INDEX_KEYS
+    if unknown:
+        raise ManifestError(
+            f"Sharded index entry '{key}' may only contain key, title, and summary "
+            f"(found: {', '.join(sorted(unknown))})"
+        )
+    if Path(key).name != key or key.startswith("."):
+        raise ManifestError(f"Component key '{key}' cannot be used as a shard filename")
+    return IndexEntry(
+        key=key, title=entry.get("title", key.title()), summary=entry.get("summary", "")
+    )
+
+
+def _parse_manifest(path: Path, *, use_cache: bool = True) -> tuple[Manifest, str | None]:
+    """Validate the manifest at `path`; also return its `shards` directory, if any."""
+    import yaml  # deferred: only needed when the cached snapshot is stale
 
     data = yaml.safe_load(path.read_text(encoding="utf-8"))
     if not isinstance(data, dict):
@@ -110,28 +357,27 @@ def load_manifest(path: Path) -> Manifest:
     if not isinstance(raw_components, list):
         raise ManifestError("Manifest 'components' must be a list")
 
-    components: dict[str, Component] = {}
-    for entry in raw_components:
-        if not isinstance(entry, dict):
-            raise ManifestError("Each component entry must be a mapping")
-        key = entry.get("key")
-        if not isinstance(key, str):
-            raise ManifestError("Component entry missing string 'key'")
-        unknown_component_keys = set(entry) - ALLOWED_COMPONENT_KEYS
-        if unknown_component_keys:
-            raise ManifestError(
-                f"Component '{key}' has unknown fields: "
-                + ", ".join(sorted(unknown_component_keys))
-            )
-        if key in components:
-            raise ManifestError(f"Duplicate component key '{key}'")
-        title = entry.get("title", key.title())
-        summary = entry.get("summary", "")
-        files = entry.get("files", [])
-        if not isinstance(files, list) or not all(isinstance(p, str) for p in files):
-            raise ManifestError(f"Component '{key}' has invalid 'files' list")
-        _validate_component_files(key, files)
-        components[key] = Component(key=key, title=title, summary=summary, files=list(files))
+    shards = data.get("shards")
+    if shards is not None and (not isinstance(shards, str) or not shards.strip()):
+        raise ManifestError("Manifest 'shards' must be a directory path when provided")
+
+    components: Mapping[str, Component]
+    if shards is None:
+        inline: dict[str, Component] = {}
+        for entry in raw_components:
+            if _component_key(entry) in inline:
+                raise ManifestError(f"Duplicate component key '{entry['key']}'")
+            component = _component_from_entry(entry)
+            inline[component.key] = component
+        components = inline
+    else:
+        index: dict[str, IndexEntry] = {}
+        for entry in raw_components:
+            if _component_key(entry) in index:
+                raise ManifestError(f"Duplicate component key '{entry['key']}'")
+            row = _index_entry(entry)
+            index[row.key] = row
+        components = ShardedComponents(index, path.parent / shards, use_cache=use_cache)
 
     library = data.get("library")
     allowed_library_keys = {"packages", "tokens_file", "name", "description", "docs_site"}
@@ -156,13 +402,48 @@ def load_manifest(path: Path) -> Manifest:
     if tokens_file is not None and not isinstance(tokens_file, str):
         raise ManifestError("library.tokens_file must be a string when provided")
 
-    return Manifest(
+    manifest = Manifest(
         version=version,
         components=components,
         root=path.parent,
         library=library_data,
         path=path,
     )
+    return manifest, shards
+
+
+def split_manifest(source: Path, target: Path, *, shards: str = "manifest.d") -> Path:
+    """Convert a monolithic manifest into an index plus one file per component.
+
+    Writes the index to `target` and each component to `<target dir>/<shards>/<key>.yaml`,
+    keeping every component field (endpoints, events, ...) in its shard. Component file
+    paths resolve against the manifest's directory, so `target` normally sits next to
+    `source` (or replaces it). Returns the shard directory.
+    """
+    import yaml
+
+    _parse_manifest(source)  # validate before writing anything
+    data = yaml.safe_load(source.read_text(encoding="utf-8"))
+    if data.get("shards") is not None:
+        raise ManifestError(f"Manifest is already sharded: {source}")
+
+    shard_dir = target.parent / shards
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    index = []
+    for entry in data["components"]:
+        row = _index_entry({"key": entry["key"]})  # rejects keys unusable as filenames
+        index.append({name: entry[name] for name in ("key", "title", "summary") if name in entry})
+        (shard_dir / f"{row.key}.yaml").write_text(
+            yaml.safe_dump(entry, sort_keys=False, allow_unicode=True), encoding="utf-8"
+        )
+
+    root = {name: value for name, value in data.items() if name != "components"}
+    root["shards"] = shards
+    root["components"] = index
+    target.write_text(
+        yaml.safe_dump(root, sort_keys=False, allow_unicode=True, width=100), encoding="utf-8"
+    )
+    return shard_dir
 
 
 def default_manifest_path() -> Path:
@@ -172,6 +453,14 @@ def default_manifest_path() -> Path:
     if repo_manifest.exists():
         return repo_manifest
 
+    # Walking the distribution's RECORD is slow; remember the located path per install.
+    cache_path = _cache_file("manifest-path", str(Path(__file__).resolve()))
+    cached = _read_cache(cache_path)
+    if isinstance(cached, str) and Path(cached).exists():
+        return Path(cached)
+
+    from importlib import metadata
+
     try:
         files = metadata.files("greeble")
     except metadata.PackageNotFoundError:
@@ -181,9 +470,11 @@ def default_manifest_path() -> Path:
         for file in files:
             if str(file).endswith(manifest_name):
                 try:
-                    return Path(file.locate())
+                    located = Path(file.locate())
                 except Exception:
                     break
+                _write_cache(cache_path, str(located))
+                return located
 
     try:
         dist = metadata.distribution("greeble")
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import errno
 import itertools
+import os
 import shutil
-from collections.abc import Iterable
+import sys
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+from greeble.minify import MinifyResult, can_minify, minify_file_text
+
 from .manifest import Component, Manifest
 
 __all__ = [
@@ -16,6 +22,8 @@ __all__ = [
     "component_sources",
     "ensure_within_project",
     "execute_plan",
+    "merge_plans",
+    "minify_savings",
     "remove_files",
 ]
 
@@ -98,26 +106,147 @@ def ensure_within_project(project_root: Path, destinations: Iterable[CopyPlan])
             raise ScaffoldError(f"Refusing to write outside project root: {dest}")
 
 
-def execute_plan(plans: Iterable[CopyPlan], *, force: bool, dry_run: bool) -> list[Path]:
-    written: list[Path] = []
-    for plan in plans:
-        if not dry_run:
-            dest_parent = plan.destination.parent
+# Below this many files a thread pool costs more than it saves.
+PARALLEL_COPY_THRESHOLD = 8
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+_CLONE_UNSUPPORTED = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.EPERM,
+}
+
+
+class _CloneSupport:
+    """Remember which fast-copy strategies failed so later files skip straight past them."""
+
+    ficlone = sys.platform == "linux"
+    copy_file_range = hasattr(os, "copy_file_range")
+
+
+_CLONE = _CloneSupport()
+
+
+def _clone_file(source: Path, destination: Path) -> bool:
+    """Copy `source` via a reflink clone or in-kernel `copy_file_range`.
+
+    Returns False (leaving `destination` for the caller to overwrite) when neither is
+    available for this pair of files, e.g. across filesystems or on macOS/Windows.
+    """
+    if not (_CLONE.ficlone or _CLONE.copy_file_range):
+        return False
+    with source.open("rb") as src, destination.open("wb") as dst:
+        if _CLONE.ficlone:
+            import fcntl
+
             try:
-                dest_parent.mkdir(parents=True, exist_ok=True)
-            except OSError as e:
-                raise ScaffoldError(
-                    f"Failed to create destination directory '{dest_parent}': {e}"
-                ) from e
-        if plan.destination.exists() and not force and not dry_run:
-            raise ScaffoldError(f"File already exists: {plan.destination}")
-        if not dry_run:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return True
+            except OSError as exc:
+                if exc.errno not in _CLONE_UNSUPPORTED:
+                    raise
+                if exc.errno != errno.EXDEV:  # EXDEV only rules out this pair
+                    _CLONE.ficlone = False
+        if _CLONE.copy_file_range:
+            remaining = os.fstat(src.fileno()).st_size
             try:
-                shutil.copy2(plan.source, plan.destination)
-            except OSError as e:
-                raise ScaffoldError(f"Failed to copy to '{plan.destination}': {e}") from e
-        written.append(plan.destination)
-    return written
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return remaining == 0
+            except OSError as exc:
+                if exc.errno not in _CLONE_UNSUPPORTED:
+                    raise
+                if exc.errno != errno.EXDEV:
+                    _CLONE.copy_file_range = False
+    return False
+
+
+def _copy_file(plan: CopyPlan, *, minify: bool) -> None:
+    # Only HTML/SVG are read as text; fonts, images and other assets are copied as bytes.
+    if minify and can_minify(plan.source.name):
+        text = plan.source.read_text(encoding="utf-8")
+        minified = minify_file_text(plan.source.name, text)
+        if minified is not None:
+            plan.destination.write_text(minified, encoding="utf-8")
+            shutil.copystat(plan.source, plan.destination)
+            return
+    if _clone_file(plan.source, plan.destination):
+        shutil.copystat(plan.source, plan.destination)
+    else:
+        shutil.copy2(plan.source, plan.destination)
+
+
+def merge_plans(plans: Iterable[CopyPlan]) -> list[CopyPlan]:
+    """Combine plans from several components, dropping exact duplicates.
+
+    Two plans writing different sources to the same destination are a conflict.
+    """
+    merged: dict[Path, CopyPlan] = {}
+    for plan in plans:
+        existing = merged.get(plan.destination)
+        if existing is None:
+            merged[plan.destination] = plan
+        elif existing.source != plan.source:
+            raise ScaffoldError(
+                f"Conflicting sources for {plan.destination}: {existing.source} and {plan.source}"
+            )
+    return list(merged.values())
+
+
+def _make_directories(plans: Sequence[CopyPlan]) -> None:
+    created: set[Path] = set()
+    for parent in sorted({plan.destination.parent for plan in plans}):
+        if parent in created:
+            continue
+        try:
+            parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise ScaffoldError(f"Failed to create destination directory '{parent}': {e}") from e
+        created.update(parent.parents)
+        created.add(parent)
+
+
+def _copy_one(plan: CopyPlan, minify: bool) -> Path:
+    try:
+        _copy_file(plan, minify=minify)
+    except OSError as e:
+        raise ScaffoldError(f"Failed to copy to '{plan.destination}': {e}") from e
+    return plan.destination
+
+
+def execute_plan(
+    plans: Iterable[CopyPlan],
+    *,
+    force: bool,
+    dry_run: bool,
+    minify: bool = False,
+    workers: int | None = None,
+) -> list[Path]:
+    """Copy every plan, creating each destination directory once.
+
+    Existing destinations are checked up front (unless `force`), so a conflict aborts
+    before anything is written. Batches of `PARALLEL_COPY_THRESHOLD` or more files are
+    copied on a thread pool (`workers` threads; the executor default when None).
+    """
+    plans = list(plans)
+    if not force and not dry_run:
+        for plan in plans:
+            if plan.destination.exists():
+                raise ScaffoldError(f"File already exists: {plan.destination}")
+    if dry_run:
+        return [plan.destination for plan in plans]
+
+    _make_directories(plans)
+    if len(plans) < PARALLEL_COPY_THRESHOLD or workers == 1:
+        return [_copy_one(plan, minify) for plan in plans]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="greeble-copy") as pool:
+        return list(pool.map(_copy_one, plans, itertools.repeat(minify)))
 
 
 def remove_files(plans: Iterable[CopyPlan], *, dry_run: bool) -> tuple[list[Path], list[Path]]:
@@ -141,6 +270,23 @@ def component_sources(manifest: Manifest, component: Component) -> list[Path]:
     return sources
 
 
+def minify_savings(sources: Iterable[Path]) -> dict[Path, MinifyResult]:
+    """Return original/minified byte counts for each HTML or SVG source file."""
+    results: dict[Path, MinifyResult] = {}
+    for source in sources:
+        if not can_minify(source.name) or not source.is_file():
+            continue
+        text = source.read_text(encoding="utf-8")
+        minified = minify_file_text(source.name, text)
+        if minified is None:
+            continue
+        results[source] = MinifyResult(
+            original_bytes=len(text.encode("utf-8")),
+            minified_bytes=len(minified.encode("utf-8")),
+        )
+    return results
+
+
 def _next_backup_path(path: Path, suffix: str = ".bak") -> Path:
     candidate = path.with_name(path.name + suffix)
     if not candidate.exists():
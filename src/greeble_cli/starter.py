@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import contextlib
 import shutil
+from collections.abc import Sequence
 from dataclasses import dataclass
 from importlib import resources
 from pathlib import Path
 
 from .manifest import Manifest
 from .scaffold import (
+    CopyPlan,
     build_copy_plan,
     ensure_within_project,
     execute_plan,
+    merge_plans,
 )
 
 STARTER_COMPONENTS: tuple[str, ...] = (
@@ -183,12 +186,13 @@ def scaffold_starter(
     docs_dir: Path,
     force: bool,
     dry_run: bool,
+    components: Sequence[str] = STARTER_COMPONENTS,
 ) -> StarterPlan:
     project_root = project_root.resolve()
-    component_plans: list[Path] = []
-    for key in STARTER_COMPONENTS:
+    plans: list[CopyPlan] = []
+    for key in components:
         component = manifest.get(key)
-        plans = build_copy_plan(
+        component_plans = build_copy_plan(
             manifest=manifest,
             component=component,
             project_root=project_root,
@@ -197,10 +201,12 @@ def scaffold_starter(
             include_docs=include_docs,
             docs_dir=docs_dir,
         )
-        ensure_within_project(project_root, plans)
-        component_plans.extend(plan.destination for plan in plans)
-        if dry_run:
-            continue
+        ensure_within_project(project_root, component_plans)
+        plans.extend(component_plans)
+    plans = merge_plans(plans)
+    component_plans_dest = [plan.destination for plan in plans]
+    if not dry_run:
+        # One batch: directories are created once and files copied on a thread pool.
         execute_plan(plans, force=force, dry_run=False)
 
     project_files: list[Path] = []
@@ -243,6 +249,6 @@ def scaffold_starter(
             if source.exists() and not dry_run:
                 shutil.copy2(source, dest_dir / name)
 
-    component_plans_sorted = sorted(component_plans, key=lambda path: tuple(path.parts))
+    component_plans_sorted = sorted(component_plans_dest, key=lambda path: tuple(path.parts))
     project_files_sorted = sorted(project_files, key=lambda path: tuple(path.parts))
     return StarterPlan(component_files=component_plans_sorted, project_files=project_files_sorted)
@@ -0,0 +1,251 @@
+"""
+`greeble watch`: copy edited component sources into a project as they change.
+
+The watcher keeps `(mtime_ns, size)` stamps for every planned source file and polls
+them with `stat()`; on Linux an inotify descriptor on the source directories (via
+ctypes) wakes the loop as soon as something is written, otherwise it sleeps for the
+polling interval. Bursts of writes (editor save + format-on-save, `git checkout`) are
+debounced into one sync. Only the changed files are copied, recorded in
+`.greeble.lock`, and optionally announced to a running dev server with a POST so it can
+drop compiled templates (see `mount_template_reload()` in the adapters).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import select
+import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from .lockfile import Lockfile, classify_plans
+from .scaffold import CopyPlan, ScaffoldError, execute_plan, merge_plans
+
+__all__ = [
+    "DEFAULT_DEBOUNCE",
+    "DEFAULT_INTERVAL",
+    "SourcePoller",
+    "WatchTarget",
+    "Watcher",
+    "notify_server",
+]
+
+DEFAULT_INTERVAL = 0.25
+DEFAULT_DEBOUNCE = 0.1
+
+# linux/inotify.h
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+class _Inotify:
+    """Wake-up signal for writes under a set of directories.
+
+    Events are drained and discarded: which files changed is always decided by
+    comparing stat stamps, so a dropped or coalesced event cannot be missed.
+    """
+
+    def __init__(self, directories: Iterable[Path]) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        for directory in directories:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    return
+            except BlockingIOError:
+                return
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _open_inotify(directories: Iterable[Path]) -> _Inotify | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify(directories)
+    except (OSError, AttributeError):
+        return None
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class SourcePoller:
+    """Detect changed files by comparing `(mtime_ns, size)` stamps between polls."""
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self._stamps = {path: _stamp(path) for path in dict.fromkeys(paths)}
+
+    @property
+    def paths(self) -> list[Path]:
+        return list(self._stamps)
+
+    def poll(self) -> list[Path]:
+        changed: list[Path] = []
+        for path, previous in self._stamps.items():
+            current = _stamp(path)
+            if current != previous:
+                self._stamps[path] = current
+                changed.append(path)
+        return changed
+
+
+@dataclass(frozen=True)
+class WatchTarget:
+    component: str
+    plan: CopyPlan
+
+
+def notify_server(url: str, changed: Sequence[str], *, timeout: float = 2.0) -> bool:
+    """POST `{"changed": [...]}` to a dev server; returns False when it is unreachable."""
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(
+        url,
+        data=json.dumps({"changed": list(changed)}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            return True
+    except (OSError, urllib.error.URLError):
+        return False
+
+
+class Watcher:
+    """Poll the sources of `targets` and copy changed ones into `project_root`."""
+
+    def __init__(
+        self,
+        targets: Sequence[WatchTarget],
+        *,
+        project_root: Path,
+        minify: bool = False,
+        notify: str | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        use_inotify: bool = True,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.project_root = project_root
+        self.minify = minify
+        self.notify = notify
+        self.interval = interval
+        self.debounce = debounce
+        self.log = log
+        self._targets: dict[Path, list[WatchTarget]] = {}
+        for target in targets:
+            self._targets.setdefault(target.plan.source, []).append(target)
+        self.poller = SourcePoller(self._targets)
+        directories = {path.parent for path in self._targets}
+        self._inotify = _open_inotify(directories) if use_inotify else None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _wait(self, timeout: float) -> None:
+        if self._inotify is not None:
+            self._inotify.wait(timeout)
+        else:
+            time.sleep(timeout)
+
+    def wait_for_changes(self, timeout: float | None = None) -> list[Path]:
+        """Block until sources change (or `timeout` passes) and return them, debounced.
+
+        After the first change the watcher keeps waiting while further changes arrive
+        within `debounce` seconds, so a burst of writes results in one sync.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: list[Path] = []
+        while not changed:
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+            self._wait(self.interval)
+            changed = self.poller.poll()
+        while True:
+            time.sleep(self.debounce)
+            more = self.poller.poll()
+            if not more:
+                return list(dict.fromkeys(changed))
+            changed.extend(more)
+
+    def sync(self, sources: Iterable[Path]) -> list[Path]:
+        """Copy the plans for `sources` (overwriting), record them, and notify the server."""
+        targets = [target for source in sources for target in self._targets.get(source, [])]
+        present = [target for target in targets if target.plan.source.exists()]
+        if not present:
+            return []
+        lock = Lockfile.load(self.project_root)
+        statuses = [
+            status
+            for target in present
+            for status in classify_plans(lock, target.component, [target.plan], minify=self.minify)
+        ]
+        written = execute_plan(
+            merge_plans(target.plan for target in present),
+            force=True,
+            dry_run=False,
+            minify=self.minify,
+        )
+        for status in statuses:
+            lock.record(status.component, status, minified=self.minify)
+        lock.save()
+        if self.notify:
+            keys = [status.key for status in statuses]
+            if not notify_server(self.notify, keys):
+                self.log(f"! dev server did not answer at {self.notify}")
+        return written
+
+    def run(self, *, cycles: int | None = None) -> None:
+        """Watch until interrupted (or for `cycles` syncs); copy errors are logged, not fatal."""
+        completed = 0
+        while cycles is None or completed < cycles:
+            changed = self.wait_for_changes()
+            started = time.perf_counter()
+            try:
+                written = self.sync(changed)
+            except ScaffoldError as exc:
+                self.log(f"! {exc}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            for path in written:
+                self.log(f"  ↻ {path.relative_to(self.project_root)}")
+            self.log(f"Synced {len(written)} file(s) in {elapsed:.1f} ms")
+            completed += 1
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
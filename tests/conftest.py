@@ -1,11 +1,14 @@
 """Test configuration.
 
-Ensures the `src/` directory is on sys.path so tests can import `greeble.*`.
+Ensures the `src/` directory is on sys.path so tests can import `greeble.*`, and points
+the CLI's compiled caches at a throwaway directory instead of the user's cache.
 """
 
 from __future__ import annotations
 
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -15,3 +18,5 @@ if str(SRC) not in sys.path:
 
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("GREEBLE_CACHE_DIR", tempfile.mkdtemp(prefix="greeble-cache-"))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from greeble import assets
+from greeble.adapters.fastapi import template_response
+from greeble_cli import main
+
+
+@pytest.fixture(autouse=True)
+def reset_preload() -> Iterator[None]:
+    yield
+    assets.configure_preload([])
+
+
+def test_hashed_name_inserts_digest_before_suffix() -> None:
+    name = assets.hashed_name("htmx.min.js", b"console.log(1)")
+    stem, digest, suffix = name.rsplit(".", 2)
+    assert stem == "htmx.min"
+    assert suffix == "js"
+    assert len(digest) == 10
+    assert assets.hashed_name("htmx.min.js", b"other") != name
+
+
+def test_vendor_scripts_writes_hashed_files_and_manifest(tmp_path: Path) -> None:
+    fetched: list[str] = []
+
+    def fetch(url: str) -> bytes:
+        fetched.append(url)
+        return url.encode()
+
+    mapping = assets.vendor_scripts(tmp_path / "vendor", fetch=fetch)
+    assert set(mapping) == set(assets.CDN_SCRIPTS)
+    assert fetched == list(assets.CDN_SCRIPTS.values())
+    for name, filename in mapping.items():
+        assert (tmp_path / "vendor" / filename).read_bytes() == assets.CDN_SCRIPTS[name].encode()
+    assert assets.load_vendor_manifest(tmp_path / "vendor") == mapping
+    assert assets.load_vendor_manifest(tmp_path / "missing") is None
+
+
+def test_link_header_serialization() -> None:
+    header = assets.link_header(
+        [
+            assets.PreloadLink(href="/static/greeble/greeble-core.css", as_="style"),
+            assets.PreloadLink(href="/vendor/htmx.js", as_="script", crossorigin=True),
+        ]
+    )
+    assert header == (
+        "</static/greeble/greeble-core.css>; rel=preload; as=style, "
+        "</vendor/htmx.js>; rel=preload; as=script; crossorigin"
+    )
+
+
+def test_template_response_attaches_preload_on_full_pages_only(tmp_path: Path) -> None:
+    (tmp_path / "layout.html").write_text("FULL", encoding="utf-8")
+    (tmp_path / "partial.html").write_text("PART", encoding="utf-8")
+    templates = Jinja2Templates(directory=str(tmp_path))
+    app = FastAPI()
+
+    @app.get("/")
+    def root(request: Request) -> Response:
+        return template_response(
+            templates, "layout.html", {}, request, partial_template="partial.html"
+        )
+
+    client = TestClient(app)
+    assert "Link" not in client.get("/").headers
+
+    assets.configure_preload([assets.PreloadLink(href="/core.css", as_="style")])
+    full = client.get("/")
+    assert full.headers["Link"] == "</core.css>; rel=preload; as=style"
+    partial = client.get("/", headers={"HX-Request": "true"})
+    assert partial.text == "PART"
+    assert "Link" not in partial.headers
+
+
+def test_cli_vendor(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(assets, "_fetch", lambda url: b"/* " + url.encode() + b" */")
+    exit_code = main(["vendor", "--project", str(tmp_path)])
+    assert exit_code == 0
+    vendor_dir = tmp_path / "static" / "greeble" / "vendor"
+    mapping = json.loads((vendor_dir / assets.VENDOR_MANIFEST).read_text(encoding="utf-8"))
+    assert all((vendor_dir / filename).exists() for filename in mapping.values())
+    assert "Vendored 3 script(s)" in capsys.readouterr().out
@@ -374,3 +374,41 @@ def test_cli_theme_init_force_overwrites(tmp_path: Path) -> None:
     assert "--greeble-color-background" in content, (
         "Force run should overwrite with canonical preset contents"
     )
+
+
+def test_manifest_cache_reuses_validated_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from greeble_cli import manifest as manifest_module
+
+    monkeypatch.setenv("GREEBLE_CACHE_DIR", str(tmp_path / "cache"))
+    source = default_manifest_path()
+    copy = tmp_path / "greeble.manifest.yaml"
+    copy.write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
+
+    first = load_manifest(copy)
+    assert list((tmp_path / "cache").glob("manifest-*.json"))
+
+    parse = manifest_module._parse_manifest
+
+    def _fail(_: Path, **__: object) -> tuple[Manifest, str | None]:
+        raise AssertionError("manifest should come from the cache")
+
+    monkeypatch.setattr(manifest_module, "_parse_manifest", _fail)
+    cached = load_manifest(copy)
+    assert cached.components == first.components
+    assert cached.library == first.library
+
+    # Any change to the file (size/mtime) invalidates the snapshot
+    copy.write_text(copy.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    with pytest.raises(AssertionError, match="from the cache"):
+        load_manifest(copy)
+    monkeypatch.setattr(manifest_module, "_parse_manifest", parse)
+    assert load_manifest(copy, use_cache=False).components == first.components
+
+
+def test_manifest_cache_can_be_disabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GREEBLE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GREEBLE_NO_CACHE", "1")
+    load_manifest(default_manifest_path())
+    assert not (tmp_path / "cache").exists()
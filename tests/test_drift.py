@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from greeble_cli import drift, main
+from greeble_cli.drift import FileHasher, detect_drift
+from greeble_cli.manifest import default_manifest_path, load_manifest
+
+
+def _detect(project: Path) -> dict[str, list[tuple[str, str]]]:
+    manifest = load_manifest(default_manifest_path())
+    report = detect_drift(
+        manifest,
+        [manifest.get(key) for key in sorted(manifest.keys())],
+        project_root=project,
+        templates_dir=Path("templates"),
+        static_dir=Path("static"),
+        docs_dir=None,
+        include_docs=False,
+    )
+    return {
+        component.key: [(entry.destination.name, entry.state) for entry in component.drifted]
+        for component in report
+    }
+
+
+def test_detect_drift_reports_installed_components_only(tmp_path: Path) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "modal", "--project", str(project)]) == 0
+    assert _detect(project) == {"button": [], "modal": []}
+
+    (project / "templates" / "greeble" / "button.html").write_text("edited", encoding="utf-8")
+    (project / "static" / "greeble" / "modal.css").unlink()
+    assert _detect(project) == {
+        "button": [("button.html", "modified")],
+        "modal": [("modal.css", "missing")],
+    }
+
+
+def test_minified_installs_are_not_drift(tmp_path: Path) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "modal", "--project", str(project), "--minify"]) == 0
+    assert _detect(project) == {"modal": []}
+
+
+def test_hash_cache_skips_unchanged_files(tmp_path: Path) -> None:
+    files = []
+    for index in range(5):
+        path = tmp_path / f"f{index}.txt"
+        path.write_text(str(index) * 100, encoding="utf-8")
+        files.append(path)
+
+    first = FileHasher("project")
+    digests = first.hash_many([*files, tmp_path / "missing.txt"])
+    first.save()
+    assert first.hashed == 5
+    assert digests[tmp_path / "missing.txt"] is None
+
+    second = FileHasher("project")
+    assert second.hash_many(files) == {path: digests[path] for path in files}
+    assert second.hashed == 0
+
+    files[0].write_text("changed", encoding="utf-8")
+    third = FileHasher("project")
+    assert third.hash_many(files)[files[0]] != digests[files[0]]
+    assert third.hashed == 1
+
+
+def test_large_files_hash_through_mmap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(drift, "MMAP_THRESHOLD", 16)
+    small, large = tmp_path / "small.bin", tmp_path / "large.bin"
+    small.write_bytes(b"x" * 8)
+    large.write_bytes(b"x" * 64)
+    digests = FileHasher("mmap").hash_many([small, large])
+    assert digests[large] == drift._digest(large, 0)  # chunked path gives the same digest
+
+
+def test_cli_doctor_drift(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+    capsys.readouterr()
+    assert main(["doctor", "--drift", "--project", str(project)]) == 0
+    assert "No drift in 1 installed component(s)" in capsys.readouterr().out
+
+    (project / "templates" / "greeble" / "button.html").write_text("edited", encoding="utf-8")
+    assert main(["doctor", "--drift", "--project", str(project)]) == 1
+    assert "modified: templates/greeble/button.html" in capsys.readouterr().out
+
+    assert main(["doctor", "--drift", "--json", "--project", str(project), "--workers", "2"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["summary"]["drifted_components"] == 1
+    assert report["drift"]["drifted"][0]["files"] == [
+        {"path": "templates/greeble/button.html", "state": "modified"}
+    ]
+
+
+def test_cli_doctor_drift_reports_a_malformed_lockfile(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+    (project / ".greeble.lock").write_text("{not json", encoding="utf-8")
+    capsys.readouterr()
+    assert main(["doctor", "--drift", "--project", str(project)]) == 2
+    captured = capsys.readouterr()
+    assert captured.err.startswith("error: ")
+    assert captured.out == ""
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+from flask import Flask
+
+from greeble.adapters.fastapi import mount_static_fragments
+from greeble.adapters.flask import register_static_fragments
+from greeble.fragments import StaticFragment, StaticFragmentRegistry, accepts_gzip
+
+MENU = "<nav>" + "<a href='/docs'>Docs</a>" * 20 + "</nav>"
+
+
+def _registry() -> StaticFragmentRegistry:
+    registry = StaticFragmentRegistry()
+    registry.add("/menu/open", MENU)
+    registry.add("/menu/close", "")
+    return registry
+
+
+def test_accepts_gzip_parsing() -> None:
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("br")
+    assert not accepts_gzip(None)
+
+
+def test_static_fragment_variants() -> None:
+    fragment = StaticFragment.build(MENU)
+    assert fragment.body == MENU.encode()
+    assert fragment.gzipped is not None
+    assert gzip.decompress(fragment.gzipped.body) == fragment.body
+    assert fragment.select(None, "gzip") is fragment.gzipped
+    assert fragment.select(None, None) is fragment.identity
+    assert fragment.select(f"W/{fragment.etag}", None) is fragment.not_modified
+    assert fragment.select('"other"', None) is fragment.identity
+    # Each encoding is its own representation with its own validator.
+    assert fragment.gzip_etag == f'{fragment.etag[:-1]}-gz"'
+    assert fragment.gzipped.headers["ETag"] == fragment.gzip_etag
+    assert fragment.select(fragment.gzip_etag, "gzip") is fragment.gzip_not_modified
+    assert fragment.select(fragment.etag, "gzip") is fragment.gzipped
+    assert fragment.select(fragment.gzip_etag, None) is fragment.identity
+    # Bodies too small to benefit from compression have no gzip variant
+    assert StaticFragment.build("").gzipped is None
+
+
+def test_registry_rejects_duplicates_and_relative_paths() -> None:
+    registry = _registry()
+    assert len(registry) == 2
+    assert "/menu/open" in registry
+    with pytest.raises(ValueError):
+        registry.add("/menu/open", "x")
+    with pytest.raises(ValueError):
+        registry.add("menu", "x")
+
+
+def test_fastapi_mount_serves_conditional_and_gzip() -> None:
+    app = FastAPI()
+
+    @app.get("/menu/open", response_class=HTMLResponse)
+    def shadowed() -> str:
+        return "dynamic"
+
+    mount_static_fragments(app, _registry())
+    client = TestClient(app)
+
+    plain = client.get("/menu/open", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert plain.text == MENU
+    assert plain.headers["content-type"] == "text/html; charset=utf-8"
+    assert plain.headers["vary"] == "Accept-Encoding"
+    etag = plain.headers["etag"]
+
+    compressed = client.get("/menu/open", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.text == MENU  # httpx decodes transparently
+
+    assert compressed.headers["etag"] != etag
+
+    cached = client.get(
+        "/menu/open", headers={"If-None-Match": etag, "Accept-Encoding": "identity"}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    revalidated = client.get(
+        "/menu/open",
+        headers={"If-None-Match": compressed.headers["etag"], "Accept-Encoding": "gzip"},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == compressed.headers["etag"]
+
+    head = client.head("/menu/open", headers={"Accept-Encoding": "identity"})
+    assert head.status_code == 200
+    assert head.headers["content-length"] == str(len(MENU))
+    assert client.post("/menu/open").status_code == 405
+    assert client.get("/menu/close").text == ""
+
+
+def test_flask_register_serves_conditional_and_gzip() -> None:
+    app = Flask(__name__)
+    register_static_fragments(app, _registry())
+    client = app.test_client()
+
+    plain = client.get("/menu/open")
+    assert plain.status_code == 200
+    assert plain.get_data(as_text=True) == MENU
+    etag = plain.headers["ETag"]
+
+    compressed = client.get("/menu/open", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.get_data()) == MENU.encode()
+    assert compressed.headers["ETag"] != etag
+
+    assert client.get("/menu/open", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_django_urls_serve_safe_methods_only() -> None:
+    django = pytest.importorskip("django")
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from greeble.adapters.django import static_fragment_urls
+
+    if not settings.configured:
+        # Same settings as tests/test_greeble_django_package.py, whichever module runs first.
+        settings.configure(
+            SECRET_KEY="test-secret",
+            INSTALLED_APPS=[
+                "django.contrib.auth",
+                "django.contrib.contenttypes",
+                "django.contrib.sessions",
+                "django.contrib.messages",
+            ],
+            MIDDLEWARE=[],
+            TEMPLATES=[
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "APP_DIRS": True,
+                    "OPTIONS": {"context_processors": []},
+                }
+            ],
+            USE_TZ=True,
+        )
+        django.setup()
+
+    patterns = {str(p.pattern): p.callback for p in static_fragment_urls(_registry())}
+    view = patterns["menu/open"]
+    factory = RequestFactory()
+
+    plain = view(factory.get("/menu/open"))
+    assert plain.status_code == 200
+    assert plain.content == MENU.encode()
+    assert view(factory.head("/menu/open")).status_code == 200
+    cached = view(factory.get("/menu/open", headers={"If-None-Match": plain["ETag"]}))
+    assert cached.status_code == 304
+    for method in ("post", "put", "delete"):
+        rejected = getattr(factory, method)("/menu/open")
+        assert view(rejected).status_code == 405
@@ -0,0 +1,77 @@
+"""Cold-start import budgets for the CLI entry point and framework adapters.
+
+Each module is imported in a fresh interpreter under `-X importtime`. Only the self time
+of greeble's own modules counts against the budget (framework import cost is outside our
+control), and modules that a lightweight entry point must not pull in are listed
+explicitly. Set GREEBLE_IMPORT_BUDGET_SCALE to loosen budgets on slow machines.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCALE = float(os.environ.get("GREEBLE_IMPORT_BUDGET_SCALE", "1"))
+RUNS = 3
+
+_PROBE = (
+    "import sys; before = set(sys.modules); import {module}; "
+    "print('\\n'.join(sorted(set(sys.modules) - before)))"
+)
+
+# module -> (budget for greeble's own modules in ms, modules that must stay unimported)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "greeble_cli.cli": (
+        60,
+        (
+            "yaml",
+            "asyncio",
+            "urllib.request",
+            "greeble.prerender",
+            "greeble.theme",
+            "greeble_cli.scaffold",
+            "greeble_cli.starter",
+        ),
+    ),
+    "greeble.adapters.fastapi": (40, ("flask", "django", "yaml", "urllib.request")),
+    "greeble.adapters.flask": (40, ("flask", "werkzeug", "django", "fastapi")),
+    "greeble.adapters.django": (40, ("django", "flask", "fastapi")),
+    "examples.shared": (40, ("fastapi", "flask", "werkzeug", "markupsafe")),
+}
+
+
+def _import_profile(module: str) -> tuple[float, set[str]]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT)])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    own_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        if name.strip().startswith(("greeble", "examples.shared")):
+            own_us += int(self_us)
+    return own_us / 1000, set(result.stdout.split())
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_budget(module: str) -> None:
+    budget_ms, forbidden = BUDGETS[module]
+    samples = [_import_profile(module) for _ in range(RUNS)]
+    imported = samples[0][1]
+
+    loaded = sorted(name for name in forbidden if name in imported)
+    assert not loaded, f"importing {module} pulled in {loaded}"
+
+    own_ms = min(sample[0] for sample in samples)
+    assert own_ms <= budget_ms * SCALE, f"{module} took {own_ms:.1f} ms (budget {budget_ms} ms)"
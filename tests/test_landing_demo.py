@@ -195,3 +195,15 @@ def test_sse_stream_emits_oob_fragments(client: TestClient) -> None:
                 found = True
                 break
     assert found
+
+
+def test_static_fragments_revalidate(client: TestClient) -> None:
+    menu = client.get("/menu/open")
+    assert menu.status_code == 200
+    assert "greeble-mobile-menu" in menu.text
+    cached = client.get("/menu/open", headers={"If-None-Match": menu.headers["ETag"]})
+    assert cached.status_code == 304
+
+    options = client.get("/options/target")
+    assert '<option value="en">English</option>' in options.text
+    assert client.get("/modal/close").text == ""
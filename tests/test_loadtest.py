@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+from flask import Flask, Response
+from flask import request as flask_request
+
+from greeble_cli import loadtest, main
+from greeble_cli.loadtest import (
+    LoadtestError,
+    Step,
+    Typing,
+    component_scenarios,
+    open_target,
+    run_loadtest,
+)
+from greeble_cli.manifest import Component
+
+SCENARIOS = [
+    {
+        "name": "search",
+        "steps": [
+            {
+                "method": "POST",
+                "path": "/search",
+                "hx_target": "results",
+                "type": {"field": "q", "text": "abcd", "keystroke_ms": [100, 100, 400]},
+            }
+        ],
+    },
+    {"name": "page", "steps": [{"path": "/rows?page={i}", "repeat": 3, "think_ms": 50}]},
+    {"name": "live", "steps": [{"name": "stream", "path": "/stream", "sse_events": 2}]},
+]
+
+
+def _component() -> Component:
+    return Component(key="demo", title="Demo", summary="", files=[], loadtest=SCENARIOS)
+
+
+def test_typing_fires_after_debounce_gaps_and_last_key() -> None:
+    typing = Typing(field="q", text="abcd", keystroke_ms=(100, 100, 400), debounce_ms=250)
+    assert typing.bursts() == [(0.45, "abc"), (0.4, "abcd")]
+
+
+def test_scenarios_expand_to_htmx_requests() -> None:
+    search, page, live = component_scenarios(_component())
+    assert [r.body for r in search.requests()] == [b"q=abc", b"q=abcd"]
+    first = search.requests()[0]
+    assert first.headers["HX-Request"] == "true"
+    assert first.headers["HX-Target"] == "results"
+    assert [r.url for r in page.requests()] == ["/rows?page=1", "/rows?page=2", "/rows?page=3"]
+    [stream] = live.requests()
+    assert stream.sse_events == 2
+    assert "HX-Request" not in stream.headers
+
+
+def test_only_the_repeat_index_is_substituted() -> None:
+    step = Step(
+        name="json",
+        path="/items/{i}?filter={%22a%22}",
+        params={"q": '{"page": {i}}'},
+        repeat=2,
+    )
+    assert [r.url for r in step.requests()] == [
+        "/items/1?filter={%22a%22}&q=%7B%22page%22%3A+1%7D",
+        "/items/2?filter={%22a%22}&q=%7B%22page%22%3A+2%7D",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("raw", "message"),
+    [
+        ({"name": "x", "steps": []}, "non-empty"),
+        ({"name": "x", "steps": [{"path": "/", "repeat": 0}]}, "repeat"),
+        ({"name": "x", "steps": [{"path": "/", "wait": 1}]}, "unknown step keys: wait"),
+        ({"name": "x", "steps": [{"path": "/", "type": {"field": "q"}}]}, "'field' and 'text'"),
+    ],
+)
+def test_invalid_scenarios_are_rejected(raw: dict[str, object], message: str) -> None:
+    component = Component(key="demo", title="Demo", summary="", files=[], loadtest=[raw])
+    with pytest.raises(LoadtestError, match=message):
+        component_scenarios(component)
+
+
+def _asgi_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/search")
+    async def search(request: Request, q: str = Form("")) -> HTMLResponse:
+        assert request.headers["hx-target"] == "results"
+        return HTMLResponse(f"<li>{q}</li>")
+
+    @app.get("/rows")
+    async def rows(page: int) -> HTMLResponse:
+        return HTMLResponse("<tr></tr>" * page)
+
+    async def ticks() -> AsyncIterator[str]:
+        while True:  # never ends; the load generator disconnects
+            yield "data: tick\n\n"
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        return StreamingResponse(ticks(), media_type="text/event-stream")
+
+    return app
+
+
+def _wsgi_app() -> Flask:
+    app = Flask(__name__)
+
+    @app.post("/search")
+    def search() -> str:
+        return f"<li>{flask_request.form['q']}</li>"
+
+    @app.get("/rows")
+    def rows() -> str:
+        return "<tr></tr>" * int(flask_request.args["page"])
+
+    def ticks() -> Iterator[str]:
+        while True:
+            yield "data: tick\n\n"
+
+    @app.get("/stream")
+    def stream() -> Response:
+        return Response(ticks(), mimetype="text/event-stream")
+
+    return app
+
+
+@pytest.mark.parametrize("make_app", [_asgi_app, _wsgi_app], ids=["asgi", "wsgi"])
+def test_run_loadtest_in_process(make_app: Callable[[], Any]) -> None:
+    scenarios = component_scenarios(_component())
+    report = run_loadtest(scenarios, app=make_app(), users=3, iterations=2, think=False)
+    rows = {(row.scenario, row.step): row for row in report.steps}
+    assert report.requests == 3 * 2 * (2 + 3 + 1)
+    assert all(row.errors == 0 for row in report.steps)
+
+    search = rows["demo/search", "POST /search"]
+    assert search.requests == 12
+    assert search.total_bytes == 6 * len("<li>abc</li><li>abcd</li>")
+    page = rows["demo/page", "GET /rows?page={i}"]
+    assert page.total_bytes == 6 * len("<tr></tr>") * (1 + 2 + 3)
+    stream = rows["demo/live", "stream"]
+    assert stream.requests == 6
+    assert stream.events >= 12
+    assert stream.p50_ms >= 0
+
+
+def test_percentiles_are_exact_beyond_histogram_bounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Nine 1 ms requests and one 5 s request, timed by a fake clock.
+    ticks = iter([*(t for n in range(9) for t in (n, n + 10**6)), 0, 5 * 10**9])
+    clock = SimpleNamespace(perf_counter=lambda: 0.0, perf_counter_ns=lambda: next(ticks))
+    monkeypatch.setattr(loadtest, "time", clock)
+    component = Component(
+        key="demo",
+        title="Demo",
+        summary="",
+        files=[],
+        loadtest=[{"name": "s", "steps": [{"path": "/rows?page=1", "repeat": 10}]}],
+    )
+    [row] = run_loadtest(component_scenarios(component), app=_wsgi_app(), think=False).steps
+    assert row.requests == 10
+    assert (row.p50_ms, row.p95_ms, row.p99_ms) == (1.0, 5000.0, 5000.0)
+
+
+def test_wsgi_target_runs_one_thread_per_user() -> None:
+    target = open_target(app=_wsgi_app(), users=40)
+    assert target.executor._max_workers == 40  # type: ignore[union-attr]
+
+
+def test_loadtest_cli_against_the_demo_site(capsys: pytest.CaptureFixture[str]) -> None:
+    exit_code = main(
+        [
+            "loadtest",
+            "table",
+            "palette",
+            "--app",
+            "examples.site.landing:app",
+            "--users",
+            "2",
+            "--iterations",
+            "1",
+            "--no-think",
+            "--json",
+        ]
+    )
+    assert exit_code == 0
+    payload = json.loads(capsys.readouterr().out)
+    steps = {(row["scenario"], row["step"]): row for row in payload["steps"]}
+    assert steps["table/paginate", "GET /table?page={i}&sort=org:asc"]["requests"] == 8
+    # "analytics" typed with a pause after every fourth key: "anal", "analytic", "analytics"
+    assert steps["palette/type-to-search", "POST /palette/search"]["requests"] == 2 * 3
+    assert all(row["errors"] == 0 for row in payload["steps"])
+
+    assert main(["loadtest", "button", "--app", "examples.site.landing:app"]) == 2
+    assert "no loadtest scenarios" in capsys.readouterr().err
+
+
+def test_loadtest_cli_streams_the_demo_sse_feed(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # The bundled manifest has no SSE component; the demo's live clock is declared here.
+    manifest = tmp_path / "greeble.manifest.yaml"
+    manifest.write_text(
+        """\
+version: 1
+library:
+  name: "Demo"
+components:
+  - key: live-status
+    title: "Live Status"
+    summary: "Server time ticks over SSE"
+    files: []
+    endpoints:
+      - method: GET
+        path: "/stream"
+    loadtest:
+      - name: live
+        steps:
+          - {path: "/stream?test=1", sse_events: 1}
+""",
+        encoding="utf-8",
+    )
+    exit_code = main(
+        [
+            "--manifest",
+            str(manifest),
+            "loadtest",
+            "live-status",
+            "--app",
+            "examples.site.landing:app",
+            "--users",
+            "2",
+            "--iterations",
+            "1",
+            "--json",
+        ]
+    )
+    assert exit_code == 0
+    [row] = json.loads(capsys.readouterr().out)["steps"]
+    assert (row["scenario"], row["requests"], row["events"], row["errors"]) == (
+        "live-status/live",
+        2,
+        2,
+        0,
+    )
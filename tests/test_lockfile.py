@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from greeble_cli import lockfile, main
+from greeble_cli.lockfile import (
+    CONFLICT,
+    LOCAL,
+    LOCKFILE_NAME,
+    MISSING,
+    UNCHANGED,
+    UNTRACKED,
+    UPSTREAM,
+    Lockfile,
+    classify_plans,
+)
+from greeble_cli.scaffold import CopyPlan
+
+
+def _states(project: Path, plans: list[CopyPlan], *, minify: bool = False) -> list[str]:
+    lock = Lockfile.load(project)
+    return [status.state for status in classify_plans(lock, "demo", plans, minify=minify)]
+
+
+def _install(project: Path, plans: list[CopyPlan]) -> None:
+    lock = Lockfile.load(project)
+    for status in classify_plans(lock, "demo", plans, minify=False):
+        status.plan.destination.write_bytes(status.plan.source.read_bytes())
+        lock.record("demo", status, minified=False)
+    lock.save()
+
+
+def _touch_later(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_classify_three_way_states(tmp_path: Path) -> None:
+    library = tmp_path / "library"
+    project = tmp_path / "project"
+    library.mkdir()
+    project.mkdir()
+    plans = []
+    for name in ("a", "b", "c", "d"):
+        (library / f"{name}.html").write_text(f"<p>{name}</p>", encoding="utf-8")
+        plans.append(CopyPlan(library / f"{name}.html", project / f"{name}.html"))
+
+    assert _states(project, plans) == [MISSING] * 4
+    (project / "a.html").write_text("<p>a</p>", encoding="utf-8")
+    (project / "b.html").write_text("mine", encoding="utf-8")
+    assert _states(project, plans)[:2] == [UNCHANGED, UNTRACKED]
+
+    _install(project, plans)
+    assert json.loads((project / LOCKFILE_NAME).read_text("utf-8"))["version"] == 1
+    assert _states(project, plans) == [UNCHANGED] * 4
+
+    _touch_later(library / "b.html", "<p>b v2</p>")  # upstream only
+    _touch_later(project / "c.html", "edited")  # local only
+    _touch_later(library / "d.html", "<p>d v2</p>")  # both
+    _touch_later(project / "d.html", "edited")
+    assert _states(project, plans) == [UNCHANGED, UPSTREAM, LOCAL, CONFLICT]
+    # Switching to minified output counts as an upstream change
+    assert _states(project, plans, minify=True)[0] == UPSTREAM
+
+
+def test_unchanged_files_are_recognised_without_hashing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+
+    def _fail(path: Path) -> str:
+        raise AssertionError(f"unexpected hash of {path}")
+
+    monkeypatch.setattr(lockfile, "file_sha256", _fail)
+    assert main(["sync", "button", "--project", str(project), "--backup"]) == 0
+    assert not list(project.rglob("*.bak"))
+
+
+def test_add_skips_unchanged_files(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+    capsys.readouterr()
+    # Re-adding no longer fails on files the lock shows are already current
+    assert main(["add", "button", "--project", str(project)]) == 0
+    out = capsys.readouterr().out
+    assert "Copied 0 file(s)" in out
+    assert "Skipped 2 unchanged file(s)." in out
+
+    target = project / "templates" / "greeble" / "button.html"
+    _touch_later(target, "edited")
+    assert main(["add", "button", "--project", str(project)]) == 2
+    assert "File already exists" in capsys.readouterr().err
+
+
+def test_sync_backs_up_and_keeps_only_local_edits(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+    target = project / "templates" / "greeble" / "button.html"
+    _touch_later(target, "edited")
+    capsys.readouterr()
+
+    assert main(["sync", "button", "--project", str(project), "--keep-local"]) == 0
+    assert "kept local edits: templates/greeble/button.html" in capsys.readouterr().out
+    assert target.read_text("utf-8") == "edited"
+
+    assert main(["sync", "button", "--project", str(project), "--backup"]) == 0
+    out = capsys.readouterr().out
+    assert "Synced 1 file(s); 1 unchanged." in out
+    assert "overwrote local edits (local)" in out
+    assert [path.name for path in project.rglob("*.bak")] == ["button.html.bak"]
+    assert target.read_text("utf-8") != "edited"
+
+
+def test_remove_forgets_lock_entries(tmp_path: Path) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "--project", str(project)]) == 0
+    assert main(["add", "modal", "--project", str(project)]) == 0
+    assert main(["remove", "button", "--project", str(project)]) == 0
+    lock = json.loads((project / LOCKFILE_NAME).read_text("utf-8"))
+    assert list(lock["components"]) == ["modal"]
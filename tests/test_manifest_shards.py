@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from greeble_cli import main
+from greeble_cli import manifest as manifest_module
+from greeble_cli.manifest import (
+    IndexEntry,
+    ManifestError,
+    ShardedComponents,
+    default_manifest_path,
+    load_manifest,
+    split_manifest,
+)
+
+
+@pytest.fixture
+def sharded(tmp_path: Path) -> Path:
+    source = tmp_path / "source.yaml"
+    source.write_text(default_manifest_path().read_text(encoding="utf-8"), encoding="utf-8")
+    index = tmp_path / "greeble.manifest.yaml"
+    split_manifest(source, index)
+    return index
+
+
+def test_split_manifest_round_trips(sharded: Path) -> None:
+    monolithic = load_manifest(default_manifest_path(), use_cache=False)
+    manifest = load_manifest(sharded, use_cache=False)
+
+    assert manifest.sharded
+    assert list(manifest.keys()) == list(monolithic.keys())
+    assert list(manifest.entries()) == list(monolithic.entries())
+    assert manifest.get("button") == monolithic.get("button")
+    # Shards keep the fields the Component model does not carry
+    assert "events:" in (sharded.parent / "manifest.d" / "button.yaml").read_text("utf-8")
+
+
+def test_sharded_components_load_lazily(sharded: Path) -> None:
+    manifest = load_manifest(sharded, use_cache=False)
+    components = manifest.components
+    assert isinstance(components, ShardedComponents)
+
+    (sharded.parent / "manifest.d" / "modal.yaml").unlink()
+    assert "modal" in components
+    assert len(components) == len(components.index)
+    assert manifest.get("button").files
+    with pytest.raises(ManifestError, match="shard not found"):
+        manifest.get("modal")
+    with pytest.raises(KeyError, match="Unknown component"):
+        manifest.get("missing")
+
+
+def test_list_streams_from_index(
+    sharded: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _fail(*_: object) -> None:
+        raise AssertionError("list should not open component shards")
+
+    monkeypatch.setattr(manifest_module, "_load_shard", _fail)
+    assert main(["--manifest", str(sharded), "list"]) == 0
+    assert "- button: Buttons" in capsys.readouterr().out
+
+
+def test_cached_index_and_shards_skip_yaml(
+    sharded: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("GREEBLE_CACHE_DIR", str(tmp_path / "cache"))
+    first = load_manifest(sharded).get("button")
+    assert list((tmp_path / "cache").glob("manifest-shard-*.json"))
+
+    def _fail(*_: object) -> None:
+        raise AssertionError("manifest should come from the cache")
+
+    monkeypatch.setattr(manifest_module, "_parse_manifest", _fail)
+    monkeypatch.setattr(manifest_module, "_component_from_entry", _fail)
+    assert load_manifest(sharded).get("button") == first
+
+
+def test_uncached_loads_bypass_the_shard_cache(
+    sharded: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("GREEBLE_CACHE_DIR", str(cache))
+    cached = load_manifest(sharded).get("button")
+    shard_cache = next(cache.glob("manifest-shard-*.json"))
+    shard_cache.unlink()
+
+    # A stale cache entry must not be served, and no new entry is written.
+    stale = {"stamp": manifest_module._cache_stamp(sharded.parent / "manifest.d" / "button.yaml")}
+    stale["component"] = {**asdict(cached), "title": "Stale"}
+    shard_cache.write_text(json.dumps(stale), encoding="utf-8")
+    before = sorted(cache.iterdir())
+    assert load_manifest(sharded, use_cache=False).get("button") == cached
+    assert sorted(cache.iterdir()) == before
+    assert load_manifest(sharded).get("button").title == "Stale"
+
+
+def test_sharded_index_validation(tmp_path: Path) -> None:
+    index = tmp_path / "greeble.manifest.yaml"
+    shards = tmp_path / "manifest.d"
+    shards.mkdir()
+
+    index.write_text(
+        "version: 1\nshards: manifest.d\ncomponents:\n"
+        "  - key: card\n    files: [templates/card.html]\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ManifestError, match="may only contain"):
+        load_manifest(index, use_cache=False)
+
+    index.write_text(
+        "version: 1\nshards: manifest.d\ncomponents:\n  - key: ../card\n", encoding="utf-8"
+    )
+    with pytest.raises(ManifestError, match="shard filename"):
+        load_manifest(index, use_cache=False)
+
+    index.write_text(
+        "version: 1\nshards: manifest.d\ncomponents:\n  - key: card\n    title: Card\n",
+        encoding="utf-8",
+    )
+    (shards / "card.yaml").write_text("key: panel\n", encoding="utf-8")
+    manifest = load_manifest(index, use_cache=False)
+    assert list(manifest.entries()) == [IndexEntry(key="card", title="Card", summary="")]
+    with pytest.raises(ManifestError, match="expected 'card'"):
+        manifest.get("card")
+
+    (shards / "card.yaml").write_text("files: [templates/greeble/card.html]\n", encoding="utf-8")
+    card = manifest.get("card")
+    assert (card.title, card.files) == ("Card", ["templates/greeble/card.html"])
+
+
+def test_cli_split_manifest(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    target = tmp_path / "greeble.manifest.yaml"
+    assert main(["split-manifest", "--out", str(target), "--shards", "parts"]) == 0
+    assert "component shard(s)" in capsys.readouterr().out
+    assert (tmp_path / "parts" / "button.yaml").exists()
+
+    assert main(["--manifest", str(target), "split-manifest"]) == 2
+    assert "already sharded" in capsys.readouterr().err
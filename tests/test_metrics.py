@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gc
+import threading
+import types
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+from flask import Flask
+from flask import request as flask_request
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from greeble import metrics
+from greeble.adapters import fastapi as g_fastapi
+from greeble.adapters import flask as g_flask
+from greeble.adapters.utils import hx_target
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> Iterator[None]:
+    yield
+    metrics.configure_metrics(False)
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    histogram = metrics.Histogram((10, 20, 40))
+    for value in (5, 10, 15, 30, 100):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 160
+    assert histogram.quantile(0.2) == 5.0
+    assert histogram.quantile(0.5) == 15.0
+    assert histogram.quantile(0.99) == 40.0  # +Inf bucket clamps to the last bound
+
+
+def test_threads_record_into_shards_merged_on_read() -> None:
+    registry = metrics.MetricsRegistry()
+
+    def record() -> None:
+        for _ in range(1000):
+            registry.observe(
+                "list.html", kind="partial", hx_target="rows", elapsed_ns=2_000_000, size=300
+            )
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    [summary] = registry.summaries()
+    assert (summary.template, summary.kind, summary.hx_target) == ("list.html", "partial", "rows")
+    assert summary.count == 4000
+    assert summary.bytes_total == 1_200_000
+    assert 0.001 < summary.p50 <= 0.0025
+
+
+def test_dead_threads_shards_are_retired() -> None:
+    registry = metrics.MetricsRegistry()
+
+    def record() -> None:
+        registry.observe("row.html", kind="partial", hx_target="t", elapsed_ns=1, size=10)
+
+    for _ in range(200):
+        thread = threading.Thread(target=record)
+        thread.start()
+        thread.join()
+        del thread
+    gc.collect()
+    assert len(registry._shards) <= 1
+    [summary] = registry.summaries()
+    assert summary.count == 200
+    assert summary.bytes_total == 2000
+
+
+def test_cardinality_limit_holds_under_concurrency() -> None:
+    registry = metrics.MetricsRegistry(max_series=5)
+    barrier = threading.Barrier(8)
+
+    def record(worker: int) -> None:
+        barrier.wait()
+        for i in range(50):
+            registry.observe(f"t{worker}-{i}", kind="full", hx_target=None, elapsed_ns=1, size=1)
+
+    threads = [threading.Thread(target=record, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    templates = {row.template for row in registry.summaries()}
+    assert len(templates - {"__other__"}) == 5
+    assert registry.dropped == 8 * 50 - 5
+
+
+def test_cardinality_limit_folds_new_series() -> None:
+    registry = metrics.MetricsRegistry(max_series=2)
+    for target in ("a", "b", "c", "d"):
+        registry.observe("row.html", kind="partial", hx_target=target, elapsed_ns=1, size=1)
+    registry.observe("row.html", kind="partial", hx_target="a", elapsed_ns=1, size=1)
+    counts = {(row.template, row.hx_target): row.count for row in registry.summaries()}
+    assert counts == {("row.html", "a"): 2, ("row.html", "b"): 1, ("__other__", "__other__"): 2}
+    assert registry.dropped == 2
+
+
+def test_exposition_format() -> None:
+    registry = metrics.MetricsRegistry(latency_buckets=(0.001, 0.01), size_buckets=(100,))
+    registry.observe('we"ird\n.html', kind="full", hx_target=None, elapsed_ns=5_000_000, size=50)
+    lines = registry.exposition().splitlines()
+    labels = 'template="we\\"ird\\n.html",kind="full",hx_target=""'
+    assert "# TYPE greeble_render_seconds histogram" in lines
+    assert f'greeble_render_seconds_bucket{{{labels},le="0.001"}} 0' in lines
+    assert f'greeble_render_seconds_bucket{{{labels},le="0.01"}} 1' in lines
+    assert f'greeble_render_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"greeble_render_seconds_sum{{{labels}}} 0.005" in lines
+    assert f'greeble_response_bytes_bucket{{{labels},le="100"}} 1' in lines
+    assert f"greeble_response_bytes_count{{{labels}}} 1" in lines
+    assert lines[-1] == "greeble_metrics_series_dropped_total 0"
+
+
+def test_fastapi_records_and_serves_metrics(tmp_path: Path) -> None:
+    (tmp_path / "page.html").write_text("FULL", encoding="utf-8")
+    (tmp_path / "rows.html").write_text("<tr></tr>", encoding="utf-8")
+    templates = Jinja2Templates(directory=str(tmp_path))
+    app = FastAPI()
+
+    @app.get("/page")
+    def page(request: Request) -> Response:
+        return g_fastapi.template_response(
+            templates, "page.html", {}, request, partial_template="rows.html"
+        )
+
+    g_fastapi.mount_metrics(app)
+    client = TestClient(app)
+    client.get("/page")
+    assert client.get("/metrics").text == ""
+
+    metrics.configure_metrics()
+    client.get("/page")
+    client.get("/page", headers={"HX-Request": "true", "HX-Target": "table-body"})
+    response = client.get("/metrics")
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert (
+        'greeble_response_bytes_count{template="page.html",kind="full",hx_target=""} 1'
+        in response.text
+    )
+    assert (
+        'greeble_response_bytes_sum{template="rows.html",kind="partial",hx_target="table-body"} 9'
+        in response.text
+    )
+
+
+def test_flask_records_and_serves_metrics(tmp_path: Path) -> None:
+    (tmp_path / "page.html").write_text("Hello {{ name }}", encoding="utf-8")
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.add_url_rule(
+        "/", "page", lambda: g_flask.template_response("page.html", {"name": "Ada"}, flask_request)
+    )
+    g_flask.register_metrics(app)
+    registry = metrics.configure_metrics()
+    assert registry is not None
+    client = app.test_client()
+    client.get("/", headers={"HX-Target": "greeting"})
+    [summary] = registry.summaries()
+    assert (summary.template, summary.kind, summary.hx_target) == ("page.html", "full", "greeting")
+    assert summary.bytes_total == len("Hello Ada")
+    response = client.get("/metrics")
+    assert response.content_type == metrics.CONTENT_TYPE
+    assert "greeble_render_seconds_count" in response.text
+
+
+def test_hx_target_reads_environ_fallback() -> None:
+    request = types.SimpleNamespace(headers=None, environ={"HTTP_HX_TARGET": "panel"})
+    assert hx_target(request) == "panel"
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import jinja2
+import pytest
+
+from greeble import minify
+from greeble.adapters.fastapi import partial_html
+from greeble.minify import ResponseMinifier, minify_html, minify_svg
+from greeble_cli import main
+from greeble_cli.manifest import default_manifest_path
+
+COMPONENTS = default_manifest_path().parent / "packages" / "greeble_components" / "components"
+
+
+@pytest.fixture(autouse=True)
+def reset_response_minify() -> Iterator[None]:
+    yield
+    minify.configure_response_minify(False)
+
+
+def test_minify_html_strips_comments_and_collapses_whitespace() -> None:
+    source = """
+<!-- Component doc header
+     spanning lines -->
+<ul>
+  <li>
+    <strong>Hello</strong>   <span>world</span>
+  </li>
+</ul>
+"""
+    assert minify_html(source) == "<ul><li><strong>Hello</strong> <span>world</span></li></ul>"
+
+
+def test_minify_html_preserves_raw_blocks_and_attribute_values() -> None:
+    source = (
+        "<pre>\n  keep\n    this</pre>\n"
+        "<textarea name='x'>  a\n b </textarea>\n"
+        '<button _="on click\n  toggle .open" hx-vals=\'{"a":  1}\'>Go</button>'
+    )
+    result = minify_html(source)
+    assert "<pre>\n  keep\n    this</pre>" in result
+    assert "<textarea name='x'>  a\n b </textarea>" in result
+    assert '_="on click\n  toggle .open"' in result
+    assert "hx-vals='{\"a\":  1}'" in result
+
+
+def test_minify_html_keeps_template_syntax_and_unquoted_values() -> None:
+    source = (
+        '<ul>\n  {% for x in items %}\n  <li data-x="{{ x }}">{{ x }}</li>\n  {% endfor %}\n</ul>'
+    )
+    assert (
+        minify_html(source)
+        == '<ul>{% for x in items %}<li data-x="{{ x }}">{{ x }}</li>{% endfor %}</ul>'
+    )
+    assert minify_html("<input value=a />") == "<input value=a />"
+    assert minify_html('<input value="a" />') == '<input value="a"/>'
+
+
+def test_component_templates_stay_valid_after_minify() -> None:
+    env = jinja2.Environment()
+    for path in sorted(COMPONENTS.glob("*/templates/*.html")):
+        text = path.read_text(encoding="utf-8")
+        result = minify_html(text)
+        env.parse(result)
+        visible = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
+        assert re.sub(r"\s+", "", visible) == re.sub(r"\s+", "", result), path
+
+
+def test_minify_svg_compacts_path_data() -> None:
+    source = """<?xml version="1.0"?>
+<svg viewBox="0 0 10 10">
+  <!-- icon -->
+  <path d="M 1 2 L 3 4
+           Z" />
+  <text x="1">Hi  there</text>
+</svg>"""
+    assert minify_svg(source) == (
+        '<svg viewBox="0 0 10 10"><path d="M1 2L3 4Z"/><text x="1">Hi there</text></svg>'
+    )
+
+
+def test_response_minifier_caches_results() -> None:
+    minifier = ResponseMinifier(max_entries=1)
+    assert minifier("<p>\n a </p>") == "<p> a </p>"
+    assert minifier("<p>\n a </p>") == "<p> a </p>"
+    assert (minifier.hits, minifier.misses) == (1, 1)
+    minifier("<div> </div>")
+    assert len(minifier) == 1
+
+
+def test_response_minifier_is_thread_safe() -> None:
+    minifier = ResponseMinifier(max_entries=2)
+    fragments = [f"<p>\n {index} </p>" for index in range(6)]
+    errors: list[KeyError] = []
+
+    def work() -> None:
+        try:
+            for _ in range(300):
+                for html in fragments:
+                    minifier(html)
+        except KeyError as exc:  # pragma: no cover - the get()/move_to_end() race
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert minifier.hits + minifier.misses == 8 * 300 * len(fragments)
+    assert len(minifier) <= 2
+
+
+def test_partial_html_uses_configured_minifier() -> None:
+    assert partial_html("<div>\n  <p>x</p>\n</div>").body == b"<div>\n  <p>x</p>\n</div>"
+    minify.configure_response_minify()
+    assert partial_html("<div>\n  <p>x</p>\n</div>").body == b"<div><p>x</p></div>"
+
+
+def test_cli_add_minify(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    exit_code = main(["add", "modal", "--project", str(tmp_path), "--minify"])
+    assert exit_code == 0
+    copied = (tmp_path / "templates" / "greeble" / "modal.partial.html").read_text("utf-8")
+    assert "<!--" not in copied
+    assert "Minified" in capsys.readouterr().out
+
+
+def test_cli_add_minify_copies_binary_assets_verbatim(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    library = tmp_path / "library"
+    component = library / "packages" / "greeble_components" / "components" / "badge"
+    (component / "templates").mkdir(parents=True)
+    (component / "static").mkdir()
+    (component / "templates" / "badge.html").write_text("<span>\n  x\n</span>\n", "utf-8")
+    font = bytes(range(256)) * 4  # not valid UTF-8
+    (component / "static" / "badge.woff2").write_bytes(font)
+    manifest = library / "greeble.manifest.yaml"
+    manifest.write_text(
+        "version: 1\n"
+        "library: {name: Test}\n"
+        "components:\n"
+        "  - key: badge\n"
+        "    title: Badge\n"
+        "    summary: Badge\n"
+        "    files: [templates/greeble/badge.html, static/greeble/badge.woff2]\n",
+        encoding="utf-8",
+    )
+    project = tmp_path / "app"
+
+    args = ["--manifest", str(manifest), "add", "badge", "--project", str(project), "--minify"]
+    assert main(args) == 0
+    assert (project / "static" / "greeble" / "badge.woff2").read_bytes() == font
+    assert (project / "templates" / "greeble" / "badge.html").read_text(
+        "utf-8"
+    ) == "<span> x </span>"
+    capsys.readouterr()
+    assert main(["--manifest", str(manifest), "minify", "badge", "--json"]) == 0
+    [entry] = json.loads(capsys.readouterr().out)["entries"]
+    assert entry["files"] == 1
+
+
+def test_cli_minify_report_json(capsys: pytest.CaptureFixture[str]) -> None:
+    exit_code = main(["minify", "modal", "score-gauge", "--json"])
+    assert exit_code == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert [entry["name"] for entry in payload["entries"]] == ["modal", "score-gauge"]
+    assert all(entry["saved"] > 0 for entry in payload["entries"])
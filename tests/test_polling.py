@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import ExitStack
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+from flask import Flask
+
+from greeble.polling import (
+    STOP_POLLING_STATUS,
+    PollAdvice,
+    PollController,
+    PollLoadMiddleware,
+    PollLoadWSGIMiddleware,
+)
+
+
+def _occupy(controller: PollController, requests: int, stack: ExitStack) -> None:
+    for _ in range(requests):
+        stack.enter_context(controller.track())
+
+
+def test_interval_grows_with_in_flight_load_and_recovers() -> None:
+    controller = PollController(base_interval=2, max_interval=20, max_in_flight=10, slow_at=0.5)
+    assert controller.advise() == PollAdvice(interval=2, load=0.0)
+
+    held = ExitStack()
+    _occupy(controller, 5, held)
+    assert controller.advise().interval == 2  # slowing starts above half load
+    _occupy(controller, 3, held)
+    advice = controller.advise()
+    assert advice.load == pytest.approx(0.8)
+    assert advice.interval == 13  # 2 + 18 * 0.6 = 12.8, rounded up to whole seconds
+    assert advice.trigger == "every 13s"
+    _occupy(controller, 7, held)
+    assert controller.advise().interval == 20
+    assert controller.advise().status == 200
+
+    held.close()
+    assert controller.in_flight == 0
+    assert controller.advise().trigger == "every 2s"
+
+
+def test_stop_at_answers_286() -> None:
+    controller = PollController(max_in_flight=2, stop_at=1.0)
+    with ExitStack() as held:
+        _occupy(controller, 2, held)
+        advice = controller.advise()
+    assert advice.stop
+    assert advice.status == STOP_POLLING_STATUS
+    assert advice.sse_retry() == "retry: 30000\n\n"
+
+
+def test_lag_samples_are_smoothed() -> None:
+    controller = PollController(base_interval=1, max_interval=11, max_lag=0.1, smoothing=0.5)
+    controller.record_lag(0.2)
+    assert controller.lag == pytest.approx(0.1)
+    assert controller.advise().interval == 11
+    controller.record_lag(-1)  # early wake-ups count as no lag
+    controller.record_lag(0)
+    assert controller.lag == pytest.approx(0.025)
+    assert controller.advise().interval == 1
+
+
+def test_lag_monitor_measures_a_blocked_loop() -> None:
+    controller = PollController(smoothing=1.0)
+
+    async def scenario() -> None:
+        task = controller.start_lag_monitor(period=0.01)
+        assert controller.start_lag_monitor() is task
+        await asyncio.sleep(0)
+        threading.Event().wait(0.1)  # block the loop
+        for _ in range(3):  # let the monitor wake up late and record it
+            await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert controller.lag >= 0.05
+
+
+def test_invalid_settings_are_rejected() -> None:
+    with pytest.raises(ValueError, match="base_interval"):
+        PollController(base_interval=10, max_interval=5)
+    with pytest.raises(ValueError, match="slow_at"):
+        PollController(slow_at=1)
+    for smoothing in (0, -0.5, 1.5):
+        with pytest.raises(ValueError, match="smoothing"):
+            PollController(smoothing=smoothing)
+
+
+def test_middlewares_count_requests_in_flight() -> None:
+    controller = PollController(base_interval=2, max_interval=10, max_in_flight=1, slow_at=0)
+    app = FastAPI()
+    app.add_middleware(PollLoadMiddleware, controller=controller)
+
+    @app.get("/stats", response_class=HTMLResponse)
+    async def stats() -> HTMLResponse:
+        advice = controller.advise()
+        return HTMLResponse(
+            f'<div hx-get="/stats" hx-trigger="{advice.trigger}"></div>',
+            status_code=advice.status,
+        )
+
+    response = TestClient(app).get("/stats")
+    assert response.status_code == 200
+    assert 'hx-trigger="every 10s"' in response.text  # the poll itself is the one in flight
+    assert controller.in_flight == 0
+
+    flask_app = Flask(__name__)
+
+    @flask_app.get("/stats")
+    def flask_stats() -> str:
+        return str(controller.in_flight)
+
+    flask_app.wsgi_app = PollLoadWSGIMiddleware(flask_app.wsgi_app, controller)  # type: ignore[method-assign]
+    assert flask_app.test_client().get("/stats").text == "1"
+    assert controller.in_flight == 0
+
+
+def test_open_event_streams_do_not_slow_polling() -> None:
+    controller = PollController(base_interval=2, max_interval=10, max_in_flight=4, slow_at=0.5)
+    streaming = asyncio.Event()
+    hang_up = asyncio.Event()
+
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["path"] == "/stream":
+            headers = [(b"content-type", b"text/event-stream; charset=utf-8")]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"data: 1\n\n", "more_body": True})
+            streaming.set()
+            await hang_up.wait()  # an SSE stream stays open indefinitely
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if scope["path"] == "/longpoll":
+            await hang_up.wait()
+        advice = controller.advise()
+        await send({"type": "http.response.start", "status": advice.status, "headers": []})
+        await send({"type": "http.response.body", "body": advice.trigger.encode()})
+
+    middleware = PollLoadMiddleware(app, controller, exclude=lambda path: path == "/longpoll")
+
+    async def request(path: str) -> bytes:
+        chunks: list[bytes] = []
+
+        async def send(message: dict[str, Any]) -> None:
+            chunks.append(message.get("body", b""))
+
+        await middleware({"type": "http", "path": path, "headers": []}, None, send)
+        return b"".join(chunks)
+
+    async def scenario() -> tuple[int, bytes]:
+        streams = [asyncio.create_task(request("/stream")) for _ in range(5)]
+        longpoll = asyncio.create_task(request("/longpoll"))
+        await streaming.wait()
+        await asyncio.sleep(0)
+        during = controller.in_flight
+        poll = await request("/stats")
+        hang_up.set()
+        await asyncio.gather(*streams, longpoll)
+        return during, poll
+
+    during, poll = asyncio.run(scenario())
+    assert during == 0
+    # Five open streams would saturate max_in_flight=4; only the poll itself counts.
+    assert poll == b"every 2s"
+    assert controller.in_flight == 0
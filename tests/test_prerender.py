@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.testclient import TestClient
+from flask import Flask
+
+from greeble.prerender import (
+    SNAPSHOT_MANIFEST,
+    PrerenderError,
+    SnapshotMiddleware,
+    SnapshotWSGIMiddleware,
+    export_static,
+    snapshot_filename,
+)
+from greeble_cli import main
+
+
+def _fastapi_app() -> FastAPI:
+    app = FastAPI()
+    calls: list[str] = []
+    app.state.calls = calls
+
+    @app.get("/", response_class=HTMLResponse)
+    def home(request: Request) -> str:
+        calls.append("/")
+        if request.headers.get("HX-Request") == "true":
+            return "<p>partial</p>"
+        return "<html><body>" + "<p>home</p>" * 50 + "</body></html>"
+
+    @app.get("/about", response_class=HTMLResponse)
+    def about() -> str:
+        return "<html>about</html>"
+
+    @app.get("/api")
+    def api() -> JSONResponse:
+        return JSONResponse({"ok": True})
+
+    return app
+
+
+def test_snapshot_filename() -> None:
+    assert snapshot_filename("/") == "index.html"
+    assert snapshot_filename("/docs/") == "docs/index.html"
+    assert snapshot_filename("/about.html") == "about.html"
+    paged = snapshot_filename("/?page=2")
+    assert paged.startswith("index.") and paged.endswith(".html")
+    assert paged not in {"index.html", snapshot_filename("/?page=3")}
+
+
+def test_export_static_writes_pages_gzip_and_manifest(tmp_path: Path) -> None:
+    snapshots = export_static(_fastapi_app(), ["/", "/about"], tmp_path)
+    assert [snap.file for snap in snapshots] == ["index.html", "about/index.html"]
+    html = (tmp_path / "index.html").read_bytes()
+    assert html.startswith(b"<html><body><p>home</p>")
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == html
+    manifest = json.loads((tmp_path / SNAPSHOT_MANIFEST).read_text("utf-8"))
+    assert [entry["route"] for entry in manifest["routes"]] == ["/", "/about"]
+
+
+def test_export_static_rejects_non_html_and_errors(tmp_path: Path) -> None:
+    with pytest.raises(PrerenderError, match="application/json"):
+        export_static(_fastapi_app(), ["/api"], tmp_path)
+    with pytest.raises(PrerenderError, match="404"):
+        export_static(_fastapi_app(), ["/missing"], tmp_path)
+
+
+def test_snapshot_middleware_serves_pages_and_passes_partials(tmp_path: Path) -> None:
+    export_static(_fastapi_app(), ["/"], tmp_path)
+    app = _fastapi_app()
+    app.add_middleware(SnapshotMiddleware, directory=tmp_path)
+    client = TestClient(app)
+
+    page = client.get("/")
+    assert page.headers["content-encoding"] == "gzip"
+    assert "<p>home</p>" in page.text
+    assert app.state.calls == []
+
+    assert client.get("/", headers={"If-None-Match": page.headers["etag"]}).status_code == 304
+    partial = client.get("/", headers={"HX-Request": "true"})
+    assert partial.text == "<p>partial</p>"
+    assert app.state.calls == ["/"]
+    assert client.get("/about").text == "<html>about</html>"
+
+
+def test_snapshots_are_keyed_by_query_string(tmp_path: Path) -> None:
+    export_static(_fastapi_app(), ["/", "/?page=2", "/?page=3"], tmp_path)
+    app = _fastapi_app()
+    app.add_middleware(SnapshotMiddleware, directory=tmp_path)
+    client = TestClient(app)
+
+    assert "<p>home</p>" in client.get("/?page=2").text
+    assert app.state.calls == []
+    client.get("/?page=4")
+    assert app.state.calls == ["/"]
+
+    flask_app = Flask(__name__)
+
+    @flask_app.get("/")
+    def home() -> str:
+        return "<html>live</html>"
+
+    flask_app.wsgi_app = SnapshotWSGIMiddleware(flask_app.wsgi_app, tmp_path)  # type: ignore[method-assign]
+    flask_client = flask_app.test_client()
+    assert "<p>home</p>" in flask_client.get("/?page=3").get_data(as_text=True)
+    assert flask_client.get("/?page=4").get_data(as_text=True) == "<html>live</html>"
+
+
+def test_wsgi_export_and_middleware(tmp_path: Path) -> None:
+    flask_app = Flask(__name__)
+
+    @flask_app.get("/")
+    def home() -> str:
+        return "<html>flask</html>"
+
+    export_static(flask_app, ["/"], tmp_path, compress=False)
+    assert (tmp_path / "index.html").read_text("utf-8") == "<html>flask</html>"
+    assert not (tmp_path / "index.html.gz").exists()
+
+    flask_app.wsgi_app = SnapshotWSGIMiddleware(flask_app.wsgi_app, tmp_path)  # type: ignore[method-assign]
+    resp = flask_app.test_client().get("/")
+    assert resp.get_data(as_text=True) == "<html>flask</html>"
+    assert "ETag" in resp.headers
+
+
+def test_cli_export_static_uses_declared_routes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "siteapp.py").write_text(
+        "from fastapi import FastAPI\n"
+        "from fastapi.responses import HTMLResponse\n"
+        "app = FastAPI()\n"
+        "PRERENDER_ROUTES = ['/about']\n"
+        "@app.get('/about', response_class=HTMLResponse)\n"
+        "def about() -> str:\n"
+        "    return '<html>about</html>'\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    out = tmp_path / "dist"
+    exit_code = main(
+        ["export-static", "siteapp:app", "--app-dir", str(tmp_path), "--out", str(out)]
+    )
+    assert exit_code == 0
+    assert (out / "about" / "index.html").read_text("utf-8") == "<html>about</html>"
+    assert "Prerendered 1 route(s)" in capsys.readouterr().out
+
+    assert main(["export-static", "missing_module:app", "--out", str(out)]) == 2
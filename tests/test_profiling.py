@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from flask import request as flask_request
+
+from greeble import profiling
+from greeble.adapters import flask as g_flask
+from greeble_cli import main
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiling() -> Iterator[None]:
+    yield
+    profiling.configure_profiling(False)
+
+
+def _flask_app(templates: Path) -> Flask:
+    (templates / "rows.html").write_text(
+        "{% for i in range(200) %}<tr>{{ i }}</tr>{% endfor %}", encoding="utf-8"
+    )
+    app = Flask(__name__, template_folder=str(templates))
+    app.add_url_rule("/", "rows", lambda: g_flask.template_response("rows.html", {}, flask_request))
+    return app
+
+
+def test_sampled_slow_renders_are_captured_and_rotated(tmp_path: Path) -> None:
+    captures = tmp_path / "profiles"
+    client = _flask_app(tmp_path).test_client()
+    profiling.configure_profiling(
+        directory=captures, threshold_ms=0, sample_every=2, max_captures=2
+    )
+    for _ in range(6):  # renders 1, 3 and 5 are sampled
+        client.get("/", headers={"HX-Request": "true", "HX-Target": "table-body"})
+
+    pstats_files = sorted(captures.glob("*.pstats"))
+    assert len(pstats_files) == 2
+    assert all(path.name.endswith("-rows.html.pstats") for path in pstats_files)
+    meta = json.loads(pstats_files[-1].with_suffix(".json").read_text(encoding="utf-8"))
+    assert meta["template"] == "rows.html"
+    assert meta["headers"] == {"HX-Request": "true", "HX-Target": "table-body"}
+
+
+def test_fast_renders_are_discarded(tmp_path: Path) -> None:
+    captures = tmp_path / "profiles"
+    profiling.configure_profiling(directory=captures, threshold_ms=60_000, sample_every=1)
+    _flask_app(tmp_path).test_client().get("/")
+    assert not list(captures.iterdir())
+    # The profiler slot was released, so the next sampled render can run.
+    capture = profiling.start_profile()
+    assert capture is not None
+    assert capture.finish("rows.html", {}) is None
+
+
+def test_capture_write_errors_do_not_break_the_response(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    captures = tmp_path / "profiles"
+    profiling.configure_profiling(directory=captures, threshold_ms=0, sample_every=1)
+    captures.rmdir()
+    captures.write_text("not a directory", encoding="utf-8")  # every write now fails
+
+    response = _flask_app(tmp_path).test_client().get("/")
+    assert response.status_code == 200
+    assert "<tr>199</tr>" in response.get_data(as_text=True)
+    assert "Could not write profile capture for rows.html" in caplog.text
+    capture = profiling.start_profile()  # the profiler slot was released
+    assert capture is not None
+    assert capture.finish("rows.html", {}) is None
+
+
+def test_profiler_start_failures_leave_the_render_unprofiled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    class BusyProfile:
+        def enable(self) -> None:
+            raise ValueError("Another profiling tool is already active")
+
+    profiling.configure_profiling(directory=tmp_path / "profiles", threshold_ms=0, sample_every=1)
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    client = _flask_app(tmp_path).test_client()
+    assert client.get("/").status_code == 200
+    assert client.get("/").status_code == 200
+    assert caplog.text.count("Could not start the render profiler") == 1
+
+    monkeypatch.undo()
+    capture = profiling.start_profile()  # the profiler slot was released
+    assert capture is not None
+    capture.finish("rows.html", {})
+
+
+def test_profile_report_summarises_captures(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    captures = tmp_path / "profiles"
+    profiling.configure_profiling(directory=captures, threshold_ms=0, sample_every=1)
+    _flask_app(tmp_path).test_client().get("/", headers={"HX-Target": "table-body"})
+
+    report = profiling.summarize_captures(captures, limit=5, sort="cumtime")
+    assert report.captures == 1
+    [row] = report.templates
+    assert (row.template, row.captures, row.hx_targets) == ("rows.html", 1, ("table-body",))
+    assert len(report.functions) == 5
+    assert report.functions[0].cumtime >= report.functions[-1].cumtime
+
+    assert main(["profile", "report", str(captures), "--limit", "3"]) == 0
+    out = capsys.readouterr().out
+    assert "1 capture(s)" in out
+    assert "rows.html" in out
+    assert "table-body" in out
+    assert main(["profile", "report", str(tmp_path / "missing")]) == 2
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from examples.site import landing
+from greeble.demo import account_row_version, account_rows_diff, account_slug
+from greeble.rowdiff import (
+    ROW_STATE_FIELD,
+    RowDiff,
+    decode_rows,
+    diff_rows,
+    encode_rows,
+    row_state_input,
+    row_version,
+)
+
+
+@dataclass(frozen=True)
+class Item:
+    key: str
+    label: str
+
+
+def _render(item: Item) -> str:
+    return f'<tr id="row-{item.key}"><td>{item.label}</td></tr>'
+
+
+def _diff(items: list[Item], client_state: str | None) -> RowDiff:
+    return diff_rows(
+        items,
+        key=lambda item: item.key,
+        version=lambda item: row_version(item.label),
+        render=_render,
+        client_state=client_state,
+        tbody_id="rows",
+    )
+
+
+ITEMS = [Item("a", "A"), Item("b", "B"), Item("c", "C")]
+
+
+def test_without_client_state_renders_the_full_body() -> None:
+    diff = _diff(ITEMS, None)
+    assert diff.full
+    assert diff.html.startswith('<tr id="row-a">')
+    assert diff.html.endswith(row_state_input(diff.state, swap_oob=True))
+    assert diff.headers == {}
+    assert [k for k, _ in decode_rows(diff.state)] == ["a", "b", "c"]
+
+
+def test_only_changed_inserted_and_removed_rows_are_sent() -> None:
+    state = _diff(ITEMS, None).state
+    after = [Item("new", "N"), Item("a", "A"), Item("c", "C*"), Item("d", "D")]
+    diff = _diff(after, state)
+
+    assert not diff.full
+    assert diff.headers == {"HX-Reswap": "none"}
+    assert (diff.inserted, diff.updated, diff.removed) == (("new", "d"), ("c",), ("b",))
+    html = diff.html
+    # No <template>: htmx 1.9 does not look for hx-swap-oob inside template content.
+    assert "<template" not in html
+    assert html.startswith(
+        '<tbody><tr id="row-b" hx-swap-oob="delete"></tr>'
+        '<tr hx-swap-oob="true" id="row-c"><td>C*</td></tr></tbody>'
+    )
+    assert '<tbody hx-swap-oob="afterbegin:#rows"><tr id="row-new">' in html
+    assert '<tbody hx-swap-oob="afterend:#row-c"><tr id="row-d">' in html
+    assert html.endswith(row_state_input(diff.state, swap_oob=True))
+    assert "row-a" not in html
+    assert _diff(after, diff.state).unchanged
+    assert _diff(after, diff.state).html == ""
+
+
+def test_reordered_or_disjoint_rows_fall_back_to_full() -> None:
+    state = _diff(ITEMS, None).state
+    assert _diff(list(reversed(ITEMS)), state).full
+    assert _diff([Item("x", "X")], state).full
+
+
+def test_empty_rows_render_the_empty_body_and_reset_state() -> None:
+    state = _diff(ITEMS, None).state
+    diff = diff_rows(
+        [],
+        key=lambda item: item.key,
+        version=lambda item: row_version(item.label),
+        render=_render,
+        client_state=state,
+        tbody_id="rows",
+        empty="<tr><td>None</td></tr>",
+    )
+    assert diff.full
+    assert diff.state == ""
+    assert diff.html == "<tr><td>None</td></tr>" + row_state_input("", swap_oob=True)
+
+
+def test_state_encoding_and_render_contract() -> None:
+    assert decode_rows(encode_rows([("a", "1"), ("b", "2")])) == [("a", "1"), ("b", "2")]
+    assert decode_rows("junk;:1;a:1") == [("a", "1")]
+    with pytest.raises(ValueError, match="<tr"):
+        diff_rows(
+            [Item("a", "changed")],
+            key=lambda item: item.key,
+            version=lambda item: row_version(item.label),
+            render=lambda item: "<div></div>",
+            client_state="a:stale",
+            tbody_id="rows",
+        )
+
+
+def test_account_rows_diff_after_a_status_change() -> None:
+    accounts = list(landing.ACCOUNTS[:3])
+    state = account_rows_diff(accounts, None).state
+    changed = replace(accounts[1], status="delinquent")
+    diff = account_rows_diff([accounts[0], changed, accounts[2]], state)
+    assert diff.updated == (account_slug(changed),)
+    assert f'id="account-row-{account_slug(changed)}"' in diff.html
+    assert account_row_version(changed) in diff.state
+
+
+def test_table_component_includes_the_row_state() -> None:
+    template = (
+        Path(__file__).parents[1]
+        / "packages/greeble_components/components/table/templates/table.html"
+    ).read_text(encoding="utf-8")
+    assert row_state_input("") in template
+    triggers = re.findall(
+        r"<(?:button|form|tbody)[^>]*hx-(?:get|post)=\"/table(?:\?|/search)[^>]*>", template
+    )
+    assert len(triggers) == 8  # search, initial load, three sorts, three pages
+    assert all('hx-include="#table-row-state"' in trigger for trigger in triggers)
+
+
+def test_landing_table_uses_row_diffs_when_state_is_sent() -> None:
+    client = TestClient(landing.app)
+    full = client.get("/table", params={"page": 1, ROW_STATE_FIELD: ""})
+    assert full.status_code == 200
+    assert 'id="account-row-' in full.text
+    assert f'name="{ROW_STATE_FIELD}"' in full.text
+    state = decode_rows(full.text.rsplit('value="', 1)[1].split('"', 1)[0])
+
+    same = client.get("/table", params={"page": 1, ROW_STATE_FIELD: encode_rows(state)})
+    assert same.text == ""
+    assert same.headers["HX-Reswap"] == "none"
+    assert "HX-Trigger" in same.headers
+
+    search = client.post("/table/search", data={"q": "", ROW_STATE_FIELD: encode_rows(state)})
+    assert search.text == ""
+
+    # A search without matches resets the state, so clearing it renders the rows again.
+    nothing = client.post("/table/search", data={"q": "zzz", ROW_STATE_FIELD: encode_rows(state)})
+    assert "No accounts match this search." in nothing.text
+    assert f'name="{ROW_STATE_FIELD}" value=""' in nothing.text
+    cleared = client.post("/table/search", data={"q": "", ROW_STATE_FIELD: ""})
+    assert 'id="account-row-' in cleared.text
+
+    legacy = client.get("/table", params={"page": 1})
+    assert "<tr>" in legacy.text
+    assert ROW_STATE_FIELD not in legacy.text
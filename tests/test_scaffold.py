@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from greeble_cli import main, scaffold
+from greeble_cli.scaffold import CopyPlan, ScaffoldError, execute_plan, merge_plans
+
+
+def _sources(root: Path, count: int) -> list[Path]:
+    root.mkdir()
+    sources = []
+    for index in range(count):
+        path = root / f"file{index}.html"
+        path.write_text(f"<p>{index}</p>\n" * 50, encoding="utf-8")
+        sources.append(path)
+    return sources
+
+
+def test_execute_plan_copies_batches_in_parallel(tmp_path: Path) -> None:
+    sources = _sources(tmp_path / "src", scaffold.PARALLEL_COPY_THRESHOLD * 2)
+    plans = [
+        CopyPlan(source, tmp_path / "out" / f"d{index % 3}" / source.name)
+        for index, source in enumerate(sources)
+    ]
+    written = execute_plan(plans, force=False, dry_run=False)
+    assert written == [plan.destination for plan in plans]
+    for plan in plans:
+        assert plan.destination.read_bytes() == plan.source.read_bytes()
+        assert plan.destination.stat().st_mtime_ns == plan.source.stat().st_mtime_ns
+
+
+def test_execute_plan_checks_conflicts_before_writing(tmp_path: Path) -> None:
+    sources = _sources(tmp_path / "src", 3)
+    plans = [CopyPlan(source, tmp_path / "out" / source.name) for source in sources]
+    plans[-1].destination.parent.mkdir()
+    plans[-1].destination.write_text("existing", encoding="utf-8")
+    with pytest.raises(ScaffoldError, match="already exists"):
+        execute_plan(plans, force=False, dry_run=False)
+    assert not plans[0].destination.exists()
+
+
+def test_merge_plans_drops_duplicates_and_rejects_conflicts(tmp_path: Path) -> None:
+    a, b = tmp_path / "a.css", tmp_path / "b.css"
+    target = tmp_path / "out" / "shared.css"
+    assert merge_plans([CopyPlan(a, target), CopyPlan(a, target)]) == [CopyPlan(a, target)]
+    with pytest.raises(ScaffoldError, match="Conflicting sources"):
+        merge_plans([CopyPlan(a, target), CopyPlan(b, target)])
+
+
+def test_copy_falls_back_when_clone_is_unsupported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (source,) = _sources(tmp_path / "src", 1)
+    monkeypatch.setattr(scaffold, "_CLONE", scaffold._CloneSupport())
+    monkeypatch.setattr(scaffold._CLONE, "ficlone", False)
+
+    def _unsupported(*_: object) -> int:
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    if hasattr(os, "copy_file_range"):
+        monkeypatch.setattr(os, "copy_file_range", _unsupported)
+    destination = tmp_path / "copy.html"
+    execute_plan([CopyPlan(source, destination)], force=False, dry_run=False)
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_cli_add_multiple_components_and_all(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    project = tmp_path / "app"
+    assert main(["add", "button", "modal", "--project", str(project)]) == 0
+    assert (project / "templates" / "greeble" / "button.html").exists()
+    assert (project / "templates" / "greeble" / "modal.html").exists()
+    capsys.readouterr()
+
+    assert main(["add", "--all", "--project", str(project), "--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "/templates/greeble/button.html\n" not in out  # already current per the lockfile
+    assert "Plan: " in out and "planned in" in out
+
+    assert main(["add", "--project", str(project)]) == 2
+    assert "at least one component or --all" in capsys.readouterr().err
+    assert main(["sync", "button", "nope", "--project", str(project)]) == 2
+
+
+def test_cli_new_with_extra_components(tmp_path: Path) -> None:
+    project = tmp_path / "starter"
+    assert main(["new", str(project), "--component", "score-gauge"]) == 0
+    assert (project / "templates" / "greeble" / "modal.html").exists()
+    assert list((project / "templates" / "greeble").glob("score-gauge*"))
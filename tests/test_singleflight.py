@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from flask import Flask
+
+from greeble import singleflight as sf
+from greeble.singleflight import AsyncSingleFlight, request_key, singleflight
+
+
+def test_concurrent_sync_calls_share_one_execution() -> None:
+    calls: list[str] = []
+    release = threading.Event()
+
+    @singleflight
+    def expensive(query: str) -> list[str]:
+        calls.append(query)
+        release.wait(5)
+        return [query.upper()]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(expensive, "tea") for _ in range(8)]
+        while not calls:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert calls == ["tea"]
+    assert all(result is results[0] for result in results)
+    assert expensive("tea") == ["TEA"]  # no ttl: the next call recomputes
+    assert calls == ["tea", "tea"]
+
+
+def test_errors_are_shared_but_not_cached() -> None:
+    attempts = 0
+
+    @singleflight(ttl=60)
+    def flaky() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        flaky()
+    assert flaky() == "ok"
+    assert flaky() == "ok"
+    assert attempts == 2
+
+
+def test_ttl_serves_recent_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(sf.time, "monotonic", lambda: now[0])
+    calls = 0
+
+    @singleflight(ttl=5)
+    def load(key: str) -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert load("a") == 1
+    now[0] += 4
+    assert load("a") == 1
+    now[0] += 2
+    assert load("a") == 2
+    load.flight.forget((("a",), ()))  # type: ignore[attr-defined]
+    assert load("a") == 3
+
+
+def test_async_calls_coalesce_and_survive_waiter_cancellation() -> None:
+    calls = 0
+
+    @singleflight(key=lambda brand: brand.lower())
+    async def audit(brand: str) -> dict[str, str]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"brand": brand}
+
+    async def scenario() -> None:
+        impatient = asyncio.ensure_future(audit("Acme"))
+        others = [asyncio.ensure_future(audit(name)) for name in ("acme", "ACME")]
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        results = await asyncio.gather(*others)
+        assert results[0] is results[1]
+        assert results[0] == {"brand": "Acme"}
+
+    asyncio.run(scenario())
+    assert calls == 1
+
+
+def test_async_group_keeps_keys_separate() -> None:
+    flight = AsyncSingleFlight()
+    seen: list[int] = []
+
+    async def compute(value: int) -> int:
+        seen.append(value)
+        await asyncio.sleep(0)
+        return value * 2
+
+    async def scenario() -> list[int]:
+        return await asyncio.gather(*(flight.do(v % 2, compute, v % 2) for v in range(6)))
+
+    assert asyncio.run(scenario()) == [0, 2, 0, 2, 0, 2]
+    assert sorted(seen) == [0, 1]
+
+
+def test_fastapi_handler_coalesces_identical_requests() -> None:
+    app = FastAPI()
+    computed: list[str] = []
+
+    @app.get("/palette/search")
+    @singleflight(key=lambda request, **params: request_key(request))
+    async def palette_search(request: Request, q: str = "") -> HTMLResponse:
+        computed.append(q)
+        await asyncio.sleep(0.05)
+        return HTMLResponse(f"<li>{q}</li>")
+
+    async def scenario() -> list[str]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(
+                *(client.get("/palette/search", params={"q": q}) for q in ["a", "a", "a", "b"])
+            )
+        return [response.text for response in responses]
+
+    assert asyncio.run(scenario()) == ["<li>a</li>", "<li>a</li>", "<li>a</li>", "<li>b</li>"]
+    assert sorted(computed) == ["a", "b"]
+
+
+def test_request_key_normalizes_framework_requests() -> None:
+    flask_app = Flask(__name__)
+    with flask_app.test_request_context("/table?sort=org&page=2", headers={"HX-Request": "true"}):
+        from flask import request
+
+        flask_key = request_key(request)
+    django_request = types.SimpleNamespace(
+        method="GET",
+        path="/table",
+        headers={},
+        META={"QUERY_STRING": "page=2&sort=org", "HTTP_HX_REQUEST": "true"},
+    )
+    assert flask_key == request_key(django_request)
+    assert flask_key == ("GET", "/table", (("page", "2"), ("sort", "org")), True)
+    assert request_key(django_request, "extra")[-1] == "extra"
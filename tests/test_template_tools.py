@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from tools import setup_template, template_export
+
+
+def _project(root: Path) -> Path:
+    (root / "src" / "greeble").mkdir(parents=True)
+    (root / "src" / "greeble" / "__init__.py").write_text(
+        '"""Greeble components."""\nimport greeble.core\n', encoding="utf-8"
+    )
+    (root / "pyproject.toml").write_text('[project]\nname = "greeble"\n', encoding="utf-8")
+    (root / "LICENSE").write_text("MIT License\n", encoding="utf-8")
+    (root / "logo.png").write_bytes(b"\x89PNG\x00\xff")
+    (root / "empty.txt").write_bytes(b"")
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/greeble\n", encoding="utf-8")
+    return root
+
+
+def test_export_tokenizes_only_files_that_mention_the_project(tmp_path: Path) -> None:
+    source = _project(tmp_path / "repo")
+    out = tmp_path / "out"
+    report = template_export.copy_tree_with_tokens(source, out, workers=1)
+
+    assert report.files == 5
+    assert report.rewritten == 2
+    assert not (out / ".git").exists()
+    assert (out / "src" / "{{package_name}}" / "__init__.py").read_text("utf-8") == (
+        '"""{{project_name}} components."""\nimport {{package_name}}.core\n'
+    )
+    assert 'name = "{{project_name}}"' in (out / "pyproject.toml").read_text("utf-8")
+    untouched = out / "LICENSE"
+    assert untouched.stat().st_mtime_ns == (source / "LICENSE").stat().st_mtime_ns
+    assert (out / "logo.png").read_bytes() == b"\x89PNG\x00\xff"
+    assert "files/s" in report.summary()
+
+
+def test_export_and_setup_round_trip_on_a_process_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(template_export, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(setup_template, "PARALLEL_THRESHOLD", 1)
+    source = _project(tmp_path / "repo")
+    out = tmp_path / "out"
+    template_export.copy_tree_with_tokens(source, out, workers=2)
+
+    setup_template.rename_token_dirs(out, "acme")
+    report = setup_template.rewrite_files(out, "acme-ui", "acme", workers=2)
+
+    assert report.rewritten == 2
+    assert (out / "src" / "acme" / "__init__.py").read_text("utf-8") == (
+        '"""acme-ui components."""\nimport acme.core\n'
+    )
+    assert 'name = "acme-ui"' in (out / "pyproject.toml").read_text("utf-8")
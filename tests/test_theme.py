@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from examples.site import playground
+from greeble.theme import (
+    ThemeCache,
+    ThemeError,
+    ThemeSpec,
+    compile_theme_css,
+    tailwind_theme_source,
+    theme_hash,
+)
+from greeble_cli import main
+from greeble_cli.manifest import default_manifest_path
+
+PRESET_THEME = default_manifest_path().parent / "packages" / "greeble_tailwind_preset" / "theme.cjs"
+
+
+def test_compile_theme_css_applies_overrides() -> None:
+    css = compile_theme_css(ThemeSpec(palette="nord", accent="#ff0000", spacing_scale=1.5))
+    assert css.startswith(":root {\n")
+    assert "--greeble-color-background: #2e3440;" in css
+    assert "--greeble-color-accent: #ff0000;" in css
+    assert "--greeble-spacing-4: 1.5rem;" in css
+    assert "--greeble-focus-ring: 0 0 0 3px #ff000080;" in css
+
+
+def test_theme_spec_validates_untrusted_input() -> None:
+    assert ThemeSpec.from_mapping({"palette": "paper", "scale": "0.75"}) == ThemeSpec(
+        palette="paper", spacing_scale=0.75
+    )
+    with pytest.raises(ThemeError):
+        ThemeSpec.from_mapping({"accent": "red;} body{display:none"})
+    with pytest.raises(ThemeError):
+        ThemeSpec.from_mapping({"palette": "unknown"})
+    with pytest.raises(ThemeError):
+        ThemeSpec.from_mapping({"scale": "9"})
+
+
+def test_theme_cache_is_content_addressed() -> None:
+    cache = ThemeCache(max_entries=2)
+    first = cache.compile(ThemeSpec())
+    # An explicit accent equal to the palette default compiles to the same CSS
+    same = cache.compile(ThemeSpec(accent="#6aa1ff"))
+    assert same is first
+    assert first.hash == theme_hash(ThemeSpec())
+    assert first.fragment.body == first.css.encode()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.compile(ThemeSpec(palette="nord"))
+    cache.compile(ThemeSpec(palette="paper"))
+    assert len(cache) == 2
+    assert cache.get(first.hash) is None
+
+
+def test_tailwind_preset_is_generated_from_spec() -> None:
+    assert PRESET_THEME.read_text(encoding="utf-8") == tailwind_theme_source()
+    assert main(["theme", "preset", "--check"]) == 0
+
+
+def test_cli_theme_css(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["theme", "css", "--palette", "dracula"]) == 0
+    assert "--greeble-color-background: #282a36;" in capsys.readouterr().out
+    assert main(["theme", "css", "--accent", "blue"]) == 2
+
+    stale = tmp_path / "theme.cjs"
+    stale.write_text("// old\n", encoding="utf-8")
+    assert main(["theme", "preset", "--out", str(stale), "--check"]) == 1
+    assert main(["theme", "preset", "--out", str(stale)]) == 0
+    assert stale.read_text(encoding="utf-8") == tailwind_theme_source()
+
+
+def test_playground_serves_hashed_theme_css() -> None:
+    client = TestClient(playground.app)
+    redirect = client.get("/theme.css?palette=solar&radius=sm", follow_redirects=False)
+    assert redirect.status_code == 307
+    location = redirect.headers["location"]
+
+    css = client.get(location)
+    assert css.status_code == 200
+    assert css.headers["content-type"] == "text/css; charset=utf-8"
+    assert "immutable" in css.headers["cache-control"]
+    assert "--greeble-radius-medium: 4px;" in css.text
+    assert client.get(location, headers={"If-None-Match": css.headers["etag"]}).status_code == 304
+
+    assert client.get("/theme.css?accent=nope").status_code == 400
+    assert client.get("/theme/ffffffffffff.css").status_code == 404
+
+    # Another worker (or an evicted entry) rebuilds the theme from the spec in the URL.
+    playground.THEME_CACHE.clear()
+    assert location.endswith("?palette=solar&radius=sm")
+    assert client.get(location).text == css.text
+    playground.THEME_CACHE.clear()
+    forged = location.replace("radius=sm", "radius=lg")
+    assert client.get(forged).status_code == 404
+
+
+def test_spec_round_trips_through_mapping() -> None:
+    spec = ThemeSpec(palette="nord", accent="#ff0000", spacing_scale=1.25)
+    assert spec.to_mapping() == {"palette": "nord", "accent": "#ff0000", "scale": "1.25"}
+    assert ThemeSpec.from_mapping(spec.to_mapping()) == spec
+    assert ThemeSpec().to_mapping() == {}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+from flask import Flask
+
+from greeble import throttle as throttle_module
+from greeble.throttle import (
+    RuleCounters,
+    Throttle,
+    ThrottleMiddleware,
+    ThrottleRule,
+    ThrottleWSGIMiddleware,
+)
+
+HX = {"HX-Request": "true"}
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_refills(clock: list[float]) -> None:
+    rule = ThrottleRule("/auth/validate", rate=2, burst=3)
+    throttle = Throttle([rule])
+    assert [throttle.acquire(rule, "a") for _ in range(4)] == [True, True, True, False]
+    assert throttle.acquire(rule, "b")  # other clients have their own bucket
+    clock[0] += 0.5  # one token back at 2/s
+    assert throttle.acquire(rule, "a")
+    assert not throttle.acquire(rule, "a")
+    clock[0] += 60  # refill is capped at the burst size
+    assert [throttle.acquire(rule, "a") for _ in range(4)] == [True, True, True, False]
+    assert throttle.counters() == [RuleCounters("/auth/validate", allowed=8, shed=3)]
+
+
+def test_rules_match_patterns_methods_and_htmx_only(clock: list[float]) -> None:
+    throttle = Throttle(
+        [
+            ThrottleRule("/palette/*", rate=1, burst=1, methods=frozenset({"post"})),
+            ThrottleRule("/form/validate", rate=1, burst=1),
+        ]
+    )
+
+    def check(method: str, path: str, hx: str | None = "true") -> bool:
+        return throttle.check(method, path, hx_request=hx, remote_addr="1.2.3.4", headers=dict)
+
+    assert check("POST", "/palette/search")
+    assert not check("POST", "/palette/search")
+    assert check("GET", "/palette/search")  # method not covered by the rule
+    assert check("POST", "/table")  # no rule
+    assert check("POST", "/form/validate")
+    assert check("POST", "/form/validate", hx=None)  # plain form posts are never shed
+    assert not check("POST", "/form/validate", hx="True")
+
+    throttle.reset()
+    assert check("POST", "/palette/search")
+    assert [c.shed for c in throttle.counters()] == [0, 0]
+
+
+def test_client_key_and_bounded_buckets(clock: list[float]) -> None:
+    throttle = Throttle(
+        [ThrottleRule("/search", rate=1, burst=1)],
+        client_key=lambda addr, headers: headers.get("x-forwarded-for", addr),
+        max_clients=2,
+    )
+
+    def check(forwarded: str) -> bool:
+        return throttle.check(
+            "POST",
+            "/search",
+            hx_request="true",
+            remote_addr="10.0.0.1",
+            headers=lambda: {"x-forwarded-for": forwarded},
+        )
+
+    assert check("a")
+    assert check("b")
+    assert not check("a")
+    assert check("c")  # evicts "b", the least recently used bucket
+    assert check("b")  # starts over with a full bucket
+
+
+def test_invalid_rules_are_rejected() -> None:
+    with pytest.raises(ValueError, match="rate"):
+        ThrottleRule("/x", rate=0, burst=1)
+    with pytest.raises(ValueError, match="burst"):
+        ThrottleRule("/x", rate=1, burst=0)
+
+
+def test_asgi_middleware_sheds_with_no_swap(clock: list[float]) -> None:
+    app = FastAPI()
+
+    @app.post("/auth/validate", response_class=HTMLResponse)
+    async def validate() -> str:
+        return "<p>ok</p>"
+
+    throttle = Throttle([ThrottleRule("/auth/validate", rate=1, burst=2)])
+    app.add_middleware(ThrottleMiddleware, throttle=throttle)
+    client = TestClient(app)
+
+    responses = [client.post("/auth/validate", headers=HX) for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 204]
+    shed = responses[-1]
+    assert shed.headers["HX-Reswap"] == "none"
+    assert shed.content == b""
+    assert client.post("/auth/validate").status_code == 200
+    assert 'route="/auth/validate",outcome="shed"} 1' in throttle.exposition()
+
+
+def test_wsgi_middleware_sheds_with_no_swap(clock: list[float]) -> None:
+    app = Flask(__name__)
+
+    @app.post("/form/validate")
+    def validate() -> str:
+        return "<p>ok</p>"
+
+    throttle = Throttle([ThrottleRule("/form/validate", rate=1, burst=1)])
+    app.wsgi_app = ThrottleWSGIMiddleware(app.wsgi_app, throttle)  # type: ignore[method-assign]
+    client = app.test_client()
+
+    assert client.post("/form/validate", headers=HX).status_code == 200
+    shed = client.post("/form/validate", headers=HX)
+    assert shed.status_code == 204
+    assert shed.headers["HX-Reswap"] == "none"
+    clock[0] += 1
+    assert client.post("/form/validate", headers=HX).status_code == 200
+    assert throttle.counters() == [RuleCounters("/form/validate", allowed=2, shed=1)]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+import sys
+import types
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+from flask import Flask
+from flask import request as flask_request
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from greeble import timing
+from greeble.adapters import django as g_django
+from greeble.adapters import fastapi as g_fastapi
+from greeble.adapters import flask as g_flask
+
+SPAN = r"(\w+);dur=\d+\.\d{3}"
+
+
+@pytest.fixture(autouse=True)
+def _reset_timing() -> Iterator[None]:
+    yield
+    timing.configure_server_timing(False)
+
+
+def _span_names(header: str) -> list[str]:
+    return [re.fullmatch(SPAN, part).group(1) for part in header.split(", ")]  # type: ignore[union-attr]
+
+
+def test_spans_serialize_in_order_with_total() -> None:
+    spans = timing.ServerTiming()
+    spans.mark("lookup")
+    spans.mark("render")
+    assert _span_names(spans.header_value()) == ["lookup", "render", "total"]
+    assert timing.merge_server_timing("db;dur=2", spans).startswith("db;dur=2, lookup;dur=")
+
+
+def test_sampling_is_off_by_default_and_validated() -> None:
+    assert timing.start_timing() is None
+    timing.configure_server_timing(sample_rate=0.0)
+    assert timing.start_timing() is None
+    timing.configure_server_timing()
+    assert isinstance(timing.start_timing(), timing.ServerTiming)
+    with pytest.raises(ValueError, match="sample_rate"):
+        timing.configure_server_timing(sample_rate=2)
+
+
+def test_fastapi_responses_carry_server_timing(tmp_path: Path) -> None:
+    (tmp_path / "page.html").write_text("FULL", encoding="utf-8")
+    templates = Jinja2Templates(directory=str(tmp_path))
+    app = FastAPI()
+
+    @app.get("/page")
+    def page(request: Request) -> Response:
+        return g_fastapi.template_response(templates, "page.html", {}, request, triggers="saved")
+
+    @app.get("/fragment")
+    def fragment() -> Response:
+        return g_fastapi.partial_html("<p>x</p>", headers={"Server-Timing": "db;dur=1"})
+
+    client = TestClient(app)
+    assert "server-timing" not in client.get("/page").headers
+
+    timing.configure_server_timing()
+    response = client.get("/page")
+    assert response.text == "FULL"
+    assert _span_names(response.headers["server-timing"]) == [
+        "lookup",
+        "render",
+        "serialize",
+        "total",
+    ]
+    header = client.get("/fragment").headers["server-timing"]
+    assert header.startswith("db;dur=1, serialize;dur=")
+
+
+def test_flask_template_response_carries_server_timing(tmp_path: Path) -> None:
+    (tmp_path / "page.html").write_text("Hello {{ name }}", encoding="utf-8")
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.add_url_rule(
+        "/", "page", lambda: g_flask.template_response("page.html", {"name": "Ada"}, flask_request)
+    )
+    timing.configure_server_timing()
+    response = app.test_client().get("/")
+    assert response.text == "Hello Ada"
+    assert _span_names(response.headers["Server-Timing"]) == [
+        "lookup",
+        "render",
+        "serialize",
+        "total",
+    ]
+
+
+def test_django_template_response_splits_lookup_and_render(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class FakeResponse(dict[str, str]):
+        def __init__(self, content: str, status: int) -> None:
+            super().__init__()
+            self.content = content
+            self.status_code = status
+
+        @property
+        def headers(self) -> dict[str, str]:
+            return self
+
+    class FakeTemplate:
+        def render(self, context: dict[str, Any], request: Any) -> str:
+            return f"Hello {context['name']}"
+
+    fake_loader = types.ModuleType("django.template.loader")
+    fake_loader.get_template = lambda name: FakeTemplate()  # type: ignore[attr-defined]
+    fake_template = types.ModuleType("django.template")
+    fake_template.loader = fake_loader  # type: ignore[attr-defined]
+    fake_http = types.ModuleType("django.http")
+    fake_http.HttpResponse = FakeResponse  # type: ignore[attr-defined]
+    fake_shortcuts = types.ModuleType("django.shortcuts")
+    for name, module in {
+        "django": types.ModuleType("django"),
+        "django.http": fake_http,
+        "django.shortcuts": fake_shortcuts,
+        "django.template": fake_template,
+        "django.template.loader": fake_loader,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+    timing.configure_server_timing()
+    request = types.SimpleNamespace(headers={}, META={})
+    response = g_django.template_response("page.html", {"name": "Ada"}, request)
+    assert response.content == "Hello Ada"
+    assert _span_names(response["Server-Timing"]) == ["lookup", "render", "serialize", "total"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from greeble.demo import render_signin_group, validate_signin_email
+from greeble.validation import (
+    DIRTY_FIELD,
+    STATE_FIELD,
+    BatchValidator,
+    FieldGroup,
+    decode_state,
+    encode_state,
+    state_token,
+)
+
+
+def _render_name(value: str, error: str | None, *, swap_oob: bool) -> str:
+    oob = ' hx-swap-oob="true"' if swap_oob else ""
+    return f'<div id="name-group"{oob}>{error or "ok"}</div>'
+
+
+def _name_matches_email(value: str, form: Mapping[str, Any]) -> str | None:
+    if not value.strip():
+        return "Name is required."
+    return None if value.lower() in str(form.get("email", "")) else "Use the name in your email."
+
+
+def _batch() -> BatchValidator:
+    return BatchValidator(
+        [
+            FieldGroup(
+                "email", lambda value, form: validate_signin_email(value), render_signin_group
+            ),
+            FieldGroup("name", _name_matches_email, _render_name),
+        ]
+    )
+
+
+def test_first_batch_renders_every_dirty_group_with_state() -> None:
+    result = _batch().validate({"email": "nope", "name": "ada"})
+    assert result.changed == ("email", "name")
+    assert result.errors == {
+        "email": "Enter a valid work email address.",
+        "name": "Use the name in your email.",
+    }
+    assert not result.valid
+    assert 'id="signin-email-group"' in result.html
+    assert result.html.count('hx-swap-oob="true"') == 3
+    assert result.html.endswith(
+        f'<input type="hidden" id="greeble-validation-state" name="{STATE_FIELD}" '
+        f'value="{result.state}" hx-swap-oob="true" />'
+    )
+
+
+def test_unchanged_outcomes_are_skipped() -> None:
+    batch = _batch()
+    first = batch.validate({"email": "nope", "name": "ada"})
+
+    # Still invalid for the same reason while typing: nothing to swap.
+    same = batch.validate({"email": "nope2", "name": "ada", STATE_FIELD: first.state})
+    assert same.changed == ()
+    assert same.html == ""
+    assert same.state == first.state
+
+    # The email becomes valid, which also fixes the cross-field name check.
+    fixed = batch.validate({"email": "ada@example.com", "name": "ada", STATE_FIELD: first.state})
+    assert fixed.changed == ("email", "name")
+    assert fixed.valid
+    assert "greeble-field--invalid" not in fixed.html
+
+
+def test_dirty_field_list_limits_validation() -> None:
+    batch = _batch()
+    state = batch.initial_state()
+    result = batch.validate(
+        {"email": "", "name": "", DIRTY_FIELD: "email, unknown", STATE_FIELD: state}
+    )
+    assert result.changed == ("email",)
+    assert set(result.errors) == {"email"}
+    assert decode_state(result.state)["name"] == state_token(None)
+
+    assert batch.validate({"email": "", "name": ""}, dirty=["name"]).changed == ("name",)
+
+
+def test_state_round_trips_and_tolerates_garbage() -> None:
+    tokens = {"b": "2", "a": "1"}
+    assert encode_state(tokens) == "a:1;b:2"
+    assert decode_state(encode_state(tokens)) == tokens
+    assert decode_state("junk;:x;a:1") == {"a": "1"}
+
+
+def test_fastapi_endpoint_returns_one_response() -> None:
+    batch = _batch()
+    app = FastAPI()
+
+    @app.post("/form/validate-batch")
+    async def validate_batch(request: Request) -> HTMLResponse:
+        return HTMLResponse(batch.validate(await request.form()).html)
+
+    client = TestClient(app)
+    first = client.post("/form/validate-batch", data={"email": "", "name": ""})
+    assert first.text.count("hx-swap-oob") == 3
+    state = batch.validate({"email": "", "name": ""}).state
+    again = client.post("/form/validate-batch", data={"email": " ", "name": "", STATE_FIELD: state})
+    assert again.text == ""
+    assert batch.state_input(state).startswith('<input type="hidden"')
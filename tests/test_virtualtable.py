@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from examples.site import landing
+from greeble.virtualtable import SequenceSource, VirtualTable, window_for
+
+
+def _row(value: int) -> str:
+    return f"<tr><td>{value}</td></tr>"
+
+
+class CountingSource:
+    """A huge indexed source that records which rows were fetched."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.fetched: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return self.total
+
+    def fetch(self, start: int, stop: int) -> list[int]:
+        self.fetched.append((start, stop))
+        return list(range(start, stop))
+
+
+TABLE = VirtualTable(endpoint="/rows", tbody_id="rows", columns=3, row_height=20, window_size=10)
+
+
+def test_window_clamps_to_the_dataset() -> None:
+    assert window_for(100, -5, 10).start == 0
+    last = window_for(100, 95, 10)
+    assert (last.start, last.stop, last.after, last.next_start) == (90, 100, 0, None)
+    middle = window_for(100, 40, 10)
+    assert (middle.previous_start, middle.next_start) == (35, 45)
+    assert window_for(3, 2, 10).stop == 3
+    with pytest.raises(ValueError, match="window size"):
+        window_for(10, 0, 0)
+
+
+def test_render_emits_window_between_spacer_sentinels() -> None:
+    source = CountingSource(1_000_000)
+    html = TABLE.render(source, 500_000, _row, params={"sort": "org:asc"})
+
+    assert source.fetched == [(500_000, 500_010)]
+    rows = re.findall(r'<tr aria-rowindex="(\d+)"><td>(\d+)</td></tr>', html)
+    assert rows[0] == ("500001", "500000")
+    assert len(rows) == 10
+
+    top, bottom = re.findall(r"<tr id=\"rows-spacer-[^>]*>.*?</tr>", html)
+    assert 'hx-get="/rows?sort=org%3Aasc"' in top
+    assert 'hx-trigger="intersect once"' in top
+    assert 'hx-target="#rows"' in top
+    assert "height: 10000000.0px" in top
+    assert 'id="rows-spacer-bottom"' in bottom
+    assert "height: 9999800.0px" in bottom
+    assert 'colspan="3"' in bottom
+
+
+def test_spacers_compute_the_window_from_the_scroll_offset() -> None:
+    html = TABLE.render(CountingSource(1_000_000), 500_000, _row)
+    top, bottom = re.findall(r'hx-vals="js:\{start: (.*?)\}"', html)
+    # Rows past the spacer's top edge are added to its first row, minus half a window.
+    assert top.startswith("Math.max(0, 0 + Math.floor(")
+    assert "/ 20) - 5)" in top
+    assert bottom.startswith("Math.max(0, 500010 + Math.floor(")
+    assert "getElementById(&#x27;rows-spacer-bottom&#x27;)" in bottom
+    assert "start=" not in html
+
+
+def test_render_cost_is_independent_of_dataset_size() -> None:
+    small = TABLE.render(SequenceSource(list(range(50))), 20, _row)
+    huge = CountingSource(10_000_000)
+    large = TABLE.render(huge, 5_000_000, _row)
+    assert small.count("<tr") == large.count("<tr") == 12
+    assert huge.fetched == [(5_000_000, 5_000_010)]
+
+
+def test_edges_drop_spacers_and_sentinels() -> None:
+    first = TABLE.render(SequenceSource(list(range(25))), 0, _row)
+    assert first.startswith('<tr aria-rowindex="1">')
+    assert first.count("greeble-table__spacer--") == 1
+    last = TABLE.render(SequenceSource(list(range(25))), 24, _row)
+    assert last.endswith("<td>24</td></tr>")
+    assert "Math.max(0, 0 + " in last
+    assert TABLE.render(SequenceSource(list(range(5))), 0, _row).count("spacer") == 0
+    with pytest.raises(ValueError, match="<tr>"):
+        TABLE.render(SequenceSource([1]), 0, lambda value: "<div></div>")
+
+
+def test_landing_window_endpoint() -> None:
+    client = TestClient(landing.app)
+    response = client.get("/table/window", params={"start": 50_000})
+    assert response.status_code == 200
+    assert response.text.count("aria-rowindex=") == landing.VIRTUAL_TABLE.window_size
+    first_row = response.text.split('<tr aria-rowindex="50001">', 1)[1].split("</tr>", 1)[0]
+    assert "<strong>Comet Ops 050001</strong>" in first_row
+    assert 'hx-get="/table/window"' in response.text
+    assert "Math.max(0, 50050 + " in response.text
+
+    page = client.get("/").text
+    assert f'id="{landing.VIRTUAL_TABLE.tbody_id}" hx-get="/table/window?start=0"' in page
+    assert f'aria-rowcount="{len(landing.VIRTUAL_ACCOUNTS)}"' in page
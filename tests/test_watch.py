@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import jinja2
+import pytest
+from fastapi import FastAPI
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+from flask import Flask
+
+from greeble.adapters.fastapi import mount_template_reload
+from greeble.adapters.flask import register_template_reload
+from greeble_cli import main
+from greeble_cli.lockfile import Lockfile
+from greeble_cli.scaffold import CopyPlan
+from greeble_cli.watch import SourcePoller, Watcher, WatchTarget, notify_server
+
+
+def _bump(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture
+def library(tmp_path: Path) -> tuple[Path, Path, list[WatchTarget]]:
+    source_dir, project = tmp_path / "library", tmp_path / "project"
+    source_dir.mkdir()
+    targets = []
+    for name in ("card.html", "card.css"):
+        (source_dir / name).write_text(f"/* {name} */", encoding="utf-8")
+        plan = CopyPlan(source_dir / name, project / "greeble" / name)
+        targets.append(WatchTarget(component="card", plan=plan))
+    return source_dir, project, targets
+
+
+def test_source_poller_reports_each_change_once(tmp_path: Path) -> None:
+    path = tmp_path / "a.html"
+    path.write_text("a", encoding="utf-8")
+    poller = SourcePoller([path, path])
+    assert poller.paths == [path]
+    assert poller.poll() == []
+    _bump(path, "b")
+    assert poller.poll() == [path]
+    assert poller.poll() == []
+    path.unlink()
+    assert poller.poll() == [path]
+
+
+def test_watcher_copies_only_changed_files(library: tuple[Path, Path, list[WatchTarget]]) -> None:
+    source_dir, project, targets = library
+    watcher = Watcher(targets, project_root=project, interval=0.01, debounce=0.01)
+    try:
+        assert watcher.wait_for_changes(timeout=0.05) == []
+        _bump(source_dir / "card.html", "<div>v2</div>")
+        changed = watcher.wait_for_changes(timeout=2)
+        assert changed == [source_dir / "card.html"]
+        assert watcher.sync(changed) == [project / "greeble" / "card.html"]
+    finally:
+        watcher.close()
+    assert (project / "greeble" / "card.html").read_text("utf-8") == "<div>v2</div>"
+    assert not (project / "greeble" / "card.css").exists()
+    assert list(Lockfile.load(project).components["card"]) == ["greeble/card.html"]
+
+
+def test_watcher_debounces_bursts(library: tuple[Path, Path, list[WatchTarget]]) -> None:
+    source_dir, project, targets = library
+    watcher = Watcher(targets, project_root=project, interval=0.01, debounce=0.2, use_inotify=False)
+    assert watcher.backend == "polling"
+
+    def burst() -> None:
+        _bump(source_dir / "card.html", "one")
+        time.sleep(0.05)
+        _bump(source_dir / "card.css", "two")
+
+    thread = threading.Thread(target=burst)
+    thread.start()
+    changed = watcher.wait_for_changes(timeout=2)
+    thread.join()
+    assert sorted(changed) == sorted([source_dir / "card.html", source_dir / "card.css"])
+
+
+class _Recorder(BaseHTTPRequestHandler):
+    received: ClassVar[list[dict[str, object]]] = []
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        _Recorder.received.append(json.loads(self.rfile.read(length)))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture
+def dev_server() -> Iterator[str]:
+    server = HTTPServer(("127.0.0.1", 0), _Recorder)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _Recorder.received.clear()
+    yield f"http://127.0.0.1:{server.server_port}/__greeble/reload"
+    server.shutdown()
+
+
+def test_watcher_notifies_dev_server(
+    library: tuple[Path, Path, list[WatchTarget]], dev_server: str
+) -> None:
+    source_dir, project, targets = library
+    logs: list[str] = []
+    watcher = Watcher(targets, project_root=project, notify=dev_server, log=logs.append)
+    watcher.sync([source_dir / "card.css"])
+    watcher.close()
+    assert _Recorder.received == [{"changed": ["greeble/card.css"]}]
+    assert logs == []
+    assert not notify_server("http://127.0.0.1:9/unreachable", ["x"], timeout=0.2)
+
+
+def test_cli_watch_requires_components(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["watch", "--project", str(tmp_path)]) == 2
+    assert "nothing to watch" in capsys.readouterr().err
+
+
+def test_template_reload_hooks(tmp_path: Path) -> None:
+    (tmp_path / "page.html").write_text("v1", encoding="utf-8")
+
+    templates = Jinja2Templates(directory=str(tmp_path))
+    templates.env.get_template("page.html")
+    app = FastAPI()
+    mount_template_reload(app, templates)
+    assert templates.env.cache
+    assert TestClient(app).post("/__greeble/reload").status_code == 204
+    assert not templates.env.cache
+
+    flask_app = Flask(__name__)
+    flask_app.jinja_loader = jinja2.FileSystemLoader(str(tmp_path))
+    register_template_reload(flask_app)
+    flask_app.jinja_env.get_template("page.html")
+    assert flask_app.jinja_env.cache
+    client = flask_app.test_client()
+    assert client.post("/__greeble/reload").status_code == 204
+    assert not flask_app.jinja_env.cache
+    assert client.get("/__greeble/reload").status_code == 405
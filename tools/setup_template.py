@@ -22,17 +22,26 @@ Usage examples:
 
 Notes:
 - The script modifies files in-place under the current directory.
-- It skips common build and VCS directories (e.g., .git, .venv).
+- It skips common build and VCS directories (e.g., .git, .venv), pruned during one scan.
+- Files without placeholders (checked through mmap) are never decoded or rewritten;
+  large templates are rewritten on a process pool (`--workers`).
 - It will also rename directories that are named exactly '{{package_name}}'.
 """
 
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import re
 import subprocess
 import sys
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TypeVar
 
 PH_PROJECT = "{{project_name}}"
 PH_PACKAGE = "{{package_name}}"
@@ -65,6 +74,12 @@ TEXT_EXTENSIONS = {
     ".editorconfig",
 }
 
+# Below this many files a process pool costs more to start than it saves.
+PARALLEL_THRESHOLD = 64
+TOKEN_PATTERN = re.compile(re.escape(PH_PROJECT.encode()) + b"|" + re.escape(PH_PACKAGE.encode()))
+
+T = TypeVar("T")
+
 
 def is_text_file(path: Path) -> bool:
     if path.suffix in TEXT_EXTENSIONS:
@@ -76,11 +91,25 @@ def is_text_file(path: Path) -> bool:
         return False
 
 
-def should_skip(path: Path) -> bool:
-    parts = set(path.parts)
-    if any(p in EXCLUDE_DIRS for p in parts):
-        return True
-    return path.name in EXCLUDE_FILES
+def scan_tree(root: Path) -> tuple[list[Path], list[Path]]:
+    """Return `(directories, files)` under `root`, pruning excluded directories as it walks."""
+    directories: list[Path] = []
+    files: list[Path] = []
+    for current, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in EXCLUDE_DIRS)
+        base = Path(current)
+        directories.extend(base / name for name in dirnames)
+        files.extend(base / name for name in sorted(filenames) if name not in EXCLUDE_FILES)
+    return directories, files
+
+
+def has_tokens(path: Path) -> bool:
+    """Return True when the file contains a placeholder."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return TOKEN_PATTERN.search(mapped) is not None
 
 
 def validate_project_name(name: str) -> bool:
@@ -105,8 +134,7 @@ def rename_token_dirs(root: Path, package_name: str) -> None:
 
     We do a bottom-up traversal to avoid breaking parent paths prematurely.
     """
-    # Collect directories first
-    dirs = [p for p in root.rglob("*") if p.is_dir() and not should_skip(p)]
+    dirs, _ = scan_tree(root)
     # Sort by depth descending so we rename deepest first
     dirs.sort(key=lambda p: len(p.relative_to(root).parts), reverse=True)
     for d in dirs:
@@ -116,18 +144,70 @@ def rename_token_dirs(root: Path, package_name: str) -> None:
                 d.rename(new_d)
 
 
-def rewrite_files(root: Path, project_name: str, package_name: str) -> None:
-    for p in root.rglob("*"):
-        if should_skip(p) or p.is_dir():
-            continue
-        if is_text_file(p):
-            try:
-                content = p.read_text(encoding="utf-8")
-            except Exception:
-                continue
-            new_content = replace_tokens_in_text(content, project_name, package_name)
-            if new_content != content:
-                p.write_text(new_content, encoding="utf-8")
+@dataclass(frozen=True)
+class RewriteReport:
+    files: int
+    rewritten: int
+    bytes: int
+    seconds: float
+
+    def summary(self) -> str:
+        seconds = max(self.seconds, 1e-9)
+        mib = self.bytes / (1 << 20)
+        return (
+            f"Scanned {self.files} files ({mib:.1f} MiB, {self.rewritten} rewritten) "
+            f"in {self.seconds:.2f}s: {self.files / seconds:.0f} files/s, "
+            f"{mib / seconds:.1f} MiB/s"
+        )
+
+
+def rewrite_file(path: Path, project_name: str, package_name: str) -> tuple[int, bool]:
+    """Replace placeholders in one file; returns `(size in bytes, whether it was rewritten)`."""
+    size = path.stat().st_size
+    if not has_tokens(path) or not is_text_file(path):
+        return size, False
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return size, False
+    new_content = replace_tokens_in_text(content, project_name, package_name)
+    if new_content == content:
+        return size, False
+    path.write_text(new_content, encoding="utf-8")
+    return size, True
+
+
+def run_batch(
+    func: Callable[..., T], *columns: Sequence[object], workers: int | None = None
+) -> list[T]:
+    """Apply `func` across `columns`, on a process pool when the batch is large enough."""
+    count = len(columns[0]) if columns else 0
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or count < PARALLEL_THRESHOLD:
+        return list(map(func, *columns))
+    chunksize = max(1, count // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *columns, chunksize=chunksize))
+
+
+def rewrite_files(
+    root: Path, project_name: str, package_name: str, *, workers: int | None = None
+) -> RewriteReport:
+    started = time.perf_counter()
+    _, files = scan_tree(root)
+    results = run_batch(
+        rewrite_file,
+        files,
+        [project_name] * len(files),
+        [package_name] * len(files),
+        workers=workers,
+    )
+    return RewriteReport(
+        files=len(files),
+        rewritten=sum(rewritten for _, rewritten in results),
+        bytes=sum(size for size, _ in results),
+        seconds=time.perf_counter() - started,
+    )
 
 
 def git_init(remote_url: str | None, default_branch: str = "main") -> None:
@@ -147,6 +227,11 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--init-git", action="store_true", help="Initialize a git repo and commit")
     ap.add_argument("--remote-url", help="Optional remote URL to add as origin and push")
     ap.add_argument("--default-branch", default="main", help="Default branch name (main)")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for rewriting files (default: CPU count; 1 disables the pool)",
+    )
     args = ap.parse_args(argv)
 
     project_name = args.project_name or input("Project name (e.g., my-cool-thing): ").strip()
@@ -166,11 +251,12 @@ def main(argv: list[str] | None = None) -> int:
     # 1) Rename any {{package_name}} directories first (e.g., src/{{package_name}})
     rename_token_dirs(root, package_name)
     # 2) Replace placeholders in text files
-    rewrite_files(root, project_name, package_name)
+    report = rewrite_files(root, project_name, package_name, workers=args.workers)
 
     print("Applied template tokens:")
     print(f"  {PH_PROJECT} -> {project_name}")
     print(f"  {PH_PACKAGE} -> {package_name}")
+    print(report.summary())
 
     if args.init_git:
         try:
@@ -4,7 +4,10 @@ Export this repo as a tokenized template.
 
 - Replaces occurrences of the current project and package names with placeholders
   in file contents and path names.
-- Excludes typical build/venv/metadata directories.
+- Excludes typical build/venv/metadata directories (pruned during a single scan).
+- Files that do not mention the project are copied byte-for-byte; only files whose
+  mmap'd contents match a token are decoded and rewritten. Large trees are processed
+  on a process pool (`--workers`), and a files/bytes-per-second report is printed.
 - Optionally initializes a new git repo in the output directory and pushes to
   a remote (by default the URL of the local 'template' remote).
 
@@ -19,10 +22,17 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import re
 import shutil
 import subprocess
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TypeVar
 
 # Defaults for the current repo
 CURRENT_PROJECT_NAME = "greeble"
@@ -63,6 +73,20 @@ TEXT_EXTENSIONS = {
     ".editorconfig",
 }
 
+# Below this many files a process pool costs more to start than it saves.
+PARALLEL_THRESHOLD = 64
+
+# Anything replace_tokens_in_text() would change; files without a match are copied as-is.
+TOKEN_PATTERN = re.compile(
+    rb"(?m)"
+    + re.escape(CURRENT_PACKAGE_NAME.encode())
+    + rb"|"
+    + re.escape(CURRENT_PROJECT_NAME.capitalize().encode())
+    + rb'|^\s*name\s*=\s*"[^"]+"'
+)
+
+T = TypeVar("T")
+
 
 def is_text_file(path: Path) -> bool:
     if path.suffix in TEXT_EXTENSIONS:
@@ -97,33 +121,90 @@ def replace_tokens_in_text(content: str) -> str:
     return content
 
 
-def should_skip(path: Path) -> bool:
-    parts = set(path.parts)
-    if any(p in EXCLUDE_DIRS for p in parts):
-        return True
-    return path.name in EXCLUDE_FILES
-
-
-def copy_tree_with_tokens(src_root: Path, out_dir: Path) -> None:
+@dataclass(frozen=True)
+class RewriteReport:
+    files: int
+    rewritten: int
+    bytes: int
+    seconds: float
+
+    def summary(self) -> str:
+        seconds = max(self.seconds, 1e-9)
+        mib = self.bytes / (1 << 20)
+        return (
+            f"Processed {self.files} files ({mib:.1f} MiB, {self.rewritten} tokenized) "
+            f"in {self.seconds:.2f}s: {self.files / seconds:.0f} files/s, "
+            f"{mib / seconds:.1f} MiB/s"
+        )
+
+
+def scan_tree(root: Path) -> tuple[list[Path], list[Path]]:
+    """Return `(directories, files)` under `root`, pruning excluded directories as it walks."""
+    directories: list[Path] = []
+    files: list[Path] = []
+    for current, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in EXCLUDE_DIRS)
+        base = Path(current)
+        directories.extend(base / name for name in dirnames)
+        files.extend(base / name for name in sorted(filenames) if name not in EXCLUDE_FILES)
+    return directories, files
+
+
+def has_tokens(path: Path) -> bool:
+    """Return True when the file contains anything the export would replace."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return TOKEN_PATTERN.search(mapped) is not None
+
+
+def export_file(path: Path, target: Path) -> tuple[int, bool]:
+    """Copy `path` to `target`, tokenizing text files that mention the project.
+
+    Returns `(size in bytes, whether the contents were rewritten)`.
+    """
+    size = path.stat().st_size
+    if has_tokens(path) and is_text_file(path):
+        content = path.read_text(encoding="utf-8")
+        target.write_text(replace_tokens_in_text(content), encoding="utf-8")
+        return size, True
+    shutil.copy2(path, target)
+    return size, False
+
+
+def run_batch(
+    func: Callable[..., T], *columns: Sequence[object], workers: int | None = None
+) -> list[T]:
+    """Apply `func` across `columns`, on a process pool when the batch is large enough."""
+    count = len(columns[0]) if columns else 0
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or count < PARALLEL_THRESHOLD:
+        return list(map(func, *columns))
+    chunksize = max(1, count // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *columns, chunksize=chunksize))
+
+
+def copy_tree_with_tokens(
+    src_root: Path, out_dir: Path, *, workers: int | None = None
+) -> RewriteReport:
+    started = time.perf_counter()
     if out_dir.exists():
         shutil.rmtree(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    for p in src_root.rglob("*"):
-        if should_skip(p):
-            continue
-        rel_new = renamed_rel_path(src_root, p)
-        target = out_dir / rel_new
-        if p.is_dir():
-            target.mkdir(parents=True, exist_ok=True)
-            continue
-        target.parent.mkdir(parents=True, exist_ok=True)
-        if is_text_file(p):
-            content = p.read_text(encoding="utf-8")
-            new_content = replace_tokens_in_text(content)
-            target.write_text(new_content, encoding="utf-8")
-        else:
-            shutil.copy2(p, target)
+    directories, files = scan_tree(src_root)
+    for directory in directories:
+        (out_dir / renamed_rel_path(src_root, directory)).mkdir(parents=True, exist_ok=True)
+    targets = [out_dir / renamed_rel_path(src_root, path) for path in files]
+    results = run_batch(export_file, files, targets, workers=workers)
+    return RewriteReport(
+        files=len(files),
+        rewritten=sum(rewritten for _, rewritten in results),
+        bytes=sum(size for size, _ in results),
+        seconds=time.perf_counter() - started,
+    )
 
 
 def git_remote_url(name: str) -> str | None:
@@ -157,12 +238,18 @@ def main(argv: list[str] | None = None) -> int:
         "--remote-url",
         help="Explicit remote URL to push to (overrides the local 'template' remote)",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for tokenizing files (default: CPU count; 1 disables the pool)",
+    )
     args = ap.parse_args(argv)
 
     src_root = Path.cwd()
     out_dir = Path(args.out_dir).resolve()
 
-    copy_tree_with_tokens(src_root, out_dir)
+    report = copy_tree_with_tokens(src_root, out_dir, workers=args.workers)
+    print(report.summary())
 
     if args.push:
         remote_url = args.remote_url or git_remote_url("template")